@@ -0,0 +1,102 @@
+"""
+Measures the overhead of checkpointing graph runs, per node transition.
+
+The supervisor and orchestrator nodes are mocked so only the checkpoint writes are timed.
+Set REDIS_URL to also measure a real redis server.
+
+Run with: python -m benchmarks.bench_checkpointer
+"""
+import os
+import json
+import asyncio
+import time
+from statistics import mean
+from unittest.mock import Mock, AsyncMock
+from uuid import UUID, uuid4
+from langgraph.checkpoint.memory import InMemorySaver
+from fakeredis import FakeAsyncRedis
+from src.api.core.services.redis_service import RedisService
+from src.api.modules.interactions.interactions_models import WorkerState
+from src.dependencies.container import Container
+from src.workflow.agents.supervisor.supervisor_models import SupervisorOutput
+from src.workflow.graph import create_graph, get_run_config
+from src.workflow.orchestrator.deadline import Deadline
+from src.workflow.services.redis_checkpoint_saver import RedisCheckpointSaver
+from src.workflow.state import create_state
+
+ITERATIONS = 500
+AGENT_ID = "95e222ef-c637-42d3-a81e-955beeeb0ba2"
+
+
+def build_worker_state() -> WorkerState:
+    return WorkerState(
+        input="Can I terminate an employee without notice?",
+        agents=[UUID(AGENT_ID), uuid4(), uuid4()],
+        chat_id=uuid4(),
+        company_id=uuid4(),
+        chat_history=[
+            {"role": "human" if index % 2 == 0 else "ai", "content": f"Message {index} " * 20}
+            for index in range(10)
+        ],
+        user_id=uuid4()
+    )
+
+
+def register_nodes():
+    supervisor = Mock()
+    supervisor.interact = AsyncMock(return_value=SupervisorOutput(selected_agents=[AGENT_ID]))
+    orchestrator = Mock()
+    orchestrator.orchestrate = AsyncMock()
+    Container.register("supervisor", supervisor)
+    Container.register("orchestrator", orchestrator)
+
+
+async def bench(checkpointer) -> tuple:
+    graph = create_graph(checkpointer=checkpointer)
+    state = create_state(build_worker_state(), Deadline.after().expires_at)
+    samples = []
+    for _ in range(ITERATIONS):
+        thread_id = uuid4().hex
+        start = time.perf_counter()
+        if checkpointer is None:
+            await graph.ainvoke(state)
+        else:
+            await graph.ainvoke(state, get_run_config(thread_id))
+        samples.append(time.perf_counter() - start)
+
+    transitions = 0
+    if checkpointer is not None:
+        transitions = len([c async for c in checkpointer.alist(get_run_config(thread_id))])
+    return mean(samples), transitions
+
+
+def report_sizes():
+    saver = RedisCheckpointSaver(redis_service=RedisService(client=FakeAsyncRedis()))
+    worker_state = build_worker_state()
+    json_size = len(json.dumps(worker_state.model_dump(mode="json")))
+    _, msgpack_bytes = saver.serde.dumps_typed(worker_state)
+    print(f"worker state json={json_size}B msgpack={len(msgpack_bytes)}B")
+
+
+async def main():
+    register_nodes()
+    report_sizes()
+
+    baseline, _ = await bench(None)
+    print(f"{'no checkpointer':<24} run={baseline * 1e3:8.3f}ms")
+
+    checkpointers = {
+        "in-memory saver": InMemorySaver(),
+        "redis (fakeredis)": RedisCheckpointSaver(redis_service=RedisService(client=FakeAsyncRedis()))
+    }
+    if os.getenv("REDIS_URL") and not os.getenv("REDIS_URL").startswith("memory://"):
+        checkpointers["redis (server)"] = RedisCheckpointSaver(redis_service=RedisService())
+
+    for name, checkpointer in checkpointers.items():
+        run, transitions = await bench(checkpointer)
+        overhead = (run - baseline) / transitions
+        print(f"{name:<24} run={run * 1e3:8.3f}ms  checkpoints={transitions}  overhead/transition={overhead * 1e6:8.1f}us")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
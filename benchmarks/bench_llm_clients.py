@@ -0,0 +1,117 @@
+"""
+Measures the cost of building an LLM client per request against the pooled clients of LlmService,
+then runs the whole interaction pipeline offline with the fake model backend and a fake worker agent.
+
+Run with: python -m benchmarks.bench_llm_clients
+"""
+import os
+import asyncio
+import time
+import httpx
+from statistics import mean, median, quantiles
+from uuid import UUID, uuid4
+from langchain_openai import ChatOpenAI
+from src.api.core.services.http_client_service import HttpClientService
+from src.api.modules.interactions.interactions_models import WorkerState
+from src.api.modules.websocket.websocket_service import WebsocketService
+from src.dependencies.container import Container
+from src.workflow.agents.supervisor.supervisor_agent import Supervisor
+from src.workflow.graph import create_graph
+from src.workflow.orchestrator.deadline import Deadline
+from src.workflow.orchestrator.orchestrator import Orchestrator
+from src.workflow.services.llm_service import LlmService
+from src.workflow.services.message_sink_service import MessageSinkService
+from src.workflow.services.prompt_service import PromptService
+from src.workflow.state import create_state
+from benchmarks.fake_worker import create_fake_worker
+
+ITERATIONS = 500
+INTERACTIONS = 500
+CONCURRENCY = 50
+AGENT_IDS = ["95e222ef-c637-42d3-a81e-955beeeb0ba2", "99b5792d-c38a-4e49-9207-a3fa547905ae"]
+
+
+class OfflineTransport(httpx.AsyncBaseTransport):
+    """
+    Fake worker agents for interaction calls, an accepting main server for everything else.
+    """
+    def __init__(self):
+        self.worker = httpx.ASGITransport(app=create_fake_worker(latency=0.02))
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/interactions/internal/interact":
+            return await self.worker.handle_async_request(request)
+        return httpx.Response(201)
+
+
+def bench_client_construction():
+    per_request, pooled = [], []
+    llm_service = LlmService(backend="openai")
+    for _ in range(ITERATIONS):
+        start = time.perf_counter()
+        ChatOpenAI(model="gpt-4o", temperature=0.1)
+        per_request.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        llm_service.get_llm(temperature=0.1)
+        pooled.append(time.perf_counter() - start)
+    return per_request, pooled
+
+
+async def bench_offline_pipeline():
+    http_client_service = HttpClientService(transport=OfflineTransport())
+    message_sink_service = MessageSinkService(http_client_service)
+    Container.register("supervisor", Supervisor(PromptService(), LlmService(backend="fake", fake_latency=0.05)))
+    Container.register("orchestrator", Orchestrator(
+        websocket_service=WebsocketService(),
+        http_client_service=http_client_service,
+        message_sink_service=message_sink_service
+    ))
+    graph = create_graph()
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    latencies = []
+
+    async def interact(index: int):
+        worker_state = WorkerState(
+            input=f"Show me our revenue trends for quarter {index}",
+            agents=[UUID(agent_id) for agent_id in AGENT_IDS],
+            chat_id=uuid4(),
+            company_id=uuid4(),
+            chat_history=[],
+            user_id=uuid4()
+        )
+        async with semaphore:
+            start = time.perf_counter()
+            await graph.ainvoke(create_state(worker_state, Deadline.after().expires_at))
+            latencies.append(time.perf_counter() - start)
+
+    await message_sink_service.start()
+    start = time.perf_counter()
+    await asyncio.gather(*(interact(index) for index in range(INTERACTIONS)))
+    elapsed = time.perf_counter() - start
+    await message_sink_service.aclose()
+    await http_client_service.aclose()
+    Container.clear()
+    return elapsed, latencies
+
+
+def report(name: str, samples: list):
+    print(f"{name:<24} mean={mean(samples) * 1e6:10.1f}us  median={median(samples) * 1e6:10.1f}us")
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("OPENAI_API_KEY", "sk-offline")
+    os.environ.setdefault("WORKER_HOST", ".workers.test")
+    os.environ.setdefault("HMAC_SECRET", "offline")
+    os.environ.setdefault("MAIN_SERVER_ENDPOINT", "main.test")
+
+    per_request, pooled = bench_client_construction()
+    report("ChatOpenAI per request", per_request)
+    report("pooled client", pooled)
+
+    elapsed, latencies = asyncio.run(bench_offline_pipeline())
+    percentiles = quantiles(latencies, n=100)
+    print(
+        f"offline pipeline         {INTERACTIONS / elapsed:8.1f} interactions/s  "
+        f"p50={percentiles[49] * 1e3:.1f}ms  p95={percentiles[94] * 1e3:.1f}ms"
+    )
@@ -0,0 +1,52 @@
+"""
+Offline accuracy/latency benchmark for the fast-path local router.
+
+Coverage is the share of queries answered without the LLM; accuracy is measured on those queries only.
+Run with: python -m benchmarks.bench_local_router
+"""
+import json
+import time
+from pathlib import Path
+from statistics import median, quantiles
+from src.workflow.agents.supervisor.local_router import RegistryLocalRouter
+from src.workflow.services.agent_registry_service import AgentRegistryService
+
+DATASET = Path(__file__).parent / "data" / "routing_queries.jsonl"
+REPEATS = 200
+
+
+def load_dataset():
+    with DATASET.open() as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def run(router: RegistryLocalRouter, dataset: list):
+    answered = correct = 0
+    latencies = []
+
+    for row in dataset:
+        start = time.perf_counter()
+        for _ in range(REPEATS):
+            decision = router.route(row["input"])
+        latencies.append((time.perf_counter() - start) / REPEATS)
+
+        if decision is None:
+            continue
+
+        answered += 1
+        if set(decision.selected_agents) == set(row["selected_agents"]):
+            correct += 1
+
+    return answered, correct, latencies
+
+
+if __name__ == "__main__":
+    dataset = load_dataset()
+    router = RegistryLocalRouter(AgentRegistryService.from_file())
+    answered, correct, latencies = run(router, dataset)
+
+    p99 = quantiles(latencies, n=100)[98]
+    print(f"queries            {len(dataset)}")
+    print(f"fast-path coverage {answered / len(dataset):.1%} ({answered}/{len(dataset)})")
+    print(f"fast-path accuracy {correct / answered if answered else 0:.1%} ({correct}/{answered})")
+    print(f"latency            median={median(latencies) * 1e6:.1f}us  p99={p99 * 1e6:.1f}us")
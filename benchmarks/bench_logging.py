@@ -0,0 +1,93 @@
+"""
+Compares the previous Logger.log (setLevel and a handler check per call, formatted and written
+to the stream from the event loop) with the queue-backed JSON logging, under concurrent interactions.
+The stream sleeps on every write to stand in for a congested stdout pipe.
+
+Run with: python -m benchmarks.bench_logging
+"""
+import time
+import asyncio
+import logging
+from statistics import median
+from uuid import uuid4
+from src.utils.logs.logger import Logger
+from src.utils.logs.structured_logging import configure_logging, log_context, shutdown_logging
+
+INTERACTIONS = 200
+RECORDS_PER_INTERACTION = 25
+WRITE_LATENCY = 0.00005
+
+
+class SlowStream:
+    def write(self, data: str) -> int:
+        time.sleep(WRITE_LATENCY)
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+
+def legacy_log(message: str, level: int = logging.INFO, name: str = "app", stream=None):
+    ## the Logger.log this replaces
+    logger = logging.getLogger(name)
+    logger.setLevel(level)
+    if not logger.handlers:
+        handler = logging.StreamHandler(stream)
+        handler.setLevel(level)
+        handler.setFormatter(logging.Formatter("[%(asctime)s] %(levelname)s in %(name)s: %(message)s"))
+        logger.addHandler(handler)
+    logger.log(level, message)
+
+
+async def run(log) -> tuple:
+    """
+    Returns the median time a log call holds the event loop and the worst loop lag seen by a ticker.
+    """
+    calls = []
+    lag = 0.0
+    done = asyncio.Event()
+
+    async def ticker():
+        nonlocal lag
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lag = max(lag, time.perf_counter() - start - 0.001)
+
+    async def interaction():
+        with log_context(chat_id=uuid4(), company_id=uuid4()):
+            for index in range(RECORDS_PER_INTERACTION):
+                start = time.perf_counter()
+                log(f"Agent response chunk {index} delivered")
+                calls.append(time.perf_counter() - start)
+                await asyncio.sleep(0)
+
+    ticker_task = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    await asyncio.gather(*(interaction() for _ in range(INTERACTIONS)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await ticker_task
+    return median(calls), lag, elapsed
+
+
+if __name__ == "__main__":
+    stream = SlowStream()
+    total = INTERACTIONS * RECORDS_PER_INTERACTION
+    print(f"{INTERACTIONS} concurrent interactions, {total} records, {WRITE_LATENCY * 1e6:.0f}us per stream write")
+
+    per_call, lag, elapsed = asyncio.run(run(lambda message: legacy_log(message, name="bench.legacy", stream=stream)))
+    print(f"{'previous logger':<22} {per_call * 1e6:8.2f}us per call  {lag * 1e3:8.2f}ms max loop lag  {elapsed * 1e3:8.1f}ms total")
+    logging.getLogger("bench.legacy").handlers.clear()
+    logging.getLogger("bench.legacy").propagate = False
+
+    for name, async_enabled in (("json, sync handler", False), ("json, queue handler", True)):
+        configure_logging(level="INFO", format="json", async_enabled=async_enabled, sample_rates={}, stream=stream)
+        per_call, lag, elapsed = asyncio.run(run(lambda message: Logger.log(message=message, name="bench.structured")))
+        shutdown_logging()
+        print(f"{name:<22} {per_call * 1e6:8.2f}us per call  {lag * 1e3:8.2f}ms max loop lag  {elapsed * 1e3:8.1f}ms total")
+
+    configure_logging(level="INFO", format="json", async_enabled=True, sample_rates={"bench.structured": 0.1}, stream=stream)
+    per_call, lag, elapsed = asyncio.run(run(lambda message: Logger.log(message=message, name="bench.structured")))
+    shutdown_logging()
+    print(f"{'queue handler, 10%':<22} {per_call * 1e6:8.2f}us per call  {lag * 1e3:8.2f}ms max loop lag  {elapsed * 1e3:8.1f}ms total")
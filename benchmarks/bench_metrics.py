@@ -0,0 +1,63 @@
+"""
+Measures what the metrics cost: recording on the hot path (histogram observe, labelled counter)
+and rendering a /metrics scrape with a realistic number of label sets.
+
+Run with: python -m benchmarks.bench_metrics
+"""
+import time
+from statistics import median
+from src.utils.metrics.metrics import MetricsRegistry
+
+OBSERVATIONS = 100000
+ROUNDS = 7
+AGENTS = 20
+SCRAPES = 200
+
+
+def bench_record(registry: MetricsRegistry) -> tuple:
+    histogram = registry.histogram("worker_agent_request_seconds", "Worker agent latency", ["agent_id", "outcome"])
+    counter = registry.counter("supervisor_routing_decisions", "Routing decisions", ["agent_id"])
+    agent_ids = [f"agent-{index}" for index in range(AGENTS)]
+
+    observe_rounds, count_rounds = [], []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        for index in range(OBSERVATIONS):
+            histogram.labels(agent_ids[index % AGENTS], "ok").observe(0.42)
+        observe_rounds.append((time.perf_counter() - start) / OBSERVATIONS)
+
+        start = time.perf_counter()
+        for index in range(OBSERVATIONS):
+            counter.labels(agent_ids[index % AGENTS]).inc()
+        count_rounds.append((time.perf_counter() - start) / OBSERVATIONS)
+    return median(observe_rounds), median(count_rounds)
+
+
+def bench_render(registry: MetricsRegistry) -> tuple:
+    rounds = []
+    for _ in range(SCRAPES):
+        start = time.perf_counter()
+        body = "\n".join(registry.render())
+        rounds.append(time.perf_counter() - start)
+    return median(rounds), len(body.encode())
+
+
+def baseline() -> float:
+    rounds = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        for index in range(OBSERVATIONS):
+            index % AGENTS
+        rounds.append((time.perf_counter() - start) / OBSERVATIONS)
+    return median(rounds)
+
+
+if __name__ == "__main__":
+    registry = MetricsRegistry()
+    empty = baseline()
+    observe, count = bench_record(registry)
+    print(f"{'histogram observe':<24} {(observe - empty) * 1e6:6.3f}us")
+    print(f"{'counter inc':<24} {(count - empty) * 1e6:6.3f}us")
+
+    seconds, size = bench_render(registry)
+    print(f"{'render':<24} {seconds * 1e3:6.3f}ms for {AGENTS * 2} label sets, {size} bytes")
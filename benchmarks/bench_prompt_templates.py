@@ -0,0 +1,75 @@
+"""
+Measures the per-request cost of building the supervisor prompt template, against reusing the compiled one.
+
+Both paths format the same messages so the comparison covers everything up to the LLM call.
+
+Run with: python -m benchmarks.bench_prompt_templates
+"""
+import asyncio
+import time
+from statistics import mean, median
+from uuid import UUID, uuid4
+from src.api.modules.interactions.interactions_models import WorkerState
+from src.workflow.prompts.prompt_registry import PromptRegistry
+from src.workflow.services.prompt_service import PromptService
+from src.workflow.services.history_strategies import LastTurnsStrategy
+
+ITERATIONS = 2000
+
+
+def build_state() -> dict:
+    worker_state = WorkerState(
+        input="Can I terminate an employee without notice?",
+        agents=[UUID("95e222ef-c637-42d3-a81e-955beeeb0ba2")],
+        chat_id=uuid4(),
+        company_id=uuid4(),
+        chat_history=[
+            {"role": "human" if index % 2 == 0 else "ai", "content": f"Message {index}"}
+            for index in range(10)
+        ],
+        user_id=uuid4()
+    )
+    return {"chat_id": worker_state.chat_id, "input": worker_state.input, "worker_state": worker_state}
+
+
+async def bench_build_per_request(prompt_service: PromptService, system_message: str, state: dict):
+    samples = []
+    for _ in range(ITERATIONS):
+        start = time.perf_counter()
+        prompt = await prompt_service.custom_prompt_template(state=state, system_message=system_message, with_chat_history=True)
+        prompt.format_messages(input=state["input"])
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+async def bench_compiled(prompt_service: PromptService, state: dict):
+    samples = []
+    for _ in range(ITERATIONS):
+        start = time.perf_counter()
+        prompt = prompt_service.get_prompt("supervisor")
+        prompt.format_messages(input=state["input"], chat_history=await prompt_service.get_chat_history(state))
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def report(name: str, samples: list):
+    print(f"{name:<24} mean={mean(samples) * 1e6:10.1f}us  median={median(samples) * 1e6:10.1f}us")
+
+
+async def main():
+    registry = PromptRegistry()
+    prompt_service = PromptService(history_strategy=LastTurnsStrategy(max_messages=10), prompt_registry=registry)
+    state = build_state()
+    ## the literal system message the supervisor used to rebuild on every request
+    system_message = registry.get("supervisor").format_messages(input="")[0].content
+
+    per_request = await bench_build_per_request(prompt_service, system_message, state)
+    compiled = await bench_compiled(prompt_service, state)
+
+    report("build per request", per_request)
+    report("compiled template", compiled)
+    print(f"saved per request       ~{(mean(per_request) - mean(compiled)) * 1e6:.1f}us")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
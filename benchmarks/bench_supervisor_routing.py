@@ -0,0 +1,94 @@
+"""
+Compares supervisor routing with one model call per request against the micro-batching router
+and the small-to-large model cascade, using the fake model backend.
+Requests come from a few companies and the batcher shares calls within a company.
+
+Run with: python -m benchmarks.bench_supervisor_routing
+"""
+import asyncio
+import time
+from statistics import quantiles
+from uuid import UUID, uuid4
+from src.api.modules.interactions.interactions_models import WorkerState
+from src.workflow.agents.supervisor.routing_batcher import RoutingBatcher
+from src.workflow.agents.supervisor.routing_cascade import RoutingCascade
+from src.workflow.agents.supervisor.supervisor_agent import Supervisor
+from src.workflow.services.llm_service import LlmService
+from src.workflow.services.prompt_service import PromptService
+
+REQUESTS = 400
+CONCURRENCY = 50
+LATENCY = 0.05
+AGENT_IDS = [UUID("95e222ef-c637-42d3-a81e-955beeeb0ba2"), UUID("99b5792d-c38a-4e49-9207-a3fa547905ae")]
+COMPANY_IDS = [uuid4() for _ in range(4)]
+
+
+def build_state(index: int) -> dict:
+    worker_state = WorkerState(
+        input=f"Show me our revenue trends for quarter {index}",
+        agents=AGENT_IDS,
+        chat_id=uuid4(),
+        company_id=COMPANY_IDS[index % len(COMPANY_IDS)],
+        chat_history=[],
+        user_id=uuid4()
+    )
+    return {"input": worker_state.input, "chat_id": worker_state.chat_id, "available_agents": AGENT_IDS, "worker_state": worker_state}
+
+
+async def run(name: str, llm_service: LlmService, **options):
+    prompt_service = PromptService()
+    if options.pop("batched", False):
+        options["routing_batcher"] = RoutingBatcher(llm_service, prompt_service, window=0.005, max_batch_size=16, scope="company")
+    supervisor = Supervisor(prompt_service, llm_service, **options)
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    latencies = []
+
+    async def route(index: int):
+        state = build_state(index)
+        async with semaphore:
+            start = time.perf_counter()
+            await supervisor.interact(state)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(route(index) for index in range(REQUESTS)))
+    elapsed = time.perf_counter() - start
+
+    calls = sum(llm_service.get_llm(temperature=0.1, model=model).calls for model in ("gpt-4o", "gpt-4o-mini"))
+    percentiles = quantiles(latencies, n=100)
+    print(
+        f"{name:<22} {REQUESTS / elapsed:8.1f} routes/s  p50={percentiles[49] * 1e3:6.1f}ms  "
+        f"p95={percentiles[94] * 1e3:6.1f}ms  model calls={calls}"
+    )
+    return options
+
+
+async def main():
+    await run("single call", LlmService(backend="fake", fake_latency=LATENCY))
+    await run("micro-batched", LlmService(backend="fake", fake_latency=LATENCY), batched=True)
+
+    for escalation_rate in (0.0, 0.2):
+        llm_service = LlmService(backend="fake", fake_latency=LATENCY)
+        small = llm_service.get_llm(temperature=0.1, model="gpt-4o-mini")
+        small.latency = LATENCY / 3
+        cascade = RoutingCascade(llm_service, RoutingCascade.parse_tiers("gpt-4o-mini:0.15:0.6,gpt-4o:2.5:10"), min_confidence=0.7)
+        if escalation_rate:
+            ## every fifth answer of the small model is unsure
+            original = small.build_structured_output
+            counter = iter(range(REQUESTS * 2))
+            object.__setattr__(small, "build_structured_output", lambda schema, messages: original(schema, messages).model_copy(
+                update={"confidence": 0.3 if next(counter) % 5 == 0 else 0.9}
+            ))
+        await run(f"cascade ({escalation_rate:.0%} escalated)", llm_service, routing_cascade=cascade)
+        for model, stats in cascade.stats().items():
+            print(f"    {model:<12} calls={stats['calls']:4d}  p50={(stats['p50'] or 0) * 1e3:6.1f}ms  cost=${stats['cost']:.4f}")
+
+    ## the same routes on the large model alone, for the cost comparison
+    llm_service = LlmService(backend="fake", fake_latency=LATENCY)
+    large_only = RoutingCascade(llm_service, RoutingCascade.parse_tiers("gpt-4o:2.5:10"))
+    await run("large model only", llm_service, routing_cascade=large_only)
+    print(f"    {'gpt-4o':<12} cost=${large_only.stats()['gpt-4o']['cost']:.4f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
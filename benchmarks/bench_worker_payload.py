@@ -0,0 +1,75 @@
+"""
+Measures worker payload serialisation time and bytes on the wire for large chat histories.
+Compares re-serialising the WorkerState for every agent of the fan-out with one WorkerPayload per interaction,
+for each format and compression.
+
+Run with: python -m benchmarks.bench_worker_payload
+"""
+import json
+import time
+from statistics import median
+from uuid import UUID, uuid4
+from src.api.modules.interactions.interactions_models import WorkerState
+from src.workflow.orchestrator.payload_codec import COMPRESSORS, ENCODERS, WorkerPayload
+
+ITERATIONS = 50
+AGENTS = 4
+HISTORY_SIZES = [20, 200, 1000]
+AGENT_IDS = [UUID("95e222ef-c637-42d3-a81e-955beeeb0ba2"), UUID("99b5792d-c38a-4e49-9207-a3fa547905ae")]
+
+
+def build_worker_state(messages: int) -> WorkerState:
+    return WorkerState(
+        input="Can I terminate an employee without notice?",
+        agents=AGENT_IDS,
+        chat_id=uuid4(),
+        company_id=uuid4(),
+        chat_history=[
+            {
+                "role": "human" if index % 2 == 0 else "ai",
+                "content": f"Message {index} about the employment contract, the notice period and overtime rules. " * 3
+            }
+            for index in range(messages)
+        ],
+        user_id=uuid4()
+    )
+
+
+def measure(encode) -> float:
+    samples = []
+    for _ in range(ITERATIONS):
+        start = time.perf_counter()
+        encode()
+        samples.append(time.perf_counter() - start)
+    return median(samples)
+
+
+def per_agent(worker_state: WorkerState) -> bytes:
+    ## what the orchestrator used to do, httpx then encodes the dict again
+    for _ in range(AGENTS):
+        body = json.dumps(worker_state.model_dump(mode="json"), ensure_ascii=False, separators=(",", ":")).encode()
+    return body
+
+
+def once(worker_state: WorkerState, media_type: str, content_encoding) -> bytes:
+    payload = WorkerPayload(worker_state.model_dump(mode="json"))
+    for _ in range(AGENTS):
+        body = payload.encode(media_type, content_encoding)
+    return body
+
+
+if __name__ == "__main__":
+    print(f"{AGENTS} agents per interaction, median of {ITERATIONS} interactions")
+    for messages in HISTORY_SIZES:
+        worker_state = build_worker_state(messages)
+        print(f"\nchat history of {messages} messages")
+
+        seconds = measure(lambda: per_agent(worker_state))
+        print(f"  {'per agent json':<28} {seconds * 1e3:8.3f}ms  {len(per_agent(worker_state)):>9} bytes")
+
+        for media_type in ENCODERS:
+            for content_encoding in (None, *COMPRESSORS):
+                name = f"once {media_type.split('/')[1]}" + (f"+{content_encoding}" if content_encoding else "")
+                seconds = measure(lambda: once(worker_state, media_type, content_encoding))
+                size = len(once(worker_state, media_type, content_encoding))
+                print(f"  {name:<28} {seconds * 1e3:8.3f}ms  {size:>9} bytes")
@@ -0,0 +1,72 @@
+"""
+Message flow benchmark for WebsocketService cluster mode against fakeredis.
+
+Compares direct delivery on the node holding the socket with delivery published from another node.
+Run with: python -m benchmarks.bench_ws_fanout
+"""
+import asyncio
+import time
+from statistics import median, quantiles
+from uuid import uuid4
+from fakeredis import FakeAsyncRedis
+from src.api.core.services.redis_service import RedisService
+from src.api.modules.websocket.websocket_service import WebsocketService
+
+CHATS = 50
+MESSAGES_PER_CHAT = 200
+
+
+class RecordingWebSocket:
+    def __init__(self):
+        self.latencies = []
+        self.done = asyncio.Event()
+
+    async def send_json(self, data: dict):
+        self.latencies.append(time.perf_counter() - data["sent_at"])
+        if len(self.latencies) == MESSAGES_PER_CHAT:
+            self.done.set()
+
+
+async def run(cross_node: bool):
+    redis_service = RedisService(client=FakeAsyncRedis())
+    holder = WebsocketService(redis_service=redis_service)
+    sender = WebsocketService(redis_service=redis_service) if cross_node else holder
+    await holder.start()
+    await sender.start()
+
+    sockets = {}
+    for _ in range(CHATS):
+        chat_id = uuid4()
+        sockets[chat_id] = RecordingWebSocket()
+        await holder.add_connection(chat_id, sockets[chat_id])
+
+    start = time.perf_counter()
+    for _ in range(MESSAGES_PER_CHAT):
+        for chat_id in sockets:
+            await sender.send_json(chat_id, {"token": "x", "sent_at": time.perf_counter()})
+        await asyncio.sleep(0)
+    await asyncio.gather(*(socket.done.wait() for socket in sockets.values()))
+    elapsed = time.perf_counter() - start
+
+    await holder.stop()
+    await sender.stop()
+
+    latencies = [latency for socket in sockets.values() for latency in socket.latencies]
+    return elapsed, latencies
+
+
+def report(name: str, elapsed: float, latencies: list):
+    p99 = quantiles(latencies, n=100)[98]
+    print(
+        f"{name:<12} {len(latencies) / elapsed:10.0f} msg/s  "
+        f"median={median(latencies) * 1e6:8.1f}us  p99={p99 * 1e6:8.1f}us"
+    )
+
+
+async def main():
+    report("local", *await run(cross_node=False))
+    report("cross-node", *await run(cross_node=True))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
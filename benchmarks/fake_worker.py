@@ -0,0 +1,50 @@
+"""
+Fake worker agent that injects latency and errors.
+
+Used in-process through httpx.ASGITransport by the load tests, or served on its own with:
+python -m benchmarks.fake_worker --port 8100 --latency 0.5 --error-rate 0.3
+"""
+import argparse
+import asyncio
+import random
+from fastapi import FastAPI, Request, Response
+from src.workflow.orchestrator.payload_codec import COMPRESSORS, ENCODERS, decode_payload
+
+
+def create_fake_worker(latency: float = 0.05, jitter: float = 0.0, error_rate: float = 0.0, seed: int = 7) -> FastAPI:
+    """
+    Decodes every payload format and compression, and advertises them so the orchestrator negotiates.
+    """
+    app = FastAPI()
+    app.state.latency = latency
+    app.state.jitter = jitter
+    app.state.error_rate = error_rate
+    app.state.calls = 0
+    generator = random.Random(seed)
+
+    @app.post("/interactions/internal/interact")
+    async def interact(request: Request, response: Response):
+        app.state.calls += 1
+        decode_payload(await request.body(), request.headers.get("content-type", "application/json"), request.headers.get("content-encoding"))
+        response.headers["Accept-Post"] = ", ".join(ENCODERS)
+        response.headers["Accept-Encoding"] = ", ".join(COMPRESSORS)
+        await asyncio.sleep(app.state.latency + generator.random() * app.state.jitter)
+        if generator.random() < app.state.error_rate:
+            response.status_code = 503
+            return {"detail": "injected failure"}
+        return {"response": "fake answer"}
+
+    return app
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    uvicorn.run(create_fake_worker(args.latency, args.jitter, args.error_rate), port=args.port)
@@ -0,0 +1,101 @@
+"""
+Load test of WorkerClient against one healthy and one degraded fake worker agent.
+
+The degraded agent answers slowly and fails often. With breakers and adaptive limits the calls
+to it are shed quickly instead of holding a slot until the interaction deadline.
+Run with: python -m benchmarks.load_worker_agents
+"""
+import os
+import asyncio
+import time
+import httpx
+from statistics import median, quantiles
+from src.api.core.services.http_client_service import HttpClientService
+from src.workflow.orchestrator.deadline import Deadline
+from src.workflow.orchestrator.worker_client import WorkerClient, AgentUnavailableError
+from benchmarks.fake_worker import create_fake_worker
+
+HEALTHY_AGENT_ID = "95e222ef-c637-42d3-a81e-955beeeb0ba2"
+DEGRADED_AGENT_ID = "99b5792d-c38a-4e49-9207-a3fa547905ae"
+INTERACTIONS = 600
+CONCURRENCY = 40
+DEADLINE_SECONDS = 1.0
+
+
+class RoutingTransport(httpx.AsyncBaseTransport):
+    def __init__(self):
+        self.workers = {
+            HEALTHY_AGENT_ID: create_fake_worker(latency=0.02, jitter=0.02),
+            DEGRADED_AGENT_ID: create_fake_worker(latency=0.6, jitter=0.8, error_rate=0.5)
+        }
+        self.transports = {
+            agent_id: httpx.ASGITransport(app=app) for agent_id, app in self.workers.items()
+        }
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        agent_id = request.url.host.split(".", 1)[0]
+        return await self.transports[agent_id].handle_async_request(request)
+
+
+async def call(client: WorkerClient, agent_id: str, outcomes: dict):
+    deadline = Deadline.after(DEADLINE_SECONDS)
+    started = time.perf_counter()
+    try:
+        response = await asyncio.wait_for(
+            client.post(agent_id, headers={}, payload={}, deadline=deadline),
+            timeout=deadline.remaining()
+        )
+        result = "ok" if response.status_code < 500 else "error"
+    except AgentUnavailableError:
+        result = "shed"
+    except (asyncio.TimeoutError, httpx.HTTPError):
+        result = "timeout"
+    outcomes.setdefault(agent_id, []).append((result, time.perf_counter() - started))
+
+
+async def run(resilience: bool):
+    os.environ["WORKER_HOST"] = ".workers.test"
+    os.environ["WORKER_CIRCUIT_BREAKER_ENABLED"] = str(resilience).lower()
+    os.environ["WORKER_CONCURRENCY_LIMIT_ENABLED"] = str(resilience).lower()
+    os.environ.setdefault("WORKER_BREAKER_RECOVERY_SECONDS", "0.5")
+
+    transport = RoutingTransport()
+    client = WorkerClient(HttpClientService(transport=transport))
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    outcomes = {}
+
+    async def interaction(index: int):
+        async with semaphore:
+            await asyncio.gather(
+                call(client, HEALTHY_AGENT_ID, outcomes),
+                call(client, DEGRADED_AGENT_ID, outcomes)
+            )
+
+    start = time.perf_counter()
+    await asyncio.gather(*(interaction(index) for index in range(INTERACTIONS)))
+    elapsed = time.perf_counter() - start
+    return elapsed, outcomes, client.stats(), transport.workers[DEGRADED_AGENT_ID].state.calls
+
+
+def report(name: str, elapsed: float, outcomes: dict, stats: dict, degraded_calls: int):
+    print(f"{name}: {INTERACTIONS / elapsed:.0f} interactions/s, degraded worker received {degraded_calls} calls")
+    for agent_id, label in ((HEALTHY_AGENT_ID, "healthy"), (DEGRADED_AGENT_ID, "degraded")):
+        results = outcomes[agent_id]
+        latencies = [latency for _, latency in results]
+        counts = {kind: sum(1 for result, _ in results if result == kind) for kind in ("ok", "error", "timeout", "shed")}
+        print(
+            f"  {label:<9} median={median(latencies) * 1000:7.1f}ms p99={quantiles(latencies, n=100)[98] * 1000:7.1f}ms "
+            + " ".join(f"{kind}={count}" for kind, count in counts.items())
+        )
+        agent_stats = stats["agents"].get(agent_id, {})
+        if agent_stats.get("breaker"):
+            print(f"  {'':<9} breaker={agent_stats['breaker']} limiter={agent_stats['limiter']}")
+
+
+async def main():
+    report("without breaker/limiter", *await run(resilience=False))
+    report("with breaker/limiter", *await run(resilience=True))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
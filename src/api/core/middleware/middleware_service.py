@@ -1,14 +1,19 @@
 import os
 import jwt
+import logging
 from typing import Dict
 from fastapi import Request, HTTPException
 from src.api.core.services.http_service import HttpService
 from fastapi.security import HTTPBearer
+from src.utils.tracing.tracer import get_tracer
+from src.utils.logs.logger import Logger
 
 
 
 security = HTTPBearer()
 class MiddlewareService:
+    __MODULE = "auth.middleware"
+
     def __init__(self, http_service: HttpService):
         self.TOKEN_KEY = os.getenv("TOKEN_KEY")
         self.http_service = http_service
@@ -22,11 +27,12 @@ class MiddlewareService:
         token = auth_header.split(" ")[1]
 
         try:
-            payload = self.http_service.webtoken_service.decode_token(token=token)
+            with get_tracer().start_span("auth.jwt"):
+                payload = self.http_service.webtoken_service.decode_token(token=token)
 
             return payload
         except jwt.ExpiredSignatureError:
-            print("token expired")
+            Logger.log(message="Expired token rejected", level=logging.INFO, name=self.__MODULE)
             raise HTTPException(status_code=403, detail="Expired Token")
         
         except jwt.InvalidTokenError:
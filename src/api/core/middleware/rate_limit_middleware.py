@@ -0,0 +1,23 @@
+from fastapi import Request, Depends
+from src.dependencies.container import Container
+from src.api.core.middleware.auth_middleware import auth_middleware
+from src.api.core.services.rate_limiter_service import RateLimiterService
+
+
+async def rate_limit_middleware(req: Request, _: None = Depends(auth_middleware)):
+    """
+    Rejects with 429 when the company is over its rate and 503 when too many runs are in flight.
+    The slot id is left on req.state for the graph run on success and given back if the request fails.
+    """
+    rate_limiter_service: RateLimiterService = Container.resolve("rate_limiter_service")
+    if rate_limiter_service is None:
+        yield
+        return
+
+    await rate_limiter_service.check_company(req.state.company)
+    req.state.rate_limit_slot = await rate_limiter_service.acquire_slot()
+    try:
+        yield
+    except Exception:
+        await rate_limiter_service.release_slot(req.state.rate_limit_slot)
+        raise
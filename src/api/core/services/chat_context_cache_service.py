@@ -0,0 +1,110 @@
+import json
+from typing import Any, Dict, List, Optional, Union
+from uuid import UUID
+from src.api.core.services.redis_service import RedisService
+from src.api.modules.interactions.interactions_models import WorkerState
+
+## appends only to a cached chat, an invalidated or expired one is rebuilt from the main server
+APPEND_TURN_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+redis.call('RPUSH', KEYS[2], unpack(ARGV, 2))
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+redis.call('EXPIRE', KEYS[2], ARGV[1])
+return 1
+"""
+
+
+class ChatContextCacheService:
+    """
+    Caches the chat context returned by the main server so most turns skip the worker state round-trip.
+    Turns are appended locally; the main server invalidates a chat or a whole company through a signed webhook.
+    The history is a Redis list next to the context, so concurrent turns append without overwriting each other.
+    """
+    def __init__(self, redis_service: RedisService, ttl_seconds: int = 3600):
+        self.__redis_service = redis_service
+        self.ttl_seconds = ttl_seconds
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    async def get(self, chat_id: UUID, user_id: Union[UUID, str], company_id: Union[UUID, str], input: str) -> Optional[WorkerState]:
+        async with self.__redis_service.redis.pipeline(transaction=True) as pipeline:
+            pipeline.get(RedisService.get_agent_state_key(chat_id))
+            pipeline.lrange(self.get_history_key(chat_id), 0, -1)
+            pipeline.get(self.get_version_key(company_id))
+            context, history, version = await pipeline.execute()
+        context = json.loads(context) if context else None
+
+        ## a context is only reused by the same user and company, and until the company is invalidated
+        if (
+            context is None
+            or context["user_id"] != str(user_id)
+            or context["company_id"] != str(company_id)
+            or context.get("version") != int(version or 0)
+        ):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        context.pop("version", None)
+        return WorkerState(**context, chat_history=[json.loads(message) for message in history], input=input)
+
+    async def store(self, worker_state: WorkerState) -> None:
+        context = worker_state.model_dump(mode="json", exclude={"input"})
+        history = [json.dumps(message) for message in context.pop("chat_history")]
+        context["version"] = await self.__get_version(worker_state.company_id)
+        history_key = self.get_history_key(worker_state.chat_id)
+
+        async with self.__redis_service.redis.pipeline(transaction=True) as pipeline:
+            pipeline.set(RedisService.get_agent_state_key(worker_state.chat_id), json.dumps(context), ex=self.ttl_seconds)
+            pipeline.delete(history_key)
+            if history:
+                pipeline.rpush(history_key, *history)
+                pipeline.expire(history_key, self.ttl_seconds)
+            await pipeline.execute()
+
+    async def append_turn(self, chat_id: UUID, messages: List[Dict[str, Any]]) -> None:
+        if not messages:
+            return
+
+        await self.__redis_service.redis.eval(
+            APPEND_TURN_SCRIPT,
+            2,
+            RedisService.get_agent_state_key(chat_id),
+            self.get_history_key(chat_id),
+            self.ttl_seconds,
+            *(json.dumps(message) for message in messages)
+        )
+
+    async def invalidate_chat(self, chat_id: UUID) -> None:
+        self.invalidations += 1
+        await self.__redis_service.redis.delete(RedisService.get_agent_state_key(chat_id), self.get_history_key(chat_id))
+
+    async def invalidate_company(self, company_id: UUID) -> None:
+        """
+        Bumps the company version, every cached chat of the company becomes stale at once.
+        """
+        self.invalidations += 1
+        await self.__redis_service.redis.incr(self.get_version_key(company_id))
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations
+        }
+
+    async def __get_version(self, company_id: Union[UUID, str]) -> int:
+        version = await self.__redis_service.redis.get(self.get_version_key(company_id))
+        return int(version or 0)
+
+    @staticmethod
+    def get_history_key(chat_id: Union[UUID, str]) -> str:
+        return f"chat_state_history:{chat_id}"
+
+    @staticmethod
+    def get_version_key(company_id: Union[UUID, str]) -> str:
+        return f"chat_state_version:{company_id}"
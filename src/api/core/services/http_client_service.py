@@ -0,0 +1,91 @@
+import os
+import asyncio
+import httpx
+from contextlib import asynccontextmanager, contextmanager
+from typing import Dict, Optional
+
+
+class HttpClientService:
+    """
+    Shared outbound HTTP layer for calls to the main server and worker agents.
+    Keeps one pooled client per origin so connections are reused across requests.
+    """
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.__transport = transport
+        self.__clients: Dict[str, httpx.AsyncClient] = {}
+        self.__in_flight: Dict[str, int] = {}
+
+        ## HTTP/2 needs the h2 package, installed with httpx[http2]
+        self.http2 = os.getenv("OUTBOUND_HTTP2", "false").lower() == "true"
+        self.limits = httpx.Limits(
+            max_connections=int(os.getenv("OUTBOUND_MAX_CONNECTIONS", 100)),
+            max_keepalive_connections=int(os.getenv("OUTBOUND_MAX_KEEPALIVE_CONNECTIONS", 20)),
+            keepalive_expiry=float(os.getenv("OUTBOUND_KEEPALIVE_EXPIRY", 30.0))
+        )
+        self.timeout = httpx.Timeout(
+            float(os.getenv("OUTBOUND_TIMEOUT", 30.0)),
+            connect=float(os.getenv("OUTBOUND_CONNECT_TIMEOUT", 5.0))
+        )
+
+    def get_client(self, url: str) -> httpx.AsyncClient:
+        origin = self.get_origin(url)
+        client = self.__clients.get(origin)
+
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                http2=self.http2,
+                limits=self.limits,
+                timeout=self.timeout,
+                transport=self.__transport
+            )
+            self.__clients[origin] = client
+
+        return client
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        client = self.get_client(url)
+        with self.__track(url):
+            return await client.get(url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        client = self.get_client(url)
+        with self.__track(url):
+            return await client.post(url, **kwargs)
+
+    @asynccontextmanager
+    async def stream(self, method: str, url: str, **kwargs):
+        client = self.get_client(url)
+        with self.__track(url):
+            async with client.stream(method, url, **kwargs) as response:
+                yield response
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Requests in flight per origin against the pool limit, counted by this service rather than read from httpx internals.
+        """
+        return {
+            origin: {
+                "requests": self.__in_flight.get(origin, 0),
+                "max_connections": self.limits.max_connections or 0
+            }
+            for origin in self.__clients
+        }
+
+    async def aclose(self) -> None:
+        clients = list(self.__clients.values())
+        self.__clients.clear()
+        await asyncio.gather(*(client.aclose() for client in clients))
+
+    @contextmanager
+    def __track(self, url: str):
+        origin = self.get_origin(url)
+        self.__in_flight[origin] = self.__in_flight.get(origin, 0) + 1
+        try:
+            yield
+        finally:
+            self.__in_flight[origin] -= 1
+
+    @staticmethod
+    def get_origin(url: str) -> str:
+        parsed = httpx.URL(url)
+        return f"{parsed.scheme}://{parsed.netloc.decode('ascii')}"
@@ -0,0 +1,176 @@
+from typing import Optional
+from src.api.core.services.http_client_service import HttpClientService
+from src.api.core.services.rate_limiter_service import RateLimiterService
+from src.api.core.services.chat_context_cache_service import ChatContextCacheService
+from src.api.modules.websocket.websocket_service import WebsocketService
+from src.workflow.services.message_sink_service import MessageSinkService
+from src.workflow.services.routing_cache_service import RoutingCacheService
+from src.workflow.services.llm_service import LlmService
+from src.workflow.orchestrator.orchestrator import Orchestrator
+from src.workflow.agents.supervisor.routing_cascade import RoutingCascade
+from src.workflow.agents.supervisor.routing_batcher import RoutingBatcher
+from src.workflow.jobs.worker_pool import WorkerPool
+from src.utils.metrics.metrics import REGISTRY, MetricsRegistry
+
+CIRCUIT_STATES = ("closed", "half_open", "open")
+
+
+class MetricsService:
+    """
+    Serves the /metrics scrape. Latency histograms and routing counters are recorded on the hot path in REGISTRY,
+    everything else is read from the stats() the services already keep, and only when Prometheus scrapes.
+    """
+    def __init__(
+        self,
+        websocket_service: Optional[WebsocketService] = None,
+        message_sink_service: Optional[MessageSinkService] = None,
+        orchestrator: Optional[Orchestrator] = None,
+        http_client_service: Optional[HttpClientService] = None,
+        rate_limiter_service: Optional[RateLimiterService] = None,
+        worker_pool: Optional[WorkerPool] = None,
+        chat_context_cache_service: Optional[ChatContextCacheService] = None,
+        routing_cache_service: Optional[RoutingCacheService] = None,
+        routing_cascade: Optional[RoutingCascade] = None,
+        routing_batcher: Optional[RoutingBatcher] = None,
+        llm_service: Optional[LlmService] = None,
+        registry: MetricsRegistry = REGISTRY
+    ):
+        self.__websocket_service = websocket_service
+        self.__message_sink_service = message_sink_service
+        self.__orchestrator = orchestrator
+        self.__http_client_service = http_client_service
+        self.__rate_limiter_service = rate_limiter_service
+        self.__worker_pool = worker_pool
+        self.__chat_context_cache_service = chat_context_cache_service
+        self.__routing_cache_service = routing_cache_service
+        self.__routing_cascade = routing_cascade
+        self.__routing_batcher = routing_batcher
+        self.__llm_service = llm_service
+        self.__registry = registry
+
+    async def render(self) -> str:
+        ## a fresh registry per scrape, so closed connections and idle origins drop out of the output
+        scrape = MetricsRegistry()
+        self.__collect_websocket(scrape)
+        self.__collect_message_sink(scrape)
+        self.__collect_worker_agents(scrape)
+        self.__collect_outbound_pools(scrape)
+        self.__collect_routing(scrape)
+        await self.__collect_admission(scrape)
+        await self.__collect_worker_pool(scrape)
+        return "\n".join([*self.__registry.render(), *scrape.render()]) + "\n"
+
+    def __collect_websocket(self, scrape: MetricsRegistry) -> None:
+        if self.__websocket_service is None:
+            return
+
+        scrape.gauge("websocket_active_connections", "WebSocket connections open on this process").set(len(self.__websocket_service.active_connections))
+        writers = self.__websocket_service.queue_stats().values()
+        scrape.gauge("websocket_send_queue_depth", "Messages waiting in the per-connection send queues").set(sum(writer["depth"] for writer in writers))
+        messages = scrape.counter("websocket_messages", "Messages handled by the connection writers, closed connections included", ["outcome"])
+        for outcome, count in self.__websocket_service.message_totals().items():
+            messages.labels(outcome).inc(count)
+
+        if self.__websocket_service.cluster_mode:
+            listener = self.__websocket_service.listener_stats()
+            scrape.gauge("websocket_pubsub_connected", "1 while the cluster pubsub listener is subscribed").set(listener["connected"])
+            scrape.counter("websocket_pubsub_reconnects", "Cluster pubsub listener reconnects").inc(listener["reconnects"])
+            scrape.counter("websocket_pubsub_bad_messages", "Cluster pubsub messages that could not be delivered").inc(listener["bad_messages"])
+
+    def __collect_message_sink(self, scrape: MetricsRegistry) -> None:
+        if self.__message_sink_service is None:
+            return
+
+        stats = self.__message_sink_service.stats()
+        scrape.gauge("message_sink_queue_depth", "Messages waiting to be persisted").set(stats["depth"])
+        messages = scrape.counter("message_sink_messages", "Messages handed to the main server, by outcome", ["outcome"])
+        messages.labels("persisted").inc(stats["persisted"])
+        messages.labels("failed").inc(stats["failed"])
+        messages.labels("dropped").inc(stats["dropped"])
+        scrape.counter("message_sink_retries", "Persistence retries").inc(stats["retries"])
+
+    def __collect_worker_agents(self, scrape: MetricsRegistry) -> None:
+        if self.__orchestrator is None:
+            return
+
+        stats = self.__orchestrator.stats()
+        hedges = scrape.counter("worker_hedged_requests", "Hedged worker requests, by whether the hedge won", ["won"])
+        hedges.labels("true").inc(stats["hedge_wins"])
+        hedges.labels("false").inc(stats["hedges"] - stats["hedge_wins"])
+        scrape.counter("worker_payload_bytes", "Worker request bytes sent").inc(stats["payload_bytes"])
+
+        limit = scrape.gauge("worker_agent_concurrency_limit", "Adaptive concurrency limit per worker agent", ["agent_id"])
+        in_flight = scrape.gauge("worker_agent_in_flight", "Requests in flight per worker agent", ["agent_id"])
+        circuit = scrape.gauge("worker_agent_circuit_state", "1 for the current circuit breaker state of each worker agent", ["agent_id", "state"])
+        for agent_id, agent in stats["agents"].items():
+            if agent["limiter"] is not None:
+                limit.labels(agent_id).set(agent["limiter"]["limit"])
+                in_flight.labels(agent_id).set(agent["limiter"]["in_flight"])
+            if agent["breaker"] is not None:
+                for state in CIRCUIT_STATES:
+                    circuit.labels(agent_id, state).set(1 if agent["breaker"]["state"] == state else 0)
+
+    def __collect_outbound_pools(self, scrape: MetricsRegistry) -> None:
+        if self.__http_client_service is None:
+            return
+
+        requests = scrape.gauge("outbound_pool_requests", "Requests in flight per outbound origin", ["origin"])
+        utilisation = scrape.gauge("outbound_pool_utilisation", "Requests in flight over the pool limit per origin", ["origin"])
+        for origin, pool in self.__http_client_service.stats().items():
+            requests.labels(origin).set(pool["requests"])
+            if pool["max_connections"]:
+                utilisation.labels(origin).set(pool["requests"] / pool["max_connections"])
+
+    def __collect_routing(self, scrape: MetricsRegistry) -> None:
+        if self.__routing_cache_service is not None:
+            stats = self.__routing_cache_service.stats()
+            lookups = scrape.counter("routing_cache_lookups", "Routing cache lookups, by result", ["result"])
+            lookups.labels("hit").inc(stats["hits"])
+            lookups.labels("miss").inc(stats["misses"])
+
+        if self.__chat_context_cache_service is not None:
+            stats = self.__chat_context_cache_service.stats()
+            lookups = scrape.counter("chat_context_cache_lookups", "Chat context cache lookups, by result", ["result"])
+            lookups.labels("hit").inc(stats["hits"])
+            lookups.labels("miss").inc(stats["misses"])
+
+        if self.__routing_cascade is not None:
+            calls = scrape.counter("supervisor_cascade_calls", "Routing calls per cascade model", ["model"])
+            escalations = scrape.counter("supervisor_cascade_escalations", "Routing calls passed on to the next model", ["model", "reason"])
+            cost = scrape.counter("supervisor_cascade_cost_usd", "Estimated routing spend per cascade model", ["model"])
+            for model, stats in self.__routing_cascade.stats().items():
+                calls.labels(model).inc(stats["calls"])
+                cost.labels(model).inc(stats["cost"])
+                for reason, count in stats["escalations"].items():
+                    escalations.labels(model, reason).inc(count)
+
+        if self.__routing_batcher is not None:
+            stats = self.__routing_batcher.stats()
+            scrape.counter("supervisor_routing_batches", "Batched routing calls").inc(stats["batches"])
+            scrape.counter("supervisor_batched_routes", "Interactions routed in a batch").inc(stats["batched_routes"])
+
+        if self.__llm_service is not None:
+            scrape.gauge("llm_clients", "Pooled LLM clients").set(self.__llm_service.stats()["clients"])
+
+    async def __collect_admission(self, scrape: MetricsRegistry) -> None:
+        if self.__rate_limiter_service is None:
+            return
+
+        stats = await self.__rate_limiter_service.stats()
+        if stats["in_flight"] is not None:
+            scrape.gauge("admission_slots_in_use", "Interaction slots taken across the cluster").set(stats["in_flight"])
+        scrape.gauge("admission_slots_max", "Interaction slot limit").set(stats["max_in_flight"])
+        rejected = scrape.counter("admission_rejected", "Interactions rejected at admission, by reason", ["reason"])
+        rejected.labels("rate_limited").inc(stats["limited"])
+        rejected.labels("shed").inc(stats["shed"])
+
+    async def __collect_worker_pool(self, scrape: MetricsRegistry) -> None:
+        if self.__worker_pool is None:
+            return
+
+        stats = await self.__worker_pool.stats()
+        scrape.gauge("job_queue_depth", "Interaction jobs waiting in the queue").set(stats["queue_depth"])
+        scrape.gauge("job_workers_busy", "Worker pool consumers running a job").set(stats["running"])
+        jobs = scrape.counter("jobs_completed", "Interaction jobs run by this pool, by outcome", ["outcome"])
+        jobs.labels("ok").inc(stats["processed"])
+        jobs.labels("failed").inc(stats["failed"])
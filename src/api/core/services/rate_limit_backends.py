@@ -0,0 +1,113 @@
+import time
+from uuid import uuid4
+from typing import Dict, Optional, Set, Tuple
+from src.api.core.services.redis_service import RedisService
+
+## refills the bucket from the redis clock so every node sees the same time
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(state[1]) or burst
+local updated_at = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - updated_at) * rate)
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    retry_after = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated_at', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return tostring(retry_after)
+"""
+
+## slots are members scored by their deadline, slots of a crashed node expire one by one
+ACQUIRE_SLOT_SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[1]) then
+    return 0
+end
+redis.call('ZADD', KEYS[1], now + tonumber(ARGV[2]), ARGV[3])
+local ttl = math.ceil(tonumber(ARGV[2]))
+if redis.call('TTL', KEYS[1]) < ttl then
+    redis.call('EXPIRE', KEYS[1], ttl)
+end
+return 1
+"""
+
+
+class InMemoryRateLimitBackend:
+    """
+    Token buckets and in-flight slots local to this process.
+    """
+    def __init__(self):
+        self.__buckets: Dict[str, Tuple[float, float]] = {}
+        self.__slots: Set[str] = set()
+
+    async def take_token(self, key: str, rate: float, burst: float) -> float:
+        """
+        Takes one token, returns 0 when allowed or the seconds until a token is available.
+        """
+        now = time.monotonic()
+        tokens, updated_at = self.__buckets.get(key, (burst, now))
+        tokens = min(burst, tokens + (now - updated_at) * rate)
+
+        retry_after = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / rate
+
+        self.__buckets[key] = (tokens, now)
+        return retry_after
+
+    async def acquire_slot(self, max_in_flight: int) -> Optional[str]:
+        """
+        Takes a slot, returns its id or None when max_in_flight slots are held.
+        """
+        if len(self.__slots) >= max_in_flight:
+            return None
+        slot_id = uuid4().hex
+        self.__slots.add(slot_id)
+        return slot_id
+
+    async def release_slot(self, slot_id: Optional[str]) -> None:
+        self.__slots.discard(slot_id)
+
+    async def in_flight(self) -> int:
+        return len(self.__slots)
+
+
+class RedisRateLimitBackend:
+    """
+    Token buckets and in-flight slots shared by every node through Redis.
+    Each slot expires slot_ttl_seconds after it was taken, so slots leaked by a crashed node heal on their own.
+    """
+    def __init__(self, redis_service: RedisService, prefix: str = "ratelimit", slot_ttl_seconds: int = 300):
+        self.__redis = redis_service.redis
+        self.prefix = prefix
+        self.slot_ttl_seconds = slot_ttl_seconds
+        self.in_flight_key = f"{prefix}:in_flight"
+
+    async def take_token(self, key: str, rate: float, burst: float) -> float:
+        retry_after = await self.__redis.eval(TOKEN_BUCKET_SCRIPT, 1, f"{self.prefix}:bucket:{key}", rate, burst)
+        return float(retry_after)
+
+    async def acquire_slot(self, max_in_flight: int) -> Optional[str]:
+        slot_id = uuid4().hex
+        acquired = await self.__redis.eval(
+            ACQUIRE_SLOT_SCRIPT, 1, self.in_flight_key, max_in_flight, self.slot_ttl_seconds, slot_id
+        )
+        return slot_id if int(acquired) else None
+
+    async def release_slot(self, slot_id: Optional[str]) -> None:
+        if slot_id is not None:
+            await self.__redis.zrem(self.in_flight_key, slot_id)
+
+    async def in_flight(self) -> int:
+        return await self.__redis.zcount(self.in_flight_key, time.time(), "+inf")
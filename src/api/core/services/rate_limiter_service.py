@@ -0,0 +1,58 @@
+import math
+from typing import Dict, Optional, Union
+from uuid import UUID
+from fastapi import HTTPException
+from src.api.core.services.rate_limit_backends import InMemoryRateLimitBackend, RedisRateLimitBackend
+
+
+class RateLimiterService:
+    """
+    Admission control for interactions: a token bucket per company and a global cap on runs in flight.
+    A slot is taken at admission and its id travels with the interaction until the graph run releases it.
+    """
+    def __init__(
+        self,
+        backend: Union[InMemoryRateLimitBackend, RedisRateLimitBackend],
+        rate: float = 1.0,
+        burst: float = 10,
+        max_in_flight: int = 100
+    ):
+        self.__backend = backend
+        self.rate = rate
+        self.burst = burst
+        self.max_in_flight = max_in_flight
+
+        self.limited = 0
+        self.shed = 0
+
+    async def check_company(self, company_id: Union[UUID, str]) -> None:
+        retry_after = await self.__backend.take_token(str(company_id), self.rate, self.burst)
+        if retry_after > 0:
+            self.limited += 1
+            raise HTTPException(
+                status_code=429,
+                detail="Too many interactions, slow down",
+                headers={"Retry-After": str(math.ceil(retry_after))}
+            )
+
+    async def acquire_slot(self) -> str:
+        slot_id = await self.__backend.acquire_slot(self.max_in_flight)
+        if slot_id is None:
+            self.shed += 1
+            raise HTTPException(
+                status_code=503,
+                detail="Server busy, try again later",
+                headers={"Retry-After": "1"}
+            )
+        return slot_id
+
+    async def release_slot(self, slot_id: Optional[str]) -> None:
+        await self.__backend.release_slot(slot_id)
+
+    async def stats(self) -> Dict[str, Optional[int]]:
+        return {
+            "in_flight": await self.__backend.in_flight(),
+            "max_in_flight": self.max_in_flight,
+            "limited": self.limited,
+            "shed": self.shed
+        }
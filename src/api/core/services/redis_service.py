@@ -6,9 +6,25 @@ from dotenv import load_dotenv
 from uuid import UUID
 load_dotenv()
 
+## memory:// keeps everything in the process, nothing is shared between nodes or survives a restart
+IN_MEMORY_ENVIRONMENTS = ("DEVELOPMENT", "TEST")
+
 class RedisService:
-    def __init__(self):
-        self.redis = redis.from_url(os.getenv("REDIS_URL"))
+    def __init__(self, client: Optional[Any] = None):
+        if client is not None:
+            self.redis = client
+        else:
+            redis_url = os.getenv("REDIS_URL")
+            self.redis = self.__create_in_memory_client() if redis_url.startswith("memory://") else redis.from_url(redis_url)
+
+    @staticmethod
+    def __create_in_memory_client():
+        environment = os.getenv("ENVIRONMENT")
+        if environment not in IN_MEMORY_ENVIRONMENTS:
+            raise ValueError(f"REDIS_URL=memory:// is only allowed with ENVIRONMENT in {IN_MEMORY_ENVIRONMENTS}, got {environment}")
+
+        from fakeredis import FakeAsyncRedis
+        return FakeAsyncRedis()
 
     async def set_session(self, key: str, value: dict, expire_seconds: Optional[int] = 3600) -> None:
         await self.redis.set(key, json.dumps(value), ex=expire_seconds)
@@ -19,7 +35,20 @@ class RedisService:
 
     async def delete_session(self, key: str) -> bool:
         return await self.redis.delete(key) > 0
-    
+
+    async def publish(self, channel: str, message: dict) -> int:
+        return await self.redis.publish(channel, json.dumps(message))
+
+    def pubsub(self):
+        return self.redis.pubsub()
+
+    async def close(self) -> None:
+        await self.redis.aclose()
+
     @staticmethod
     def get_agent_state_key(chat_id: UUID):
-        return f"chat_state:{chat_id}"
\ No newline at end of file
+        return f"chat_state:{chat_id}"
+
+    @staticmethod
+    def get_chat_channel(chat_id: UUID):
+        return f"ws:chat:{chat_id}"
@@ -1,10 +1,14 @@
 import os
 import jwt
 import time
+import logging
 from typing import Union, Dict, Any
+from src.utils.logs.logger import Logger
 
 
 class WebTokenService:
+    __MODULE = "auth.webtoken"
+
     def __init__(self):
         self.token_key = os.getenv("TOKEN_KEY")
         if not self.token_key:
@@ -17,8 +21,8 @@ class WebTokenService:
             payload_with_exp["exp"] = int(time.time()) + exp_seconds
 
             return jwt.encode(payload_with_exp, self.token_key, algorithm="HS256")
-        except Exception as e:
-            print("Error generating token:", e)
+        except Exception:
+            Logger.log(message="Error generating token", level=logging.ERROR, name=self.__MODULE, exc_info=True)
             raise
 
     def decode_token(self, token: str) -> Union[Dict[str, Any], None]:
@@ -1,26 +1,176 @@
-from src.api.modules.interactions.interactions_models import WorkerState
+from src.api.modules.interactions.interactions_models import WorkerState, InteractionAccepted
 from fastapi import BackgroundTasks
+from typing import Optional, Union
+from uuid import UUID, uuid4
 from src.api.core.models.http_models import CommonHttpReponse
-from src.workflow.state import State
+from src.workflow.state import State, create_state
+from src.workflow.orchestrator.deadline import Deadline
+from src.workflow.graph import GRAPH_RUNS_IN_FLIGHT
+from src.workflow.jobs.job_queue import JobQueue
+from src.workflow.jobs.job_models import InteractionJob
+from src.api.core.services.rate_limiter_service import RateLimiterService
+from src.api.modules.interactions.worker_state_service import WorkerStateService
+from src.api.modules.websocket.websocket_service import WebsocketService
+from src.utils.logs.logger import Logger
+from src.utils.logs.structured_logging import log_context
+from src.utils.tracing.tracer import get_tracer
+import logging
 
 class InteractionsController:
+    __MODULE = "interactions.controller"
+
     @staticmethod
-    def interact_request(
+    async def interact_request(
         background_tasks: BackgroundTasks,
         worker_state: WorkerState,
-        graph
+        graph,
+        job_queue: Optional[JobQueue] = None,
+        rate_limiter_service: Optional[RateLimiterService] = None,
+        slot_id: Optional[str] = None
     ) -> CommonHttpReponse:
-        state = State(
-            chat_id=worker_state.chat_id,
-            input=worker_state.input,
-            available_agents=worker_state.agents,
-            selected_agents=""
-        )
-        
-        background_tasks.add_task(graph.ainvoke, state)
+        deadline = Deadline.after().expires_at
+
+        ## queued runs survive restarts and are executed by the worker pool
+        if job_queue is not None:
+            await InteractionsController.enqueue_job(job_queue, worker_state, deadline, slot_id)
+        else:
+            background_tasks.add_task(
+                InteractionsController.run_graph,
+                graph,
+                create_state(worker_state, deadline),
+                rate_limiter_service,
+                slot_id=slot_id
+            )
 
         return CommonHttpReponse(
             detail="Request received"
         )
 
+    @staticmethod
+    def interact_async_request(
+        background_tasks: BackgroundTasks,
+        chat_id: UUID,
+        user_id: Union[UUID, str],
+        company_id: Union[UUID, str],
+        input: str,
+        graph,
+        worker_state_service: WorkerStateService,
+        websocket_service: WebsocketService,
+        job_queue: Optional[JobQueue] = None,
+        rate_limiter_service: Optional[RateLimiterService] = None,
+        slot_id: Optional[str] = None
+    ) -> InteractionAccepted:
+        interaction_id = uuid4().hex
+
+        background_tasks.add_task(
+            InteractionsController.run_intake,
+            interaction_id=interaction_id,
+            chat_id=chat_id,
+            user_id=user_id,
+            company_id=company_id,
+            input=input,
+            graph=graph,
+            worker_state_service=worker_state_service,
+            websocket_service=websocket_service,
+            job_queue=job_queue,
+            rate_limiter_service=rate_limiter_service,
+            slot_id=slot_id
+        )
+
+        return InteractionAccepted(
+            detail="Request received",
+            interaction_id=interaction_id
+        )
+
+    @staticmethod
+    async def run_intake(
+        interaction_id: str,
+        chat_id: UUID,
+        user_id: Union[UUID, str],
+        company_id: Union[UUID, str],
+        input: str,
+        graph,
+        worker_state_service: WorkerStateService,
+        websocket_service: WebsocketService,
+        job_queue: Optional[JobQueue] = None,
+        rate_limiter_service: Optional[RateLimiterService] = None,
+        slot_id: Optional[str] = None
+    ):
+        """
+        Fetches the worker state and runs the interaction after the 202 was sent, reporting progress on the chat socket.
+        """
+        ## records logged by the interaction, its background tasks included, carry the chat and company
+        with log_context(chat_id=chat_id, company_id=company_id):
+            deadline = Deadline.after().expires_at
+
+            async def send_progress(status: str, **data):
+                await websocket_service.send_json(chat_id, {"interaction_id": interaction_id, "status": status, **data})
+
+            try:
+                worker_state = await worker_state_service.get_worker_state(
+                    chat_id=chat_id,
+                    user_id=user_id,
+                    company_id=company_id,
+                    input=input
+                )
+            except Exception as exc:
+                Logger.log(
+                    message=f"Interaction {interaction_id} intake failed: {exc!r}",
+                    level=logging.ERROR,
+                    name=InteractionsController.__MODULE
+                )
+                if rate_limiter_service is not None:
+                    await rate_limiter_service.release_slot(slot_id)
+                await send_progress("failed", error="context_unavailable")
+                return
+
+            if job_queue is not None:
+                await InteractionsController.enqueue_job(job_queue, worker_state, deadline, slot_id)
+                await send_progress("queued")
+                return
 
+            await send_progress("running")
+            try:
+                await InteractionsController.run_graph(
+                    graph,
+                    create_state(worker_state, deadline),
+                    rate_limiter_service,
+                    slot_id=slot_id
+                )
+            except Exception:
+                await send_progress("failed", error="interaction_failed")
+                raise
+            await send_progress("completed")
+
+    @staticmethod
+    async def enqueue_job(job_queue: JobQueue, worker_state: WorkerState, deadline: float, slot_id: Optional[str] = None):
+        context = get_tracer().get_current_context()
+        await job_queue.enqueue(InteractionJob(
+            priority=job_queue.get_priority(worker_state.company_id),
+            deadline=deadline,
+            worker_state=worker_state,
+            traceparent=context.to_traceparent() if context else None,
+            slot_id=slot_id
+        ))
+
+    @staticmethod
+    async def run_graph(
+        graph,
+        state: State,
+        rate_limiter_service: Optional[RateLimiterService] = None,
+        slot_id: Optional[str] = None
+    ):
+        ## only queued jobs are retried from their checkpoints, a run started here would write them for nothing
+        if getattr(graph, "checkpointer", None):
+            graph = graph.copy({"checkpointer": None})
+        GRAPH_RUNS_IN_FLIGHT.inc()
+        try:
+            ## the sync route schedules run_graph directly, so the context is bound here and not by the callers
+            with log_context(chat_id=state["chat_id"], company_id=state["worker_state"].company_id), get_tracer().start_span(
+                "interaction.run", attributes={"chat_id": state["chat_id"]}
+            ):
+                await graph.ainvoke(state)
+        finally:
+            GRAPH_RUNS_IN_FLIGHT.dec()
+            if rate_limiter_service is not None:
+                await rate_limiter_service.release_slot(slot_id)
@@ -1,6 +1,7 @@
 from pydantic import BaseModel
 from uuid import UUID
 from typing import List, Any, Dict
+from src.api.core.models.http_models import CommonHttpReponse
 
 class InteractionRequest(BaseModel):
     input: str
@@ -11,4 +12,7 @@ class WorkerState(BaseModel):
     chat_id: UUID
     company_id: UUID
     chat_history: List[Dict[str, Any]]
-    user_id: UUID
\ No newline at end of file
+    user_id: UUID
+
+class InteractionAccepted(CommonHttpReponse):
+    interaction_id: str
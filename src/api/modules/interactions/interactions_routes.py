@@ -1,13 +1,15 @@
 from fastapi import APIRouter, Request, Body, Depends, BackgroundTasks, Path
 from  src.api.core.middleware.middleware_service import security
 from src.api.core.middleware.auth_middleware import auth_middleware
+from src.api.core.middleware.rate_limit_middleware import rate_limit_middleware
 from src.api.core.models.http_models import CommonHttpReponse
+from src.api.core.middleware.hmac_verification import verify_hmac
 from uuid import UUID
-from src.utils.http.get_hmac_header import generate_hmac_headers
-import httpx
-import os
-from src.workflow.graph import create_graph
-from src.api.modules.interactions.interactions_models import WorkerState, InteractionRequest
+from src.api.modules.interactions.interactions_models import WorkerState, InteractionRequest, InteractionAccepted
+from src.api.modules.interactions.worker_state_service import WorkerStateService
+from src.api.core.services.chat_context_cache_service import ChatContextCacheService
+from src.workflow.services.agent_registry_service import AgentRegistryService
+from src.workflow.agents.supervisor.supervisor_models import AgentRegistryConfig
 from src.dependencies.container import Container
 from src.api.modules.interactions.interactions_controller import InteractionsController
 
@@ -17,45 +19,45 @@ router = APIRouter(
     tags=["Interactions"]
 )
 
+internal_router = APIRouter(
+    prefix="/interactions/internal",
+    dependencies=[Depends(verify_hmac)],
+    tags=["Internal"]
+)
+
 
 async def get_worker_state(
         req: Request,
         chat_id: UUID = Path(...), 
         data: InteractionRequest = Body(...), 
-        _: None = Depends(auth_middleware)
+        _: None = Depends(auth_middleware),
+        __: None = Depends(rate_limit_middleware)
 ):
     """
     get the payload to send to the agents servers
     """
-    user_id = req.state.user
-    company_id = req.state.company
-    
-    hmac_secret = os.getenv("HMAC_SECRET")
-
-    headers = generate_hmac_headers(hmac_secret)
+    worker_state_service: WorkerStateService = Container.resolve("worker_state_service")
+    return await worker_state_service.get_worker_state(
+        chat_id=chat_id,
+        user_id=req.state.user,
+        company_id=req.state.company,
+        input=data.input
+    )
 
-    main_server_endpoint = os.getenv("MAIN_SERVER_ENDPOINT")
+def get_graph():
+    return Container.resolve("graph")
 
-    req_body = {
-        "user_id": user_id,
-        "company_id": company_id,
-        "input": data.input
-    }
+def get_job_queue():
+    return Container.resolve("job_queue")
 
-    async with httpx.AsyncClient() as client:
-        res = await client.post(
-            headers=headers,
-            url=f"https://{main_server_endpoint}/interactions/internal/incomming/{chat_id}",
-            json=req_body
-        )
+def get_rate_limiter_service():
+    return Container.resolve("rate_limiter_service")
 
-        res.raise_for_status()
-        res_data = res.json()
-        worker_state = WorkerState(**res_data)
-        return worker_state
+def get_worker_state_service():
+    return Container.resolve("worker_state_service")
 
-def get_graph(state: WorkerState = Depends(get_worker_state)):
-    return create_graph(worker_state=state)
+def get_websocket_service():
+    return Container.resolve("websocket_service")
 
 def get_controller():
     return InteractionsController()
@@ -63,13 +65,15 @@ def get_controller():
 
 
 @router.post("/secure/{chat_id}", status_code=202, response_model=CommonHttpReponse)
-def secure_interact(
+async def secure_interact(
     background_tasks: BackgroundTasks,
     chat_id: UUID,
     req: Request,
     data: InteractionRequest = Body(...), # added for docs
     worker_state: WorkerState = Depends(get_worker_state), # handles user auth
     graph = Depends(get_graph),
+    job_queue = Depends(get_job_queue),
+    rate_limiter_service = Depends(get_rate_limiter_service),
     controller: InteractionsController = Depends(get_controller)
 ):
     """
@@ -78,8 +82,99 @@ def secure_interact(
     Use this endpoint to interact with the agents.
     Only company marked tokens have access to this endpoint.
     """
-    return controller.interact_request(
+    return await controller.interact_request(
         background_tasks=background_tasks,
         worker_state=worker_state,
-        graph=graph
-    )
\ No newline at end of file
+        graph=graph,
+        job_queue=job_queue,
+        rate_limiter_service=rate_limiter_service,
+        slot_id=getattr(req.state, "rate_limit_slot", None)
+    )
+
+
+@router.post("/secure/{chat_id}/async", status_code=202, response_model=InteractionAccepted)
+async def secure_interact_async(
+    background_tasks: BackgroundTasks,
+    chat_id: UUID,
+    req: Request,
+    data: InteractionRequest = Body(...),
+    _: None = Depends(auth_middleware),
+    __: None = Depends(rate_limit_middleware),
+    graph = Depends(get_graph),
+    job_queue = Depends(get_job_queue),
+    rate_limiter_service = Depends(get_rate_limiter_service),
+    worker_state_service: WorkerStateService = Depends(get_worker_state_service),
+    websocket_service = Depends(get_websocket_service),
+    controller: InteractionsController = Depends(get_controller)
+):
+    """
+    ## Asynchronous interaction request
+
+    Returns as soon as the token is validated. The chat context is loaded in the background
+    and progress events with the returned interaction id are pushed over the chat websocket.
+    """
+    return controller.interact_async_request(
+        background_tasks=background_tasks,
+        chat_id=chat_id,
+        user_id=req.state.user,
+        company_id=req.state.company,
+        input=data.input,
+        graph=graph,
+        worker_state_service=worker_state_service,
+        websocket_service=websocket_service,
+        job_queue=job_queue,
+        rate_limiter_service=rate_limiter_service,
+        slot_id=getattr(req.state, "rate_limit_slot", None)
+    )
+
+
+def get_chat_context_cache_service():
+    return Container.resolve("chat_context_cache_service")
+
+
+@internal_router.post("/context/chats/{chat_id}/invalidate", response_model=CommonHttpReponse)
+async def invalidate_chat_context(
+    chat_id: UUID,
+    chat_context_cache_service: ChatContextCacheService = Depends(get_chat_context_cache_service)
+):
+    """
+    ## Chat context invalidation
+
+    Called by the main server when a chat changes outside of an interaction.
+    """
+    if chat_context_cache_service is not None:
+        await chat_context_cache_service.invalidate_chat(chat_id)
+    return CommonHttpReponse(detail="Chat context invalidated")
+
+
+@internal_router.post("/context/companies/{company_id}/invalidate", response_model=CommonHttpReponse)
+async def invalidate_company_context(
+    company_id: UUID,
+    chat_context_cache_service: ChatContextCacheService = Depends(get_chat_context_cache_service)
+):
+    """
+    ## Company context invalidation
+
+    Called by the main server when the agents available to a company change.
+    """
+    if chat_context_cache_service is not None:
+        await chat_context_cache_service.invalidate_company(company_id)
+    return CommonHttpReponse(detail="Company context invalidated")
+
+
+def get_agent_registry_service():
+    return Container.resolve("agent_registry_service")
+
+
+@internal_router.put("/agents", response_model=CommonHttpReponse)
+async def update_agent_registry(
+    config: AgentRegistryConfig = Body(...),
+    agent_registry_service: AgentRegistryService = Depends(get_agent_registry_service)
+):
+    """
+    ## Agent registry update
+
+    Called by the main server when agents are added or their descriptions change.
+    """
+    agent_registry_service.load(config)
+    return CommonHttpReponse(detail="Agent registry updated")
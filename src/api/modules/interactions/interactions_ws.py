@@ -3,6 +3,9 @@ from uuid import UUID
 from src.api.modules.websocket.ws_hmac_verification import verify_hmac_ws
 from src.dependencies.container import Container
 from src.api.modules.websocket.websocket_service import WebsocketService
+from src.utils.logs.logger import Logger
+from src.utils.logs.structured_logging import log_context
+import logging
 
 
 router = APIRouter()
@@ -20,13 +23,14 @@ async def websocket_interact(websocket: WebSocket, chat_id: UUID):
         return
 
     websocket_service: WebsocketService = Container.resolve("websocket_service")
-    websocket_service.add_connection(chat_id, websocket)
-    
-    print(f'Websocket connection: {chat_id} opened.')
-    try:
-        while True: 
-            await websocket.receive_text()
-
-    except WebSocketDisconnect:
-        websocket_service.remove_connection(chat_id)
-        print(f'Websocket connection: {chat_id} closed.')
\ No newline at end of file
+    await websocket_service.add_connection(chat_id, websocket)
+
+    with log_context(chat_id=chat_id):
+        Logger.log(message="Websocket connection opened", level=logging.INFO, name="websocket.interact")
+        try:
+            while True: 
+                await websocket.receive_text()
+
+        except WebSocketDisconnect:
+            await websocket_service.remove_connection(chat_id)
+            Logger.log(message="Websocket connection closed", level=logging.INFO, name="websocket.interact")
\ No newline at end of file
@@ -0,0 +1,83 @@
+import os
+import asyncio
+import logging
+from typing import Optional, Set, Union
+from uuid import UUID
+from src.utils.http.get_hmac_header import generate_hmac_headers
+from src.api.core.services.http_client_service import HttpClientService
+from src.api.core.services.chat_context_cache_service import ChatContextCacheService
+from src.api.modules.interactions.interactions_models import WorkerState
+from src.utils.logs.logger import Logger
+from src.utils.tracing.tracer import get_tracer
+
+
+class WorkerStateService:
+    """
+    Resolves the payload sent to the agent servers, from the chat context cache when possible.
+    On a cache hit the main server is still told about the incoming turn, in the background.
+    """
+    __MODULE = "worker_state.service"
+
+    def __init__(
+        self,
+        http_client_service: HttpClientService,
+        chat_context_cache_service: Optional[ChatContextCacheService] = None,
+        notify_on_hit: Optional[bool] = None
+    ):
+        self.__http_client_service = http_client_service
+        self.__chat_context_cache_service = chat_context_cache_service
+        self.notify_on_hit = (
+            notify_on_hit if notify_on_hit is not None
+            else os.getenv("CHAT_CONTEXT_NOTIFY_ON_HIT", "true").lower() == "true"
+        )
+        self.__tasks: Set[asyncio.Task] = set()
+
+    async def get_worker_state(self, chat_id: UUID, user_id: Union[UUID, str], company_id: Union[UUID, str], input: str) -> WorkerState:
+        with get_tracer().start_span("worker_state.get", kind="client", attributes={"chat_id": chat_id}) as span:
+            if self.__chat_context_cache_service is not None:
+                worker_state = await self.__chat_context_cache_service.get(chat_id, user_id, company_id, input)
+                span.set_attribute("cache_hit", worker_state is not None)
+                if worker_state is not None:
+                    if self.notify_on_hit:
+                        self.__schedule_notify(chat_id, user_id, company_id, input)
+                    return worker_state
+
+            return await self.__fetch_worker_state(chat_id, user_id, company_id, input)
+
+    async def wait_for_notifications(self) -> None:
+        if self.__tasks:
+            await asyncio.gather(*self.__tasks, return_exceptions=True)
+
+    async def __fetch_worker_state(self, chat_id: UUID, user_id: Union[UUID, str], company_id: Union[UUID, str], input: str) -> WorkerState:
+        res = await self.__post_incoming(chat_id, user_id, company_id, input)
+        res.raise_for_status()
+        worker_state = WorkerState(**res.json())
+
+        if self.__chat_context_cache_service is not None:
+            await self.__chat_context_cache_service.store(worker_state)
+        return worker_state
+
+    async def __post_incoming(self, chat_id: UUID, user_id: Union[UUID, str], company_id: Union[UUID, str], input: str):
+        main_server_endpoint = os.getenv("MAIN_SERVER_ENDPOINT")
+        return await self.__http_client_service.post(
+            headers=get_tracer().inject(generate_hmac_headers(os.getenv("HMAC_SECRET"))),
+            url=f"https://{main_server_endpoint}/interactions/internal/incomming/{chat_id}",
+            json={
+                "user_id": user_id,
+                "company_id": company_id,
+                "input": input
+            }
+        )
+
+    def __schedule_notify(self, chat_id: UUID, user_id: Union[UUID, str], company_id: Union[UUID, str], input: str) -> None:
+        task = asyncio.create_task(self.__notify(chat_id, user_id, company_id, input))
+        self.__tasks.add(task)
+        task.add_done_callback(self.__tasks.discard)
+
+    async def __notify(self, chat_id: UUID, user_id: Union[UUID, str], company_id: Union[UUID, str], input: str) -> None:
+        ## the main server may track the turn on its side, the returned context is not needed
+        try:
+            res = await self.__post_incoming(chat_id, user_id, company_id, input)
+            res.raise_for_status()
+        except Exception as exc:
+            Logger.log(message=f"Incoming turn notification for chat {chat_id} failed: {exc!r}", level=logging.WARNING, name=self.__MODULE)
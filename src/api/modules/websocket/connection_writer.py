@@ -0,0 +1,147 @@
+import asyncio
+from collections import deque
+from typing import Dict, Optional
+from fastapi import WebSocket, WebSocketDisconnect, status
+
+DROP_OLDEST = "drop_oldest"
+COALESCE = "coalesce"
+DISCONNECT = "disconnect"
+OVERFLOW_POLICIES = (DROP_OLDEST, COALESCE, DISCONNECT)
+
+
+class ConnectionWriter:
+    """
+    Owns all sends to one socket through a bounded queue drained by a single writer task.
+    Producers never wait on the client; when the queue is full the overflow policy applies.
+    """
+    def __init__(self, websocket: WebSocket, max_queue_size: int = 256, overflow_policy: str = COALESCE):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Invalid overflow policy '{overflow_policy}', expected one of {OVERFLOW_POLICIES}")
+
+        self.websocket = websocket
+        self.max_queue_size = max_queue_size
+        self.overflow_policy = overflow_policy
+        self.closed = False
+
+        self.__queue: deque = deque()
+        self.__ready = asyncio.Event()
+        self.__task: Optional[asyncio.Task] = None
+        self.__disconnect_requested = False
+
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.max_depth = 0
+
+    def start(self) -> None:
+        if self.__task is None:
+            self.__task = asyncio.create_task(self.__run())
+
+    def enqueue(self, data: dict) -> bool:
+        if self.closed or self.__disconnect_requested:
+            return False
+
+        if len(self.__queue) >= self.max_queue_size:
+            return self.__handle_overflow(data)
+
+        self.__append(data)
+        return True
+
+    async def close(self) -> None:
+        self.closed = True
+        self.__queue.clear()
+        if self.__task is not None and self.__task is not asyncio.current_task():
+            self.__task.cancel()
+            try:
+                await self.__task
+            except asyncio.CancelledError:
+                pass
+        self.__task = None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "depth": len(self.__queue),
+            "max_depth": self.max_depth,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced
+        }
+
+    async def __run(self) -> None:
+        while not self.closed:
+            if not self.__queue:
+                if self.__disconnect_requested:
+                    break
+                self.__ready.clear()
+                await self.__ready.wait()
+                continue
+
+            data = self.__queue.popleft()
+            try:
+                await self.websocket.send_json(data)
+                self.sent += 1
+            except (WebSocketDisconnect, RuntimeError):
+                self.closed = True
+
+        if self.__disconnect_requested:
+            try:
+                await self.websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+            except RuntimeError:
+                pass
+        self.closed = True
+
+    def __append(self, data: dict) -> None:
+        self.__queue.append(data)
+        self.max_depth = max(self.max_depth, len(self.__queue))
+        self.__ready.set()
+
+    def __handle_overflow(self, data: dict) -> bool:
+        """
+        Applies the overflow policy, returns False when data was rejected.
+        """
+        if self.overflow_policy == DISCONNECT:
+            self.dropped += len(self.__queue) + 1
+            self.__queue.clear()
+            self.__disconnect_requested = True
+            self.__ready.set()
+            return False
+
+        if self.overflow_policy == COALESCE:
+            if self.__absorb(data):
+                return True
+            self.__compact()
+
+        if len(self.__queue) >= self.max_queue_size:
+            self.__queue.popleft()
+            self.dropped += 1
+
+        self.__append(data)
+        return True
+
+    def __absorb(self, data: dict) -> bool:
+        """
+        Appends a streamed token to the queued token of the same agent, returns True when merged.
+        """
+        if not self.__queue or not self.__same_stream(self.__queue[-1], data):
+            return False
+
+        self.__queue[-1] = {**self.__queue[-1], "token": self.__queue[-1]["token"] + data["token"]}
+        self.coalesced += 1
+        return True
+
+    def __compact(self) -> None:
+        compacted = deque()
+        for message in self.__queue:
+            if compacted and self.__same_stream(compacted[-1], message):
+                compacted[-1] = {**compacted[-1], "token": compacted[-1]["token"] + message["token"]}
+                self.coalesced += 1
+            else:
+                compacted.append(message)
+        self.__queue = compacted
+
+    def __same_stream(self, queued: dict, data: dict) -> bool:
+        return self.__is_token(queued) and self.__is_token(data) and queued["agent_id"] == data["agent_id"]
+
+    @staticmethod
+    def __is_token(data: dict) -> bool:
+        return "token" in data and "agent_id" in data
@@ -1,26 +1,224 @@
 from fastapi import WebSocket
-from typing import Union
-from uuid import UUID
+from typing import Dict, Optional, Union
+from uuid import UUID, uuid4
+from src.api.core.services.redis_service import RedisService
+from src.api.modules.websocket.connection_writer import ConnectionWriter
+from src.utils.tracing.tracer import get_tracer
+from src.utils.logs.logger import Logger
+import asyncio
+import logging
+import json
+import os
+
+MESSAGE_OUTCOMES = ("sent", "dropped", "coalesced")
 
 class WebsocketService:
-    def __init__(self):
+    """
+    Tracks the sockets held by this process.
+    In cluster mode messages for sockets held elsewhere are published on a per-chat
+    Redis channel, and each node subscribes to the channels of the chats it holds.
+    Every socket is written by its own ConnectionWriter so a slow client only fills its own queue.
+    """
+    __MODULE = "websocket.connection"
+
+    def __init__(
+        self,
+        redis_service: Optional[RedisService] = None,
+        max_queue_size: Optional[int] = None,
+        overflow_policy: Optional[str] = None,
+        reconnect_backoff: float = 0.5,
+        max_reconnect_backoff: float = 30.0
+    ):
         self.active_connections = {}
+        self.__writers: Dict[str, ConnectionWriter] = {}
+        ## totals of the writers already closed, so message counters never go backwards
+        self.__closed_totals: Dict[str, int] = {outcome: 0 for outcome in MESSAGE_OUTCOMES}
+        self.max_queue_size = max_queue_size or int(os.getenv("WS_SEND_QUEUE_SIZE", 256))
+        self.overflow_policy = overflow_policy or os.getenv("WS_OVERFLOW_POLICY", "coalesce")
+        self.__redis_service = redis_service
+        self.__pubsub = None
+        self.__listener_task: Optional[asyncio.Task] = None
+        self.node_id = uuid4().hex
+        self.reconnect_backoff = reconnect_backoff
+        self.max_reconnect_backoff = max_reconnect_backoff
+
+        self.listener_connected = False
+        self.reconnects = 0
+        self.bad_messages = 0
+
+    @property
+    def cluster_mode(self) -> bool:
+        return self.__redis_service is not None
+
+    async def start(self) -> None:
+        if not self.cluster_mode or self.__listener_task is not None:
+            return
+
+        await self.__subscribe()
+        self.__listener_task = asyncio.create_task(self.__listen())
+
+    async def stop(self) -> None:
+        if self.__listener_task is None:
+            return
+
+        self.__listener_task.cancel()
+        try:
+            await self.__listener_task
+        except asyncio.CancelledError:
+            pass
+
+        await self.__close_pubsub()
+        self.__listener_task = None
+        self.listener_connected = False
 
-    def add_connection(self, connection_id: Union[UUID, str], websocket: WebSocket):
+    async def add_connection(self, connection_id: Union[UUID, str], websocket: WebSocket):
         key = str(connection_id)
+        previous_writer = self.__writers.pop(key, None)
+        if previous_writer is not None:
+            await self.__close_writer(previous_writer)
+
+        writer = ConnectionWriter(websocket, max_queue_size=self.max_queue_size, overflow_policy=self.overflow_policy)
+        writer.start()
         self.active_connections[key] = websocket
-        print(f"connection {key} added.")
+        self.__writers[key] = writer
+
+        if self.__pubsub is not None:
+            try:
+                await self.__pubsub.subscribe(RedisService.get_chat_channel(key))
+            except Exception as exc:
+                ## the listener resubscribes every held chat once it reconnects
+                Logger.log(message=f"Subscribing connection {key} failed: {exc!r}", level=logging.WARNING, name=self.__MODULE)
+
+        Logger.log(message=f"Connection {key} added", level=logging.INFO, name=self.__MODULE)
         return
-    
+
     def get_connection(self, connection_id: Union[UUID, str]) -> WebSocket:
         key = str(connection_id)
         connection = self.active_connections.get(key)
         if not connection:
-            print(f"Connection {key} not found in get_connection()")
+            Logger.log(message=f"Connection {key} not found", level=logging.INFO, name=self.__MODULE)
 
         return connection
 
-    def remove_connection(self, connection_id: str):
+    async def remove_connection(self, connection_id: str):
         key = str(connection_id)
         self.active_connections.pop(key, None)
-        print(f'Connection: {key} was removed.')
\ No newline at end of file
+        writer = self.__writers.pop(key, None)
+        if writer is not None:
+            await self.__close_writer(writer)
+
+        if self.__pubsub is not None:
+            try:
+                await self.__pubsub.unsubscribe(RedisService.get_chat_channel(key))
+            except Exception as exc:
+                Logger.log(message=f"Unsubscribing connection {key} failed: {exc!r}", level=logging.WARNING, name=self.__MODULE)
+
+        Logger.log(message=f"Connection {key} removed", level=logging.INFO, name=self.__MODULE)
+
+    async def send_json(self, connection_id: Union[UUID, str], data: dict) -> bool:
+        with get_tracer().start_span("websocket.send") as span:
+            delivered = await self.__send_json(str(connection_id), data)
+            span.set_attribute("delivered", delivered)
+            return delivered
+
+    async def __send_json(self, key: str, data: dict) -> bool:
+
+        if key in self.__writers:
+            return await self.__deliver(key, data)
+
+        if self.cluster_mode:
+            receivers = await self.__redis_service.publish(RedisService.get_chat_channel(key), data)
+            return receivers > 0
+
+        return False
+
+    async def __subscribe(self) -> None:
+        self.__pubsub = self.__redis_service.pubsub()
+        ## node channel keeps the subscription open while no chats are held
+        await self.__pubsub.subscribe(f"ws:node:{self.node_id}", *(RedisService.get_chat_channel(key) for key in self.__writers))
+        self.listener_connected = True
+
+    async def __close_pubsub(self) -> None:
+        pubsub, self.__pubsub = self.__pubsub, None
+        if pubsub is None:
+            return
+
+        try:
+            await pubsub.aclose()
+        except Exception as exc:
+            Logger.log(message=f"Closing pubsub failed: {exc!r}", level=logging.WARNING, name=self.__MODULE)
+
+    async def __listen(self) -> None:
+        failures = 0
+        while True:
+            try:
+                if self.__pubsub is None:
+                    await self.__subscribe()
+                    Logger.log(message="Pubsub listener reconnected", level=logging.INFO, name=self.__MODULE)
+                async for message in self.__pubsub.listen():
+                    failures = 0
+                    await self.__handle(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                Logger.log(message=f"Pubsub listener failed: {exc!r}", level=logging.ERROR, name=self.__MODULE)
+
+            ## the connection dropped, resubscribe every held chat on a fresh one
+            self.listener_connected = False
+            self.reconnects += 1
+            failures += 1
+            await self.__close_pubsub()
+            await asyncio.sleep(min(self.max_reconnect_backoff, self.reconnect_backoff * 2 ** (failures - 1)))
+
+    async def __handle(self, message: dict) -> None:
+        if message["type"] != "message":
+            return
+
+        try:
+            channel = message["channel"]
+            if isinstance(channel, bytes):
+                channel = channel.decode("utf-8")
+
+            key = channel.rsplit(":", 1)[-1]
+            if key in self.__writers:
+                await self.__deliver(key, json.loads(message["data"]))
+        except Exception as exc:
+            self.bad_messages += 1
+            Logger.log(message=f"Dropped pubsub message: {exc!r}", level=logging.WARNING, name=self.__MODULE)
+
+    def queue_stats(self) -> Dict[str, Dict[str, int]]:
+        return {key: writer.stats() for key, writer in self.__writers.items()}
+
+    def message_totals(self) -> Dict[str, int]:
+        """
+        Messages handled by every writer this process has had, open or closed.
+        """
+        totals = dict(self.__closed_totals)
+        for writer in self.__writers.values():
+            stats = writer.stats()
+            for outcome in MESSAGE_OUTCOMES:
+                totals[outcome] += stats[outcome]
+        return totals
+
+    def listener_stats(self) -> Dict[str, int]:
+        return {
+            "connected": int(self.listener_connected),
+            "reconnects": self.reconnects,
+            "bad_messages": self.bad_messages
+        }
+
+    async def __close_writer(self, writer: ConnectionWriter) -> None:
+        await writer.close()
+        stats = writer.stats()
+        for outcome in MESSAGE_OUTCOMES:
+            self.__closed_totals[outcome] += stats[outcome]
+
+    async def __deliver(self, key: str, data: dict) -> bool:
+        writer = self.__writers[key]
+        if writer.enqueue(data):
+            return True
+
+        ## the writer shuts itself down when the client is gone or was disconnected for overflowing
+        if writer.closed:
+            await self.remove_connection(key)
+        return False
@@ -1,18 +1,56 @@
 from dotenv import load_dotenv
 import os
 load_dotenv()
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import PlainTextResponse
 from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
 from src.dependencies.configure_container import configure_container
+from src.dependencies.container import Container
+from src.api.core.services.http_client_service import HttpClientService
+from src.api.modules.websocket.websocket_service import WebsocketService
+from src.workflow.services.message_sink_service import MessageSinkService
+from src.workflow.services.agent_registry_service import AgentRegistryService
+from src.workflow.services.llm_service import LlmService
+from src.workflow.services.token_counter import TokenCounter
+from src.workflow.jobs.worker_pool import WorkerPool
+from src.api.core.services.metrics_service import MetricsService
 from src.api.modules.interactions import interactions_routes, interactions_ws
+from src.utils.tracing.tracer import get_tracer
+from src.utils.logs.structured_logging import configure_logging, shutdown_logging
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    configure_logging()
     configure_container()  
+    agent_registry_service: AgentRegistryService = Container.resolve("agent_registry_service")
+    await agent_registry_service.start()
+    llm_service: LlmService = Container.resolve("llm_service")
+    if os.getenv("LLM_WARMUP_ENABLED", "true").lower() == "true":
+        await llm_service.warmup()
+    token_counter: TokenCounter = Container.resolve("token_counter")
+    await token_counter.warmup()
+    websocket_service: WebsocketService = Container.resolve("websocket_service")
+    await websocket_service.start()
+    message_sink_service: MessageSinkService = Container.resolve("message_sink_service")
+    await message_sink_service.start()
+    worker_pool: WorkerPool = Container.resolve("worker_pool")
+    if worker_pool is not None:
+        await worker_pool.start()
     yield
 
+    if worker_pool is not None:
+        await worker_pool.stop()
+    await websocket_service.stop()
+    await agent_registry_service.aclose()
+    ## flush pending messages before the http pools close
+    await message_sink_service.aclose()
+    http_client_service: HttpClientService = Container.resolve("http_client_service")
+    await http_client_service.aclose()
+    await llm_service.aclose()
+    shutdown_logging()
+
 app = FastAPI(lifespan=lifespan)
 
 # CORS setup
@@ -25,6 +63,21 @@ app.add_middleware(
 )
 
 
+@app.middleware("http")
+async def tracing_middleware(request: Request, call_next):
+    ## continues the caller's trace, background work of the request runs inside this span
+    tracer = get_tracer()
+    with tracer.start_span(
+        f"{request.method} {request.url.path}",
+        kind="server",
+        attributes={"http.method": request.method, "http.path": request.url.path},
+        parent=tracer.extract(request.headers)
+    ) as span:
+        response = await call_next(request)
+        span.set_attribute("http.status_code", response.status_code)
+        return response
+
+
 @app.get("/health", tags=["Internal"])
 async def health():
     """
@@ -34,5 +87,18 @@ async def health():
     return {"status": "ok"}
 
 
+@app.get("/metrics", tags=["Internal"], response_class=PlainTextResponse)
+async def metrics():
+    """
+    ## Metrics
+    Prometheus scrape endpoint, disabled with METRICS_ENABLED=false.
+    """
+    metrics_service: MetricsService = Container.resolve("metrics_service")
+    if metrics_service is None:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return PlainTextResponse(await metrics_service.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 app.include_router(interactions_routes.router)
+app.include_router(interactions_routes.internal_router)
 app.include_router(interactions_ws.router)
\ No newline at end of file
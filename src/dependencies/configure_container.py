@@ -1,42 +1,110 @@
+import os
 from src.dependencies.container import Container
 from src.workflow.services.llm_service import LlmService
 from src.workflow.services.prompt_service import PromptService
+from src.workflow.services.token_counter import TokenCounter
+from src.workflow.services.history_strategies import (
+    FullHistoryStrategy,
+    LastTurnsStrategy,
+    TokenBudgetStrategy,
+    RollingSummaryStrategy
+)
 from src.workflow.agents.supervisor.supervisor_agent import Supervisor
 from src.workflow.orchestrator.orchestrator import Orchestrator
+from src.workflow.graph import create_graph
+from src.workflow.services.embedding_service import EmbeddingService
+from src.workflow.services.routing_cache_service import RoutingCacheService
+from src.workflow.services.message_sink_service import MessageSinkService
+from src.workflow.services.redis_checkpoint_saver import RedisCheckpointSaver
+from src.workflow.services.agent_registry_service import AgentRegistryService
+from src.workflow.services.vector_backends import InMemoryVectorBackend, QdrantVectorBackend
+from src.workflow.agents.supervisor.local_router import RegistryLocalRouter
+from src.workflow.agents.supervisor.routing_cascade import RoutingCascade
+from src.workflow.agents.supervisor.routing_batcher import RoutingBatcher
+from src.workflow.jobs.job_queue import InMemoryJobQueue, RedisJobQueue
+from src.workflow.jobs.worker_pool import WorkerPool
+from qdrant_client import AsyncQdrantClient
+from langgraph.checkpoint.memory import InMemorySaver
+from src.utils.tracing.tracer import Tracer, LoggingSpanExporter, set_tracer
 
 from src.api.core.services.encryption_service import EncryptionService
 from src.api.core.services.hashing_service import HashingService
 from src.api.core.services.http_service import HttpService
+from src.api.core.services.http_client_service import HttpClientService
 from src.api.core.middleware.middleware_service import MiddlewareService
 from src.api.core.services.request_validation_service import RequestValidationService
 from src.api.modules.websocket.websocket_service import WebsocketService
 from src.api.core.services.webtoken_service import WebTokenService
+from src.api.core.services.redis_service import RedisService
+from src.api.core.services.rate_limiter_service import RateLimiterService
+from src.api.core.services.chat_context_cache_service import ChatContextCacheService
+from src.api.core.services.metrics_service import MetricsService
+from src.api.modules.interactions.worker_state_service import WorkerStateService
+from src.api.core.services.rate_limit_backends import InMemoryRateLimitBackend, RedisRateLimitBackend
 from src.api.core.middleware.middleware_service import MiddlewareService
 
 
 
 def configure_container():
     ## Independent ##
+    tracer = configure_tracer()
+    set_tracer(tracer)
+    Container.register("tracer", tracer)
+
     encryption_service = EncryptionService()
     Container.register("encryption_service", encryption_service)
 
     hashing_service = HashingService()
     Container.register("hashing_service", hashing_service)
 
+    http_client_service = HttpClientService()
+    Container.register("http_client_service", http_client_service)
+
     llm_service = LlmService()
     Container.register("llm_service", llm_service)
     
-    prompt_service = PromptService()
-    Container.register("prompt_service", prompt_service)
-
     request_validation_service = RequestValidationService()
     Container.register("request_validation_service", request_validation_service)
 
     
 
-    websocket_service = WebsocketService()
+    redis_service = None
+    if os.getenv("REDIS_URL"):
+        redis_service = RedisService()
+        Container.register("redis_service", redis_service)
+
+    ## the encoding is loaded by the lifespan, see TokenCounter.warmup
+    token_counter = TokenCounter()
+    Container.register("token_counter", token_counter)
+
+    prompt_service = PromptService(
+        history_strategy=configure_history_strategy(llm_service, redis_service, token_counter)
+    )
+    Container.register("prompt_service", prompt_service)
+
+    websocket_cluster_mode = os.getenv("WEBSOCKET_CLUSTER_MODE", "false").lower() == "true"
+    websocket_service = WebsocketService(
+        redis_service=redis_service if websocket_cluster_mode else None
+    )
     Container.register("websocket_service", websocket_service)
 
+    rate_limiter_service = configure_rate_limiter(redis_service)
+    Container.register("rate_limiter_service", rate_limiter_service)
+
+    chat_context_cache_service = None
+    if redis_service is not None and os.getenv("CHAT_CONTEXT_CACHE_ENABLED", "false").lower() == "true":
+        chat_context_cache_service = ChatContextCacheService(
+            redis_service=redis_service,
+            ttl_seconds=int(os.getenv("CHAT_CONTEXT_TTL_SECONDS", 3600))
+        )
+    Container.register("chat_context_cache_service", chat_context_cache_service)
+
+    worker_state_service = WorkerStateService(
+        http_client_service=http_client_service,
+        chat_context_cache_service=chat_context_cache_service
+    )
+    Container.register("worker_state_service", worker_state_service)
+
     webtoken_service = WebTokenService()
     Container.register("webtoken_service", webtoken_service)
 
@@ -54,20 +122,261 @@ def configure_container():
     )
     Container.register("middleware_service", middleware_service)
 
+    message_sink_service = MessageSinkService(
+        http_client_service=http_client_service
+    )
+    Container.register("message_sink_service", message_sink_service)
+
     orchestrator = Orchestrator(
-        websocket_service=websocket_service
+        websocket_service=websocket_service,
+        http_client_service=http_client_service,
+        message_sink_service=message_sink_service,
+        chat_context_cache_service=chat_context_cache_service
     )
     Container.register("orchestrator", orchestrator)
 
+    routing_cache_service = configure_routing_cache()
+    if routing_cache_service is not None:
+        Container.register("routing_cache_service", routing_cache_service)
+
+    agent_registry_service = configure_agent_registry(http_client_service)
+    Container.register("agent_registry_service", agent_registry_service)
+
+    local_router = configure_local_router(agent_registry_service)
+    if local_router is not None:
+        Container.register("local_router", local_router)
+
+    routing_cascade = configure_routing_cascade(llm_service)
+    Container.register("routing_cascade", routing_cascade)
+
+    routing_batcher = configure_routing_batcher(llm_service, prompt_service)
+    Container.register("routing_batcher", routing_batcher)
+
     supervisor = Supervisor(
         prompt_service=prompt_service,
-        llm_service=llm_service
+        llm_service=llm_service,
+        routing_cache_service=routing_cache_service,
+        local_router=local_router,
+        agent_registry_service=agent_registry_service,
+        routing_cascade=routing_cascade,
+        routing_batcher=routing_batcher
     )
     Container.register("supervisor", supervisor)
 
+    ## Workflow
+    graph = create_graph(checkpointer=configure_checkpointer(redis_service))
+    Container.register("graph", graph)
 
-    
+    job_queue = configure_job_queue(redis_service)
+    Container.register("job_queue", job_queue)
+
+    ## in-memory jobs can only be run by the process that accepted them
+    worker_pool = None
+    if job_queue is not None and (
+        isinstance(job_queue, InMemoryJobQueue) or os.getenv("JOB_WORKER_EMBEDDED", "false").lower() == "true"
+    ):
+        worker_pool = WorkerPool(
+            job_queue=job_queue,
+            graph=graph,
+            rate_limiter_service=rate_limiter_service,
+            message_sink_service=message_sink_service
+        )
+    Container.register("worker_pool", worker_pool)
+
+    metrics_service = None
+    if os.getenv("METRICS_ENABLED", "true").lower() == "true":
+        metrics_service = MetricsService(
+            websocket_service=websocket_service,
+            message_sink_service=message_sink_service,
+            orchestrator=orchestrator,
+            http_client_service=http_client_service,
+            rate_limiter_service=rate_limiter_service,
+            worker_pool=worker_pool,
+            chat_context_cache_service=chat_context_cache_service,
+            routing_cache_service=routing_cache_service,
+            routing_cascade=routing_cascade,
+            routing_batcher=routing_batcher,
+            llm_service=llm_service
+        )
+    Container.register("metrics_service", metrics_service)
+
+
+def configure_tracer():
+    if os.getenv("TRACING_ENABLED", "false").lower() != "true":
+        return Tracer(enabled=False)
+
+    exporter = os.getenv("TRACING_EXPORTER", "log")
+    if exporter not in ("log", "none"):
+        raise ValueError(f"Unknown TRACING_EXPORTER {exporter}")
+
+    return Tracer(
+        exporter=LoggingSpanExporter() if exporter == "log" else None,
+        enabled=True,
+        sample_ratio=float(os.getenv("TRACING_SAMPLE_RATIO", 1.0))
+    )
+
+
+def configure_routing_cache():
+    if os.getenv("ROUTING_CACHE_ENABLED", "false").lower() != "true":
+        return None
+
+    ttl_seconds = float(os.getenv("ROUTING_CACHE_TTL_SECONDS", 86400))
+    max_entries = int(os.getenv("ROUTING_CACHE_MAX_ENTRIES", 1000))
+
+    if os.getenv("ROUTING_CACHE_BACKEND", "memory") == "qdrant":
+        backend = QdrantVectorBackend(
+            client=AsyncQdrantClient(url=os.getenv("QDRANT_URL"), api_key=os.getenv("QDRANT_API_KEY")),
+            collection_name=os.getenv("ROUTING_CACHE_COLLECTION", "supervisor_routing_cache"),
+            ttl_seconds=ttl_seconds,
+            max_entries=max_entries,
+            evict_sample_rate=float(os.getenv("ROUTING_CACHE_EVICT_SAMPLE_RATE", 0.05))
+        )
+    else:
+        backend = InMemoryVectorBackend(ttl_seconds=ttl_seconds, max_entries=max_entries)
 
+    return RoutingCacheService(
+        embedding_service=EmbeddingService(),
+        backend=backend,
+        similarity_threshold=float(os.getenv("ROUTING_CACHE_SIMILARITY_THRESHOLD", 0.95)),
+        max_pending_stores=int(os.getenv("ROUTING_CACHE_MAX_PENDING_STORES", 100))
+    )
+
+
+def configure_local_router(agent_registry_service: AgentRegistryService):
+    if os.getenv("LOCAL_ROUTER_ENABLED", "false").lower() != "true":
+        return None
+
+    return RegistryLocalRouter(
+        agent_registry_service=agent_registry_service,
+        min_score=float(os.getenv("LOCAL_ROUTER_MIN_SCORE", 0.1)),
+        min_confidence=float(os.getenv("LOCAL_ROUTER_MIN_CONFIDENCE", 0.8))
+    )
+
+
+def configure_routing_cascade(llm_service: LlmService):
+    if os.getenv("SUPERVISOR_CASCADE_ENABLED", "false").lower() != "true":
+        return None
+
+    ## cheapest tier first, model:input_cost:output_cost in USD per million tokens
+    return RoutingCascade(
+        llm_service=llm_service,
+        tiers=RoutingCascade.parse_tiers(os.getenv("SUPERVISOR_CASCADE_TIERS", "gpt-4o-mini:0.15:0.6,gpt-4o:2.5:10")),
+        min_confidence=float(os.getenv("SUPERVISOR_CASCADE_MIN_CONFIDENCE", 0.7))
+    )
+
+
+def configure_routing_batcher(llm_service: LlmService, prompt_service: PromptService):
+    if os.getenv("SUPERVISOR_BATCH_ENABLED", "false").lower() != "true":
+        return None
+
+    return RoutingBatcher(
+        llm_service=llm_service,
+        prompt_service=prompt_service,
+        window=float(os.getenv("SUPERVISOR_BATCH_WINDOW_MS", 5)) / 1000,
+        max_batch_size=int(os.getenv("SUPERVISOR_BATCH_MAX_SIZE", 16)),
+        model=os.getenv("SUPERVISOR_BATCH_MODEL") or None,
+        scope=os.getenv("SUPERVISOR_BATCH_SCOPE", "chat")
+    )
+
+
+def configure_job_queue(redis_service: RedisService):
+    if os.getenv("JOB_QUEUE_ENABLED", "false").lower() != "true":
+        return None
+
+    options = {
+        "company_priorities": {
+            company_id.strip(): int(priority)
+            for company_id, priority in (
+                entry.split("=") for entry in os.getenv("JOB_COMPANY_PRIORITIES", "").split(",") if entry.strip()
+            )
+        },
+        "default_priority": int(os.getenv("JOB_DEFAULT_PRIORITY", 1)),
+        "max_attempts": int(os.getenv("JOB_MAX_ATTEMPTS", 3))
+    }
 
+    backend = os.getenv("JOB_QUEUE_BACKEND", "redis" if redis_service is not None else "memory")
+    if backend == "redis":
+        if redis_service is None:
+            raise ValueError("JOB_QUEUE_BACKEND=redis requires REDIS_URL")
+        return RedisJobQueue(
+            redis_service=redis_service,
+            name=os.getenv("JOB_QUEUE_NAME", "interactions"),
+            lease_seconds=float(os.getenv("JOB_LEASE_SECONDS", 120)),
+            poll_interval=float(os.getenv("JOB_POLL_SECONDS", 0.05)),
+            **options
+        )
 
+    return InMemoryJobQueue(**options)
 
+
+def configure_agent_registry(http_client_service: HttpClientService):
+    ## main_server pulls the agents on start and every AGENT_REGISTRY_REFRESH_SECONDS, the file is the fallback
+    if os.getenv("AGENT_REGISTRY_SOURCE", "file") == "main_server":
+        return AgentRegistryService.from_file(os.getenv("AGENT_REGISTRY_PATH"), http_client_service=http_client_service)
+
+    return AgentRegistryService.from_file(os.getenv("AGENT_REGISTRY_PATH"))
+
+
+def configure_history_strategy(llm_service: LlmService, redis_service: RedisService, token_counter: TokenCounter):
+    strategy = os.getenv("PROMPT_HISTORY_STRATEGY", "token_budget")
+    if strategy == "full":
+        return FullHistoryStrategy()
+    if strategy == "last_n":
+        return LastTurnsStrategy(max_messages=int(os.getenv("PROMPT_HISTORY_MAX_MESSAGES", 10)))
+
+    token_budget = TokenBudgetStrategy(
+        token_counter=token_counter,
+        max_tokens=int(os.getenv("PROMPT_HISTORY_MAX_TOKENS", 2000))
+    )
+    if strategy == "token_budget":
+        return token_budget
+    if strategy == "summary":
+        return RollingSummaryStrategy(
+            llm_service=llm_service,
+            window=token_budget,
+            redis_service=redis_service,
+            summary_max_tokens=int(os.getenv("PROMPT_HISTORY_SUMMARY_MAX_TOKENS", 300)),
+            ttl_seconds=int(os.getenv("PROMPT_HISTORY_SUMMARY_TTL_SECONDS", 86400))
+        )
+
+    raise ValueError(f"Unknown PROMPT_HISTORY_STRATEGY {strategy}")
+
+
+def configure_checkpointer(redis_service: RedisService):
+    if os.getenv("GRAPH_CHECKPOINT_ENABLED", "false").lower() != "true":
+        return None
+
+    backend = os.getenv("GRAPH_CHECKPOINT_BACKEND", "redis" if redis_service is not None else "memory")
+    if backend == "redis":
+        if redis_service is None:
+            raise ValueError("GRAPH_CHECKPOINT_BACKEND=redis requires REDIS_URL")
+        return RedisCheckpointSaver(
+            redis_service=redis_service,
+            ttl_seconds=int(os.getenv("GRAPH_CHECKPOINT_TTL_SECONDS", 3600))
+        )
+
+    return InMemorySaver()
+
+
+def configure_rate_limiter(redis_service: RedisService):
+    if os.getenv("RATE_LIMIT_ENABLED", "false").lower() != "true":
+        return None
+
+    ## shared by default so slots taken here can be released by the worker pool process
+    backend = os.getenv("RATE_LIMIT_BACKEND", "redis" if redis_service is not None else "memory")
+    if backend == "redis":
+        if redis_service is None:
+            raise ValueError("RATE_LIMIT_BACKEND=redis requires REDIS_URL")
+        rate_limit_backend = RedisRateLimitBackend(
+            redis_service=redis_service,
+            slot_ttl_seconds=int(os.getenv("RATE_LIMIT_SLOT_TTL_SECONDS", 300))
+        )
+    else:
+        rate_limit_backend = InMemoryRateLimitBackend()
+
+    return RateLimiterService(
+        backend=rate_limit_backend,
+        rate=float(os.getenv("RATE_LIMIT_COMPANY_RATE", 1.0)),
+        burst=float(os.getenv("RATE_LIMIT_COMPANY_BURST", 10)),
+        max_in_flight=int(os.getenv("RATE_LIMIT_MAX_IN_FLIGHT", 100))
+    )
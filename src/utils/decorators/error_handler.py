@@ -1,25 +1,38 @@
 # core/decorators/error_handling.py
 from functools import wraps
+import inspect
 import logging
 from typing import Callable, Any
 from src.utils.logs.logger import Logger
-from src.dependencies.container import Container
 
 
 def error_handler(module: str) -> Callable:
     def decorator(func: Callable) -> Callable:
+        def log_error() -> None:
+            Logger.log(
+                message=f"Error in {func.__name__}",
+                level=logging.ERROR,
+                name=f"{module}.{func.__name__}",
+                exc_info=True
+            )
+
+        ## coroutine functions raise when awaited, not when called
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                try:
+                    return await func(*args, **kwargs)
+                except Exception:
+                    log_error()
+                    raise
+            return async_wrapper
+
         @wraps(func) 
         def wrapper(*args: Any, **kwargs: Any) -> Any:
             try:
                 return func(*args, **kwargs)
-            except Exception as e:
-                logger: Logger = Container.resolve("logger")
-                logger.log(
-                    message=f"Error in {func.__name__}",
-                    level=logging.ERROR,
-                    name=f"{module}.{func.__name__}",
-                    exc_info=True
-                )
+            except Exception:
+                log_error()
                 raise  
         return wrapper
-    return decorator
\ No newline at end of file
+    return decorator
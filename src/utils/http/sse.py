@@ -0,0 +1,38 @@
+import json
+from typing import AsyncIterator
+import httpx
+
+SSE_DONE = "[DONE]"
+
+
+async def iter_sse_tokens(response: httpx.Response) -> AsyncIterator[str]:
+    """
+    Yield the text tokens of a server-sent events response.
+    Each event's data is either a JSON object with a "token" key or plain text; "[DONE]" ends the stream.
+    Plain text is yielded as sent, its spaces are part of the token.
+    """
+    async for line in response.aiter_lines():
+        if not line.startswith("data:"):
+            continue
+
+        ## the spec allows one space after the colon, anything further belongs to the data
+        data = line[5:]
+        if data.startswith(" "):
+            data = data[1:]
+        if data == SSE_DONE:
+            return
+
+        if not data.startswith("{"):
+            if data:
+                yield data
+            continue
+
+        try:
+            event = json.loads(data)
+        except ValueError:
+            yield data
+            continue
+
+        token = event.get("token") if isinstance(event, dict) else None
+        if token:
+            yield token
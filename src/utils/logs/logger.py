@@ -1,5 +1,6 @@
 import logging
-from typing import Optional
+from typing import Any, Dict, Optional
+from src.utils.logs.structured_logging import configure_logging, is_logging_configured
 
 class Logger:
     @staticmethod
@@ -7,16 +8,13 @@ class Logger:
         message: str,
         level: int = logging.INFO,
         name: str = "app",
-        exc_info: Optional[bool] = False
+        exc_info: Optional[bool] = False,
+        fields: Optional[Dict[str, Any]] = None
     ):
-        logger = logging.getLogger(name)
-        logger.setLevel(level)
-
-        if not logger.handlers:
-            console_handler = logging.StreamHandler()
-            console_handler.setLevel(level)
-            formatter = logging.Formatter("[%(asctime)s] %(levelname)s in %(name)s: %(message)s")
-            console_handler.setFormatter(formatter)
-            logger.addHandler(console_handler)
+        ## handlers and levels are set up once for the process, see configure_logging
+        if not is_logging_configured():
+            configure_logging()
 
-        logger.log(level, message, exc_info=exc_info)
\ No newline at end of file
+        logger = logging.getLogger(name)
+        if logger.isEnabledFor(level):
+            logger.log(level, message, exc_info=exc_info, extra={"fields": fields} if fields else None)
@@ -0,0 +1,209 @@
+import os
+import sys
+import json
+import queue
+import atexit
+import random
+import logging
+import logging.handlers
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Union
+from uuid import UUID
+
+chat_id_var: ContextVar[Optional[str]] = ContextVar("log_chat_id", default=None)
+company_id_var: ContextVar[Optional[str]] = ContextVar("log_company_id", default=None)
+
+TEXT_FORMAT = "[%(asctime)s] %(levelname)s in %(name)s: %(message)s"
+
+
+class log_context:
+    """
+    Binds the chat and company of the interaction to every record logged within the block,
+    tasks started inside it inherit the context.
+    """
+    __slots__ = ("chat_id", "company_id", "__tokens")
+
+    def __init__(self, chat_id: Union[UUID, str, None] = None, company_id: Union[UUID, str, None] = None):
+        self.chat_id = str(chat_id) if chat_id is not None else None
+        self.company_id = str(company_id) if company_id is not None else None
+        self.__tokens = ()
+
+    def __enter__(self) -> "log_context":
+        self.__tokens = (
+            chat_id_var.set(self.chat_id or chat_id_var.get()),
+            company_id_var.set(self.company_id or company_id_var.get())
+        )
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> bool:
+        chat_token, company_token = self.__tokens
+        company_id_var.reset(company_token)
+        chat_id_var.reset(chat_token)
+        return False
+
+
+class ContextFilter(logging.Filter):
+    """
+    Copies the interaction context onto the record. Runs in the calling task, before the record is queued.
+    """
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.chat_id = chat_id_var.get()
+        record.company_id = company_id_var.get()
+        if not hasattr(record, "trace_id"):
+            ## imported here, the tracer logs through this module
+            from src.utils.tracing.tracer import get_tracer
+            context = get_tracer().get_current_context()
+            record.trace_id = context.trace_id if context is not None else None
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps a fraction of the records of high-volume loggers, by logger name prefix.
+    Warnings and errors are always kept.
+    """
+    def __init__(self, rates: Dict[str, float], seed: Optional[int] = None):
+        super().__init__()
+        ## longest prefix first, so websocket.connection can be sampled differently from websocket
+        self.rates = sorted(rates.items(), key=lambda item: len(item[0]), reverse=True)
+        self.dropped = 0
+        self.__random = random.Random(seed)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+
+        for prefix, rate in self.rates:
+            if record.name == prefix or record.name.startswith(prefix + "."):
+                if self.__random.random() < rate:
+                    return True
+                self.dropped += 1
+                return False
+        return True
+
+    @staticmethod
+    def parse_rates(value: str) -> Dict[str, float]:
+        """
+        LOG_SAMPLE_RATES format, logger:rate pairs separated by commas.
+        """
+        rates = {}
+        for entry in value.split(","):
+            if entry.strip():
+                name, rate = entry.rsplit(":", 1)
+                rates[name.strip()] = float(rate)
+        return rates
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line, with the interaction context and the fields passed to Logger.log.
+    """
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        for key in ("chat_id", "company_id", "trace_id"):
+            value = getattr(record, key, None)
+            if value is not None:
+                entry[key] = value
+
+        fields = getattr(record, "fields", None)
+        if fields:
+            entry.update(fields)
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class AsyncQueueHandler(logging.handlers.QueueHandler):
+    """
+    Hands records to the listener thread without blocking the event loop.
+    Formatting and writing happen on the listener; when the queue is full the record is dropped and counted.
+    """
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        ## the default prepare formats in the caller, only the arguments are merged here
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_handler: Optional[logging.Handler] = None
+
+
+def configure_logging(
+    level: Optional[Union[int, str]] = None,
+    format: Optional[str] = None,
+    async_enabled: Optional[bool] = None,
+    queue_size: Optional[int] = None,
+    sample_rates: Optional[Dict[str, float]] = None,
+    stream=None
+) -> logging.Handler:
+    """
+    Installs the process log handler on the root logger, replacing the previous one.
+    """
+    shutdown_logging()
+
+    level = level or os.getenv("LOG_LEVEL", "INFO").upper()
+    format = format or os.getenv("LOG_FORMAT", "json")
+    if format not in ("json", "text"):
+        raise ValueError(f"Unknown LOG_FORMAT {format}")
+    async_enabled = async_enabled if async_enabled is not None else os.getenv("LOG_ASYNC_ENABLED", "true").lower() == "true"
+    queue_size = queue_size if queue_size is not None else int(os.getenv("LOG_QUEUE_SIZE", 10000))
+    sample_rates = sample_rates if sample_rates is not None else SamplingFilter.parse_rates(os.getenv("LOG_SAMPLE_RATES", ""))
+
+    stream_handler = logging.StreamHandler(stream or sys.stderr)
+    stream_handler.setFormatter(JsonFormatter() if format == "json" else logging.Formatter(TEXT_FORMAT))
+
+    global _listener, _handler
+    if async_enabled:
+        _handler = AsyncQueueHandler(queue.Queue(maxsize=queue_size))
+        _listener = logging.handlers.QueueListener(_handler.queue, stream_handler)
+        _listener.start()
+    else:
+        _handler = stream_handler
+
+    _handler.addFilter(SamplingFilter(sample_rates))
+    _handler.addFilter(ContextFilter())
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(_handler)
+    return _handler
+
+
+def is_logging_configured() -> bool:
+    return _handler is not None
+
+
+def shutdown_logging() -> None:
+    """
+    Stops the listener after it has written the queued records.
+    """
+    global _listener, _handler
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    if _handler is not None:
+        logging.getLogger().removeHandler(_handler)
+        _handler.close()
+        _handler = None
+
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,209 @@
+import math
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+Sample = Tuple[str, Dict[str, str], float]
+
+
+def escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def format_sample(name: str, labels: Dict[str, str], value: float) -> str:
+    if not labels:
+        return f"{name} {format_value(value)}"
+    rendered = ",".join(f'{key}="{escape_label(str(label))}"' for key, label in labels.items())
+    return f"{name}{{{rendered}}} {format_value(value)}"
+
+
+class Metric(ABC):
+    """
+    One metric family, children are kept per label values so the hot path is a dict lookup and an addition.
+    """
+    type = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[LabelValues, object] = {}
+
+    def labels(self, *values: str, **labels: str):
+        ## label values are nearly always strings already, the positional tuple is the key as it is
+        child = self._children.get(values) if values else None
+        if child is not None:
+            return child
+
+        key = tuple(str(value) for value in values) if values else tuple(str(labels[name]) for name in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            child = self._new_child()
+            self._children[key] = child
+        return child
+
+    @abstractmethod
+    def _new_child(self):
+        ...
+
+    @abstractmethod
+    def samples(self) -> Iterable[Sample]:
+        ...
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+        lines.extend(format_sample(*sample) for sample in self.samples())
+        return lines
+
+    def _label_dict(self, key: LabelValues) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+
+class CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def _new_child(self):
+        return CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def samples(self):
+        for key, child in self._children.items():
+            yield f"{self.name}_total", self._label_dict(key), child.value
+
+
+class GaugeChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def _new_child(self):
+        return GaugeChild()
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.labels().dec(amount)
+
+    def samples(self):
+        for key, child in self._children.items():
+            yield self.name, self._label_dict(key), child.value
+
+
+class HistogramChild:
+    __slots__ = ("upper_bounds", "counts", "sum")
+
+    def __init__(self, upper_bounds: Tuple[float, ...]):
+        self.upper_bounds = upper_bounds
+        self.counts = [0] * (len(upper_bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        ## one bucket per observation, made cumulative when scraped
+        self.counts[bisect_left(self.upper_bounds, value)] += 1
+        self.sum += value
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.upper_bounds = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return HistogramChild(self.upper_bounds)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def samples(self):
+        for key, child in self._children.items():
+            labels = self._label_dict(key)
+            cumulative = 0
+            for upper_bound, count in zip((*self.upper_bounds, math.inf), child.counts):
+                cumulative += count
+                yield f"{self.name}_bucket", {**labels, "le": format_value(upper_bound)}, cumulative
+            yield f"{self.name}_sum", labels, child.sum
+            yield f"{self.name}_count", labels, cumulative
+
+
+class MetricsRegistry:
+    """
+    Metrics recorded on the hot path, rendered in the Prometheus text exposition format.
+    prometheus_client is not a dependency, the format is small enough to write here.
+    """
+    def __init__(self):
+        self.__metrics: Dict[str, Metric] = {}
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.__register(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.__register(Gauge(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.__register(Histogram(name, help, labelnames, buckets))
+
+    def get(self, name: str) -> Optional[Metric]:
+        return self.__metrics.get(name)
+
+    def render(self) -> List[str]:
+        lines = []
+        for metric in self.__metrics.values():
+            if metric._children:
+                lines.extend(metric.render())
+        return lines
+
+    def __register(self, metric: Metric) -> Metric:
+        ## modules may be imported again by tests, the first registration wins
+        existing = self.__metrics.get(metric.name)
+        if existing is not None:
+            return existing
+        self.__metrics[metric.name] = metric
+        return metric
+
+
+REGISTRY = MetricsRegistry()
@@ -0,0 +1,231 @@
+import os
+import json
+import time
+import random
+import logging
+from abc import ABC, abstractmethod
+from contextvars import ContextVar
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+from src.utils.logs.logger import Logger
+
+TRACEPARENT_HEADER = "traceparent"
+
+
+class SpanContext:
+    """
+    W3C trace context of a span, what crosses process boundaries in the traceparent header.
+    """
+    __slots__ = ("trace_id", "span_id", "sampled")
+
+    def __init__(self, trace_id: str, span_id: str, sampled: bool = True):
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.sampled = sampled
+
+    def to_traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+    @staticmethod
+    def from_traceparent(value: Optional[str]) -> Optional["SpanContext"]:
+        parts = (value or "").strip().split("-")
+        if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16 or set(parts[1]) == {"0"}:
+            return None
+        try:
+            int(parts[1], 16), int(parts[2], 16)
+            flags = int(parts[3], 16)
+        except ValueError:
+            return None
+        return SpanContext(parts[1], parts[2], bool(flags & 1))
+
+
+class Span:
+    __slots__ = ("name", "context", "parent_id", "kind", "attributes", "status", "error", "start_ns", "end_ns")
+
+    def __init__(self, name: str, context: SpanContext, parent_id: Optional[str], kind: str, attributes: Optional[Dict[str, Any]]):
+        self.name = name
+        self.context = context
+        self.parent_id = parent_id
+        self.kind = kind
+        self.attributes = dict(attributes) if attributes else {}
+        self.status = "ok"
+        self.error: Optional[str] = None
+        self.start_ns = time.perf_counter_ns()
+        self.end_ns: Optional[int] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def record_exception(self, exc: BaseException) -> None:
+        self.status = "error"
+        self.error = repr(exc)
+
+    @property
+    def duration(self) -> Optional[float]:
+        return (self.end_ns - self.start_ns) / 1e9 if self.end_ns is not None else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.context.trace_id,
+            "span_id": self.context.span_id,
+            "parent_id": self.parent_id,
+            "kind": self.kind,
+            "duration_ms": round(self.duration * 1e3, 3) if self.duration is not None else None,
+            "status": self.status,
+            "error": self.error,
+            "attributes": {key: value if isinstance(value, (str, int, float, bool)) else str(value) for key, value in self.attributes.items()}
+        }
+
+
+class NoopSpan:
+    """
+    Handed out while tracing is disabled, accepts and drops everything. Also its own context manager.
+    """
+    context = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def record_exception(self, exc: BaseException) -> None:
+        pass
+
+    def __enter__(self) -> "NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> bool:
+        return False
+
+
+NOOP_SPAN = NoopSpan()
+
+
+class SpanScope:
+    """
+    Makes a span current while the with block runs, then ends and exports it.
+    """
+    __slots__ = ("span", "__current", "__exporter", "__token")
+
+    def __init__(self, span: Span, current: ContextVar, exporter: Optional["SpanExporter"]):
+        self.span = span
+        self.__current = current
+        self.__exporter = exporter
+        self.__token = None
+
+    def __enter__(self) -> Span:
+        self.__token = self.__current.set(self.span.context)
+        return self.span
+
+    def __exit__(self, exc_type, exc, traceback) -> bool:
+        if exc is not None:
+            self.span.record_exception(exc)
+        self.__current.reset(self.__token)
+        self.span.end_ns = time.perf_counter_ns()
+        if self.span.context.sampled and self.__exporter is not None:
+            self.__exporter.export((self.span,))
+        return False
+
+
+class SpanExporter(ABC):
+    @abstractmethod
+    def export(self, spans: Sequence[Span]) -> None:
+        ...
+
+
+class InMemorySpanExporter(SpanExporter):
+    """
+    Keeps finished spans, used by the tests.
+    """
+    def __init__(self):
+        self.spans: List[Span] = []
+
+    def export(self, spans):
+        self.spans.extend(spans)
+
+    def get_finished_spans(self, name: Optional[str] = None) -> List[Span]:
+        return [span for span in self.spans if name is None or span.name == name]
+
+    def clear(self) -> None:
+        self.spans.clear()
+
+
+class LoggingSpanExporter(SpanExporter):
+    """
+    Writes one JSON line per finished span.
+    """
+    __MODULE = "tracing"
+
+    def export(self, spans):
+        for span in spans:
+            Logger.log(message=json.dumps(span.to_dict()), level=logging.INFO, name=self.__MODULE)
+
+
+class Tracer:
+    """
+    Minimal OpenTelemetry-style tracer, the SDK is not a dependency of the service.
+    Spans nest through a context variable, so concurrent interactions keep separate traces,
+    and the trace context crosses services in the W3C traceparent header.
+    Sampling is decided on the root span and inherited by its children and by downstream services.
+    """
+    def __init__(self, exporter: Optional[SpanExporter] = None, enabled: Optional[bool] = None, sample_ratio: Optional[float] = None):
+        self.exporter = exporter
+        self.enabled = enabled if enabled is not None else os.getenv("TRACING_ENABLED", "false").lower() == "true"
+        self.sample_ratio = sample_ratio if sample_ratio is not None else float(os.getenv("TRACING_SAMPLE_RATIO", 1.0))
+        self.__current: ContextVar[Optional[SpanContext]] = ContextVar("current_span", default=None)
+        self.__random = random.Random()
+
+    def start_span(
+        self,
+        name: str,
+        kind: str = "internal",
+        attributes: Optional[Dict[str, Any]] = None,
+        parent: Optional[SpanContext] = None
+    ):
+        """
+        Used as a context manager, the span is the parent of the spans started within the block.
+        """
+        if not self.enabled:
+            return NOOP_SPAN
+
+        parent = parent or self.__current.get()
+        if parent is None:
+            context = SpanContext(self.__random.getrandbits(128).to_bytes(16, "big").hex(), self.__new_span_id(), self.__random.random() < self.sample_ratio)
+        else:
+            context = SpanContext(parent.trace_id, self.__new_span_id(), parent.sampled)
+
+        span = Span(name, context, parent.span_id if parent else None, kind, attributes)
+        return SpanScope(span, self.__current, self.exporter)
+
+    def get_current_context(self) -> Optional[SpanContext]:
+        return self.__current.get() if self.enabled else None
+
+    def inject(self, headers: Dict[str, str], context: Optional[SpanContext] = None) -> Dict[str, str]:
+        """
+        Adds the traceparent of the current span to outgoing headers.
+        """
+        context = context or self.get_current_context()
+        if context is not None:
+            headers[TRACEPARENT_HEADER] = context.to_traceparent()
+        return headers
+
+    def extract(self, headers: Mapping[str, str]) -> Optional[SpanContext]:
+        if not self.enabled:
+            return None
+        return SpanContext.from_traceparent(headers.get(TRACEPARENT_HEADER))
+
+    def __new_span_id(self) -> str:
+        return self.__random.getrandbits(64).to_bytes(8, "big").hex()
+
+
+_tracer = Tracer(enabled=False)
+
+
+def get_tracer() -> Tracer:
+    return _tracer
+
+
+def set_tracer(tracer: Tracer) -> None:
+    """
+    Installs the process tracer, instrumented code looks it up on every call.
+    """
+    global _tracer
+    _tracer = tracer
@@ -0,0 +1,129 @@
+import math
+import re
+from abc import ABC, abstractmethod
+import unicodedata
+from collections import Counter
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+from src.workflow.agents.supervisor.supervisor_models import AgentRegistryConfig, LocalRouteDecision
+
+if TYPE_CHECKING:
+    from src.workflow.services.agent_registry_service import AgentRegistryService
+
+NO_AGENT_LABEL = "none"
+## registry descriptions are written for the supervisor prompt and run long, the curated keywords count double
+KEYWORD_WEIGHT = 2
+
+STOPWORDS = {
+    "the", "a", "an", "and", "or", "of", "to", "in", "on", "for", "our", "my", "me", "we", "is", "are",
+    "what", "how", "can", "do", "does", "i", "it", "with", "them", "their", "about", "by", "this", "that",
+    "el", "la", "los", "las", "de", "del", "y", "o", "en", "por", "para", "que", "es", "son", "un", "una",
+    "mi", "mis", "nuestro", "nuestra", "como", "cual", "se", "lo", "al", "con"
+}
+
+
+class LocalRouter(ABC):
+    """
+    Base class for fast-path routers consulted before the supervisor LLM.
+    route() returns None whenever the router is not confident enough to skip the LLM.
+    """
+    @abstractmethod
+    def route(self, text: str, available_agents: Optional[Iterable[str]] = None) -> Optional[LocalRouteDecision]:
+        ...
+
+
+class TfidfLocalRouter(LocalRouter):
+    """
+    Scores the query against one document per agent, built from the agent registry:
+    description, keywords and the routing examples selecting the agent.
+    """
+    def __init__(
+        self,
+        config: AgentRegistryConfig,
+        min_score: float = 0.1,
+        min_confidence: float = 0.8
+    ):
+        self.min_score = min_score
+        self.min_confidence = min_confidence
+
+        documents = {agent.agent_id: self.__profile_terms(agent.description, agent.keywords) for agent in config.agents}
+        documents[NO_AGENT_LABEL] = self.__profile_terms(config.no_agent.description, config.no_agent.keywords) if config.no_agent else []
+
+        for example in config.examples:
+            for label in example.selected_agents or [NO_AGENT_LABEL]:
+                documents.setdefault(label, []).extend(self.tokenize(example.query))
+
+        document_frequency = Counter(term for terms in documents.values() for term in set(terms))
+        self.__idf = {
+            term: math.log((1 + len(documents)) / (1 + frequency)) + 1
+            for term, frequency in document_frequency.items()
+        }
+        self.__label_vectors = {label: self.__vectorize(terms) for label, terms in documents.items()}
+
+    def route(self, text: str, available_agents: Optional[Iterable[str]] = None) -> Optional[LocalRouteDecision]:
+        query_vector = self.__vectorize(self.tokenize(text))
+        if not query_vector:
+            return None
+
+        scores = {label: self.__cosine(query_vector, vector) for label, vector in self.__label_vectors.items()}
+        top_label = max(scores, key=scores.get)
+        top_score = scores[top_label]
+
+        ## share of the total score held by the best label, low when a query spans several agents
+        confidence = top_score / sum(scores.values()) if top_score else 0.0
+        if top_score < self.min_score or confidence < self.min_confidence:
+            return None
+
+        if top_label == NO_AGENT_LABEL:
+            return LocalRouteDecision(selected_agents=[], confidence=confidence)
+
+        if available_agents is not None and top_label not in {str(agent) for agent in available_agents}:
+            return None
+
+        return LocalRouteDecision(selected_agents=[top_label], confidence=confidence)
+
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        normalized = unicodedata.normalize("NFKD", text.lower()).encode("ascii", "ignore").decode("ascii")
+        terms = []
+        for token in re.findall(r"[a-z0-9]+", normalized):
+            if len(token) < 2 or token in STOPWORDS:
+                continue
+            terms.append(token[:-1] if len(token) > 4 and token.endswith("s") else token)
+
+        return terms
+
+    def __profile_terms(self, description: str, keywords: List[str]) -> List[str]:
+        return self.tokenize(description) + self.tokenize(" ".join(keywords)) * KEYWORD_WEIGHT
+
+    def __vectorize(self, terms: List[str]) -> Dict[str, float]:
+        counts = Counter(term for term in terms if term in self.__idf)
+        vector = {term: count * self.__idf[term] for term, count in counts.items()}
+        norm = math.sqrt(sum(value * value for value in vector.values()))
+
+        return {term: value / norm for term, value in vector.items()} if norm else {}
+
+    @staticmethod
+    def __cosine(query_vector: Dict[str, float], label_vector: Dict[str, float]) -> float:
+        return sum(value * label_vector.get(term, 0.0) for term, value in query_vector.items())
+
+
+class RegistryLocalRouter(LocalRouter):
+    """
+    Local router following the agent registry, the tf-idf index is rebuilt when the registry version changes.
+    """
+    def __init__(self, agent_registry_service: "AgentRegistryService", min_score: float = 0.1, min_confidence: float = 0.8):
+        self.__agent_registry_service = agent_registry_service
+        self.min_score = min_score
+        self.min_confidence = min_confidence
+        self.__router: Optional[TfidfLocalRouter] = None
+        self.__version: Optional[int] = None
+
+    def route(self, text: str, available_agents: Optional[Iterable[str]] = None) -> Optional[LocalRouteDecision]:
+        return self.get_router().route(text, available_agents)
+
+    def get_router(self) -> TfidfLocalRouter:
+        version = self.__agent_registry_service.version
+        if self.__router is None or version != self.__version:
+            self.__router = TfidfLocalRouter(self.__agent_registry_service.get_config(), self.min_score, self.min_confidence)
+            self.__version = version
+        return self.__router
@@ -0,0 +1,158 @@
+import os
+import asyncio
+import logging
+from typing import Dict, List, Optional, Set, Tuple
+from langchain_core.messages import BaseMessage
+from src.utils.logs.logger import Logger
+from src.workflow.services.llm_service import LlmService
+from src.workflow.services.prompt_service import PromptService
+from src.workflow.agents.supervisor.supervisor_models import BatchSupervisorOutput, SupervisorOutput
+
+BatchKey = Tuple[str, str, str, str]
+
+BATCH_SCOPES = ("chat", "company")
+
+
+class PendingRoute:
+    def __init__(self, input: str, chat_history: List[BaseMessage], future: asyncio.Future):
+        self.input = input
+        self.chat_history = chat_history
+        self.future = future
+
+
+class PendingBatch:
+    def __init__(self, variables: Dict[str, str]):
+        self.variables = variables
+        self.routes: List[PendingRoute] = []
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class RoutingBatcher:
+    """
+    Collects the routing requests arriving within a short window and routes them with one structured-output call.
+    Requests are only batched with others of the same tenant sharing the same prompt variables, i.e. the same
+    available agents: the same chat by default, or the same company with SUPERVISOR_BATCH_SCOPE=company.
+    route returns None when the request could not be answered in a batch, the caller then routes it on its own.
+    """
+    __MODULE = "supervisor.batcher"
+
+    def __init__(
+        self,
+        llm_service: LlmService,
+        prompt_service: PromptService,
+        window: Optional[float] = None,
+        max_batch_size: Optional[int] = None,
+        model: Optional[str] = None,
+        temperature: float = 0.1,
+        scope: Optional[str] = None
+    ):
+        self.__llm_service = llm_service
+        self.__prompt_service = prompt_service
+        self.window = window if window is not None else float(os.getenv("SUPERVISOR_BATCH_WINDOW_MS", 5)) / 1000
+        self.max_batch_size = max_batch_size or int(os.getenv("SUPERVISOR_BATCH_MAX_SIZE", 16))
+        self.model = model or os.getenv("SUPERVISOR_BATCH_MODEL") or None
+        self.temperature = temperature
+        self.scope = scope or os.getenv("SUPERVISOR_BATCH_SCOPE", "chat")
+        if self.scope not in BATCH_SCOPES:
+            raise ValueError(f"Unknown SUPERVISOR_BATCH_SCOPE {self.scope}")
+        self.__pending: Dict[BatchKey, PendingBatch] = {}
+        self.__tasks: Set[asyncio.Task] = set()
+        self.__structured_llm = None
+        self.batches = 0
+        self.batched_routes = 0
+        self.fallbacks = 0
+
+    async def route(
+        self,
+        input: str,
+        chat_history: List[BaseMessage],
+        variables: Dict[str, str],
+        company_id: Optional[str] = None,
+        chat_id: Optional[str] = None
+    ) -> Optional[SupervisorOutput]:
+        ## one prompt never mixes the queries and histories of different tenants
+        tenant = (str(company_id) if company_id else "", str(chat_id) if chat_id and self.scope == "chat" else "")
+        if not tenant[0] or (self.scope == "chat" and not tenant[1]):
+            self.fallbacks += 1
+            return None
+
+        loop = asyncio.get_running_loop()
+        key = (*tenant, variables.get("agents", ""), variables.get("examples", ""))
+        batch = self.__pending.get(key)
+        if batch is None:
+            batch = PendingBatch(variables)
+            batch.timer = loop.call_later(self.window, self.__flush, key)
+            self.__pending[key] = batch
+
+        future = loop.create_future()
+        batch.routes.append(PendingRoute(input, chat_history, future))
+        if len(batch.routes) >= self.max_batch_size:
+            self.__flush(key)
+
+        return await future
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "batches": self.batches,
+            "batched_routes": self.batched_routes,
+            "fallbacks": self.fallbacks,
+            "mean_batch_size": self.batched_routes / self.batches if self.batches else 0.0
+        }
+
+    def __flush(self, key: BatchKey) -> None:
+        batch = self.__pending.pop(key, None)
+        if batch is None:
+            return
+        batch.timer.cancel()
+        routes = [route for route in batch.routes if not route.future.done()]
+        if len(routes) < 2:
+            ## a batch of one gains nothing, the caller uses its regular prompt
+            self.__resolve(routes, {})
+            return
+
+        task = asyncio.create_task(self.__run(batch.variables, routes))
+        self.__tasks.add(task)
+        task.add_done_callback(self.__tasks.discard)
+
+    async def __run(self, variables: Dict[str, str], routes: List[PendingRoute]) -> None:
+        self.batches += 1
+        self.batched_routes += len(routes)
+        try:
+            chain = self.__prompt_service.get_prompt("supervisor_batch") | self.__get_structured_llm()
+            response: BatchSupervisorOutput = await chain.ainvoke({"input": self.__compose(routes), **variables})
+        except Exception as exc:
+            ## every caller routes on its own instead
+            Logger.log(message=f"Batched routing of {len(routes)} requests failed: {exc!r}", level=logging.WARNING, name=self.__MODULE)
+            self.__resolve(routes, {})
+            return
+
+        self.__resolve(routes, {selection.index: selection.selected_agents for selection in response.selections})
+
+    def __resolve(self, routes: List[PendingRoute], selections: Dict[int, List[str]]) -> None:
+        for index, route in enumerate(routes):
+            if route.future.done():
+                continue
+            selected_agents = selections.get(index)
+            if selected_agents is None:
+                self.fallbacks += 1
+                route.future.set_result(None)
+            else:
+                route.future.set_result(SupervisorOutput(selected_agents=selected_agents))
+
+    def __get_structured_llm(self):
+        if self.__structured_llm is None:
+            llm = self.__llm_service.get_llm(temperature=self.temperature, model=self.model)
+            self.__structured_llm = llm.with_structured_output(BatchSupervisorOutput)
+        return self.__structured_llm
+
+    @staticmethod
+    def __compose(routes: List[PendingRoute]) -> str:
+        blocks = []
+        for index, route in enumerate(routes):
+            lines = [f"Query {index}:"]
+            if route.chat_history:
+                lines.append("Conversation:")
+                lines.extend(f"{message.type}: {message.content}" for message in route.chat_history)
+            lines.append(f"User query: {route.input}")
+            blocks.append("\n".join(lines))
+        return "\n\n".join(blocks)
@@ -0,0 +1,128 @@
+import os
+import asyncio
+import logging
+from typing import Dict, Iterable, List, Optional, Set
+from langchain_core.prompts import ChatPromptTemplate
+from src.utils.logs.logger import Logger
+from src.workflow.services.llm_service import LlmService
+from src.workflow.orchestrator.worker_client import LatencyTracker
+from src.workflow.agents.supervisor.supervisor_models import ModelTier, SupervisorDecision, SupervisorOutput
+
+
+class TierStats:
+    def __init__(self):
+        self.calls = 0
+        self.failures = 0
+        self.escalations: Dict[str, int] = {}
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.cost = 0.0
+        self.latency = LatencyTracker()
+
+
+class RoutingCascade:
+    """
+    Routes with the cheapest model tier first and escalates to the next tier when the structured output
+    is invalid, selects agents that are not available, or is below the confidence threshold.
+    The last tier's answer is always used. Latency, tokens and cost are tracked per tier.
+    """
+    __MODULE = "supervisor.cascade"
+
+    def __init__(self, llm_service: LlmService, tiers: List[ModelTier], min_confidence: Optional[float] = None, temperature: float = 0.1):
+        if not tiers:
+            raise ValueError("RoutingCascade needs at least one model tier")
+        self.__llm_service = llm_service
+        self.tiers = tiers
+        self.min_confidence = min_confidence if min_confidence is not None else float(os.getenv("SUPERVISOR_CASCADE_MIN_CONFIDENCE", 0.7))
+        self.temperature = temperature
+        self.__structured_llms = {}
+        self.__stats: Dict[str, TierStats] = {tier.model: TierStats() for tier in tiers}
+
+    @staticmethod
+    def parse_tiers(value: str) -> List[ModelTier]:
+        """
+        Parses "model:input_cost:output_cost,..." ordered from the cheapest tier, costs are USD per million tokens.
+        """
+        tiers = []
+        for entry in value.split(","):
+            if entry.strip():
+                model, *costs = entry.strip().split(":")
+                tiers.append(ModelTier(model=model, **dict(zip(("input_cost", "output_cost"), map(float, costs)))))
+        return tiers
+
+    async def route(self, prompt: ChatPromptTemplate, inputs: dict, available_agents: Optional[Iterable] = None) -> SupervisorOutput:
+        allowed: Optional[Set[str]] = set(str(agent_id) for agent_id in available_agents) if available_agents is not None else None
+        loop = asyncio.get_running_loop()
+
+        for position, tier in enumerate(self.tiers):
+            last = position == len(self.tiers) - 1
+            stats = self.__stats[tier.model]
+            stats.calls += 1
+            started = loop.time()
+            try:
+                result = await (prompt | self.__get_structured_llm(tier)).ainvoke(inputs)
+            except Exception as exc:
+                stats.failures += 1
+                if last:
+                    raise
+                Logger.log(message=f"Routing with {tier.model} failed: {exc!r}", level=logging.WARNING, name=self.__MODULE)
+                self.__escalate(stats, "error")
+                continue
+            finally:
+                stats.latency.record(loop.time() - started)
+
+            self.__record_usage(tier, stats, result.get("raw"))
+            decision: Optional[SupervisorDecision] = result.get("parsed")
+            reason = self.__get_escalation_reason(decision, allowed)
+            if reason is None:
+                return SupervisorOutput(selected_agents=decision.selected_agents)
+            if last:
+                if decision is None:
+                    raise ValueError(f"Routing with {tier.model} returned no valid selection: {result.get('parsing_error')!r}")
+                return SupervisorOutput(selected_agents=[a for a in decision.selected_agents if allowed is None or a in allowed])
+            self.__escalate(stats, reason)
+
+    def stats(self) -> Dict[str, dict]:
+        return {
+            model: {
+                "calls": stats.calls,
+                "failures": stats.failures,
+                "escalations": dict(stats.escalations),
+                "p50": stats.latency.percentile(0.5),
+                "p95": stats.latency.percentile(0.95),
+                "input_tokens": stats.input_tokens,
+                "output_tokens": stats.output_tokens,
+                "cost": stats.cost
+            }
+            for model, stats in self.__stats.items()
+        }
+
+    def __get_escalation_reason(self, decision: Optional[SupervisorDecision], allowed: Optional[Set[str]]) -> Optional[str]:
+        if decision is None:
+            return "invalid_output"
+        if allowed is not None and any(agent_id not in allowed for agent_id in decision.selected_agents):
+            return "unavailable_agent"
+        if decision.confidence < self.min_confidence:
+            return "low_confidence"
+        return None
+
+    def __get_structured_llm(self, tier: ModelTier):
+        structured_llm = self.__structured_llms.get(tier.model)
+        if structured_llm is None:
+            llm = self.__llm_service.get_llm(temperature=self.temperature, model=tier.model)
+            structured_llm = llm.with_structured_output(SupervisorDecision, include_raw=True)
+            self.__structured_llms[tier.model] = structured_llm
+        return structured_llm
+
+    @staticmethod
+    def __escalate(stats: TierStats, reason: str) -> None:
+        stats.escalations[reason] = stats.escalations.get(reason, 0) + 1
+
+    @staticmethod
+    def __record_usage(tier: ModelTier, stats: TierStats, raw) -> None:
+        usage = getattr(raw, "usage_metadata", None) or {}
+        input_tokens = usage.get("input_tokens", 0)
+        output_tokens = usage.get("output_tokens", 0)
+        stats.input_tokens += input_tokens
+        stats.output_tokens += output_tokens
+        stats.cost += (input_tokens * tier.input_cost + output_tokens * tier.output_cost) / 1_000_000
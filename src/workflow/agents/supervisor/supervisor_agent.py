@@ -1,68 +1,121 @@
 from src.workflow.services.prompt_service import PromptService
-from langchain_openai import ChatOpenAI
 from src.workflow.state import State
 from src.workflow.services.llm_service import LlmService
 from src.utils.decorators.error_handler import error_handler
 from src.workflow.agents.supervisor.supervisor_models import SupervisorOutput
+from src.workflow.services.routing_cache_service import RoutingCacheService
+from src.workflow.agents.supervisor.local_router import LocalRouter
+from src.workflow.services.agent_registry_service import AgentRegistryService
+from src.workflow.agents.supervisor.routing_cascade import RoutingCascade
+from src.workflow.agents.supervisor.routing_batcher import RoutingBatcher
+from src.utils.tracing.tracer import get_tracer
+from src.utils.metrics.metrics import REGISTRY
+from typing import Optional
+import time
+
+ROUTING_SECONDS = REGISTRY.histogram("supervisor_routing_seconds", "Time the supervisor takes to select agents, by router", ["route"])
+ROUTING_DECISIONS = REGISTRY.counter("supervisor_routing_decisions", "Agents selected by the supervisor", ["agent_id"])
 
 class Supervisor:
     __MODULE = "context_orchestrator.agent"
-    def __init__(self, prompt_service: PromptService, llm_service: LlmService):
+    def __init__(
+        self,
+        prompt_service: PromptService,
+        llm_service: LlmService,
+        routing_cache_service: Optional[RoutingCacheService] = None,
+        local_router: Optional[LocalRouter] = None,
+        agent_registry_service: Optional[AgentRegistryService] = None,
+        routing_cascade: Optional[RoutingCascade] = None,
+        routing_batcher: Optional[RoutingBatcher] = None
+    ):
         self.__prompt_service = prompt_service
         self.__llm_service = llm_service
+        self.__routing_cache_service = routing_cache_service
+        self.__local_router = local_router
+        self.__agent_registry_service = agent_registry_service or AgentRegistryService.from_file()
+        self.__routing_cascade = routing_cascade
+        self.__routing_batcher = routing_batcher
 
     @error_handler(module=__MODULE)
     async def __get_prompt_template(self, state: State):
-        system_message = """
-        You are an expert workflow orchestrator for a company assistant platform.
-        Given a user's query and their context, your job is to decide which specialized agents should be involved in answering the query.
-
-        Available agents:
-        - 95e222ef-c637-42d3-a81e-955beeeb0ba2: Handles questions about the law, legal system, statutes, or regulations.
-        - 99b5792d-c38a-4e49-9207-a3fa547905ae: Accounting & Data Analysis Agent - Handles:
-          * General accounting principles and best practices
-          * Financial data organization and management
-          * Questions about company-specific financial data and spreadsheets
-          * Data visualization requests for company financial information
-          * Analysis of company financial metrics and reports
-          * Questions involving numbers, costs, or financial calculations
-
-        Only include an agent's UUID in the list if their expertise is required for the query.
-        For the Accounting & Data Analysis Agent, include it when:
-        1. The query mentions accounting concepts, financial terms, or business finances
-        2. The user asks about specific company data, numbers, or reports
-        3. The query involves analyzing, visualizing, or understanding financial information
-        4. The user wants to perform calculations or comparisons with company data
-
-        Examples:
-        User query: "Can I terminate an employee without notice?"
-        Output: {"selected_agents": ["95e222ef-c637-42d3-a81e-955beeeb0ba2"]}
-
-        User query: "What's the best way to organize our expense categories?"
-        Output: {"selected_agents": ["99b5792d-c38a-4e49-9207-a3fa547905ae"]}
-
-        User query: "Show me our revenue trends for the last quarter"
-        Output: {"selected_agents": ["99b5792d-c38a-4e49-9207-a3fa547905ae"]}
-
-        User query: "How do I reset my company email password?"
-        Output: {"selected_agents": []}
-
-        User query: "Calculate our profit margins and compare them to industry standards"
-        Output: {"selected_agents": ["99b5792d-c38a-4e49-9207-a3fa547905ae"]}
-        """
-        prompt = await self.__prompt_service.custom_prompt_template(state=state, system_message=system_message, with_chat_history=True)
-
-        return prompt
+        ## compiled once by the registry, the history is passed when the chain is invoked
+        return self.__prompt_service.get_prompt("supervisor")
 
     @error_handler(module=__MODULE)
     async def interact(self, state: State):
-        llm = self.__llm_service.get_llm(temperature=0.1)
-        
+        with get_tracer().start_span("supervisor.interact") as span:
+            started = time.perf_counter()
+            response, route = await self.__select_agents(state)
+            ROUTING_SECONDS.labels(route).observe(time.perf_counter() - started)
+            ## the ids come from model output, unknown ones share a label so they cannot grow the series
+            known_agents = {str(agent_id) for agent_id in self.__agent_registry_service.get_agent_ids()}
+            for agent_id in response.selected_agents:
+                ROUTING_DECISIONS.labels(agent_id if str(agent_id) in known_agents else "unknown").inc()
+            span.set_attribute("route", route)
+            span.set_attribute("selected_agents", len(response.selected_agents))
+            return response
+
+    async def __select_agents(self, state: State):
+        """
+        Returns the decision and which router made it.
+        """
+        available_agents = state.get("available_agents")
+        if available_agents is not None and not available_agents:
+            ## nothing to route to, skip the model
+            return SupervisorOutput(selected_agents=[]), "none"
+
+        if self.__local_router is not None:
+            decision = self.__local_router.route(state["input"], available_agents)
+            if decision is not None:
+                return SupervisorOutput(selected_agents=decision.selected_agents), "local"
+
+        cache_namespace = self.__get_cache_namespace(state)
+        if cache_namespace is not None:
+            cached_agents = await self.__routing_cache_service.lookup(cache_namespace, state["input"])
+            if cached_agents is not None:
+                return SupervisorOutput(selected_agents=cached_agents), "cache"
+
+        chat_history = await self.__prompt_service.get_chat_history(state)
+        variables = self.__agent_registry_service.get_prompt_variables(available_agents)
+
+        response, route = None, "batch"
+        if self.__routing_batcher is not None:
+            worker_state = state.get("worker_state")
+            response = await self.__routing_batcher.route(
+                state["input"],
+                chat_history,
+                variables,
+                company_id=worker_state.company_id if worker_state is not None else None,
+                chat_id=state.get("chat_id")
+            )
+
+        if response is None:
+            route = "cascade" if self.__routing_cascade is not None else "llm"
+            response = await self.__route(state, {"input": state["input"], "chat_history": chat_history, **variables})
+
+        if cache_namespace is not None:
+            self.__routing_cache_service.schedule_store(cache_namespace, state["input"], response.selected_agents)
+
+        return response, route
+
+    async def __route(self, state: State, inputs: dict) -> SupervisorOutput:
         prompt = await self.__get_prompt_template(state)
-        
+        if self.__routing_cascade is not None:
+            return await self.__routing_cascade.route(prompt, inputs, state.get("available_agents"))
+
+        llm = self.__llm_service.get_llm(temperature=0.1)
         structured_llm  = llm.with_structured_output(SupervisorOutput)
         chain = prompt | structured_llm
-        
-        response = await chain.ainvoke({"input": state["input"]})
 
-        return response
\ No newline at end of file
+        return await chain.ainvoke(inputs)
+
+    def __get_cache_namespace(self, state: State) -> Optional[str]:
+        worker_state = state.get("worker_state")
+        if self.__routing_cache_service is None or worker_state is None:
+            return None
+
+        ## the key is the input alone, a follow-up like "and for last year?" depends on the turns before it
+        if worker_state.chat_history:
+            return None
+
+        return str(worker_state.company_id)
\ No newline at end of file
@@ -1,6 +1,48 @@
-from pydantic import BaseModel
-from typing import Dict, List
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
 
 
 class SupervisorOutput(BaseModel):
-    selected_agents: List[str]
\ No newline at end of file
+    selected_agents: List[str]
+
+class SupervisorDecision(SupervisorOutput):
+    confidence: float = Field(ge=0, le=1, description="How sure you are that the selection is right, from 0 to 1")
+
+class BatchSelection(BaseModel):
+    index: int = Field(description="Index of the query this selection answers")
+    selected_agents: List[str]
+
+class BatchSupervisorOutput(BaseModel):
+    selections: List[BatchSelection]
+
+class LocalRouteDecision(BaseModel):
+    selected_agents: List[str]
+    confidence: float
+
+
+class ModelTier(BaseModel):
+    model: str
+    input_cost: float = 0.0     ## USD per million tokens
+    output_cost: float = 0.0
+
+class AgentProfile(BaseModel):
+    agent_id: str
+    name: str
+    description: str
+    keywords: List[str] = []    ## extra terms for the local router, any language
+
+class NoAgentProfile(BaseModel):
+    """
+    What queries needing no agent look like, for the local router.
+    """
+    description: str
+    keywords: List[str] = []
+
+class RoutingExample(BaseModel):
+    query: str
+    selected_agents: List[str]
+
+class AgentRegistryConfig(BaseModel):
+    agents: List[AgentProfile]
+    examples: List[RoutingExample] = []
+    no_agent: Optional[NoAgentProfile] = None
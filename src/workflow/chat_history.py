@@ -0,0 +1,35 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Tuple
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+
+MESSAGE_TYPES = {"human": HumanMessage, "ai": AIMessage, "system": SystemMessage}
+
+
+@dataclass(frozen=True, slots=True)
+class ChatRecord:
+    """
+    One chat turn as carried in the graph state, immutable so the same records are shared by every node.
+    """
+    role: str
+    content: str
+
+    def to_message(self) -> BaseMessage:
+        return MESSAGE_TYPES[self.role](content=self.content)
+
+    def to_dict(self) -> Dict[str, str]:
+        return {"role": self.role, "content": self.content}
+
+
+ChatHistory = Tuple[ChatRecord, ...]
+
+
+def normalize_history(chat_history: Iterable[Dict[str, Any]]) -> ChatHistory:
+    """
+    Accepts both {"role", "content"} and legacy {"type", "text"} messages, anything but human and ai turns is dropped.
+    """
+    records = []
+    for message in chat_history or ():
+        role = message.get("role") or message.get("type")
+        if role in ("human", "ai"):
+            records.append(ChatRecord(role, message.get("content") or message.get("text") or ""))
+    return tuple(records)
@@ -2,17 +2,41 @@ from src.workflow.state import State
 from src.dependencies.container import Container
 from langgraph.graph import StateGraph, END, START
 from src.workflow.agents.supervisor.supervisor_agent import Supervisor
-from src.api.modules.interactions.interactions_models import WorkerState
 from src.workflow.orchestrator.orchestrator import Orchestrator
+from src.workflow.orchestrator.deadline import Deadline
+from src.utils.tracing.tracer import get_tracer
+from src.utils.logs.logger import Logger
+from src.utils.metrics.metrics import REGISTRY
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from typing import Optional
+import asyncio
+import logging
 
-def create_graph(worker_state: WorkerState):
+GRAPH_RUNS_IN_FLIGHT = REGISTRY.gauge("graph_runs_in_flight", "Interactions currently running through the graph")
+GRAPH_RUNS_IN_FLIGHT.set(0)
+
+def create_graph(checkpointer: Optional[BaseCheckpointSaver] = None):
     graph = StateGraph(State)
  
     async def supervisor(state: State):
         supervisor: Supervisor = Container.resolve("supervisor")
 
-        response = await supervisor.interact(state=state)
-        print(response, "selcted agents::::::")
+        with get_tracer().start_span("graph.supervisor") as span:
+            try:
+                response = await asyncio.wait_for(
+                    supervisor.interact(state=state),
+                    timeout=Deadline.from_state(state).remaining()
+                )
+            except asyncio.TimeoutError:
+                ## out of time before routing, the orchestrator reports no agents
+                span.set_attribute("deadline_exceeded", True)
+                return {"selected_agents": []}
+        Logger.log(
+            message="Supervisor selected agents",
+            level=logging.DEBUG,
+            name="graph.supervisor",
+            fields={"selected_agents": response.selected_agents}
+        )
 
         return {"selected_agents": response.selected_agents}
 
@@ -20,7 +44,8 @@ def create_graph(worker_state: WorkerState):
     async def orchestrator(state: State):
         orchestrator: Orchestrator = Container.resolve("orchestrator")
 
-        await orchestrator.orchestrate(state=state, worker_state=worker_state)
+        with get_tracer().start_span("graph.orchestrator", attributes={"agents": len(state["selected_agents"])}):
+            await orchestrator.orchestrate(state=state, worker_state=state["worker_state"])
 
         return state        
 
@@ -33,4 +58,11 @@ def create_graph(worker_state: WorkerState):
     graph.add_edge("orchestrator", END)
 
     
-    return graph.compile()
\ No newline at end of file
+    return graph.compile(checkpointer=checkpointer)
+
+
+def get_run_config(thread_id: str) -> dict:
+    """
+    Runs of a checkpointed graph are stored under their thread id, the interaction or job id.
+    """
+    return {"configurable": {"thread_id": thread_id}}
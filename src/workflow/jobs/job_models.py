@@ -0,0 +1,22 @@
+import time
+from uuid import uuid4
+from typing import Optional
+from pydantic import BaseModel, Field
+from src.api.modules.interactions.interactions_models import WorkerState
+from src.workflow.state import State, create_state
+
+
+class InteractionJob(BaseModel):
+    job_id: str = Field(default_factory=lambda: uuid4().hex)
+    priority: int = 1
+    enqueued_at: float = Field(default_factory=time.time)
+    deadline: float
+    attempts: int = 0
+    worker_state: WorkerState
+    ## trace context of the request that admitted the job
+    traceparent: Optional[str] = None
+    ## in-flight slot taken by the API node at admission, released by the worker
+    slot_id: Optional[str] = None
+
+    def to_state(self) -> State:
+        return create_state(self.worker_state, self.deadline)
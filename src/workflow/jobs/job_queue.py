@@ -0,0 +1,243 @@
+import asyncio
+import itertools
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+from src.api.core.services.redis_service import RedisService
+from src.workflow.jobs.job_models import InteractionJob
+from src.workflow.orchestrator.deadline import Deadline
+
+## priorities sort before enqueue time, epoch seconds stay below this factor
+PRIORITY_FACTOR = 1e10
+
+## pops the next job and leases it in one step, a worker dying in between cannot lose the job
+DEQUEUE_SCRIPT = """
+local popped = redis.call('ZPOPMIN', KEYS[1])
+if #popped == 0 then
+    return nil
+end
+local job_id = popped[1]
+local payload = redis.call('HGET', KEYS[2], job_id)
+if not payload then
+    return {job_id, false}
+end
+redis.call('HSET', KEYS[3], job_id, ARGV[1])
+return {job_id, payload}
+"""
+
+## takes an expired lease over, only one pool gets the payload back and a renewed lease is left alone
+CLAIM_EXPIRED_SCRIPT = """
+local expires_at = redis.call('HGET', KEYS[1], ARGV[1])
+if not expires_at or tonumber(expires_at) > tonumber(ARGV[2]) then
+    return false
+end
+redis.call('HDEL', KEYS[1], ARGV[1])
+return redis.call('HGET', KEYS[2], ARGV[1])
+"""
+
+## renews a lease still held, a lease already recovered by another pool is not recreated
+RENEW_LEASE_SCRIPT = """
+if redis.call('HEXISTS', KEYS[1], ARGV[1]) == 0 then
+    return 0
+end
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+return 1
+"""
+
+
+class JobQueue(ABC):
+    """
+    Priority queue of interaction runs, lower priority values are served first.
+    Dequeued jobs are leased until acked; failed or expired leases go back to the queue until max_attempts.
+    """
+    def __init__(self, company_priorities: Optional[Dict[str, int]] = None, default_priority: int = 1, max_attempts: int = 3):
+        self.company_priorities = company_priorities or {}
+        self.default_priority = default_priority
+        self.max_attempts = max_attempts
+
+        self.enqueued = 0
+        self.requeued = 0
+        self.dropped = 0
+
+    def get_priority(self, company_id) -> int:
+        return self.company_priorities.get(str(company_id), self.default_priority)
+
+    @abstractmethod
+    async def enqueue(self, job: InteractionJob) -> None:
+        ...
+
+    @abstractmethod
+    async def dequeue(self, timeout: float = 1.0) -> Optional[InteractionJob]:
+        ...
+
+    @abstractmethod
+    async def ack(self, job: InteractionJob) -> None:
+        ...
+
+    async def renew(self, job: InteractionJob) -> bool:
+        """
+        Extends the lease of a running job, returns False once the lease was lost.
+        """
+        return True
+
+    async def fail(self, job: InteractionJob) -> bool:
+        """
+        Requeues a failed job, returns False once it ran out of attempts and was dropped.
+        """
+        await self.ack(job)
+        if job.attempts >= self.max_attempts:
+            self.dropped += 1
+            return False
+
+        await self._requeue(job)
+        return True
+
+    async def recover(self) -> int:
+        """
+        Requeues jobs whose lease expired because their worker died, returns how many.
+        """
+        return 0
+
+    @abstractmethod
+    async def depth(self) -> int:
+        ...
+
+    @abstractmethod
+    async def in_flight(self) -> int:
+        ...
+
+    async def _requeue(self, job: InteractionJob) -> None:
+        ## the user is still waiting, give the retry a fresh budget
+        job.deadline = Deadline.after().expires_at
+        self.requeued += 1
+        await self._push(job)
+
+    @abstractmethod
+    async def _push(self, job: InteractionJob) -> None:
+        ...
+
+    @staticmethod
+    def get_score(job: InteractionJob) -> float:
+        return job.priority * PRIORITY_FACTOR + job.enqueued_at
+
+
+class InMemoryJobQueue(JobQueue):
+    """
+    Process-local queue for tests and single-node deployments, jobs do not survive a restart.
+    """
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.__queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self.__sequence = itertools.count()
+        self.__leased: Dict[str, InteractionJob] = {}
+
+    async def enqueue(self, job: InteractionJob) -> None:
+        self.enqueued += 1
+        await self._push(job)
+
+    async def dequeue(self, timeout: float = 1.0) -> Optional[InteractionJob]:
+        try:
+            _, _, job = await asyncio.wait_for(self.__queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+        job.attempts += 1
+        self.__leased[job.job_id] = job
+        return job
+
+    async def ack(self, job: InteractionJob) -> None:
+        self.__leased.pop(job.job_id, None)
+
+    async def depth(self) -> int:
+        return self.__queue.qsize()
+
+    async def in_flight(self) -> int:
+        return len(self.__leased)
+
+    async def _push(self, job: InteractionJob) -> None:
+        self.__queue.put_nowait((self.get_score(job), next(self.__sequence), job))
+
+
+class RedisJobQueue(JobQueue):
+    """
+    Durable queue shared by API nodes and worker pools.
+    Job ids wait in a sorted set scored by priority then enqueue time, payloads and leases live in hashes.
+    Scripts cannot block, so dequeue polls the sorted set every poll_interval until its timeout.
+    """
+    def __init__(
+        self,
+        redis_service: RedisService,
+        name: str = "interactions",
+        lease_seconds: float = 120,
+        poll_interval: float = 0.05,
+        **kwargs
+    ):
+        super().__init__(**kwargs)
+        self.__redis = redis_service.redis
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.queue_key = f"jobs:{name}:queue"
+        self.payloads_key = f"jobs:{name}:payloads"
+        self.leases_key = f"jobs:{name}:leases"
+
+    async def enqueue(self, job: InteractionJob) -> None:
+        self.enqueued += 1
+        await self._push(job)
+
+    async def dequeue(self, timeout: float = 1.0) -> Optional[InteractionJob]:
+        deadline = time.monotonic() + timeout
+        while True:
+            popped = await self.__redis.eval(
+                DEQUEUE_SCRIPT, 3, self.queue_key, self.payloads_key, self.leases_key, time.time() + self.lease_seconds
+            )
+            if popped is not None:
+                job_id, payload = popped
+                ## acked while still queued, nothing to run
+                if payload is None:
+                    continue
+
+                job = InteractionJob.model_validate_json(payload)
+                job.attempts += 1
+                await self.__redis.hset(self.payloads_key, job_id, job.model_dump_json())
+                return job
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            await asyncio.sleep(min(self.poll_interval, remaining))
+
+    async def ack(self, job: InteractionJob) -> None:
+        await self.__redis.hdel(self.leases_key, job.job_id)
+        await self.__redis.hdel(self.payloads_key, job.job_id)
+
+    async def renew(self, job: InteractionJob) -> bool:
+        renewed = await self.__redis.eval(
+            RENEW_LEASE_SCRIPT, 1, self.leases_key, job.job_id, time.time() + self.lease_seconds
+        )
+        return bool(int(renewed))
+
+    async def recover(self) -> int:
+        now = time.time()
+        leases = await self.__redis.hgetall(self.leases_key)
+        expired: List[bytes] = [job_id for job_id, expires_at in leases.items() if float(expires_at) <= now]
+
+        recovered = 0
+        for job_id in expired:
+            payload = await self.__redis.eval(CLAIM_EXPIRED_SCRIPT, 2, self.leases_key, self.payloads_key, job_id, now)
+            if payload is None:
+                continue
+
+            job = InteractionJob.model_validate_json(payload)
+            if await self.fail(job):
+                recovered += 1
+        return recovered
+
+    async def depth(self) -> int:
+        return await self.__redis.zcard(self.queue_key)
+
+    async def in_flight(self) -> int:
+        return await self.__redis.hlen(self.leases_key)
+
+    async def _push(self, job: InteractionJob) -> None:
+        await self.__redis.hset(self.payloads_key, job.job_id, job.model_dump_json())
+        await self.__redis.zadd(self.queue_key, {job.job_id: self.get_score(job)})
@@ -0,0 +1,69 @@
+"""
+Worker pool process for queued interactions, scaled independently from the API.
+Run with: python -m src.workflow.jobs.worker
+
+Needs JOB_QUEUE_ENABLED=true with the redis backend, and WEBSOCKET_CLUSTER_MODE=true so
+responses reach the API node holding the chat socket.
+"""
+from dotenv import load_dotenv
+load_dotenv()
+import os
+import asyncio
+import signal
+from src.dependencies.configure_container import configure_container
+from src.dependencies.container import Container
+from src.utils.logs.structured_logging import configure_logging, shutdown_logging
+from src.api.core.services.http_client_service import HttpClientService
+from src.api.modules.websocket.websocket_service import WebsocketService
+from src.workflow.services.message_sink_service import MessageSinkService
+from src.workflow.services.agent_registry_service import AgentRegistryService
+from src.workflow.services.llm_service import LlmService
+from src.workflow.services.token_counter import TokenCounter
+from src.workflow.jobs.worker_pool import WorkerPool
+
+
+async def main():
+    configure_logging()
+    configure_container()
+    job_queue = Container.resolve("job_queue")
+    if job_queue is None:
+        raise RuntimeError("JOB_QUEUE_ENABLED must be true to run the worker pool")
+
+    websocket_service: WebsocketService = Container.resolve("websocket_service")
+    message_sink_service: MessageSinkService = Container.resolve("message_sink_service")
+    worker_pool = WorkerPool(
+        job_queue=job_queue,
+        graph=Container.resolve("graph"),
+        rate_limiter_service=Container.resolve("rate_limiter_service"),
+        message_sink_service=message_sink_service
+    )
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+
+    agent_registry_service: AgentRegistryService = Container.resolve("agent_registry_service")
+    await agent_registry_service.start()
+    llm_service: LlmService = Container.resolve("llm_service")
+    if os.getenv("LLM_WARMUP_ENABLED", "true").lower() == "true":
+        await llm_service.warmup()
+    token_counter: TokenCounter = Container.resolve("token_counter")
+    await token_counter.warmup()
+    await websocket_service.start()
+    await message_sink_service.start()
+    await worker_pool.start()
+    await stop.wait()
+
+    await worker_pool.stop()
+    await websocket_service.stop()
+    await agent_registry_service.aclose()
+    await message_sink_service.aclose()
+    http_client_service: HttpClientService = Container.resolve("http_client_service")
+    await http_client_service.aclose()
+    await llm_service.aclose()
+    shutdown_logging()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
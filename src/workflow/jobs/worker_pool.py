@@ -0,0 +1,185 @@
+import os
+import time
+import asyncio
+import logging
+from typing import List, Optional
+from src.utils.logs.logger import Logger
+from src.utils.logs.structured_logging import log_context
+from src.utils.tracing.tracer import SpanContext, get_tracer
+from src.api.core.services.rate_limiter_service import RateLimiterService
+from src.workflow.services.message_sink_service import MessageSinkService
+from src.workflow.jobs.job_queue import JobQueue
+from src.workflow.jobs.job_models import InteractionJob
+from src.workflow.orchestrator.worker_client import LatencyTracker
+from src.workflow.graph import get_run_config, GRAPH_RUNS_IN_FLIGHT
+
+
+class WorkerPool:
+    """
+    Runs queued interactions through the graph with a bounded number of concurrent runs.
+    """
+    __MODULE = "jobs.worker_pool"
+
+    def __init__(
+        self,
+        job_queue: JobQueue,
+        graph,
+        concurrency: Optional[int] = None,
+        recover_interval: Optional[float] = None,
+        heartbeat_interval: Optional[float] = None,
+        retry_backoff: float = 0.5,
+        max_retry_backoff: float = 30.0,
+        rate_limiter_service: Optional[RateLimiterService] = None,
+        message_sink_service: Optional[MessageSinkService] = None
+    ):
+        self.__job_queue = job_queue
+        self.__message_sink_service = message_sink_service
+        self.__graph = graph
+        self.__rate_limiter_service = rate_limiter_service
+        self.concurrency = concurrency or int(os.getenv("JOB_WORKER_CONCURRENCY", 8))
+        self.recover_interval = recover_interval or float(os.getenv("JOB_RECOVER_INTERVAL_SECONDS", 30))
+        ## well under JOB_LEASE_SECONDS, a running job must never look expired to another pool
+        self.heartbeat_interval = heartbeat_interval or float(os.getenv("JOB_HEARTBEAT_SECONDS", 30))
+        self.retry_backoff = retry_backoff
+        self.max_retry_backoff = max_retry_backoff
+
+        self.__tasks: List[asyncio.Task] = []
+        self.__recover_task: Optional[asyncio.Task] = None
+        self.__stopping = False
+        self.__queue_wait = LatencyTracker()
+        self.__run_time = LatencyTracker()
+
+        self.running = 0
+        self.processed = 0
+        self.failed = 0
+        self.consumer_errors = 0
+
+    async def start(self) -> None:
+        if self.__tasks:
+            return
+
+        self.__stopping = False
+        self.__tasks = [asyncio.create_task(self.__consume()) for _ in range(self.concurrency)]
+        self.__recover_task = asyncio.create_task(self.__recover())
+
+    async def stop(self, timeout: float = 30.0) -> None:
+        """
+        Stops taking jobs and lets running ones finish, unfinished leases are recovered by another pool.
+        """
+        self.__stopping = True
+        if self.__recover_task is not None:
+            self.__recover_task.cancel()
+            await asyncio.gather(self.__recover_task, return_exceptions=True)
+            self.__recover_task = None
+
+        _, pending = await asyncio.wait(self.__tasks, timeout=timeout) if self.__tasks else (set(), set())
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        self.__tasks = []
+
+    async def stats(self) -> dict:
+        return {
+            "concurrency": self.concurrency,
+            "running": self.running,
+            "processed": self.processed,
+            "failed": self.failed,
+            "consumer_errors": self.consumer_errors,
+            "queue_depth": await self.__job_queue.depth(),
+            "queue_wait_p50": self.__queue_wait.percentile(0.5),
+            "queue_wait_p95": self.__queue_wait.percentile(0.95),
+            "run_time_p50": self.__run_time.percentile(0.5),
+            "run_time_p95": self.__run_time.percentile(0.95)
+        }
+
+    async def __consume(self) -> None:
+        errors = 0
+        while not self.__stopping:
+            try:
+                job = await self.__job_queue.dequeue(timeout=1.0)
+                if job is not None:
+                    await self.__run(job)
+                errors = 0
+            except Exception as exc:
+                ## a broken queue connection must not end the consumer, back off until it comes back
+                errors += 1
+                self.consumer_errors += 1
+                Logger.log(message=f"Job consumer failed: {exc!r}", level=logging.ERROR, name=self.__MODULE)
+                await asyncio.sleep(min(self.max_retry_backoff, self.retry_backoff * 2 ** (errors - 1)))
+
+    async def __run(self, job: InteractionJob) -> None:
+        self.__queue_wait.record(time.time() - job.enqueued_at)
+        self.running += 1
+        GRAPH_RUNS_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            ## continues the trace of the request that queued the job
+            with log_context(chat_id=job.worker_state.chat_id, company_id=job.worker_state.company_id), get_tracer().start_span(
+                "interaction.job",
+                attributes={"job_id": job.job_id, "attempt": job.attempts},
+                parent=SpanContext.from_traceparent(job.traceparent)
+            ):
+                heartbeat = asyncio.create_task(self.__heartbeat(job))
+                try:
+                    await self.__invoke(job)
+                    ## an acked job is never run again, its messages must reach the main server first
+                    if self.__message_sink_service is not None and not await self.__message_sink_service.flush(job.worker_state.chat_id):
+                        raise RuntimeError("Messages of the interaction were not persisted")
+                finally:
+                    heartbeat.cancel()
+                    await asyncio.gather(heartbeat, return_exceptions=True)
+            await self.__job_queue.ack(job)
+            self.processed += 1
+            await self.__release_slot(job)
+        except Exception as exc:
+            self.failed += 1
+            Logger.log(
+                message=f"Interaction job {job.job_id} failed on attempt {job.attempts}: {exc!r}",
+                level=logging.ERROR,
+                name=self.__MODULE
+            )
+            if not await self.__job_queue.fail(job):
+                await self.__release_slot(job)
+        finally:
+            self.running -= 1
+            GRAPH_RUNS_IN_FLIGHT.dec()
+            self.__run_time.record(time.perf_counter() - started)
+
+    async def __invoke(self, job: InteractionJob) -> None:
+        checkpointer = getattr(self.__graph, "checkpointer", None)
+        if not checkpointer:
+            await self.__graph.ainvoke(job.to_state())
+            return
+
+        config = get_run_config(job.job_id)
+        snapshot = await self.__graph.aget_state(config) if job.attempts > 1 else None
+        if snapshot is not None and snapshot.next:
+            ## a retry continues after the last completed node, within the deadline of this attempt
+            await self.__graph.aupdate_state(config, {"deadline": job.deadline})
+            await self.__graph.ainvoke(None, config)
+        else:
+            await self.__graph.ainvoke(job.to_state(), config)
+        await checkpointer.adelete_thread(job.job_id)
+
+    async def __release_slot(self, job: InteractionJob) -> None:
+        ## the slot was taken by the API node that admitted the interaction
+        if self.__rate_limiter_service is not None:
+            await self.__rate_limiter_service.release_slot(job.slot_id)
+
+    async def __heartbeat(self, job: InteractionJob) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                if not await self.__job_queue.renew(job):
+                    Logger.log(message=f"Lease of job {job.job_id} was lost", level=logging.WARNING, name=self.__MODULE)
+                    return
+            except Exception as exc:
+                Logger.log(message=f"Lease renewal of job {job.job_id} failed: {exc!r}", level=logging.WARNING, name=self.__MODULE)
+
+    async def __recover(self) -> None:
+        while not self.__stopping:
+            try:
+                await self.__job_queue.recover()
+            except Exception as exc:
+                Logger.log(message=f"Job recovery failed: {exc!r}", level=logging.WARNING, name=self.__MODULE)
+            await asyncio.sleep(self.recover_interval)
@@ -0,0 +1,83 @@
+import time
+from typing import Callable, Dict, Union
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Opens after consecutive failures so calls to an unhealthy agent fail fast.
+    After the recovery timeout a limited number of probe calls decide whether it closes again.
+    """
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 10.0,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.__clock = clock
+
+        self.__state = CLOSED
+        self.__opened_at = 0.0
+        self.__probes = 0
+        self.failures = 0
+        self.opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        if self.__state == OPEN and self.__clock() - self.__opened_at >= self.recovery_timeout:
+            self.__state = HALF_OPEN
+            self.__probes = 0
+        return self.__state
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == CLOSED:
+            return True
+
+        if state == HALF_OPEN and self.__probes < self.half_open_max_calls:
+            self.__probes += 1
+            return True
+
+        self.rejected += 1
+        return False
+
+    def release(self) -> None:
+        """
+        Returns an admitted probe that never reached the agent.
+        """
+        if self.__state == HALF_OPEN and self.__probes > 0:
+            self.__probes -= 1
+
+    def record_success(self) -> None:
+        ## a slow call admitted before the breaker opened must not close it, only probes do
+        if self.state == OPEN:
+            return
+        self.failures = 0
+        self.__state = CLOSED
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.__state == HALF_OPEN or self.failures >= self.failure_threshold:
+            self.__open()
+
+    def stats(self) -> Dict[str, Union[str, int]]:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "opened": self.opened,
+            "rejected": self.rejected
+        }
+
+    def __open(self) -> None:
+        if self.__state != OPEN:
+            self.opened += 1
+        self.__state = OPEN
+        self.__opened_at = self.__clock()
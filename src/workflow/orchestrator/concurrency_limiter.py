@@ -0,0 +1,79 @@
+from typing import Dict, Optional, Union
+
+
+class AimdLimiter:
+    """
+    Adaptive in-flight limit for one agent.
+    Grows by about one slot per round trip while calls succeed, and is cut multiplicatively on failures
+    or when recent latency grows past latency_tolerance times the agent's own long-term baseline.
+    Slow but steady agents are not penalised, only agents getting slower than they usually are.
+    """
+    def __init__(
+        self,
+        initial_limit: float = 20,
+        min_limit: float = 1,
+        max_limit: float = 200,
+        backoff_ratio: float = 0.5,
+        latency_tolerance: float = 2.0,
+        min_samples: int = 20,
+        short_smoothing: float = 0.2,
+        long_smoothing: float = 0.02
+    ):
+        self.limit = float(initial_limit)
+        self.min_limit = float(min_limit)
+        self.max_limit = float(max_limit)
+        self.backoff_ratio = backoff_ratio
+        self.latency_tolerance = latency_tolerance
+        self.min_samples = min_samples
+        self.short_smoothing = short_smoothing
+        self.long_smoothing = long_smoothing
+
+        self.short_latency: Optional[float] = None
+        self.baseline_latency: Optional[float] = None
+        self.samples = 0
+        self.in_flight = 0
+        self.rejected = 0
+
+    def try_acquire(self) -> bool:
+        if self.in_flight >= int(self.limit):
+            self.rejected += 1
+            return False
+
+        self.in_flight += 1
+        return True
+
+    def release(self, success: bool, latency: Optional[float] = None) -> None:
+        """
+        latency is the time to the response headers, None when the call failed before them.
+        """
+        self.in_flight = max(0, self.in_flight - 1)
+
+        if success and not self.__record(latency):
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        else:
+            self.limit = max(self.min_limit, self.limit * self.backoff_ratio)
+
+    def stats(self) -> Dict[str, Union[int, float, None]]:
+        return {
+            "limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "rejected": self.rejected,
+            "latency": self.short_latency,
+            "baseline_latency": self.baseline_latency
+        }
+
+    def __record(self, latency: Optional[float]) -> bool:
+        """
+        Updates both averages, True when the recent latency is congested relative to the baseline.
+        """
+        if latency is None:
+            return False
+
+        self.samples += 1
+        if self.baseline_latency is None:
+            self.short_latency = self.baseline_latency = latency
+            return False
+
+        self.short_latency += self.short_smoothing * (latency - self.short_latency)
+        self.baseline_latency += self.long_smoothing * (latency - self.baseline_latency)
+        return self.samples >= self.min_samples and self.short_latency > self.baseline_latency * self.latency_tolerance
@@ -0,0 +1,38 @@
+import os
+import time
+from typing import Dict, Optional
+
+DEADLINE_HEADER = "X-Request-Timeout-Ms"
+
+
+class Deadline:
+    """
+    Absolute point in time by which an interaction must be answered.
+    Stored as a wall clock timestamp so it survives being carried in the graph state.
+    """
+    def __init__(self, expires_at: float):
+        self.expires_at = expires_at
+
+    @classmethod
+    def after(cls, seconds: Optional[float] = None) -> "Deadline":
+        if seconds is None:
+            seconds = float(os.getenv("INTERACTION_DEADLINE_SECONDS", 30))
+        return cls(time.time() + seconds)
+
+    @classmethod
+    def from_state(cls, state: dict) -> "Deadline":
+        expires_at = state.get("deadline")
+        return cls(expires_at) if expires_at else cls.after()
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.time())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() == 0.0
+
+    def headers(self) -> Dict[str, str]:
+        """
+        Remaining budget for the callee, relative so it does not depend on synchronised clocks.
+        """
+        return {DEADLINE_HEADER: str(int(self.remaining() * 1000))}
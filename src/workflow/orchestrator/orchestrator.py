@@ -1,63 +1,112 @@
 from src.api.modules.websocket.websocket_service import WebsocketService
+from src.api.core.services.http_client_service import HttpClientService
+from src.workflow.services.message_sink_service import MessageSinkService
+from src.api.core.services.chat_context_cache_service import ChatContextCacheService
 from src.utils.http.get_hmac_header import generate_hmac_headers
+from src.utils.http.sse import iter_sse_tokens
+from src.utils.logs.logger import Logger
+from src.utils.tracing.tracer import get_tracer
+from src.utils.metrics.metrics import REGISTRY
 from src.workflow.state import State
-from fastapi import WebSocket, WebSocketDisconnect
+from src.workflow.orchestrator.deadline import Deadline
+from src.workflow.orchestrator.worker_client import AgentResponseError, WorkerClient
+from src.workflow.orchestrator.payload_codec import WorkerPayload
 from src.api.modules.interactions.interactions_models import WorkerState
-import httpx
+from typing import Dict, Optional
 import os
 import asyncio
+import logging
+import time
 from uuid import UUID
 
+WORKER_SECONDS = REGISTRY.histogram(
+    "worker_agent_request_seconds",
+    "Duration of worker agent interactions, by agent and outcome",
+    ["agent_id", "outcome"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+)
+
 class Orchestrator:
-    def __init__(self, websocket_service: WebsocketService):
+    __MODULE = "orchestrator"
+
+    def __init__(
+        self,
+        websocket_service: WebsocketService,
+        http_client_service: HttpClientService,
+        message_sink_service: MessageSinkService,
+        chat_context_cache_service: Optional[ChatContextCacheService] = None
+    ):
         self.__websocket_service = websocket_service
+        self.__message_sink_service = message_sink_service
+        self.__chat_context_cache_service = chat_context_cache_service
+        self.__worker_client = WorkerClient(http_client_service)
+        self.__streaming_enabled = os.getenv("WORKER_STREAMING", "false").lower() == "true"
 
     
-    async def __handle_agent_interaction(self, agent_id: str, state: State, worker_state: WorkerState, websocket: WebSocket):
-        hmac_secret = os.getenv("HMAC_SECRET")
-        worker_host = os.getenv("WORKER_HOST")
-        
-        agent_endpoint = f"{agent_id}{worker_host}"
-        worker_headers = generate_hmac_headers(hmac_secret)
-        payload = worker_state.model_dump(mode="json")  
+    async def __handle_agent_interaction(self, agent_id: str, state: State, payload: WorkerPayload, deadline: Optional[Deadline] = None):
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            with get_tracer().start_span("orchestrator.agent", kind="client", attributes={"agent_id": agent_id, "streaming": self.__streaming_enabled}):
+                response = await self.__interact_with_agent(agent_id, state, payload, deadline)
+            outcome = "ok"
+            return response
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        finally:
+            WORKER_SECONDS.labels(agent_id, outcome).observe(time.perf_counter() - started)
+
+    async def __interact_with_agent(self, agent_id: str, state: State, payload: WorkerPayload, deadline: Optional[Deadline] = None):
+        deadline = deadline or Deadline.from_state(state)
+        ## workers continue the trace of this call
+        worker_headers = get_tracer().inject(generate_hmac_headers(os.getenv("HMAC_SECRET")))
 
         ## interacts with the worker agent
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"https://{agent_endpoint}/interactions/internal/interact",
+        if self.__streaming_enabled:
+            final_response = await self.__stream_agent_response(
+                agent_id=agent_id,
+                headers=worker_headers,
+                payload=payload,
+                chat_id=state["chat_id"],
+                deadline=deadline
+            )
+        else:
+            response = await self.__worker_client.post(
+                agent_id=agent_id,
                 headers=worker_headers,
-                json=payload,
-                timeout=30.0
+                payload=payload,
+                deadline=deadline
             )
+            if not response.is_success:
+                raise AgentResponseError(agent_id, response.status_code)
             agent_response = response.json()
             final_response = agent_response.get("response", None)
 
         ## sends response to frontend
-        if websocket is not None:
-            try:
-                await websocket.send_json({
-                    "agent_id": agent_id,
-                    "response": final_response
-                })
-            except (WebSocketDisconnect, RuntimeError):
-                pass
+        await self.__websocket_service.send_json(state["chat_id"], {
+            "agent_id": agent_id,
+            "response": final_response
+        })
     
         
         # only save message if response present
         if final_response:
-            await self.__save_message(
-                secret=hmac_secret,
+            self.__message_sink_service.enqueue(
                 chat_id=state["chat_id"],
                 sender=agent_id,
                 message_type="ai",
                 text=final_response
             )
 
-    async def orchestrate(self, state: State, worker_state: WorkerState):
-        websocket: WebSocket = self.__websocket_service.get_connection(state["chat_id"]) 
+        return final_response
 
-        await self.__save_message(
-            secret=os.getenv("HMAC_SECRET"),
+    def stats(self) -> Dict[str, dict]:
+        return self.__worker_client.stats()
+
+    async def orchestrate(self, state: State, worker_state: WorkerState):
+        ## persisted in the background, the main server receives it in the next batch
+        self.__message_sink_service.enqueue(
             chat_id=state["chat_id"],
             sender=worker_state.user_id,
             message_type="human",
@@ -72,43 +121,91 @@ class Orchestrator:
         ]
 
         ## send frontend list of agents responding
-        if websocket is not None:
-            try:
-                await websocket.send_json({
-                    "agents": selected_agent_ids
-                })
-            except (WebSocketDisconnect, RuntimeError):
-                pass
+        await self.__websocket_service.send_json(state["chat_id"], {
+            "agents": selected_agent_ids
+        })
         
 
-        ## send responses to front end
-        await asyncio.gather(
-            *(
+        ## serialised once, every agent of the fan-out is sent the same bytes
+        payload = WorkerPayload(worker_state.model_dump(mode="json"))
+
+        ## each agent answers as soon as it is done, stragglers are cancelled at the deadline
+        deadline = Deadline.from_state(state)
+        tasks: Dict[asyncio.Task, str] = {
+            asyncio.create_task(
                 self.__handle_agent_interaction(
                     agent_id=agent_id,
                     state=state,
-                    worker_state=worker_state,
-                    websocket=websocket
-                ) for agent_id in selected_agent_ids
-            )
-        )
+                    payload=payload,
+                    deadline=deadline
+                )
+            ): agent_id
+            for agent_id in selected_agent_ids
+        }
+
+        if tasks:
+            done, pending = await asyncio.wait(tasks, timeout=deadline.remaining())
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+            for task, agent_id in tasks.items():
+                if task in pending:
+                    await self.__send_agent_error(state["chat_id"], agent_id, "deadline_exceeded")
+                elif task.exception() is not None:
+                    Logger.log(
+                        message=f"Agent {agent_id} failed: {task.exception()!r}",
+                        level=logging.WARNING,
+                        name=self.__MODULE
+                    )
+                    if isinstance(task.exception(), AgentResponseError):
+                        await self.__send_agent_error(state["chat_id"], agent_id, "agent_error", task.exception().status_code)
+                    else:
+                        await self.__send_agent_error(state["chat_id"], agent_id, "agent_unavailable")
+
+        if self.__chat_context_cache_service is not None:
+            ## same shape as the history the main server returns, so a cached history is never mixed
+            await self.__chat_context_cache_service.append_turn(state["chat_id"], [
+                {"type": "human", "text": state["input"]},
+                *(
+                    {"type": "ai", "text": task.result()}
+                    for task in tasks
+                    if task not in pending and task.exception() is None and task.result()
+                )
+            ])
 
         return state   
+
+    async def __send_agent_error(self, chat_id: UUID, agent_id: str, error: str, status: Optional[int] = None):
+        message = {
+            "agent_id": agent_id,
+            "response": None,
+            "error": error
+        }
+        if status is not None:
+            message["status"] = status
+        await self.__websocket_service.send_json(chat_id, message)
     
-    @staticmethod
-    async def __save_message(secret: str, chat_id: UUID, sender: UUID, message_type: str, text: str):
-        main_server_endpoint = os.getenv("MAIN_SERVER_ENDPOINT")
-        main_server_headers = generate_hmac_headers(secret)
-        
-        async with httpx.AsyncClient() as client:
-            await client.post(
-                f"https://{main_server_endpoint}/messages/internal/{chat_id}",
-                headers=main_server_headers,
-                json={
-                    "sender": str(sender),
-                    "message_type": message_type,
-                    "text": text
-                }
-            )
+    async def __stream_agent_response(self, agent_id: str, headers: dict, payload: WorkerPayload, chat_id: UUID, deadline: Deadline):
+        """
+        Forwards worker tokens to the frontend as they arrive.
+        Falls back to the blocking JSON response when the worker does not stream.
+        """
+        stream_headers = {**headers, "Accept": "text/event-stream, application/json"}
+
+        async with self.__worker_client.stream(agent_id, headers=stream_headers, payload=payload, deadline=deadline) as response:
+            if not response.is_success:
+                raise AgentResponseError(agent_id, response.status_code)
+            if not response.headers.get("content-type", "").startswith("text/event-stream"):
+                await response.aread()
+                return response.json().get("response", None)
+
+            tokens = []
+            async for token in iter_sse_tokens(response):
+                tokens.append(token)
+                await self.__websocket_service.send_json(chat_id, {
+                    "agent_id": agent_id,
+                    "token": token
+                })
 
-    
\ No newline at end of file
+        return "".join(tokens) or None
@@ -0,0 +1,111 @@
+import gzip
+import json
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+## optional speedups, installed with langgraph and langsmith, the stdlib json and gzip are used without them
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ormsgpack
+except ImportError:
+    ormsgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+GZIP = "gzip"
+ZSTD = "zstd"
+
+
+def encode_json(payload: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def encode_msgpack(payload: Any) -> bytes:
+    return ormsgpack.packb(payload)
+
+
+def compress_gzip(body: bytes) -> bytes:
+    return gzip.compress(body, compresslevel=5)
+
+
+def compress_zstd(body: bytes) -> bytes:
+    return zstandard.ZstdCompressor(level=3).compress(body)
+
+
+ENCODERS: Dict[str, Callable[[Any], bytes]] = {JSON: encode_json}
+if ormsgpack is not None:
+    ENCODERS[MSGPACK] = encode_msgpack
+
+COMPRESSORS: Dict[str, Callable[[bytes], bytes]] = {GZIP: compress_gzip}
+if zstandard is not None:
+    COMPRESSORS[ZSTD] = compress_zstd
+
+
+def decode_payload(body: bytes, media_type: str = JSON, content_encoding: Optional[str] = None) -> Any:
+    """
+    Reverse of WorkerPayload.encode, used by the fake worker and the tests.
+    """
+    if content_encoding == GZIP:
+        body = gzip.decompress(body)
+    elif content_encoding == ZSTD:
+        body = zstandard.ZstdDecompressor().decompressobj().decompress(body)
+    if media_type.startswith(MSGPACK):
+        return ormsgpack.unpackb(body)
+    return json.loads(body)
+
+
+def parse_header_list(value: Optional[str]) -> Tuple[str, ...]:
+    return tuple(item.split(";")[0].strip().lower() for item in (value or "").split(",") if item.strip())
+
+
+class WorkerPayload:
+    """
+    A worker request body built once per interaction and shared by every agent of the fan-out.
+    Each format and compression is encoded at most once, on first use.
+    """
+    __slots__ = ("payload", "__bodies")
+
+    def __init__(self, payload: Dict[str, Any]):
+        self.payload = payload
+        self.__bodies: Dict[Tuple[str, Optional[str]], bytes] = {}
+
+    def encode(self, media_type: str = JSON, content_encoding: Optional[str] = None) -> bytes:
+        key = (media_type, content_encoding)
+        body = self.__bodies.get(key)
+        if body is None:
+            if content_encoding is None:
+                body = ENCODERS[media_type](self.payload)
+            else:
+                body = COMPRESSORS[content_encoding](self.encode(media_type))
+            self.__bodies[key] = body
+        return body
+
+
+class PayloadNegotiation:
+    """
+    What one worker agent accepts, learned from the Accept-Post and Accept-Encoding headers of its responses.
+    Until the agent answers, requests are plain JSON, which every worker understands.
+    """
+    __slots__ = ("media_types", "content_encodings")
+
+    def __init__(self, media_types: Iterable[str] = (JSON,), content_encodings: Iterable[str] = ()):
+        self.media_types = tuple(media_types)
+        self.content_encodings = tuple(content_encodings)
+
+    def choose(self, formats: Iterable[str], compressions: Iterable[str]) -> Tuple[str, Optional[str]]:
+        media_type = next((media_type for media_type in formats if media_type in self.media_types and media_type in ENCODERS), JSON)
+        content_encoding = next(
+            (coding for coding in compressions if coding in self.content_encodings and coding in COMPRESSORS),
+            None
+        )
+        return media_type, content_encoding
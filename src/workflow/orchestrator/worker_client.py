@@ -0,0 +1,299 @@
+import os
+import asyncio
+import httpx
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Dict, Optional, Tuple, Union
+from src.api.core.services.http_client_service import HttpClientService
+from src.workflow.orchestrator.deadline import Deadline
+from src.workflow.orchestrator.circuit_breaker import CircuitBreaker
+from src.workflow.orchestrator.concurrency_limiter import AimdLimiter
+from src.workflow.orchestrator.payload_codec import JSON, MSGPACK, PayloadNegotiation, WorkerPayload, parse_header_list
+
+PAYLOAD_FORMATS = {"json": JSON, "msgpack": MSGPACK}
+
+
+class AgentUnavailableError(Exception):
+    """
+    Raised without calling the agent when its breaker is open or its concurrency limit is reached.
+    """
+    def __init__(self, agent_id: str, reason: str):
+        super().__init__(f"Agent {agent_id} unavailable: {reason}")
+        self.agent_id = agent_id
+        self.reason = reason
+
+
+class AgentResponseError(Exception):
+    """
+    Raised when the agent answered with a status other than 2xx.
+    """
+    def __init__(self, agent_id: str, status_code: int):
+        super().__init__(f"Agent {agent_id} answered {status_code}")
+        self.agent_id = agent_id
+        self.status_code = status_code
+
+
+class LatencyTracker:
+    """
+    Sliding window of successful call latencies for one agent.
+    """
+    def __init__(self, window: int = 200):
+        self.__samples: deque = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        self.__samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.__samples:
+            return None
+        ordered = sorted(self.__samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def __len__(self) -> int:
+        return len(self.__samples)
+
+
+class WorkerClient:
+    """
+    Calls worker agents within the interaction deadline.
+    With hedging enabled, a duplicate request goes to a replica once the primary is slower than the agent's p95.
+    Every agent has a circuit breaker, and optionally an AIMD concurrency limit, that shed calls while it is unhealthy.
+    Payloads are plain JSON until an agent advertises other formats (Accept-Post) or compressions (Accept-Encoding),
+    the preferred ones it accepts are then used. A 415 answer drops back to plain JSON.
+    """
+    def __init__(
+        self,
+        http_client_service: HttpClientService,
+        hedging_enabled: Optional[bool] = None,
+        hedge_percentile: Optional[float] = None,
+        hedge_min_samples: Optional[int] = None,
+        payload_formats: Optional[str] = None,
+        payload_compressions: Optional[str] = None,
+        compression_min_bytes: Optional[int] = None
+    ):
+        self.__http_client_service = http_client_service
+        self.hedging_enabled = hedging_enabled if hedging_enabled is not None else os.getenv("WORKER_HEDGING_ENABLED", "false").lower() == "true"
+        self.hedge_percentile = hedge_percentile or float(os.getenv("WORKER_HEDGE_PERCENTILE", 0.95))
+        self.hedge_min_samples = hedge_min_samples or int(os.getenv("WORKER_HEDGE_MIN_SAMPLES", 20))
+        self.__latencies: Dict[str, LatencyTracker] = {}
+        self.__breakers: Dict[str, CircuitBreaker] = {}
+        self.__limiters: Dict[str, AimdLimiter] = {}
+        self.__negotiations: Dict[str, PayloadNegotiation] = {}
+
+        ## preference order, only used with agents that advertise them
+        self.payload_formats = tuple(
+            PAYLOAD_FORMATS[name] for name in parse_header_list(payload_formats or os.getenv("WORKER_PAYLOAD_FORMATS", "json"))
+        )
+        self.payload_compressions = parse_header_list(
+            payload_compressions if payload_compressions is not None else os.getenv("WORKER_PAYLOAD_COMPRESSION", "zstd,gzip")
+        )
+        self.compression_min_bytes = compression_min_bytes if compression_min_bytes is not None else int(os.getenv("WORKER_PAYLOAD_COMPRESSION_MIN_BYTES", 1024))
+
+        self.breaker_enabled = os.getenv("WORKER_CIRCUIT_BREAKER_ENABLED", "true").lower() == "true"
+        self.limiter_enabled = os.getenv("WORKER_CONCURRENCY_LIMIT_ENABLED", "false").lower() == "true"
+
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.payload_bytes = 0
+        self.payload_fallbacks = 0
+
+    @staticmethod
+    def get_url(agent_id: str, worker_host: Optional[str] = None) -> str:
+        worker_host = worker_host or os.getenv("WORKER_HOST")
+        return f"https://{agent_id}{worker_host}/interactions/internal/interact"
+
+    def get_hedge_delay(self, agent_id: str) -> Optional[float]:
+        tracker = self.__latencies.get(agent_id)
+        if not self.hedging_enabled or tracker is None or len(tracker) < self.hedge_min_samples:
+            return None
+        return tracker.percentile(self.hedge_percentile)
+
+    async def post(self, agent_id: str, headers: dict, payload: Union[dict, WorkerPayload], deadline: Deadline) -> httpx.Response:
+        payload = payload if isinstance(payload, WorkerPayload) else WorkerPayload(payload)
+        async with self.__admit(agent_id) as outcome:
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            delay = self.get_hedge_delay(agent_id)
+
+            primary = asyncio.create_task(self.__post(agent_id, self.get_url(agent_id), headers, payload, deadline))
+            tasks = {primary}
+            try:
+                if delay is None or delay >= deadline.remaining():
+                    response = await primary
+                else:
+                    response = await self.__hedge(agent_id, primary, tasks, delay, headers, payload, deadline)
+            finally:
+                for task in tasks:
+                    task.cancel()
+                ## the losing attempt still holds a pooled connection until its cancellation lands
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+            outcome["success"] = response.status_code < 500
+            if outcome["success"]:
+                outcome["latency"] = loop.time() - started
+                self.__latencies.setdefault(agent_id, LatencyTracker()).record(outcome["latency"])
+            return response
+
+    @asynccontextmanager
+    async def stream(self, agent_id: str, headers: dict, payload: Union[dict, WorkerPayload], deadline: Deadline):
+        """
+        Streams are never hedged, a duplicate would forward every token twice.
+        """
+        payload = payload if isinstance(payload, WorkerPayload) else WorkerPayload(payload)
+        async with self.__admit(agent_id) as outcome:
+            started = asyncio.get_running_loop().time()
+            for _ in range(2):
+                content, content_headers = self.__encode(agent_id, payload)
+                async with self.__http_client_service.stream(
+                    "POST",
+                    self.get_url(agent_id),
+                    headers={**headers, **deadline.headers(), **content_headers},
+                    content=content,
+                    timeout=deadline.remaining()
+                ) as response:
+                    if self.__negotiate(agent_id, response, content_headers):
+                        continue
+                    ## the limiter sees the time to the headers, a long answer is not a slow agent
+                    outcome["latency"] = asyncio.get_running_loop().time() - started
+                    yield response
+                    outcome["success"] = response.status_code < 500
+                    return
+
+    def get_breaker(self, agent_id: str) -> CircuitBreaker:
+        breaker = self.__breakers.get(agent_id)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                failure_threshold=int(os.getenv("WORKER_BREAKER_FAILURE_THRESHOLD", 5)),
+                recovery_timeout=float(os.getenv("WORKER_BREAKER_RECOVERY_SECONDS", 10.0))
+            )
+            self.__breakers[agent_id] = breaker
+        return breaker
+
+    def get_limiter(self, agent_id: str) -> AimdLimiter:
+        limiter = self.__limiters.get(agent_id)
+        if limiter is None:
+            limiter = AimdLimiter(
+                initial_limit=float(os.getenv("WORKER_LIMIT_INITIAL", 50)),
+                min_limit=float(os.getenv("WORKER_LIMIT_MIN", 1)),
+                max_limit=float(os.getenv("WORKER_LIMIT_MAX", 200)),
+                latency_tolerance=float(os.getenv("WORKER_LIMIT_LATENCY_TOLERANCE", 2.0))
+            )
+            self.__limiters[agent_id] = limiter
+        return limiter
+
+    def stats(self) -> Dict[str, dict]:
+        agent_ids = set(self.__latencies) | set(self.__breakers) | set(self.__limiters)
+        return {
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "payload_bytes": self.payload_bytes,
+            "payload_fallbacks": self.payload_fallbacks,
+            "agents": {agent_id: self.__agent_stats(agent_id) for agent_id in agent_ids}
+        }
+
+    def __agent_stats(self, agent_id: str) -> dict:
+        tracker = self.__latencies.get(agent_id) or LatencyTracker()
+        breaker = self.__breakers.get(agent_id)
+        limiter = self.__limiters.get(agent_id)
+        return {
+            "samples": len(tracker),
+            "p50": tracker.percentile(0.5),
+            "p95": tracker.percentile(0.95),
+            "breaker": breaker.stats() if breaker else None,
+            "limiter": limiter.stats() if limiter else None
+        }
+
+    @asynccontextmanager
+    async def __admit(self, agent_id: str):
+        """
+        Sheds the call before it is sent when the agent is unhealthy, then feeds the outcome back.
+        Timeouts and cancellations at the deadline count as failures, the caller sets the latency of successful calls.
+        """
+        breaker = self.get_breaker(agent_id) if self.breaker_enabled else None
+        limiter = self.get_limiter(agent_id) if self.limiter_enabled else None
+
+        if breaker is not None and not breaker.allow():
+            raise AgentUnavailableError(agent_id, "circuit_open")
+
+        if limiter is not None and not limiter.try_acquire():
+            if breaker is not None:
+                breaker.release()
+            raise AgentUnavailableError(agent_id, "concurrency_limit")
+
+        outcome = {"success": False, "latency": None}
+        try:
+            yield outcome
+        finally:
+            if breaker is not None:
+                if outcome["success"]:
+                    breaker.record_success()
+                else:
+                    breaker.record_failure()
+            if limiter is not None:
+                limiter.release(outcome["success"], outcome["latency"])
+
+    async def __hedge(self, agent_id: str, primary: asyncio.Task, tasks: set, delay: float, headers: dict, payload: WorkerPayload, deadline: Deadline) -> httpx.Response:
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done:
+            return primary.result()
+
+        self.hedges += 1
+        hedge_url = self.get_url(agent_id, os.getenv("WORKER_HEDGE_HOST"))
+        hedge = asyncio.create_task(self.__post(agent_id, hedge_url, headers, payload, deadline))
+        tasks.add(hedge)
+
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is hedge:
+                        self.hedge_wins += 1
+                    return task.result()
+
+        ## both attempts failed, surface the primary error
+        return primary.result()
+
+    async def __post(self, agent_id: str, url: str, headers: dict, payload: WorkerPayload, deadline: Deadline) -> httpx.Response:
+        for _ in range(2):
+            content, content_headers = self.__encode(agent_id, payload)
+            response = await self.__http_client_service.post(
+                url,
+                headers={**headers, **deadline.headers(), **content_headers},
+                content=content,
+                timeout=deadline.remaining()
+            )
+            if not self.__negotiate(agent_id, response, content_headers):
+                return response
+        return response
+
+    def __encode(self, agent_id: str, payload: WorkerPayload) -> Tuple[bytes, Dict[str, str]]:
+        negotiation = self.__negotiations.get(agent_id) or PayloadNegotiation()
+        media_type, content_encoding = negotiation.choose(self.payload_formats, self.payload_compressions)
+        if content_encoding is not None and len(payload.encode(media_type)) < self.compression_min_bytes:
+            content_encoding = None
+
+        content = payload.encode(media_type, content_encoding)
+        self.payload_bytes += len(content)
+        headers = {"Content-Type": media_type}
+        if content_encoding is not None:
+            headers["Content-Encoding"] = content_encoding
+        return content, headers
+
+    def __negotiate(self, agent_id: str, response: httpx.Response, content_headers: Dict[str, str]) -> bool:
+        """
+        Learns what the agent accepts from its response. True when a negotiated payload was refused and must be resent as plain JSON.
+        """
+        if response.status_code == 415 and content_headers != {"Content-Type": JSON}:
+            self.payload_fallbacks += 1
+            self.__negotiations.pop(agent_id, None)
+            return True
+
+        accept_post = response.headers.get("accept-post")
+        accept_encoding = response.headers.get("accept-encoding")
+        if accept_post is not None or accept_encoding is not None:
+            self.__negotiations[agent_id] = PayloadNegotiation(
+                media_types=parse_header_list(accept_post) or (JSON,),
+                content_encodings=parse_header_list(accept_encoding)
+            )
+        return False
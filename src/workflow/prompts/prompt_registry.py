@@ -0,0 +1,114 @@
+import os
+import re
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+from langchain_core.prompts import (
+    ChatPromptTemplate,
+    HumanMessagePromptTemplate,
+    MessagesPlaceholder,
+    SystemMessagePromptTemplate
+)
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(__file__), "templates")
+HISTORY_VARIABLE = "chat_history"
+
+
+@dataclass
+class CompiledPrompt:
+    version: str
+    path: str
+    modified_at: int
+    template: ChatPromptTemplate
+
+
+class PromptRegistry:
+    """
+    Compiles each prompt template once and serves the compiled template to every request.
+    Templates are system messages stored as templates/<name>/<version>.txt, in the f-string format.
+    The highest version is used unless pinned with PROMPT_VERSIONS=name=version,...
+    With hot reload, changed or new template files are picked up without a restart.
+    """
+    def __init__(
+        self,
+        templates_dir: Optional[str] = None,
+        versions: Optional[Dict[str, str]] = None,
+        hot_reload: Optional[bool] = None,
+        reload_interval: Optional[float] = None
+    ):
+        self.templates_dir = templates_dir or os.getenv("PROMPT_TEMPLATES_DIR", TEMPLATES_DIR)
+        self.versions = versions if versions is not None else {
+            name.strip(): version.strip()
+            for name, version in (
+                entry.split("=") for entry in os.getenv("PROMPT_VERSIONS", "").split(",") if entry.strip()
+            )
+        }
+        self.hot_reload = hot_reload if hot_reload is not None else os.getenv("PROMPT_HOT_RELOAD", "false").lower() == "true"
+        self.reload_interval = reload_interval if reload_interval is not None else float(os.getenv("PROMPT_RELOAD_INTERVAL_SECONDS", 2))
+
+        self.__prompts: Dict[str, CompiledPrompt] = {}
+        self.__checked_at: Dict[str, float] = {}
+        self.compilations = 0
+
+    def get(self, name: str) -> ChatPromptTemplate:
+        """
+        Returns the compiled template, its variables are the template's own plus input and an optional chat_history.
+        """
+        return self.get_compiled(name).template
+
+    def get_version(self, name: str) -> str:
+        return self.get_compiled(name).version
+
+    def get_compiled(self, name: str) -> CompiledPrompt:
+        prompt = self.__prompts.get(name)
+        if prompt is None or (self.hot_reload and self.__is_stale(name, prompt)):
+            prompt = self.__compile(name)
+            self.__prompts[name] = prompt
+        return prompt
+
+    def reload(self) -> None:
+        self.__prompts.clear()
+        self.__checked_at.clear()
+
+    def resolve_version(self, name: str) -> str:
+        pinned = self.versions.get(name)
+        if pinned:
+            return pinned
+
+        directory = os.path.join(self.templates_dir, name)
+        versions = [file_name[:-4] for file_name in os.listdir(directory) if file_name.endswith(".txt")]
+        if not versions:
+            raise FileNotFoundError(f"No prompt templates found for {name} in {directory}")
+        return max(versions, key=self.__version_key)
+
+    def __is_stale(self, name: str, prompt: CompiledPrompt) -> bool:
+        now = time.monotonic()
+        if now - self.__checked_at.get(name, 0) < self.reload_interval:
+            return False
+        self.__checked_at[name] = now
+
+        path = self.__get_path(name, self.resolve_version(name))
+        return path != prompt.path or os.stat(path).st_mtime_ns != prompt.modified_at
+
+    def __compile(self, name: str) -> CompiledPrompt:
+        version = self.resolve_version(name)
+        path = self.__get_path(name, version)
+        with open(path, encoding="utf-8") as template_file:
+            system_template = template_file.read()
+
+        template = ChatPromptTemplate.from_messages([
+            SystemMessagePromptTemplate.from_template(system_template),
+            MessagesPlaceholder(HISTORY_VARIABLE, optional=True),
+            HumanMessagePromptTemplate.from_template("{input}")
+        ])
+        self.compilations += 1
+        self.__checked_at[name] = time.monotonic()
+        return CompiledPrompt(version=version, path=path, modified_at=os.stat(path).st_mtime_ns, template=template)
+
+    def __get_path(self, name: str, version: str) -> str:
+        return os.path.join(self.templates_dir, name, f"{version}.txt")
+
+    @staticmethod
+    def __version_key(version: str):
+        numbers = re.findall(r"\d+", version)
+        return [int(number) for number in numbers], version
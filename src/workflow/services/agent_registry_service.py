@@ -0,0 +1,125 @@
+import os
+import json
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Iterable, Optional
+from src.api.core.services.http_client_service import HttpClientService
+from src.utils.http.get_hmac_header import generate_hmac_headers
+from src.utils.logs.logger import Logger
+from src.workflow.agents.supervisor.supervisor_models import AgentRegistryConfig
+
+DEFAULT_AGENTS_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "agents", "agents.json")
+
+
+class AgentRegistryService:
+    """
+    Agent descriptions and routing examples used to build the supervisor prompt.
+    Loaded from a config file, or from the main server and refreshed periodically when an http client is given.
+    The main server source starts from the file snapshot, so startup does not depend on the main server.
+    """
+    __MODULE = "agent_registry"
+
+    def __init__(
+        self,
+        config: Optional[AgentRegistryConfig] = None,
+        http_client_service: Optional[HttpClientService] = None,
+        refresh_interval: Optional[float] = None,
+        retry_interval: Optional[float] = None,
+        max_cached_prompts: int = 1000
+    ):
+        self.__http_client_service = http_client_service
+        self.refresh_interval = refresh_interval or float(os.getenv("AGENT_REGISTRY_REFRESH_SECONDS", 300))
+        self.retry_interval = retry_interval or float(os.getenv("AGENT_REGISTRY_RETRY_SECONDS", 10))
+        self.__refreshed = False
+        self.max_cached_prompts = max_cached_prompts
+        self.__config = AgentRegistryConfig(agents=[])
+        self.__prompt_variables: "OrderedDict[FrozenSet[str], Dict[str, str]]" = OrderedDict()
+        self.__refresh_task: Optional[asyncio.Task] = None
+        self.version = 0
+        if config is not None:
+            self.load(config)
+
+    @classmethod
+    def from_file(cls, path: Optional[str] = None, **kwargs) -> "AgentRegistryService":
+        with open(path or os.getenv("AGENT_REGISTRY_PATH", DEFAULT_AGENTS_PATH), encoding="utf-8") as config_file:
+            return cls(config=AgentRegistryConfig(**json.load(config_file)), **kwargs)
+
+    def load(self, config: AgentRegistryConfig) -> None:
+        self.__config = config
+        self.__prompt_variables.clear()
+        self.version += 1
+
+    def get_config(self) -> AgentRegistryConfig:
+        return self.__config
+
+    def get_agent_ids(self):
+        return [agent.agent_id for agent in self.__config.agents]
+
+    def get_prompt_variables(self, available_agents: Optional[Iterable] = None) -> Dict[str, str]:
+        """
+        Renders the agents section and the examples of the supervisor prompt for one set of available agents.
+        Examples needing an unavailable agent are left out. Renders are cached per agent set.
+        """
+        agent_ids = frozenset(str(agent_id) for agent_id in available_agents) if available_agents is not None else frozenset(self.get_agent_ids())
+
+        variables = self.__prompt_variables.get(agent_ids)
+        if variables is not None:
+            self.__prompt_variables.move_to_end(agent_ids)
+            return variables
+
+        agents = [agent for agent in self.__config.agents if agent.agent_id in agent_ids]
+        examples = [
+            example for example in self.__config.examples
+            if all(agent_id in agent_ids for agent_id in example.selected_agents)
+        ]
+        variables = {
+            "agents": "\n".join(
+                f"- {agent.agent_id}: {agent.name}. " + agent.description.replace("\n", "\n  ")
+                for agent in agents
+            ) or "None, always return an empty list.",
+            "examples": "\n\n".join(
+                f'User query: "{example.query}"\nOutput: {json.dumps({"selected_agents": example.selected_agents})}'
+                for example in examples
+            )
+        }
+
+        self.__prompt_variables[agent_ids] = variables
+        while len(self.__prompt_variables) > self.max_cached_prompts:
+            self.__prompt_variables.popitem(last=False)
+        return variables
+
+    async def refresh(self) -> None:
+        main_server_endpoint = os.getenv("MAIN_SERVER_ENDPOINT")
+        res = await self.__http_client_service.get(
+            f"https://{main_server_endpoint}/agents/internal/registry",
+            headers=generate_hmac_headers(os.getenv("HMAC_SECRET"))
+        )
+        res.raise_for_status()
+        self.load(AgentRegistryConfig(**res.json()))
+        self.__refreshed = True
+
+    async def start(self) -> None:
+        if self.__http_client_service is None or self.__refresh_task is not None:
+            return
+        await self.__try_refresh()
+        self.__refresh_task = asyncio.create_task(self.__run())
+
+    async def aclose(self) -> None:
+        if self.__refresh_task is not None:
+            self.__refresh_task.cancel()
+            await asyncio.gather(self.__refresh_task, return_exceptions=True)
+            self.__refresh_task = None
+
+    async def __run(self) -> None:
+        while True:
+            ## retried sooner until the main server has answered once
+            await asyncio.sleep(self.refresh_interval if self.__refreshed else self.retry_interval)
+            await self.__try_refresh()
+
+    async def __try_refresh(self) -> None:
+        try:
+            await self.refresh()
+        except Exception as exc:
+            ## keep routing with the last known agents
+            Logger.log(message=f"Agent registry refresh failed: {exc!r}", level=logging.WARNING, name=self.__MODULE)
@@ -0,0 +1,15 @@
+import os
+from typing import List
+from langchain_openai import OpenAIEmbeddings
+
+
+class EmbeddingService:
+    def __init__(self):
+        self.model = os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
+        self.__embeddings = None
+
+    async def embed(self, text: str) -> List[float]:
+        if self.__embeddings is None:
+            self.__embeddings = OpenAIEmbeddings(model=self.model)
+
+        return await self.__embeddings.aembed_query(text)
@@ -0,0 +1,65 @@
+import re
+import asyncio
+import time
+from typing import Any, List, Optional
+from pydantic import BaseModel
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.prompt_values import PromptValue
+from langchain_core.runnables import RunnableLambda
+
+QUERY_PATTERN = re.compile(r"^Query (\d+):", re.MULTILINE)
+UUID_PATTERN = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Local stand-in for ChatOpenAI, selected with LLM_BACKEND=fake to run and benchmark the pipeline offline.
+    Answers after a fixed latency. Structured routing outputs pick the first agent listed in the system prompt, for every batched query.
+    """
+    latency: float = 0.05
+    response: str = "Fake response"
+    confidence: float = 0.9
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake"
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager=None, **kwargs: Any) -> ChatResult:
+        self.calls += 1
+        time.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self.response))])
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager=None, **kwargs: Any) -> ChatResult:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self.response))])
+
+    def with_structured_output(self, schema: type, include_raw: bool = False, **kwargs: Any):
+        async def respond(prompt: Any) -> Any:
+            self.calls += 1
+            await asyncio.sleep(self.latency)
+            messages = prompt.to_messages() if isinstance(prompt, PromptValue) else prompt
+            parsed = self.build_structured_output(schema, messages)
+            if not include_raw:
+                return parsed
+
+            input_tokens = sum(len(str(message.content)) for message in messages) // 4
+            raw = AIMessage(content="", usage_metadata={"input_tokens": input_tokens, "output_tokens": 20, "total_tokens": input_tokens + 20})
+            return {"raw": raw, "parsed": parsed, "parsing_error": None}
+
+        return RunnableLambda(lambda prompt: asyncio.run(respond(prompt)), afunc=respond)
+
+    def build_structured_output(self, schema: type, messages: List[BaseMessage]) -> BaseModel:
+        system_message = messages[0].content if messages else ""
+        selected_agents = UUID_PATTERN.findall(system_message.split("Examples", 1)[0])[:1]
+
+        if "selections" in schema.model_fields:
+            queries = QUERY_PATTERN.findall(messages[-1].content if messages else "")
+            return schema(selections=[{"index": int(index), "selected_agents": selected_agents} for index in queries])
+        if "selected_agents" in schema.model_fields:
+            fields = {"confidence": self.confidence} if "confidence" in schema.model_fields else {}
+            return schema(selected_agents=selected_agents, **fields)
+        return schema.model_construct()
@@ -0,0 +1,159 @@
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import List, Optional, Sequence, Set, Union
+from uuid import UUID
+from langchain.schema import HumanMessage, SystemMessage
+from src.api.core.services.redis_service import RedisService
+from src.workflow.services.llm_service import LlmService
+from src.workflow.services.token_counter import TokenCounter
+from src.workflow.chat_history import ChatRecord
+from src.utils.logs.logger import Logger
+
+class HistoryStrategy(ABC):
+    """
+    Selects the part of a chat history that goes into a prompt.
+    """
+    @abstractmethod
+    async def select(self, chat_id: Optional[Union[UUID, str]], chat_history: Sequence[ChatRecord]) -> List[ChatRecord]:
+        ...
+
+
+class FullHistoryStrategy(HistoryStrategy):
+    async def select(self, chat_id, chat_history):
+        return list(chat_history)
+
+
+class LastTurnsStrategy(HistoryStrategy):
+    """
+    Keeps the most recent messages.
+    """
+    def __init__(self, max_messages: int = 10):
+        self.max_messages = max_messages
+
+    async def select(self, chat_id, chat_history):
+        return list(chat_history[-self.max_messages:]) if self.max_messages > 0 else []
+
+
+class TokenBudgetStrategy(HistoryStrategy):
+    """
+    Keeps the most recent messages that fit the token budget, the newest one is truncated when it alone does not.
+    """
+    def __init__(self, token_counter: TokenCounter, max_tokens: int = 2000):
+        self.__token_counter = token_counter
+        self.max_tokens = max_tokens
+
+    async def select(self, chat_id, chat_history):
+        selected = []
+        remaining = self.max_tokens
+        for message in reversed(chat_history):
+            tokens = self.__token_counter.count_message(message.content)
+            if tokens > remaining:
+                if not selected:
+                    content = self.__token_counter.truncate(message.content, remaining - TokenCounter.MESSAGE_OVERHEAD)
+                    if content:
+                        selected.append(ChatRecord(message.role, content))
+                break
+            selected.append(message)
+            remaining -= tokens
+        return selected[::-1]
+
+
+class RollingSummaryStrategy(HistoryStrategy):
+    """
+    Keeps the window selected by another strategy and replaces older messages with a summary cached per chat.
+    Summaries are refreshed in the background, so a prompt never waits for one.
+    """
+    __MODULE = "history.rolling_summary"
+    SUMMARY_PROMPT = (
+        "Summarise the conversation below for an assistant that routes questions to specialised agents. "
+        "Keep the topics, entities and open questions, in at most a few sentences."
+    )
+
+    def __init__(
+        self,
+        llm_service: LlmService,
+        window: HistoryStrategy,
+        redis_service: Optional[RedisService] = None,
+        summary_max_tokens: int = 300,
+        ttl_seconds: int = 86400,
+        max_entries: int = 1000
+    ):
+        self.__llm_service = llm_service
+        self.__window = window
+        self.__redis_service = redis_service
+        self.summary_max_tokens = summary_max_tokens
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.__summaries: "OrderedDict[str, dict]" = OrderedDict()
+        self.__refreshing: Set[str] = set()
+        self.__tasks: Set[asyncio.Task] = set()
+
+    async def select(self, chat_id, chat_history):
+        recent = await self.__window.select(chat_id, chat_history)
+        older = chat_history[:len(chat_history) - len(recent)]
+        if not older or chat_id is None:
+            return recent
+
+        entry = await self.get_summary(chat_id)
+        covered = entry["covered"] if entry else 0
+        if covered < len(older):
+            self.__schedule_refresh(str(chat_id), entry, older)
+
+        if entry is None:
+            return recent
+        return [ChatRecord("system", f"Summary of the earlier conversation: {entry['summary']}"), *recent]
+
+    async def get_summary(self, chat_id: Union[UUID, str]) -> Optional[dict]:
+        if self.__redis_service is not None:
+            return await self.__redis_service.get_session(self.get_summary_key(chat_id))
+
+        entry = self.__summaries.get(str(chat_id))
+        if entry is not None:
+            self.__summaries.move_to_end(str(chat_id))
+        return entry
+
+    async def wait_for_refreshes(self) -> None:
+        if self.__tasks:
+            await asyncio.gather(*self.__tasks, return_exceptions=True)
+
+    @staticmethod
+    def get_summary_key(chat_id: Union[UUID, str]) -> str:
+        return f"chat_summary:{chat_id}"
+
+    def __schedule_refresh(self, chat_id: str, entry: Optional[dict], older: Sequence[ChatRecord]) -> None:
+        if chat_id in self.__refreshing:
+            return
+        self.__refreshing.add(chat_id)
+        task = asyncio.create_task(self.__refresh(chat_id, entry, list(older)))
+        self.__tasks.add(task)
+        task.add_done_callback(self.__tasks.discard)
+
+    async def __refresh(self, chat_id: str, entry: Optional[dict], older: Sequence[ChatRecord]) -> None:
+        """
+        Folds the messages that left the window into the previous summary.
+        """
+        try:
+            covered = entry["covered"] if entry else 0
+            transcript = "\n".join(f"{message.role}: {message.content}" for message in older[covered:])
+            if entry:
+                transcript = f"Previous summary: {entry['summary']}\n{transcript}"
+
+            llm = self.__llm_service.get_llm(temperature=0, max_tokens=self.summary_max_tokens)
+            response = await llm.ainvoke([SystemMessage(content=self.SUMMARY_PROMPT), HumanMessage(content=transcript)])
+            await self.__store(chat_id, {"summary": response.content, "covered": len(older)})
+        except Exception as exc:
+            Logger.log(message=f"Chat {chat_id} summary failed: {exc!r}", level=logging.WARNING, name=self.__MODULE)
+        finally:
+            self.__refreshing.discard(chat_id)
+
+    async def __store(self, chat_id: str, entry: dict) -> None:
+        if self.__redis_service is not None:
+            await self.__redis_service.set_session(self.get_summary_key(chat_id), entry, expire_seconds=self.ttl_seconds)
+            return
+
+        self.__summaries[chat_id] = entry
+        self.__summaries.move_to_end(chat_id)
+        while len(self.__summaries) > self.max_entries:
+            self.__summaries.popitem(last=False)
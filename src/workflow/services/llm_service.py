@@ -1,15 +1,93 @@
+import os
+import logging
+import httpx
+from typing import Dict, Optional, Tuple
 from langchain_openai import ChatOpenAI
+from langchain_core.language_models.chat_models import BaseChatModel
+from src.workflow.services.fake_chat_model import FakeChatModel
+from src.utils.logs.logger import Logger
+
+LlmKey = Tuple[str, float, Optional[int]]
+
 
 class LlmService:
-    @staticmethod
+    """
+    Pools configured chat model clients keyed by (model, temperature, max_tokens).
+    Every OpenAI client shares one http connection pool, warmed up at startup.
+    LLM_BACKEND=fake swaps in a local fake model so the pipeline can run offline.
+    """
+    __MODULE = "llm_service"
+
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        backend: Optional[str] = None,
+        http_async_client: Optional[httpx.AsyncClient] = None,
+        fake_latency: Optional[float] = None
+    ):
+        self.model = model or os.getenv("LLM_MODEL", "gpt-4o")
+        self.backend = backend or os.getenv("LLM_BACKEND", "openai")
+        self.fake_latency = fake_latency if fake_latency is not None else float(os.getenv("LLM_FAKE_LATENCY_SECONDS", 0.05))
+        self.__http_async_client = http_async_client
+        self.__clients: Dict[LlmKey, BaseChatModel] = {}
+
     def get_llm(
+        self,
         temperature: float,
-        max_tokens: int = None
-    ):
-        llm = ChatOpenAI(
-            model="gpt-4o",
+        max_tokens: int = None,
+        model: Optional[str] = None
+    ) -> BaseChatModel:
+        key = (model or self.model, temperature, max_tokens)
+        llm = self.__clients.get(key)
+        if llm is None:
+            llm = self.__create_llm(*key)
+            self.__clients[key] = llm
+        return llm
+
+    async def warmup(self, configurations: Tuple[Tuple[float, Optional[int]], ...] = ((0.1, None),)) -> None:
+        """
+        Builds the clients used on the request path and opens a pooled connection to the API.
+        Failures are logged, the first request then pays for the connection instead.
+        """
+        for temperature, max_tokens in configurations:
+            self.get_llm(temperature=temperature, max_tokens=max_tokens)
+
+        if self.backend != "openai":
+            return
+        try:
+            base_url = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
+            await self.get_http_async_client().get(f"{base_url}/models", headers={"Authorization": f"Bearer {os.getenv('OPENAI_API_KEY', '')}"})
+        except httpx.HTTPError as exc:
+            Logger.log(message=f"LLM connection warmup failed: {exc!r}", level=logging.WARNING, name=self.__MODULE)
+
+    def get_http_async_client(self) -> httpx.AsyncClient:
+        if self.__http_async_client is None:
+            self.__http_async_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=int(os.getenv("LLM_MAX_CONNECTIONS", 100)),
+                    max_keepalive_connections=int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", 20)),
+                    keepalive_expiry=float(os.getenv("LLM_KEEPALIVE_EXPIRY", 60))
+                ),
+                timeout=httpx.Timeout(float(os.getenv("LLM_TIMEOUT_SECONDS", 60)), connect=5.0)
+            )
+        return self.__http_async_client
+
+    async def aclose(self) -> None:
+        if self.__http_async_client is not None:
+            await self.__http_async_client.aclose()
+            self.__http_async_client = None
+        self.__clients.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {"clients": len(self.__clients)}
+
+    def __create_llm(self, model: str, temperature: float, max_tokens: Optional[int]) -> BaseChatModel:
+        if self.backend == "fake":
+            return FakeChatModel(latency=self.fake_latency)
+
+        return ChatOpenAI(
+            model=model,
             temperature=temperature,
-            max_completion_tokens=max_tokens
+            max_completion_tokens=max_tokens,
+            http_async_client=self.get_http_async_client()
         )
-
-        return llm
\ No newline at end of file
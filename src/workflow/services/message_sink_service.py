@@ -0,0 +1,270 @@
+import os
+import asyncio
+import logging
+import httpx
+from typing import Dict, List, Optional, Set
+from uuid import UUID
+from src.api.core.services.http_client_service import HttpClientService
+from src.utils.http.get_hmac_header import generate_hmac_headers
+from src.utils.logs.logger import Logger
+from src.utils.tracing.tracer import get_tracer
+from src.utils.metrics.metrics import REGISTRY
+import time
+
+## statuses of a main server without the batch endpoint
+BATCH_UNSUPPORTED = (404, 405)
+
+PERSIST_SECONDS = REGISTRY.histogram("message_persist_seconds", "Duration of message batch persistence, retries included", ["outcome"])
+
+
+class MessageSinkService:
+    """
+    Write-behind persistence of chat messages to the main server.
+    Messages are queued off the request path and flushed in order, with retries on transport errors and 5xx.
+    Each chat has at most one send in flight, so a chat being retried holds back its own messages and no one else's.
+    The backlog is bounded by MESSAGE_SINK_MAX_QUEUE_SIZE, messages beyond it are dropped and counted.
+    By default each message goes to the per-chat endpoint; MESSAGE_SINK_BATCH_ENDPOINT=true sends a flush
+    in one request to /messages/internal/batch, falling back to the per-chat endpoint if the main server lacks it.
+    """
+    __MODULE = "message_sink.service"
+
+    def __init__(
+        self,
+        http_client_service: HttpClientService,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        retry_backoff: Optional[float] = None,
+        batch_endpoint: Optional[bool] = None,
+        max_queue_size: Optional[int] = None
+    ):
+        self.__http_client_service = http_client_service
+        self.batch_size = batch_size or int(os.getenv("MESSAGE_SINK_BATCH_SIZE", 50))
+        self.flush_interval = flush_interval or float(os.getenv("MESSAGE_SINK_FLUSH_INTERVAL", 0.2))
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("MESSAGE_SINK_MAX_RETRIES", 5))
+        self.retry_backoff = retry_backoff if retry_backoff is not None else float(os.getenv("MESSAGE_SINK_RETRY_BACKOFF", 0.5))
+        self.batch_endpoint = batch_endpoint if batch_endpoint is not None else os.getenv("MESSAGE_SINK_BATCH_ENDPOINT", "false").lower() == "true"
+        self.max_queue_size = max_queue_size or int(os.getenv("MESSAGE_SINK_MAX_QUEUE_SIZE", 10000))
+
+        self.__queue: asyncio.Queue = asyncio.Queue()
+        self.__task: Optional[asyncio.Task] = None
+        ## taken off the queue, waiting for their chat to have no send in flight
+        self.__pending: List[dict] = []
+        self.__busy: Set[str] = set()
+        self.__sends: Set[asyncio.Task] = set()
+        self.__flushing: Dict[str, bool] = {}
+
+        self.enqueued = 0
+        self.persisted = 0
+        self.failed = 0
+        self.dropped = 0
+        self.batches = 0
+        self.retries = 0
+
+    def enqueue(self, chat_id: UUID, sender: UUID, message_type: str, text: str) -> None:
+        if self.__queue.qsize() + len(self.__pending) >= self.max_queue_size:
+            self.dropped += 1
+            Logger.log(message=f"Message sink full, dropped a message for chat {chat_id}", level=logging.WARNING, name=self.__MODULE)
+            return
+
+        self.__queue.put_nowait({
+            "chat_id": str(chat_id),
+            "sender": str(sender),
+            "message_type": message_type,
+            "text": text
+        })
+        self.enqueued += 1
+
+    async def start(self) -> None:
+        if self.__task is None:
+            self.__task = asyncio.create_task(self.__run())
+
+    async def aclose(self) -> None:
+        """
+        Stops the background flusher and persists everything still queued.
+        """
+        if self.__task is not None:
+            self.__task.cancel()
+            try:
+                await self.__task
+            except asyncio.CancelledError:
+                pass
+            self.__task = None
+
+        self.__take_queued()
+        self.__dispatch()
+        while self.__sends:
+            await asyncio.wait(set(self.__sends))
+
+    async def flush(self, chat_id: UUID) -> bool:
+        """
+        Waits until the messages queued so far for the chat were handed to the main server.
+        Returns False if any of them was dropped.
+        """
+        key = str(chat_id)
+        self.__flushing[key] = True
+        self.__take_queued()
+        self.__dispatch()
+        while key in self.__busy:
+            await asyncio.wait(set(self.__sends), return_when=asyncio.FIRST_COMPLETED)
+        return self.__flushing.pop(key)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "depth": self.__queue.qsize() + len(self.__pending),
+            "enqueued": self.enqueued,
+            "persisted": self.persisted,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "retries": self.retries
+        }
+
+    async def __run(self) -> None:
+        while True:
+            ## taken messages go straight to pending, so flush and aclose see them mid-batch
+            self.__pending.append(await self.__queue.get())
+            taken = 1
+            deadline = asyncio.get_running_loop().time() + self.flush_interval
+
+            while taken < self.batch_size:
+                timeout = deadline - asyncio.get_running_loop().time()
+                if timeout <= 0:
+                    break
+                try:
+                    self.__pending.append(await asyncio.wait_for(self.__queue.get(), timeout))
+                    taken += 1
+                except asyncio.TimeoutError:
+                    break
+
+            self.__dispatch()
+
+    def __take_queued(self) -> None:
+        while not self.__queue.empty():
+            self.__pending.append(self.__queue.get_nowait())
+
+    def __dispatch(self) -> None:
+        """
+        Starts sending every pending message whose chat has no send in flight, in arrival order.
+        """
+        ready, waiting = [], []
+        for message in self.__pending:
+            (waiting if message["chat_id"] in self.__busy else ready).append(message)
+        self.__pending = waiting
+        if not ready:
+            return
+
+        if self.batch_endpoint:
+            groups = [ready]
+        else:
+            chats: Dict[str, List[dict]] = {}
+            for message in ready:
+                chats.setdefault(message["chat_id"], []).append(message)
+            groups = list(chats.values())
+
+        for messages in groups:
+            chat_ids = {message["chat_id"] for message in messages}
+            self.__busy.update(chat_ids)
+            task = asyncio.create_task(self.__send(messages))
+            self.__sends.add(task)
+            task.add_done_callback(lambda done, chat_ids=chat_ids: self.__settle(done, chat_ids))
+
+    def __settle(self, task: asyncio.Task, chat_ids: Set[str]) -> None:
+        self.__sends.discard(task)
+        self.__busy.difference_update(chat_ids)
+        persisted = not task.cancelled() and task.exception() is None and task.result()
+        for chat_id in chat_ids & self.__flushing.keys():
+            self.__flushing[chat_id] = self.__flushing[chat_id] and persisted
+        ## messages that arrived for these chats while they were busy
+        self.__dispatch()
+
+    async def __send(self, messages: List[dict]) -> bool:
+        persisted = True
+        for start in range(0, len(messages), self.batch_size):
+            persisted = await self.__send_batch(messages[start:start + self.batch_size]) and persisted
+        return persisted
+
+    async def __send_batch(self, batch: List[dict]) -> bool:
+        ## sent from the sink's own tasks, a batch mixes interactions and is a trace of its own
+        with get_tracer().start_span("message_sink.send_batch", kind="client", attributes={"messages": len(batch)}) as span:
+            started = time.perf_counter()
+            persisted = await self.__persist(batch)
+            PERSIST_SECONDS.labels("ok" if persisted else "failed").observe(time.perf_counter() - started)
+            span.set_attribute("persisted", persisted)
+            return persisted
+
+    async def __persist(self, batch: List[dict]) -> bool:
+        main_server_endpoint = os.getenv("MAIN_SERVER_ENDPOINT")
+
+        if self.batch_endpoint:
+            status = await self.__post(f"https://{main_server_endpoint}/messages/internal/batch", {"messages": batch})
+            if status in BATCH_UNSUPPORTED:
+                ## the main server predates the batch endpoint, stay on the per-chat one from now on
+                self.batch_endpoint = False
+                Logger.log(
+                    message=f"Batch endpoint answered {status}, persisting messages per chat",
+                    level=logging.WARNING,
+                    name=self.__MODULE
+                )
+            else:
+                return self.__record(batch, status)
+
+        chats: Dict[str, List[dict]] = {}
+        for message in batch:
+            chats.setdefault(message["chat_id"], []).append(message)
+        results = await asyncio.gather(*(self.__persist_chat(main_server_endpoint, chat_id, messages) for chat_id, messages in chats.items()))
+        if all(results):
+            self.batches += 1
+        return all(results)
+
+    async def __persist_chat(self, main_server_endpoint: str, chat_id: str, messages: List[dict]) -> bool:
+        ## one chat at a time keeps its messages in order
+        persisted = True
+        for message in messages:
+            status = await self.__post(
+                f"https://{main_server_endpoint}/messages/internal/{chat_id}",
+                {"sender": message["sender"], "message_type": message["message_type"], "text": message["text"]}
+            )
+            persisted = self.__record([message], status, count_batch=False) and persisted
+        return persisted
+
+    async def __post(self, url: str, body: dict) -> Optional[int]:
+        """
+        Returns the final status code, None when the main server could not be reached.
+        Transport errors and 5xx are retried with backoff, other statuses are final.
+        """
+        status = None
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = await self.__http_client_service.post(
+                    url,
+                    headers=get_tracer().inject(generate_hmac_headers(os.getenv("HMAC_SECRET"))),
+                    json=body
+                )
+                status = response.status_code
+                if status < 500:
+                    return status
+            except httpx.TransportError:
+                status = None
+
+            if attempt < self.max_retries:
+                self.retries += 1
+                await asyncio.sleep(self.retry_backoff * (2 ** attempt))
+        return status
+
+    def __record(self, messages: List[dict], status: Optional[int], count_batch: bool = True) -> bool:
+        if status is not None and status < 300:
+            self.persisted += len(messages)
+            if count_batch:
+                self.batches += 1
+            return True
+
+        self.failed += len(messages)
+        reason = f"status {status}" if status is not None else "main server unreachable"
+        Logger.log(
+            message=f"Dropped {len(messages)} messages, {reason}",
+            level=logging.ERROR,
+            name=self.__MODULE,
+            fields={"chat_ids": sorted({message["chat_id"] for message in messages})}
+        )
+        return False
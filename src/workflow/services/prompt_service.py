@@ -1,16 +1,31 @@
 from langchain_core.prompts import ChatPromptTemplate, HumanMessagePromptTemplate
-from langchain.schema import AIMessage, HumanMessage, SystemMessage
-from typing import List, Dict, Any
+from langchain.schema import SystemMessage, BaseMessage
+from typing import List, Any, Optional
 from src.workflow.state import State
+from src.workflow.prompts.prompt_registry import PromptRegistry
+from src.workflow.services.token_counter import TokenCounter
+from src.workflow.services.history_strategies import HistoryStrategy, TokenBudgetStrategy
+from src.workflow.chat_history import normalize_history
 
 class PromptService:
+    def __init__(self, history_strategy: Optional[HistoryStrategy] = None, prompt_registry: Optional[PromptRegistry] = None):
+        ## bounded by default, long chats must not grow the prompt
+        self.__history_strategy = history_strategy or TokenBudgetStrategy(TokenCounter())
+        self.__prompt_registry = prompt_registry or PromptRegistry()
+
+    def get_prompt(self, name: str) -> ChatPromptTemplate:
+        """
+        Compiled template from the registry, invoke it with input and chat_history.
+        """
+        return self.__prompt_registry.get(name)
+
     async def custom_prompt_template(self, state: State, system_message: str, with_chat_history: bool = False):
         messages = [
             SystemMessage(content=system_message)
         ]
 
         if with_chat_history:
-            messages = self.add_chat_history(state, messages)
+            messages = await self.add_chat_history(state, messages)
 
         messages.append(HumanMessagePromptTemplate.from_template('{input}'))
 
@@ -19,19 +34,16 @@ class PromptService:
         return prompt
 
 
-    @staticmethod
-    def add_chat_history(state: State, messages: List[Any]) -> List[Any]:
+    async def add_chat_history(self, state: State, messages: List[Any]) -> List[Any]:
+        messages.extend(await self.get_chat_history(state))
+        return messages
 
-        chat_history = state.get("chat_history", [])
-        if chat_history:
-            for msg in chat_history:
-                if msg["type"] == "human":
-                    messages.append(HumanMessage(content=msg["text"]))
-                elif msg["type"] == "ai":
-                    messages.append(AIMessage(content=msg["text"]))
+    async def get_chat_history(self, state: State) -> List[BaseMessage]:
+        ## the graph state carries the records built once from the worker state
+        chat_history = state.get("chat_history")
+        if chat_history is None:
+            worker_state = state.get("worker_state")
+            chat_history = normalize_history(worker_state.chat_history if worker_state else [])
 
-        return messages
-    
-    
-    
-    
\ No newline at end of file
+        selected = await self.__history_strategy.select(state.get("chat_id"), chat_history)
+        return [record.to_message() for record in selected]
@@ -0,0 +1,230 @@
+import os
+import random
+import ormsgpack
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata
+)
+from src.api.core.services.redis_service import RedisService
+
+
+def _pack(*values: Any) -> bytes:
+    return ormsgpack.packb(values)
+
+
+def _unpack(data: bytes) -> list:
+    return ormsgpack.unpackb(data)
+
+
+class RedisCheckpointSaver(BaseCheckpointSaver[str]):
+    """
+    LangGraph checkpointer storing each thread in four redis hashes, values are msgpack encoded by the serde.
+    Every node transition is written in a single pipelined round trip, so a retried run resumes after its last completed node.
+    """
+    def __init__(self, redis_service: RedisService, ttl_seconds: Optional[int] = None):
+        super().__init__()
+        self.__redis = redis_service.redis
+        self.ttl_seconds = ttl_seconds or int(os.getenv("GRAPH_CHECKPOINT_TTL_SECONDS", 3600))
+
+    @staticmethod
+    def get_keys(thread_id: str) -> Dict[str, str]:
+        return {
+            "latest": f"checkpoint:{thread_id}:latest",
+            "checkpoints": f"checkpoint:{thread_id}:checkpoints",
+            "blobs": f"checkpoint:{thread_id}:blobs",
+            "writes": f"checkpoint:{thread_id}:writes"
+        }
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = str(config["configurable"]["thread_id"])
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        keys = self.get_keys(thread_id)
+
+        checkpoint_id = get_checkpoint_id(config)
+        if checkpoint_id is None:
+            latest = await self.__redis.hget(keys["latest"], checkpoint_ns)
+            if latest is None:
+                return None
+            checkpoint_id = latest.decode()
+
+        record = await self.__redis.hget(keys["checkpoints"], _pack(checkpoint_ns, checkpoint_id))
+        if record is None:
+            return None
+        return await self.__load(thread_id, checkpoint_ns, checkpoint_id, record)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None
+    ) -> AsyncIterator[CheckpointTuple]:
+        """
+        Lists the checkpoints of one thread, newest first. Listing across threads is not supported.
+        """
+        if config is None:
+            raise ValueError("RedisCheckpointSaver can only list the checkpoints of a thread")
+
+        thread_id = str(config["configurable"]["thread_id"])
+        config_checkpoint_ns = config["configurable"].get("checkpoint_ns")
+        config_checkpoint_id = get_checkpoint_id(config)
+        before_checkpoint_id = get_checkpoint_id(before) if before else None
+
+        records = await self.__redis.hgetall(self.get_keys(thread_id)["checkpoints"])
+        entries = sorted(
+            ((*_unpack(field), record) for field, record in records.items()),
+            key=lambda entry: entry[1],
+            reverse=True
+        )
+
+        for checkpoint_ns, checkpoint_id, record in entries:
+            if config_checkpoint_ns is not None and checkpoint_ns != config_checkpoint_ns:
+                continue
+            if config_checkpoint_id and checkpoint_id != config_checkpoint_id:
+                continue
+            if before_checkpoint_id and checkpoint_id >= before_checkpoint_id:
+                continue
+
+            checkpoint_tuple = await self.__load(thread_id, checkpoint_ns, checkpoint_id, record)
+            if filter and not all(checkpoint_tuple.metadata.get(key) == value for key, value in filter.items()):
+                continue
+
+            if limit is not None:
+                if limit <= 0:
+                    break
+                limit -= 1
+            yield checkpoint_tuple
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions
+    ) -> RunnableConfig:
+        thread_id = str(config["configurable"]["thread_id"])
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        keys = self.get_keys(thread_id)
+
+        checkpoint = checkpoint.copy()
+        values: Dict[str, Any] = checkpoint.pop("channel_values")
+        blobs = {
+            _pack(checkpoint_ns, channel, version): _pack(
+                *(self.serde.dumps_typed(values[channel]) if channel in values else ("empty", b""))
+            )
+            for channel, version in new_versions.items()
+        }
+
+        record = _pack(
+            *self.serde.dumps_typed(checkpoint),
+            *self.serde.dumps_typed(get_checkpoint_metadata(config, metadata)),
+            config["configurable"].get("checkpoint_id")
+        )
+
+        async with self.__redis.pipeline(transaction=False) as pipe:
+            pipe.hset(keys["checkpoints"], _pack(checkpoint_ns, checkpoint["id"]), record)
+            pipe.hset(keys["latest"], checkpoint_ns, checkpoint["id"])
+            if blobs:
+                pipe.hset(keys["blobs"], mapping=blobs)
+            for key in keys.values():
+                pipe.expire(key, self.ttl_seconds)
+            await pipe.execute()
+
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"]
+            }
+        }
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = ""
+    ) -> None:
+        thread_id = str(config["configurable"]["thread_id"])
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        key = self.get_keys(thread_id)["writes"]
+
+        async with self.__redis.pipeline(transaction=False) as pipe:
+            for index, (channel, value) in enumerate(writes):
+                write_index = WRITES_IDX_MAP.get(channel, index)
+                field = _pack(checkpoint_ns, checkpoint_id, task_id, write_index)
+                record = _pack(task_id, channel, *self.serde.dumps_typed(value), task_path)
+                ## special writes (errors, interrupts) are kept from the first attempt
+                if write_index >= 0:
+                    pipe.hsetnx(key, field, record)
+                else:
+                    pipe.hset(key, field, record)
+            pipe.expire(key, self.ttl_seconds)
+            await pipe.execute()
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await self.__redis.delete(*self.get_keys(str(thread_id)).values())
+
+    def get_next_version(self, current: Optional[str], channel: None) -> str:
+        if current is None:
+            current_version = 0
+        elif isinstance(current, int):
+            current_version = current
+        else:
+            current_version = int(current.split(".")[0])
+        return f"{current_version + 1:032}.{random.random():016}"
+
+    async def __load(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str, record: bytes) -> CheckpointTuple:
+        checkpoint_type, checkpoint_data, metadata_type, metadata_data, parent_checkpoint_id = _unpack(record)
+        checkpoint: Checkpoint = self.serde.loads_typed((checkpoint_type, checkpoint_data))
+        keys = self.get_keys(thread_id)
+
+        versions = list(checkpoint["channel_versions"].items())
+        async with self.__redis.pipeline(transaction=False) as pipe:
+            pipe.hmget(keys["blobs"], [_pack(checkpoint_ns, channel, version) for channel, version in versions] or [b""])
+            pipe.hgetall(keys["writes"])
+            blobs, writes = await pipe.execute()
+
+        channel_values = {}
+        for (channel, _), blob in zip(versions, blobs):
+            if blob is not None:
+                blob_type, blob_data = _unpack(blob)
+                if blob_type != "empty":
+                    channel_values[channel] = self.serde.loads_typed((blob_type, blob_data))
+
+        pending_writes: List[Tuple[str, str, Any]] = []
+        for field, write in sorted(writes.items(), key=lambda item: _unpack(item[0])[2:]):
+            write_ns, write_checkpoint_id, *_ = _unpack(field)
+            if write_ns == checkpoint_ns and write_checkpoint_id == checkpoint_id:
+                write_task_id, channel, value_type, value_data, _ = _unpack(write)
+                pending_writes.append((write_task_id, channel, self.serde.loads_typed((value_type, value_data))))
+
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id
+                }
+            },
+            checkpoint={**checkpoint, "channel_values": channel_values},
+            metadata=self.serde.loads_typed((metadata_type, metadata_data)),
+            parent_config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": parent_checkpoint_id
+                }
+            } if parent_checkpoint_id else None,
+            pending_writes=pending_writes
+        )
@@ -0,0 +1,103 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Union
+from src.workflow.services.embedding_service import EmbeddingService
+from src.workflow.services.vector_backends import InMemoryVectorBackend, QdrantVectorBackend
+from src.utils.logs.logger import Logger
+
+
+class RoutingCacheService:
+    """
+    Embedding-keyed cache of supervisor routing decisions, namespaced per company.
+    A lookup hits when a past input is within the similarity threshold of the new one.
+    Decisions are stored in the background, the request does not wait on the embedding or the backend write.
+    """
+    __MODULE = "routing_cache.service"
+    __EMBEDDING_MEMO_SIZE = 256
+
+    def __init__(
+        self,
+        embedding_service: EmbeddingService,
+        backend: Union[InMemoryVectorBackend, QdrantVectorBackend],
+        similarity_threshold: float = 0.95,
+        max_pending_stores: int = 100
+    ):
+        self.__embedding_service = embedding_service
+        self.__backend = backend
+        self.similarity_threshold = similarity_threshold
+        self.max_pending_stores = max_pending_stores
+        self.__embedding_memo: OrderedDict = OrderedDict()
+        self.__tasks: Set[asyncio.Task] = set()
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.errors = 0
+        self.skipped = 0
+
+    async def lookup(self, namespace: str, text: str) -> Optional[List[str]]:
+        try:
+            vector = await self.__embed(text)
+            match = await self.__backend.search(namespace, vector, self.similarity_threshold)
+        except Exception:
+            self.errors += 1
+            Logger.log(message="Routing cache lookup failed", level=logging.WARNING, name=self.__MODULE, exc_info=True)
+            return None
+
+        if match is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return match.selected_agents
+
+    async def store(self, namespace: str, text: str, selected_agents: List[str]) -> None:
+        try:
+            vector = await self.__embed(text)
+            self.evictions += await self.__backend.upsert(namespace, vector, selected_agents)
+            self.stores += 1
+        except Exception:
+            self.errors += 1
+            Logger.log(message="Routing cache store failed", level=logging.WARNING, name=self.__MODULE, exc_info=True)
+
+    def schedule_store(self, namespace: str, text: str, selected_agents: List[str]) -> None:
+        ## a slow backend sheds writes instead of piling up tasks, the next miss stores again
+        if len(self.__tasks) >= self.max_pending_stores:
+            self.skipped += 1
+            return
+
+        task = asyncio.create_task(self.store(namespace, text, list(selected_agents)))
+        self.__tasks.add(task)
+        task.add_done_callback(self.__tasks.discard)
+
+    async def wait_for_stores(self) -> None:
+        if self.__tasks:
+            await asyncio.gather(*self.__tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "errors": self.errors,
+            "skipped": self.skipped
+        }
+
+    async def __embed(self, text: str) -> List[float]:
+        key = " ".join(text.lower().split())
+        vector = self.__embedding_memo.get(key)
+
+        if vector is None:
+            vector = await self.__embedding_service.embed(key)
+            self.__embedding_memo[key] = vector
+            if len(self.__embedding_memo) > self.__EMBEDDING_MEMO_SIZE:
+                self.__embedding_memo.popitem(last=False)
+        else:
+            self.__embedding_memo.move_to_end(key)
+
+        return vector
@@ -0,0 +1,59 @@
+import os
+import asyncio
+import logging
+import tiktoken
+from typing import Optional
+from src.utils.logs.logger import Logger
+
+
+class TokenCounter:
+    """
+    Counts prompt tokens locally with tiktoken.
+    Falls back to about four characters per token when the encoding cannot be loaded, an empty encoding name always does.
+    Servers load the encoding with warmup at startup, reading the BPE file on a request would stall the event loop.
+    """
+    __MODULE = "token_counter"
+    CHARS_PER_TOKEN = 4
+    MESSAGE_OVERHEAD = 4
+
+    def __init__(self, encoding_name: Optional[str] = None):
+        self.encoding_name = encoding_name if encoding_name is not None else os.getenv("PROMPT_TOKENIZER_ENCODING", "o200k_base")
+        self.__encoding = None
+        self.__loaded = not self.encoding_name
+
+    async def warmup(self) -> None:
+        await asyncio.to_thread(self.load)
+
+    def load(self):
+        if not self.__loaded:
+            try:
+                self.__encoding = tiktoken.get_encoding(self.encoding_name)
+            except Exception as exc:
+                Logger.log(
+                    message=f"Tokenizer {self.encoding_name} unavailable, estimating tokens: {exc!r}",
+                    level=logging.WARNING,
+                    name=self.__MODULE
+                )
+            self.__loaded = True
+        return self.__encoding
+
+    def count(self, text: str) -> int:
+        encoding = self.load()
+        if encoding is None:
+            return -(-len(text) // self.CHARS_PER_TOKEN)
+        return len(encoding.encode(text, disallowed_special=()))
+
+    def count_message(self, text: str) -> int:
+        return self.count(text) + self.MESSAGE_OVERHEAD
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """
+        Keeps the end of the text, the most recent part of a long message.
+        """
+        if max_tokens <= 0:
+            return ""
+        encoding = self.load()
+        if encoding is None:
+            return text[-max_tokens * self.CHARS_PER_TOKEN:]
+        tokens = encoding.encode(text, disallowed_special=())
+        return encoding.decode(tokens[-max_tokens:])
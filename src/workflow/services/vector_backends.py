@@ -0,0 +1,217 @@
+import time
+import uuid
+import random
+import numpy as np
+from collections import OrderedDict
+from typing import Dict, List, Optional
+from pydantic import BaseModel
+from qdrant_client import AsyncQdrantClient, models
+
+
+class VectorMatch(BaseModel):
+    selected_agents: List[str]
+    score: float
+
+
+class InMemoryVectorBackend:
+    """
+    Process-local vector store with per-namespace TTL and LRU eviction.
+    Used for tests, offline runs and single-node deployments.
+    """
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.__namespaces: Dict[str, OrderedDict] = {}
+
+    async def search(self, namespace: str, vector: List[float], threshold: float) -> Optional[VectorMatch]:
+        entries = self.__namespaces.get(namespace)
+        if not entries:
+            return None
+
+        self.__expire(entries)
+        if not entries:
+            return None
+
+        keys = list(entries.keys())
+        matrix = np.stack([entries[key]["vector"] for key in keys])
+        scores = matrix @ self.__normalize(vector)
+        best = int(np.argmax(scores))
+        score = float(scores[best])
+
+        if score < threshold:
+            return None
+
+        entries.move_to_end(keys[best])
+        return VectorMatch(selected_agents=entries[keys[best]]["selected_agents"], score=score)
+
+    async def upsert(self, namespace: str, vector: List[float], selected_agents: List[str]) -> int:
+        entries = self.__namespaces.setdefault(namespace, OrderedDict())
+        entries[uuid.uuid4().hex] = {
+            "vector": self.__normalize(vector),
+            "selected_agents": list(selected_agents),
+            "created_at": time.monotonic()
+        }
+
+        evicted = 0
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+            evicted += 1
+
+        return evicted
+
+    def __expire(self, entries: OrderedDict) -> None:
+        cutoff = time.monotonic() - self.ttl_seconds
+        expired = [key for key, entry in entries.items() if entry["created_at"] < cutoff]
+        for key in expired:
+            del entries[key]
+
+    @staticmethod
+    def __normalize(vector: List[float]) -> np.ndarray:
+        array = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(array)
+        return array / norm if norm else array
+
+
+class QdrantVectorBackend:
+    """
+    Qdrant-backed vector store shared by every node.
+    TTL is enforced with a payload filter and LRU by trimming the least recently hit points.
+    Trimming runs on a sample of the upserts, so max_entries is a soft limit.
+    Hits are only noted in memory and written back in one batch right before a trim, the only reader of last_hit.
+    """
+    __MAX_PENDING_HITS = 1024
+
+    def __init__(
+        self,
+        client: AsyncQdrantClient,
+        collection_name: str,
+        ttl_seconds: float,
+        max_entries: int,
+        evict_sample_rate: float = 0.05,
+        seed: Optional[int] = None
+    ):
+        self.__client = client
+        self.collection_name = collection_name
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.evict_sample_rate = evict_sample_rate
+        self.__random = random.Random(seed)
+        self.__collection_ready = False
+        self.__pending_hits: OrderedDict = OrderedDict()
+
+    async def search(self, namespace: str, vector: List[float], threshold: float) -> Optional[VectorMatch]:
+        if not await self.__ensure_collection(len(vector)):
+            return None
+
+        result = await self.__client.query_points(
+            collection_name=self.collection_name,
+            query=vector,
+            query_filter=models.Filter(must=[
+                self.__namespace_condition(namespace),
+                models.FieldCondition(key="created_at", range=models.Range(gte=time.time() - self.ttl_seconds))
+            ]),
+            score_threshold=threshold,
+            limit=1,
+            with_payload=True
+        )
+
+        if not result.points:
+            return None
+
+        point = result.points[0]
+        self.__note_hit(point.id)
+        return VectorMatch(selected_agents=point.payload["selected_agents"], score=point.score)
+
+    async def upsert(self, namespace: str, vector: List[float], selected_agents: List[str]) -> int:
+        await self.__ensure_collection(len(vector), create=True)
+
+        now = time.time()
+        await self.__client.upsert(
+            collection_name=self.collection_name,
+            points=[models.PointStruct(
+                id=str(uuid.uuid4()),
+                vector=vector,
+                payload={
+                    "namespace": namespace,
+                    "selected_agents": list(selected_agents),
+                    "created_at": now,
+                    "last_hit": now
+                }
+            )]
+        )
+
+        ## delete, count and scroll cost more than the write, expired points are already filtered by search
+        if self.__random.random() >= self.evict_sample_rate:
+            return 0
+        return await self.__evict(namespace)
+
+    def __note_hit(self, point_id) -> None:
+        self.__pending_hits[point_id] = None
+        self.__pending_hits.move_to_end(point_id)
+        if len(self.__pending_hits) > self.__MAX_PENDING_HITS:
+            self.__pending_hits.popitem(last=False)
+
+    async def __flush_hits(self) -> None:
+        if not self.__pending_hits:
+            return
+
+        points = list(self.__pending_hits)
+        self.__pending_hits.clear()
+        await self.__client.set_payload(
+            collection_name=self.collection_name,
+            payload={"last_hit": time.time()},
+            points=points
+        )
+
+    async def __evict(self, namespace: str) -> int:
+        namespace_filter = models.Filter(must=[self.__namespace_condition(namespace)])
+        await self.__flush_hits()
+
+        await self.__client.delete(
+            collection_name=self.collection_name,
+            points_selector=models.FilterSelector(filter=models.Filter(must=[
+                self.__namespace_condition(namespace),
+                models.FieldCondition(key="created_at", range=models.Range(lt=time.time() - self.ttl_seconds))
+            ]))
+        )
+
+        count = await self.__client.count(
+            collection_name=self.collection_name,
+            count_filter=namespace_filter,
+            exact=True
+        )
+        overflow = count.count - self.max_entries
+        if overflow <= 0:
+            return 0
+
+        points, _ = await self.__client.scroll(
+            collection_name=self.collection_name,
+            scroll_filter=namespace_filter,
+            limit=count.count,
+            with_payload=True
+        )
+        points.sort(key=lambda point: point.payload.get("last_hit", 0))
+        await self.__client.delete(
+            collection_name=self.collection_name,
+            points_selector=models.PointIdsList(points=[point.id for point in points[:overflow]])
+        )
+
+        return overflow
+
+    async def __ensure_collection(self, size: int, create: bool = False) -> bool:
+        if self.__collection_ready:
+            return True
+
+        if await self.__client.collection_exists(self.collection_name):
+            self.__collection_ready = True
+        elif create:
+            await self.__client.create_collection(
+                collection_name=self.collection_name,
+                vectors_config=models.VectorParams(size=size, distance=models.Distance.COSINE)
+            )
+            self.__collection_ready = True
+
+        return self.__collection_ready
+
+    def __namespace_condition(self, namespace: str):
+        return models.FieldCondition(key="namespace", match=models.MatchValue(value=namespace))
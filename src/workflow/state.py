@@ -2,9 +2,26 @@ from typing_extensions import TypedDict
 from typing import List, Dict
 from uuid import UUID
 from src.workflow.agents.supervisor.supervisor_models import SupervisorOutput
+from src.api.modules.interactions.interactions_models import WorkerState
+from src.workflow.chat_history import ChatHistory, normalize_history
 
 class State(TypedDict):
     input: str
     chat_id: UUID
     available_agents: List[UUID]       
-    selected_agents: SupervisorOutput          
\ No newline at end of file
+    selected_agents: SupervisorOutput
+    worker_state: WorkerState
+    chat_history: ChatHistory
+    deadline: float
+
+
+def create_state(worker_state: WorkerState, deadline: float) -> State:
+    return State(
+        chat_id=worker_state.chat_id,
+        input=worker_state.input,
+        available_agents=worker_state.agents,
+        selected_agents="",
+        worker_state=worker_state,
+        chat_history=normalize_history(worker_state.chat_history),
+        deadline=deadline
+    )
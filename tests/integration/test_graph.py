@@ -28,11 +28,12 @@ async def test_graph_integration():
         "input": worker_state.input,
         "chat_id": worker_state.chat_id,
         "available_agents": worker_state.agents,
-        "selected_agents": []  
+        "selected_agents": [],
+        "worker_state": worker_state
     }
 
     # Run the graph
-    graph = create_graph(worker_state)
+    graph = create_graph()
     result = await graph.ainvoke(state)
 
     print("Final state:", result)
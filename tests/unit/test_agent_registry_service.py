@@ -0,0 +1,139 @@
+import json
+import asyncio
+import pytest
+import httpx
+from unittest.mock import Mock, AsyncMock, patch
+from uuid import UUID, uuid4
+
+from src.api.core.services.http_client_service import HttpClientService
+from src.workflow.agents.supervisor.supervisor_agent import Supervisor
+from src.workflow.agents.supervisor.supervisor_models import AgentRegistryConfig
+from src.workflow.services.agent_registry_service import AgentRegistryService
+from src.workflow.services.llm_service import LlmService
+from src.workflow.services.prompt_service import PromptService
+
+LEGAL_AGENT_ID = "95e222ef-c637-42d3-a81e-955beeeb0ba2"
+ACCOUNTING_AGENT_ID = "99b5792d-c38a-4e49-9207-a3fa547905ae"
+
+
+@pytest.fixture
+def registry():
+    """Registry loaded from the default agents file"""
+    return AgentRegistryService.from_file()
+
+
+def test_prompt_lists_only_available_agents(registry):
+    """Test that unavailable agents and their examples are left out of the prompt"""
+    # Act
+    variables = registry.get_prompt_variables([UUID(LEGAL_AGENT_ID)])
+
+    # Assert
+    assert LEGAL_AGENT_ID in variables["agents"]
+    assert ACCOUNTING_AGENT_ID not in variables["agents"]
+    assert ACCOUNTING_AGENT_ID not in variables["examples"]
+    assert 'Output: {"selected_agents": []}' in variables["examples"]
+
+
+def test_prompt_variables_are_cached_until_reload(registry):
+    """Test that renders are reused per agent set and dropped when the registry changes"""
+    # Arrange
+    first = registry.get_prompt_variables([LEGAL_AGENT_ID, ACCOUNTING_AGENT_ID])
+
+    # Act
+    second = registry.get_prompt_variables([ACCOUNTING_AGENT_ID, LEGAL_AGENT_ID])
+    registry.load(AgentRegistryConfig(agents=[{"agent_id": LEGAL_AGENT_ID, "name": "Lawyer", "description": "Law."}]))
+    third = registry.get_prompt_variables([LEGAL_AGENT_ID, ACCOUNTING_AGENT_ID])
+
+    # Assert
+    assert first is second
+    assert third["agents"] == f"- {LEGAL_AGENT_ID}: Lawyer. Law."
+    assert registry.version == 2
+
+
+@pytest.mark.asyncio
+async def test_refresh_loads_agents_from_main_server():
+    """Test that the registry can be populated by the main server"""
+    # Arrange
+    def handler(request: httpx.Request):
+        assert request.url.path == "/agents/internal/registry"
+        assert "x-signature" in request.headers
+        return httpx.Response(200, json={
+            "agents": [{"agent_id": LEGAL_AGENT_ID, "name": "Legal Agent", "description": "Law."}],
+            "examples": [{"query": "Is this legal?", "selected_agents": [LEGAL_AGENT_ID]}]
+        })
+
+    registry = AgentRegistryService(http_client_service=HttpClientService(transport=httpx.MockTransport(handler)))
+
+    # Act
+    with patch.dict("os.environ", {"HMAC_SECRET": "test-secret", "MAIN_SERVER_ENDPOINT": "main.test"}):
+        await registry.start()
+    await registry.aclose()
+
+    # Assert
+    assert registry.get_agent_ids() == [LEGAL_AGENT_ID]
+    assert "Is this legal?" in registry.get_prompt_variables()["examples"]
+
+
+@pytest.mark.asyncio
+async def test_start_keeps_the_file_snapshot_when_the_main_server_fails():
+    """Test that startup survives a main server without the registry and retries in the background"""
+    # Arrange
+    statuses = [404, 200]
+
+    def handler(request: httpx.Request):
+        status = statuses.pop(0) if statuses else 200
+        if status != 200:
+            return httpx.Response(status)
+        return httpx.Response(200, json={"agents": [{"agent_id": LEGAL_AGENT_ID, "name": "Legal Agent", "description": "Law."}]})
+
+    registry = AgentRegistryService.from_file(
+        http_client_service=HttpClientService(transport=httpx.MockTransport(handler)),
+        retry_interval=0.01
+    )
+
+    # Act
+    with patch.dict("os.environ", {"HMAC_SECRET": "test-secret", "MAIN_SERVER_ENDPOINT": "main.test"}):
+        await registry.start()
+        snapshot = registry.get_agent_ids()
+        await asyncio.sleep(0.1)
+    await registry.aclose()
+
+    # Assert
+    assert snapshot == [LEGAL_AGENT_ID, ACCOUNTING_AGENT_ID]
+    assert registry.get_agent_ids() == [LEGAL_AGENT_ID]
+
+
+@pytest.mark.asyncio
+async def test_supervisor_prompt_is_built_from_company_agents(registry):
+    """Test that the formatted supervisor prompt only describes the company's agents"""
+    # Arrange
+    llm_service = Mock(spec=LlmService)
+    chain = Mock()
+    chain.ainvoke = AsyncMock(return_value=Mock(selected_agents=[ACCOUNTING_AGENT_ID]))
+    supervisor = Supervisor(PromptService(), llm_service, agent_registry_service=registry)
+    state = {"input": "Show me our revenue", "chat_id": uuid4(), "available_agents": [UUID(ACCOUNTING_AGENT_ID)]}
+
+    # Act
+    with patch("src.workflow.services.prompt_service.ChatPromptTemplate.__or__", return_value=chain):
+        await supervisor.interact(state)
+
+    # Assert
+    inputs = chain.ainvoke.call_args.args[0]
+    system_message = PromptService().get_prompt("supervisor").format_messages(**inputs)[0].content
+    assert ACCOUNTING_AGENT_ID in system_message
+    assert LEGAL_AGENT_ID not in system_message
+
+
+@pytest.mark.asyncio
+async def test_supervisor_skips_the_model_without_available_agents(registry):
+    """Test that a company without agents is routed to nobody without an LLM call"""
+    # Arrange
+    llm_service = Mock(spec=LlmService)
+    supervisor = Supervisor(PromptService(), llm_service, agent_registry_service=registry)
+
+    # Act
+    result = await supervisor.interact({"input": "Hello", "chat_id": uuid4(), "available_agents": []})
+
+    # Assert
+    assert result.selected_agents == []
+    llm_service.get_llm.assert_not_called()
@@ -0,0 +1,239 @@
+import json
+import asyncio
+import pytest
+import httpx
+from unittest.mock import Mock, AsyncMock, patch
+from uuid import UUID, uuid4
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from fakeredis import FakeAsyncRedis
+from src.dependencies.container import Container
+from src.api.core.services.redis_service import RedisService
+from src.api.core.services.http_client_service import HttpClientService
+from src.api.core.services.chat_context_cache_service import ChatContextCacheService
+from src.api.modules.interactions.interactions_models import WorkerState
+from src.api.modules.interactions.worker_state_service import WorkerStateService
+from src.api.modules.interactions import interactions_routes
+from src.api.modules.websocket.websocket_service import WebsocketService
+from src.utils.http.get_hmac_header import generate_hmac_headers
+from src.workflow.orchestrator.orchestrator import Orchestrator
+from src.workflow.services.message_sink_service import MessageSinkService
+
+ENVIRONMENT = {
+    "HMAC_SECRET": "test-secret",
+    "MAIN_SERVER_ENDPOINT": "main.test"
+}
+
+
+@pytest.fixture
+def chat_context_cache_service():
+    """Chat context cache on fakeredis"""
+    return ChatContextCacheService(redis_service=RedisService(client=FakeAsyncRedis()))
+
+
+@pytest.fixture
+def worker_state():
+    """WorkerState as returned by the main server"""
+    return WorkerState(
+        input="Can I terminate an employee without notice?",
+        agents=[UUID("95e222ef-c637-42d3-a81e-955beeeb0ba2")],
+        chat_id=uuid4(),
+        company_id=uuid4(),
+        chat_history=[{"type": "human", "text": "Previous question"}],
+        user_id=uuid4()
+    )
+
+
+@pytest.mark.asyncio
+async def test_cached_context_is_reused_with_new_input(chat_context_cache_service, worker_state):
+    """Test that a stored context is served for the next turn of the same user"""
+    # Arrange
+    await chat_context_cache_service.store(worker_state)
+
+    # Act
+    cached = await chat_context_cache_service.get(worker_state.chat_id, worker_state.user_id, worker_state.company_id, "Next question")
+
+    # Assert
+    assert cached == worker_state.model_copy(update={"input": "Next question"})
+    assert chat_context_cache_service.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_context_is_not_shared_with_other_users(chat_context_cache_service, worker_state):
+    """Test that another user of the chat id misses the cache"""
+    # Arrange
+    await chat_context_cache_service.store(worker_state)
+
+    # Act
+    cached = await chat_context_cache_service.get(worker_state.chat_id, uuid4(), worker_state.company_id, "Hi")
+
+    # Assert
+    assert cached is None
+
+
+@pytest.mark.asyncio
+async def test_append_turn_extends_history(chat_context_cache_service, worker_state):
+    """Test that finished turns are appended to the cached history"""
+    # Arrange
+    await chat_context_cache_service.store(worker_state)
+    turn = [{"type": "human", "text": worker_state.input}, {"type": "ai", "text": "Legal advice"}]
+
+    # Act
+    await chat_context_cache_service.append_turn(worker_state.chat_id, turn)
+    cached = await chat_context_cache_service.get(worker_state.chat_id, worker_state.user_id, worker_state.company_id, "Next")
+
+    # Assert
+    assert cached.chat_history == worker_state.chat_history + turn
+
+
+@pytest.mark.asyncio
+async def test_concurrent_turns_are_all_appended(chat_context_cache_service, worker_state):
+    """Test that turns finishing together do not overwrite each other"""
+    # Arrange
+    await chat_context_cache_service.store(worker_state)
+    turns = [[{"type": "ai", "text": f"Answer {index}"}] for index in range(10)]
+
+    # Act
+    await asyncio.gather(*(chat_context_cache_service.append_turn(worker_state.chat_id, turn) for turn in turns))
+    await chat_context_cache_service.append_turn(uuid4(), turns[0])
+    cached = await chat_context_cache_service.get(worker_state.chat_id, worker_state.user_id, worker_state.company_id, "Next")
+
+    # Assert
+    assert len(cached.chat_history) == 11
+    assert sorted(message["text"] for message in cached.chat_history[1:]) == sorted(turn[0]["text"] for turn in turns)
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_appends_turns_in_the_main_server_format(chat_context_cache_service, worker_state):
+    """Test that turns appended after a run have the same shape as the history from the main server"""
+    # Arrange
+    agent_id = str(worker_state.agents[0])
+    websocket_service = Mock(spec=WebsocketService)
+    websocket_service.send_json = AsyncMock(return_value=True)
+    http_client_service = HttpClientService(transport=httpx.MockTransport(lambda request: httpx.Response(200, json={"response": "Legal advice"})))
+    with patch.dict("os.environ", {**ENVIRONMENT, "WORKER_HOST": ".workers.test"}):
+        orchestrator = Orchestrator(websocket_service, http_client_service, Mock(spec=MessageSinkService), chat_context_cache_service)
+    await chat_context_cache_service.store(worker_state)
+    state = {
+        "input": worker_state.input,
+        "chat_id": worker_state.chat_id,
+        "available_agents": worker_state.agents,
+        "selected_agents": [agent_id],
+        "worker_state": worker_state
+    }
+
+    # Act
+    with patch.dict("os.environ", {**ENVIRONMENT, "WORKER_HOST": ".workers.test"}):
+        await orchestrator.orchestrate(state, worker_state)
+    cached = await chat_context_cache_service.get(worker_state.chat_id, worker_state.user_id, worker_state.company_id, "Next")
+
+    # Assert
+    assert cached.chat_history == [
+        {"type": "human", "text": "Previous question"},
+        {"type": "human", "text": worker_state.input},
+        {"type": "ai", "text": "Legal advice"}
+    ]
+
+
+@pytest.mark.asyncio
+async def test_invalidation_by_chat_and_company(chat_context_cache_service, worker_state):
+    """Test that both invalidation scopes force the next lookup to the main server"""
+    # Arrange
+    other_chat = worker_state.model_copy(update={"chat_id": uuid4()})
+    await chat_context_cache_service.store(worker_state)
+    await chat_context_cache_service.store(other_chat)
+
+    # Act
+    await chat_context_cache_service.invalidate_chat(worker_state.chat_id)
+    first = await chat_context_cache_service.get(worker_state.chat_id, worker_state.user_id, worker_state.company_id, "Hi")
+    second_before = await chat_context_cache_service.get(other_chat.chat_id, other_chat.user_id, other_chat.company_id, "Hi")
+    await chat_context_cache_service.invalidate_company(worker_state.company_id)
+    second_after = await chat_context_cache_service.get(other_chat.chat_id, other_chat.user_id, other_chat.company_id, "Hi")
+
+    # Assert
+    assert first is None
+    assert second_before is not None
+    assert second_after is None
+
+
+@pytest.mark.asyncio
+async def test_worker_state_service_skips_main_server_on_hit(chat_context_cache_service, worker_state):
+    """Test that only the first turn of a chat waits on the main server"""
+    # Arrange
+    requests_seen = []
+
+    def handler(request: httpx.Request):
+        requests_seen.append(json.loads(request.content))
+        return httpx.Response(200, json=worker_state.model_dump(mode="json"))
+
+    worker_state_service = WorkerStateService(
+        http_client_service=HttpClientService(transport=httpx.MockTransport(handler)),
+        chat_context_cache_service=chat_context_cache_service,
+        notify_on_hit=False
+    )
+    arguments = {"chat_id": worker_state.chat_id, "user_id": str(worker_state.user_id), "company_id": str(worker_state.company_id)}
+
+    # Act
+    with patch.dict("os.environ", ENVIRONMENT):
+        await worker_state_service.get_worker_state(**arguments, input="First")
+        second = await worker_state_service.get_worker_state(**arguments, input="Second")
+
+    # Assert
+    assert len(requests_seen) == 1
+    assert second.input == "Second"
+
+
+@pytest.mark.asyncio
+async def test_worker_state_service_notifies_main_server_on_hit(chat_context_cache_service, worker_state):
+    """Test that a cache hit still reports the turn to the main server, without waiting on it"""
+    # Arrange
+    release = asyncio.Event()
+    requests_seen = []
+
+    async def handler(request: httpx.Request):
+        requests_seen.append(json.loads(request.content))
+        if len(requests_seen) > 1:
+            await release.wait()
+        return httpx.Response(200, json=worker_state.model_dump(mode="json"))
+
+    worker_state_service = WorkerStateService(
+        http_client_service=HttpClientService(transport=httpx.MockTransport(handler)),
+        chat_context_cache_service=chat_context_cache_service,
+        notify_on_hit=True
+    )
+    arguments = {"chat_id": worker_state.chat_id, "user_id": str(worker_state.user_id), "company_id": str(worker_state.company_id)}
+
+    # Act
+    with patch.dict("os.environ", ENVIRONMENT):
+        await worker_state_service.get_worker_state(**arguments, input="First")
+        second = await asyncio.wait_for(worker_state_service.get_worker_state(**arguments, input="Second"), timeout=1)
+        release.set()
+        await worker_state_service.wait_for_notifications()
+
+    # Assert
+    assert second.input == "Second"
+    assert [request["input"] for request in requests_seen] == ["First", "Second"]
+
+
+def test_invalidation_webhook_requires_signature(chat_context_cache_service, worker_state):
+    """Test that the webhook invalidates signed calls and rejects unsigned ones"""
+    # Arrange
+    app = FastAPI()
+    app.include_router(interactions_routes.internal_router)
+    Container.register("chat_context_cache_service", chat_context_cache_service)
+    client = TestClient(app)
+    url = f"/interactions/internal/context/chats/{worker_state.chat_id}/invalidate"
+
+    try:
+        with patch.dict("os.environ", {**ENVIRONMENT, "ENVIRONMENT": "PRODUCTION"}):
+            # Act
+            unsigned = client.post(url)
+            signed = client.post(url, headers=generate_hmac_headers("test-secret"))
+    finally:
+        Container.clear()
+
+    # Assert
+    assert unsigned.status_code == 401
+    assert signed.status_code == 200
+    assert chat_context_cache_service.stats()["invalidations"] == 1
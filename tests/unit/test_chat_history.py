@@ -0,0 +1,65 @@
+import pytest
+from uuid import UUID, uuid4
+from langchain.schema import AIMessage, HumanMessage
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from src.api.modules.interactions.interactions_models import WorkerState
+from src.workflow.chat_history import ChatRecord, normalize_history
+from src.workflow.services.history_strategies import FullHistoryStrategy
+from src.workflow.services.prompt_service import PromptService
+from src.workflow.state import create_state
+
+
+@pytest.fixture
+def worker_state():
+    """Worker state with a legacy and a current message"""
+    return WorkerState(
+        input="And what about overtime?",
+        agents=[UUID("95e222ef-c637-42d3-a81e-955beeeb0ba2")],
+        chat_id=uuid4(),
+        company_id=uuid4(),
+        chat_history=[{"type": "human", "text": "How much notice do I give?"}, {"role": "ai", "content": "Four weeks."}],
+        user_id=uuid4()
+    )
+
+
+def test_normalize_history_accepts_legacy_messages():
+    """Test that type/text messages are read like role/content ones"""
+    # Act
+    records = normalize_history([
+        {"type": "human", "text": "Hello"},
+        {"role": "ai", "content": "Hi"},
+        {"role": "tool", "content": "ignored"}
+    ])
+
+    # Assert
+    assert records == (ChatRecord("human", "Hello"), ChatRecord("ai", "Hi"))
+    assert not hasattr(records[0], "__dict__")
+
+
+@pytest.mark.asyncio
+async def test_state_history_flows_into_the_prompt(worker_state):
+    """Test that the records built with the state are the ones the prompt uses"""
+    # Arrange
+    state = create_state(worker_state, deadline=0)
+    prompt_service = PromptService(history_strategy=FullHistoryStrategy())
+
+    # Act
+    messages = await prompt_service.get_chat_history(state)
+
+    # Assert
+    assert state["chat_history"] == (ChatRecord("human", "How much notice do I give?"), ChatRecord("ai", "Four weeks."))
+    assert messages == [HumanMessage(content="How much notice do I give?"), AIMessage(content="Four weeks.")]
+
+
+def test_state_history_survives_checkpoints(worker_state):
+    """Test that the records round trip through the checkpoint serializer"""
+    # Arrange
+    serializer = JsonPlusSerializer()
+    chat_history = create_state(worker_state, deadline=0)["chat_history"]
+
+    # Act
+    restored = serializer.loads_typed(serializer.dumps_typed(chat_history))
+
+    # Assert
+    assert tuple(restored) == chat_history
@@ -0,0 +1,88 @@
+import pytest
+
+from src.workflow.orchestrator.circuit_breaker import CircuitBreaker, CLOSED, OPEN, HALF_OPEN
+
+
+@pytest.fixture
+def clock():
+    """Manually advanced clock"""
+    return {"now": 0.0}
+
+
+@pytest.fixture
+def breaker(clock):
+    """Breaker opening after 3 failures with a 10 second recovery timeout"""
+    return CircuitBreaker(failure_threshold=3, recovery_timeout=10, clock=lambda: clock["now"])
+
+
+def test_breaker_opens_after_consecutive_failures(breaker):
+    """Test that the breaker opens at the threshold and rejects calls"""
+    # Act
+    for _ in range(3):
+        breaker.record_failure()
+
+    # Assert
+    assert breaker.state == OPEN
+    assert breaker.allow() is False
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_success_resets_failure_count(breaker):
+    """Test that only consecutive failures open the breaker"""
+    # Act
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    # Assert
+    assert breaker.state == CLOSED
+
+
+def test_late_success_does_not_close_an_open_breaker(breaker, clock):
+    """Test that a call admitted before the breaker opened cannot close it by succeeding late"""
+    # Arrange
+    for _ in range(3):
+        breaker.record_failure()
+
+    # Act
+    breaker.record_success()
+
+    # Assert
+    assert breaker.state == OPEN
+    assert breaker.allow() is False
+    assert breaker.failures == 3
+
+
+def test_breaker_half_opens_and_allows_one_probe(breaker, clock):
+    """Test that after the recovery timeout a single probe is let through"""
+    # Arrange
+    for _ in range(3):
+        breaker.record_failure()
+    clock["now"] = 10
+
+    # Act & Assert
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow() is True
+    assert breaker.allow() is False
+
+
+def test_probe_result_closes_or_reopens(breaker, clock):
+    """Test that a successful probe closes the breaker and a failed one reopens it"""
+    # Arrange
+    for _ in range(3):
+        breaker.record_failure()
+    clock["now"] = 10
+    breaker.allow()
+
+    # Act
+    breaker.record_failure()
+
+    # Assert
+    assert breaker.state == OPEN
+    assert breaker.stats()["opened"] == 2
+
+    clock["now"] = 20
+    breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED
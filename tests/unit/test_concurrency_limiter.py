@@ -0,0 +1,75 @@
+from src.workflow.orchestrator.concurrency_limiter import AimdLimiter
+
+
+def test_limiter_rejects_above_limit():
+    """Test that calls beyond the current limit are shed"""
+    # Arrange
+    limiter = AimdLimiter(initial_limit=2)
+
+    # Act
+    admitted = [limiter.try_acquire() for _ in range(3)]
+
+    # Assert
+    assert admitted == [True, True, False]
+    assert limiter.stats()["rejected"] == 1
+
+
+def test_limiter_increases_additively_on_success():
+    """Test that fast successes grow the limit by about one per round of calls"""
+    # Arrange
+    limiter = AimdLimiter(initial_limit=4)
+
+    # Act
+    for _ in range(4):
+        limiter.try_acquire()
+        limiter.release(success=True, latency=0.1)
+
+    # Assert
+    assert 4.9 < limiter.limit < 5.0
+
+
+def test_limiter_decreases_multiplicatively_on_failures():
+    """Test that failures halve the limit down to the minimum"""
+    # Arrange
+    limiter = AimdLimiter(initial_limit=8, min_limit=1)
+
+    # Act
+    limiter.try_acquire()
+    limiter.release(success=False)
+    for _ in range(5):
+        limiter.release(success=False)
+
+    # Assert
+    assert limiter.limit == 1
+    assert limiter.in_flight == 0
+
+
+def test_limiter_keeps_growing_for_steadily_slow_agents():
+    """Test that an agent always taking 20 seconds is not treated as congested"""
+    # Arrange
+    limiter = AimdLimiter(initial_limit=4, min_samples=5)
+
+    # Act
+    for _ in range(30):
+        limiter.try_acquire()
+        limiter.release(success=True, latency=20.0)
+
+    # Assert
+    assert limiter.limit > 4
+
+
+def test_limiter_backs_off_when_latency_grows_past_its_baseline():
+    """Test that latency rising well above the agent's usual latency cuts the limit"""
+    # Arrange
+    limiter = AimdLimiter(initial_limit=8, min_samples=5, latency_tolerance=2.0)
+    for _ in range(20):
+        limiter.release(success=True, latency=1.0)
+    grown = limiter.limit
+
+    # Act
+    for _ in range(10):
+        limiter.release(success=True, latency=5.0)
+
+    # Assert
+    assert limiter.limit < grown
+    assert limiter.stats()["latency"] > 2 * limiter.stats()["baseline_latency"]
@@ -0,0 +1,122 @@
+import asyncio
+import pytest
+from unittest.mock import Mock, AsyncMock
+
+from src.api.modules.websocket.connection_writer import ConnectionWriter
+
+
+@pytest.fixture
+def stalled_websocket():
+    """Websocket whose sends block until released"""
+    websocket = Mock()
+    websocket.release = asyncio.Event()
+
+    async def blocked_send(data):
+        await websocket.release.wait()
+
+    websocket.send_json = AsyncMock(side_effect=blocked_send)
+    websocket.close = AsyncMock()
+    return websocket
+
+
+def token(agent_id: str, text: str) -> dict:
+    return {"agent_id": agent_id, "token": text}
+
+
+def test_invalid_overflow_policy_is_rejected(stalled_websocket):
+    """Test that unknown overflow policies fail fast"""
+    # Act & Assert
+    with pytest.raises(ValueError):
+        ConnectionWriter(stalled_websocket, overflow_policy="block")
+
+
+@pytest.mark.asyncio
+async def test_messages_are_sent_in_order():
+    """Test that the writer task serialises sends in enqueue order"""
+    # Arrange
+    websocket = Mock()
+    websocket.send_json = AsyncMock()
+    writer = ConnectionWriter(websocket, max_queue_size=10)
+    writer.start()
+
+    # Act
+    for index in range(3):
+        writer.enqueue({"index": index})
+    while writer.sent < 3:
+        await asyncio.sleep(0)
+    await writer.close()
+
+    # Assert
+    assert [c.args[0] for c in websocket.send_json.call_args_list] == [{"index": 0}, {"index": 1}, {"index": 2}]
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest_discards_head_of_queue(stalled_websocket):
+    """Test that drop_oldest keeps the newest messages"""
+    # Arrange
+    writer = ConnectionWriter(stalled_websocket, max_queue_size=2, overflow_policy="drop_oldest")
+
+    # Act
+    for index in range(4):
+        assert writer.enqueue({"index": index}) is True
+
+    # Assert
+    assert writer.stats()["depth"] == 2
+    assert writer.stats()["dropped"] == 2
+
+
+@pytest.mark.asyncio
+async def test_coalesce_merges_tokens_of_same_agent(stalled_websocket):
+    """Test that coalesce merges streamed tokens instead of dropping them"""
+    # Arrange
+    writer = ConnectionWriter(stalled_websocket, max_queue_size=2, overflow_policy="coalesce")
+    writer.enqueue({"agents": ["a"]})
+    writer.enqueue(token("a", "Hel"))
+
+    # Act
+    writer.enqueue(token("a", "lo"))
+    writer.enqueue(token("a", "!"))
+
+    # Assert
+    stats = writer.stats()
+    assert stats["depth"] == 2
+    assert stats["dropped"] == 0
+    assert stats["coalesced"] == 2
+
+
+@pytest.mark.asyncio
+async def test_coalesce_falls_back_to_dropping_when_nothing_merges(stalled_websocket):
+    """Test that coalesce drops the oldest message when no tokens can be merged"""
+    # Arrange
+    writer = ConnectionWriter(stalled_websocket, max_queue_size=2, overflow_policy="coalesce")
+    writer.enqueue({"agents": ["a"]})
+    writer.enqueue(token("a", "Hel"))
+
+    # Act
+    writer.enqueue({"agent_id": "a", "response": "Hello"})
+
+    # Assert
+    assert writer.stats()["depth"] == 2
+    assert writer.stats()["dropped"] == 1
+
+
+@pytest.mark.asyncio
+async def test_disconnect_closes_socket_on_overflow(stalled_websocket):
+    """Test that the disconnect policy rejects the message and closes the socket"""
+    # Arrange
+    writer = ConnectionWriter(stalled_websocket, max_queue_size=1, overflow_policy="disconnect")
+    writer.start()
+    writer.enqueue({"index": 0})
+    await asyncio.sleep(0)
+    writer.enqueue({"index": 1})
+
+    # Act
+    accepted = writer.enqueue({"index": 2})
+    stalled_websocket.release.set()
+    while not writer.closed:
+        await asyncio.sleep(0)
+
+    # Assert
+    assert accepted is False
+    stalled_websocket.close.assert_awaited_once()
+    assert writer.enqueue({"index": 3}) is False
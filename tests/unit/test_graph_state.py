@@ -0,0 +1,81 @@
+import pytest
+from unittest.mock import Mock, AsyncMock
+from uuid import UUID, uuid4
+
+from src.workflow.graph import create_graph
+from src.workflow.agents.supervisor.supervisor_models import SupervisorOutput
+from src.api.modules.interactions.interactions_models import WorkerState
+from src.dependencies.container import Container
+
+
+@pytest.fixture
+def worker_state():
+    """WorkerState carried through the graph State"""
+    return WorkerState(
+        input="Can I terminate an employee without notice?",
+        agents=[UUID("95e222ef-c637-42d3-a81e-955beeeb0ba2")],
+        chat_id=uuid4(),
+        company_id=uuid4(),
+        chat_history=[],
+        user_id=uuid4()
+    )
+
+
+@pytest.fixture
+def registered_nodes():
+    """Register mocked supervisor and orchestrator in the container"""
+    supervisor = Mock()
+    supervisor.interact = AsyncMock(
+        return_value=SupervisorOutput(selected_agents=["95e222ef-c637-42d3-a81e-955beeeb0ba2"])
+    )
+    orchestrator = Mock()
+    orchestrator.orchestrate = AsyncMock()
+
+    Container.register("supervisor", supervisor)
+    Container.register("orchestrator", orchestrator)
+    yield supervisor, orchestrator
+    Container.clear()
+
+
+@pytest.mark.asyncio
+async def test_compiled_graph_is_reused_across_runs(registered_nodes, worker_state):
+    """Test that one compiled graph serves runs with different worker states"""
+    # Arrange
+    _, orchestrator = registered_nodes
+    graph = create_graph()
+    other_worker_state = worker_state.model_copy(update={"chat_id": uuid4()})
+
+    # Act
+    for state in (worker_state, other_worker_state):
+        await graph.ainvoke({
+            "input": state.input,
+            "chat_id": state.chat_id,
+            "available_agents": state.agents,
+            "selected_agents": [],
+            "worker_state": state
+        })
+
+    # Assert
+    passed_states = [c.kwargs["worker_state"] for c in orchestrator.orchestrate.call_args_list]
+    assert passed_states == [worker_state, other_worker_state]
+
+
+@pytest.mark.asyncio
+async def test_graph_passes_selected_agents_to_orchestrator(registered_nodes, worker_state):
+    """Test that the supervisor output reaches the orchestrator node"""
+    # Arrange
+    _, orchestrator = registered_nodes
+    graph = create_graph()
+
+    # Act
+    await graph.ainvoke({
+        "input": worker_state.input,
+        "chat_id": worker_state.chat_id,
+        "available_agents": worker_state.agents,
+        "selected_agents": [],
+        "worker_state": worker_state
+    })
+
+    # Assert
+    state = orchestrator.orchestrate.call_args.kwargs["state"]
+    assert state["selected_agents"] == ["95e222ef-c637-42d3-a81e-955beeeb0ba2"]
@@ -0,0 +1,162 @@
+import threading
+import pytest
+from unittest.mock import Mock, AsyncMock, patch
+from uuid import UUID, uuid4
+from langchain.schema import AIMessage, HumanMessage, SystemMessage
+
+from fakeredis import FakeAsyncRedis
+from src.api.core.services.redis_service import RedisService
+from src.api.modules.interactions.interactions_models import WorkerState
+from src.workflow.services.history_strategies import (
+    LastTurnsStrategy,
+    TokenBudgetStrategy,
+    RollingSummaryStrategy
+)
+from src.workflow.chat_history import ChatRecord
+from src.workflow.services.prompt_service import PromptService
+from src.workflow.services.token_counter import TokenCounter
+
+
+@pytest.fixture
+def token_counter():
+    """Token counter using the character estimate, no tokenizer download"""
+    return TokenCounter(encoding_name="")
+
+
+@pytest.fixture
+def chat_history():
+    """Forty alternating turns of 40 characters"""
+    return tuple(
+        ChatRecord("human" if index % 2 == 0 else "ai", f"{index:02d}" + "x" * 38)
+        for index in range(40)
+    )
+
+
+@pytest.fixture
+def llm_service():
+    """LlmService returning a fixed summary"""
+    llm = Mock()
+    llm.ainvoke = AsyncMock(return_value=AIMessage(content="They asked about notice periods."))
+    service = Mock()
+    service.get_llm = Mock(return_value=llm)
+    return service
+
+
+@pytest.mark.asyncio
+async def test_last_turns_keeps_the_most_recent_messages(chat_history):
+    """Test that only the last N messages are selected"""
+    # Act
+    selected = await LastTurnsStrategy(max_messages=4).select(uuid4(), chat_history)
+
+    # Assert
+    assert selected == list(chat_history[-4:])
+
+
+@pytest.mark.asyncio
+async def test_token_budget_keeps_newest_messages_within_budget(token_counter, chat_history):
+    """Test that the window is the newest suffix fitting the budget"""
+    # Arrange
+    strategy = TokenBudgetStrategy(token_counter, max_tokens=100)
+
+    # Act
+    selected = await strategy.select(uuid4(), chat_history)
+
+    # Assert
+    ## 40 characters are 10 tokens plus 4 of message overhead
+    assert selected == list(chat_history[-7:])
+    assert sum(token_counter.count_message(m.content) for m in selected) <= 100
+
+
+@pytest.mark.asyncio
+async def test_token_budget_truncates_a_single_oversized_message(token_counter):
+    """Test that a message larger than the budget keeps its end"""
+    # Arrange
+    strategy = TokenBudgetStrategy(token_counter, max_tokens=14)
+
+    # Act
+    selected = await strategy.select(uuid4(), [ChatRecord("human", "a" * 100 + "end")])
+
+    # Assert
+    assert len(selected) == 1
+    assert selected[0].content.endswith("end")
+    assert token_counter.count_message(selected[0].content) <= 14
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", ["memory", "redis"])
+async def test_rolling_summary_replaces_older_messages(backend, token_counter, chat_history, llm_service):
+    """Test that messages outside the window are summarised once, in the background, and cached"""
+    # Arrange
+    redis_service = RedisService(client=FakeAsyncRedis()) if backend == "redis" else None
+    strategy = RollingSummaryStrategy(
+        llm_service=llm_service,
+        window=TokenBudgetStrategy(token_counter, max_tokens=100),
+        redis_service=redis_service
+    )
+    chat_id = uuid4()
+
+    # Act
+    first = await strategy.select(chat_id, chat_history)
+    await strategy.wait_for_refreshes()
+    second = await strategy.select(chat_id, chat_history)
+    await strategy.wait_for_refreshes()
+
+    # Assert
+    assert first == list(chat_history[-7:])
+    assert second[0] == ChatRecord("system", "Summary of the earlier conversation: They asked about notice periods.")
+    assert second[1:] == list(chat_history[-7:])
+    assert llm_service.get_llm.return_value.ainvoke.await_count == 1
+    assert (await strategy.get_summary(chat_id))["covered"] == 33
+
+
+@pytest.mark.asyncio
+async def test_prompt_stays_bounded_for_long_chats(token_counter):
+    """Test that the supervisor prompt size does not grow with the conversation"""
+    # Arrange
+    prompt_service = PromptService(history_strategy=TokenBudgetStrategy(token_counter, max_tokens=200))
+
+    def build_state(turns: int):
+        worker_state = WorkerState(
+            input="Can I terminate an employee without notice?",
+            agents=[UUID("95e222ef-c637-42d3-a81e-955beeeb0ba2")],
+            chat_id=uuid4(),
+            company_id=uuid4(),
+            chat_history=[{"role": "human", "content": "question " * 10}] * turns,
+            user_id=uuid4()
+        )
+        return {"chat_id": worker_state.chat_id, "input": worker_state.input, "worker_state": worker_state}
+
+    # Act
+    short = await prompt_service.custom_prompt_template(build_state(2), "system", with_chat_history=True)
+    long = await prompt_service.custom_prompt_template(build_state(1000), "system", with_chat_history=True)
+
+    # Assert
+    assert len(short.messages) == 4
+    assert isinstance(short.messages[1], HumanMessage)
+    assert isinstance(long.messages[0], SystemMessage)
+    assert len(long.messages) == 2 + 200 // token_counter.count_message("question " * 10)
+
+
+@pytest.mark.asyncio
+async def test_warmup_loads_the_encoding_off_the_event_loop():
+    """Test that the lifespan warmup reads the encoding in a thread and requests reuse it"""
+    # Arrange
+    loaded_on = []
+    encoding = Mock()
+    encoding.encode.return_value = [1, 2, 3]
+
+    def get_encoding(name):
+        loaded_on.append(threading.current_thread())
+        return encoding
+
+    token_counter = TokenCounter(encoding_name="o200k_base")
+
+    # Act
+    with patch("src.workflow.services.token_counter.tiktoken.get_encoding", side_effect=get_encoding):
+        await token_counter.warmup()
+        tokens = token_counter.count("Can I terminate an employee without notice?")
+
+    # Assert
+    assert tokens == 3
+    assert len(loaded_on) == 1
+    assert loaded_on[0] is not threading.current_thread()
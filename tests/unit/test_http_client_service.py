@@ -0,0 +1,125 @@
+import asyncio
+import pytest
+import httpx
+from unittest.mock import patch
+
+from src.api.core.services.http_client_service import HttpClientService
+
+
+@pytest.fixture
+def requests_seen():
+    """Collects the requests received by the mock transport"""
+    return []
+
+
+@pytest.fixture
+def http_client_service(requests_seen):
+    """Create HttpClientService backed by a mock transport"""
+    def handler(request: httpx.Request):
+        requests_seen.append(request)
+        return httpx.Response(200, json={"host": request.url.host})
+
+    return HttpClientService(transport=httpx.MockTransport(handler))
+
+
+def test_get_client_reuses_client_per_origin(http_client_service):
+    """Test that requests to the same origin share one pooled client"""
+    # Act
+    first = http_client_service.get_client("https://agent.example.com/interactions/internal/interact")
+    second = http_client_service.get_client("https://agent.example.com/other")
+
+    # Assert
+    assert first is second
+
+
+def test_get_client_separates_origins(http_client_service):
+    """Test that each host gets its own connection pool"""
+    # Act
+    worker_client = http_client_service.get_client("https://agent.example.com/interact")
+    main_client = http_client_service.get_client("https://main.example.com/messages")
+
+    # Assert
+    assert worker_client is not main_client
+
+
+def test_pool_limits_are_configurable():
+    """Test that pool limits and keep-alive are read from the environment"""
+    # Arrange
+    with patch.dict("os.environ", {
+        "OUTBOUND_MAX_CONNECTIONS": "7",
+        "OUTBOUND_MAX_KEEPALIVE_CONNECTIONS": "3",
+        "OUTBOUND_KEEPALIVE_EXPIRY": "12.5",
+        "OUTBOUND_HTTP2": "false"
+    }):
+        # Act
+        service = HttpClientService()
+
+    # Assert
+    assert service.limits.max_connections == 7
+    assert service.limits.max_keepalive_connections == 3
+    assert service.limits.keepalive_expiry == 12.5
+    assert service.http2 is False
+
+
+@pytest.mark.asyncio
+async def test_post_routes_request_through_pooled_client(http_client_service, requests_seen):
+    """Test that post sends the request and returns the response"""
+    # Act
+    response = await http_client_service.post("https://agent.example.com/interact", json={"input": "hi"})
+
+    # Assert
+    assert response.status_code == 200
+    assert response.json() == {"host": "agent.example.com"}
+    assert len(requests_seen) == 1
+    assert requests_seen[0].method == "POST"
+
+
+@pytest.mark.asyncio
+async def test_aclose_closes_all_clients(http_client_service):
+    """Test that aclose shuts every pooled client down"""
+    # Arrange
+    worker_client = http_client_service.get_client("https://agent.example.com/interact")
+    main_client = http_client_service.get_client("https://main.example.com/messages")
+
+    # Act
+    await http_client_service.aclose()
+
+    # Assert
+    assert worker_client.is_closed
+    assert main_client.is_closed
+    assert http_client_service.get_client("https://agent.example.com/interact") is not worker_client
+
+
+@pytest.mark.asyncio
+async def test_stats_count_requests_in_flight_per_origin():
+    """Test that in-flight requests are counted per origin and released once answered"""
+    # Arrange
+    release = asyncio.Event()
+
+    async def handler(request: httpx.Request):
+        await release.wait()
+        return httpx.Response(200)
+
+    service = HttpClientService(transport=httpx.MockTransport(handler))
+    requests = [asyncio.create_task(service.post("https://agent.example.com/interact")) for _ in range(2)]
+    await asyncio.sleep(0)
+
+    # Act
+    during = service.stats()["https://agent.example.com"]["requests"]
+    release.set()
+    await asyncio.gather(*requests)
+
+    # Assert
+    assert during == 2
+    assert service.stats()["https://agent.example.com"]["requests"] == 0
+
+
+def test_http2_is_off_by_default():
+    """Test that HTTP/2 is only used when asked for, it needs the optional h2 package"""
+    # Arrange
+    with patch.dict("os.environ", {}, clear=True):
+        # Act
+        service = HttpClientService()
+
+    # Assert
+    assert service.http2 is False
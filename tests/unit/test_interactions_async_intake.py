@@ -0,0 +1,208 @@
+import pytest
+from unittest.mock import Mock, AsyncMock
+from uuid import UUID, uuid4
+from fastapi import FastAPI, BackgroundTasks, Request
+from fastapi.testclient import TestClient
+
+from src.dependencies.container import Container
+from src.api.core.middleware.auth_middleware import auth_middleware
+from src.api.core.services.rate_limiter_service import RateLimiterService
+from src.api.modules.interactions import interactions_routes
+from src.api.modules.interactions.interactions_controller import InteractionsController
+from src.api.modules.interactions.interactions_models import WorkerState
+from src.api.modules.interactions.worker_state_service import WorkerStateService
+from src.api.modules.websocket.websocket_service import WebsocketService
+from src.utils.logs.structured_logging import chat_id_var, company_id_var
+from src.workflow.state import create_state
+
+USER_ID = str(uuid4())
+COMPANY_ID = str(uuid4())
+
+
+@pytest.fixture
+def chat_id():
+    """Chat the interaction belongs to"""
+    return uuid4()
+
+
+@pytest.fixture
+def worker_state(chat_id):
+    """WorkerState returned by the main server"""
+    return WorkerState(
+        input="Can I terminate an employee without notice?",
+        agents=[UUID("95e222ef-c637-42d3-a81e-955beeeb0ba2")],
+        chat_id=chat_id,
+        company_id=COMPANY_ID,
+        chat_history=[],
+        user_id=USER_ID
+    )
+
+
+@pytest.fixture
+def worker_state_service(worker_state):
+    """Mock WorkerStateService answering with the worker state"""
+    service = Mock(spec=WorkerStateService)
+    service.get_worker_state = AsyncMock(return_value=worker_state)
+    return service
+
+
+@pytest.fixture
+def websocket_service():
+    """Mock WebsocketService recording progress events"""
+    service = Mock(spec=WebsocketService)
+    service.send_json = AsyncMock(return_value=True)
+    return service
+
+
+@pytest.fixture
+def graph():
+    """Mock compiled graph"""
+    graph = Mock()
+    graph.ainvoke = AsyncMock()
+    graph.checkpointer = None
+    return graph
+
+
+def intake_arguments(chat_id, graph, worker_state_service, websocket_service, **overrides):
+    return {
+        "chat_id": chat_id,
+        "user_id": USER_ID,
+        "company_id": COMPANY_ID,
+        "input": "Can I terminate an employee without notice?",
+        "graph": graph,
+        "worker_state_service": worker_state_service,
+        "websocket_service": websocket_service,
+        **overrides
+    }
+
+
+def test_async_request_returns_before_fetching_worker_state(chat_id, graph, worker_state_service, websocket_service):
+    """Test that the 202 body is built without waiting on the main server"""
+    # Arrange
+    background_tasks = BackgroundTasks()
+
+    # Act
+    accepted = InteractionsController.interact_async_request(
+        background_tasks=background_tasks,
+        **intake_arguments(chat_id, graph, worker_state_service, websocket_service)
+    )
+
+    # Assert
+    assert accepted.interaction_id
+    worker_state_service.get_worker_state.assert_not_called()
+    assert len(background_tasks.tasks) == 1
+
+
+@pytest.mark.asyncio
+async def test_run_intake_reports_progress_and_runs_graph(chat_id, graph, worker_state, worker_state_service, websocket_service):
+    """Test that the background intake fetches the context, runs the graph and reports progress"""
+    # Act
+    await InteractionsController.run_intake(
+        interaction_id="abc",
+        **intake_arguments(chat_id, graph, worker_state_service, websocket_service)
+    )
+
+    # Assert
+    state = graph.ainvoke.call_args.args[0]
+    assert state["worker_state"] == worker_state
+    events = [c.args[1]["status"] for c in websocket_service.send_json.call_args_list]
+    assert events == ["running", "completed"]
+    assert all(c.args[0] == chat_id for c in websocket_service.send_json.call_args_list)
+
+
+@pytest.mark.asyncio
+async def test_run_intake_reports_failure_and_releases_slot(chat_id, graph, worker_state_service, websocket_service):
+    """Test that a failed context fetch is reported and gives the admission slot back"""
+    # Arrange
+    worker_state_service.get_worker_state.side_effect = RuntimeError("main server down")
+    rate_limiter_service = Mock(spec=RateLimiterService)
+    rate_limiter_service.release_slot = AsyncMock()
+
+    # Act
+    await InteractionsController.run_intake(
+        interaction_id="abc",
+        **intake_arguments(chat_id, graph, worker_state_service, websocket_service, rate_limiter_service=rate_limiter_service)
+    )
+
+    # Assert
+    graph.ainvoke.assert_not_called()
+    rate_limiter_service.release_slot.assert_awaited_once()
+    websocket_service.send_json.assert_awaited_once_with(chat_id, {
+        "interaction_id": "abc",
+        "status": "failed",
+        "error": "context_unavailable"
+    })
+
+
+@pytest.mark.asyncio
+async def test_run_graph_binds_the_interaction_log_context(chat_id, graph, worker_state):
+    """Test that graph runs scheduled by the sync route log with their chat and company"""
+    # Arrange
+    bound = {}
+
+    async def ainvoke(state, *args):
+        bound.update(chat_id=chat_id_var.get(), company_id=company_id_var.get())
+
+    graph.ainvoke.side_effect = ainvoke
+
+    # Act
+    await InteractionsController.run_graph(graph, create_state(worker_state, deadline=0))
+
+    # Assert
+    assert bound == {"chat_id": str(chat_id), "company_id": COMPANY_ID}
+    assert chat_id_var.get() is None
+
+
+@pytest.mark.asyncio
+async def test_run_graph_skips_the_checkpointer(graph, worker_state):
+    """Test that runs outside the job queue are not checkpointed, nothing would resume them"""
+    # Arrange
+    graph.checkpointer = Mock()
+    unchecked = Mock()
+    unchecked.ainvoke = AsyncMock()
+    graph.copy = Mock(return_value=unchecked)
+    state = create_state(worker_state, deadline=0)
+
+    # Act
+    await InteractionsController.run_graph(graph, state)
+
+    # Assert
+    graph.copy.assert_called_once_with({"checkpointer": None})
+    unchecked.ainvoke.assert_awaited_once_with(state)
+    graph.ainvoke.assert_not_awaited()
+
+
+def test_async_route_accepts_with_interaction_id(chat_id, graph, worker_state_service, websocket_service):
+    """Test that the async route answers 202 with the interaction id used in progress events"""
+    # Arrange
+    app = FastAPI()
+    app.include_router(interactions_routes.router)
+
+    async def fake_auth(req: Request):
+        req.state.user = USER_ID
+        req.state.company = COMPANY_ID
+
+    app.dependency_overrides[auth_middleware] = fake_auth
+    for key, instance in {
+        "graph": graph,
+        "job_queue": None,
+        "rate_limiter_service": None,
+        "worker_state_service": worker_state_service,
+        "websocket_service": websocket_service
+    }.items():
+        Container.register(key, instance)
+
+    try:
+        # Act
+        response = TestClient(app).post(
+            f"/interactions/secure/{chat_id}/async",
+            json={"input": "Hello"},
+            headers={"Authorization": "Bearer token"}
+        )
+    finally:
+        Container.clear()
+
+    # Assert
+    assert response.status_code == 202
+    interaction_id = response.json()["interaction_id"]
+    assert websocket_service.send_json.call_args_list[-1].args[1] == {"interaction_id": interaction_id, "status": "completed"}
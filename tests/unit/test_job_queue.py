@@ -0,0 +1,178 @@
+import asyncio
+import pytest
+from uuid import UUID, uuid4
+from fakeredis import FakeAsyncRedis
+
+from src.api.core.services.redis_service import RedisService
+from src.api.modules.interactions.interactions_models import WorkerState
+from src.workflow.jobs.job_models import InteractionJob
+from src.workflow.jobs.job_queue import InMemoryJobQueue, RedisJobQueue
+
+PRIORITY_COMPANY_ID = str(uuid4())
+
+
+def build_job(text: str, company_id: str = None) -> InteractionJob:
+    worker_state = WorkerState(
+        input=text,
+        agents=[UUID("95e222ef-c637-42d3-a81e-955beeeb0ba2")],
+        chat_id=uuid4(),
+        company_id=company_id or uuid4(),
+        chat_history=[],
+        user_id=uuid4()
+    )
+    return InteractionJob(deadline=0, worker_state=worker_state)
+
+
+@pytest.fixture(params=["memory", "redis"])
+def job_queue(request):
+    """Job queue for each backend, the redis one running on fakeredis"""
+    options = {"company_priorities": {PRIORITY_COMPANY_ID: 0}, "max_attempts": 2}
+    if request.param == "memory":
+        return InMemoryJobQueue(**options)
+    return RedisJobQueue(redis_service=RedisService(client=FakeAsyncRedis()), lease_seconds=0, **options)
+
+
+async def enqueue(job_queue, job: InteractionJob) -> InteractionJob:
+    job.priority = job_queue.get_priority(job.worker_state.company_id)
+    await job_queue.enqueue(job)
+    return job
+
+
+@pytest.mark.asyncio
+async def test_dequeue_serves_priority_companies_first(job_queue):
+    """Test that prioritised companies jump the queue and others stay in FIFO order"""
+    # Arrange
+    await enqueue(job_queue, build_job("first"))
+    await enqueue(job_queue, build_job("second"))
+    await enqueue(job_queue, build_job("priority", company_id=PRIORITY_COMPANY_ID))
+
+    # Act
+    order = [(await job_queue.dequeue(timeout=0.1)).worker_state.input for _ in range(3)]
+
+    # Assert
+    assert order == ["priority", "first", "second"]
+    assert await job_queue.depth() == 0
+
+
+@pytest.mark.asyncio
+async def test_dequeue_times_out_on_empty_queue(job_queue):
+    """Test that an idle consumer gets None back after the timeout"""
+    # Act
+    job = await job_queue.dequeue(timeout=0.05)
+
+    # Assert
+    assert job is None
+
+
+@pytest.mark.asyncio
+async def test_ack_releases_the_lease(job_queue):
+    """Test that a leased job is in flight until acked"""
+    # Arrange
+    await enqueue(job_queue, build_job("Hello"))
+    job = await job_queue.dequeue(timeout=0.1)
+
+    # Act
+    in_flight = await job_queue.in_flight()
+    await job_queue.ack(job)
+
+    # Assert
+    assert in_flight == 1
+    assert await job_queue.in_flight() == 0
+    assert job.attempts == 1
+
+
+@pytest.mark.asyncio
+async def test_fail_requeues_until_max_attempts(job_queue):
+    """Test that failed jobs are retried and dropped once attempts run out"""
+    # Arrange
+    await enqueue(job_queue, build_job("Hello"))
+
+    # Act
+    first = await job_queue.dequeue(timeout=0.1)
+    retried = await job_queue.fail(first)
+    second = await job_queue.dequeue(timeout=0.1)
+    dropped = not await job_queue.fail(second)
+
+    # Assert
+    assert retried and dropped
+    assert second.job_id == first.job_id
+    assert second.deadline > 0
+    assert await job_queue.depth() == 0
+
+
+@pytest.mark.asyncio
+async def test_recover_requeues_expired_leases():
+    """Test that jobs leased by a dead worker go back to the queue"""
+    # Arrange
+    job_queue = RedisJobQueue(redis_service=RedisService(client=FakeAsyncRedis()), lease_seconds=0)
+    await job_queue.enqueue(build_job("Hello"))
+    leased = await job_queue.dequeue(timeout=0.1)
+
+    # Act
+    recovered = await job_queue.recover()
+    job = await job_queue.dequeue(timeout=0.1)
+
+    # Assert
+    assert recovered == 1
+    assert job.job_id == leased.job_id
+    assert job.attempts == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_dequeues_lease_every_popped_job():
+    """Test that workers polling together never share a job and every popped job is leased"""
+    # Arrange
+    job_queue = RedisJobQueue(redis_service=RedisService(client=FakeAsyncRedis()), poll_interval=0.01)
+    for index in range(5):
+        await job_queue.enqueue(build_job(f"Hello {index}"))
+
+    # Act
+    dequeued = await asyncio.gather(*(job_queue.dequeue(timeout=0.05) for _ in range(8)))
+
+    # Assert
+    leased = [job.job_id for job in dequeued if job is not None]
+    assert len(leased) == len(set(leased)) == 5
+    assert await job_queue.in_flight() == 5
+    assert await job_queue.depth() == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_recovers_requeue_a_job_once():
+    """Test that two pools recovering the same expired lease requeue the job only once"""
+    # Arrange
+    redis_service = RedisService(client=FakeAsyncRedis())
+    first = RedisJobQueue(redis_service=redis_service, lease_seconds=0)
+    second = RedisJobQueue(redis_service=redis_service, lease_seconds=0)
+    await first.enqueue(build_job("Hello"))
+    await first.dequeue(timeout=0.1)
+
+    # Act
+    recovered = await asyncio.gather(first.recover(), second.recover())
+
+    # Assert
+    assert sum(recovered) == 1
+    assert await first.depth() == 1
+
+
+@pytest.mark.asyncio
+async def test_renew_keeps_a_running_job_from_being_recovered():
+    """Test that a renewed lease is not recovered and a recovered lease cannot be renewed"""
+    # Arrange
+    redis_service = RedisService(client=FakeAsyncRedis())
+    expiring = RedisJobQueue(redis_service=redis_service, lease_seconds=0)
+    renewing = RedisJobQueue(redis_service=redis_service, lease_seconds=60)
+    await expiring.enqueue(build_job("Hello"))
+    await expiring.enqueue(build_job("World"))
+    renewed_job = await expiring.dequeue(timeout=0.1)
+    lost_job = await expiring.dequeue(timeout=0.1)
+
+    # Act
+    renewed = await renewing.renew(renewed_job)
+    recovered = await expiring.recover()
+    lost = await renewing.renew(lost_job)
+
+    # Assert
+    assert renewed is True
+    assert recovered == 1
+    assert lost is False
+    assert await expiring.in_flight() == 1
@@ -0,0 +1,87 @@
+import pytest
+import httpx
+from unittest.mock import patch
+from uuid import UUID, uuid4
+
+from src.workflow.agents.supervisor.supervisor_agent import Supervisor
+from src.workflow.services.fake_chat_model import FakeChatModel
+from src.workflow.services.llm_service import LlmService
+from src.workflow.services.prompt_service import PromptService
+
+ENVIRONMENT = {"OPENAI_API_KEY": "sk-test"}
+
+
+def test_clients_are_pooled_by_configuration():
+    """Test that one client is built per model, temperature and max_tokens"""
+    # Arrange
+    service = LlmService(model="gpt-4o", backend="openai")
+
+    # Act
+    with patch.dict("os.environ", ENVIRONMENT):
+        first = service.get_llm(temperature=0.1)
+        second = service.get_llm(temperature=0.1)
+        other_temperature = service.get_llm(temperature=0)
+        other_model = service.get_llm(temperature=0.1, model="gpt-4o-mini")
+
+    # Assert
+    assert first is second
+    assert first is not other_temperature and first is not other_model
+    assert other_model.model_name == "gpt-4o-mini"
+    assert service.stats()["clients"] == 3
+
+
+def test_clients_share_one_connection_pool():
+    """Test that every OpenAI client uses the service's http client"""
+    # Arrange
+    service = LlmService(backend="openai")
+
+    # Act
+    with patch.dict("os.environ", ENVIRONMENT):
+        clients = [service.get_llm(temperature=0.1), service.get_llm(temperature=0, max_tokens=300)]
+
+    # Assert
+    assert all(client.http_async_client is service.get_http_async_client() for client in clients)
+
+
+@pytest.mark.asyncio
+async def test_warmup_opens_a_pooled_connection():
+    """Test that warmup builds the request path clients and reaches the API once"""
+    # Arrange
+    requests = []
+
+    def handler(request: httpx.Request):
+        requests.append(request)
+        return httpx.Response(200, json={"data": []})
+
+    service = LlmService(backend="openai", http_async_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+    # Act
+    with patch.dict("os.environ", ENVIRONMENT):
+        await service.warmup()
+    await service.aclose()
+
+    # Assert
+    assert [request.url.path for request in requests] == ["/v1/models"]
+    assert service.stats()["clients"] == 0
+
+
+@pytest.mark.asyncio
+async def test_fake_backend_routes_the_supervisor_offline():
+    """Test that the fake model answers structured supervisor calls from the prompt"""
+    # Arrange
+    llm_service = LlmService(backend="fake", fake_latency=0)
+    supervisor = Supervisor(PromptService(), llm_service)
+    state = {
+        "input": "Show me our revenue trends",
+        "chat_id": uuid4(),
+        "available_agents": [UUID("99b5792d-c38a-4e49-9207-a3fa547905ae")]
+    }
+
+    # Act
+    response = await supervisor.interact(state)
+
+    # Assert
+    assert response.selected_agents == ["99b5792d-c38a-4e49-9207-a3fa547905ae"]
+    llm = llm_service.get_llm(temperature=0.1)
+    assert isinstance(llm, FakeChatModel)
+    assert llm.calls == 1
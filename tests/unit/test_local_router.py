@@ -0,0 +1,122 @@
+import pytest
+from unittest.mock import Mock
+from uuid import uuid4
+
+from src.workflow.agents.supervisor.local_router import LocalRouter, RegistryLocalRouter, TfidfLocalRouter
+from src.workflow.agents.supervisor.supervisor_agent import Supervisor
+from src.workflow.agents.supervisor.supervisor_models import AgentRegistryConfig, SupervisorOutput, LocalRouteDecision
+from src.workflow.services.agent_registry_service import AgentRegistryService
+
+LEGAL_AGENT_ID = "95e222ef-c637-42d3-a81e-955beeeb0ba2"
+ACCOUNTING_AGENT_ID = "99b5792d-c38a-4e49-9207-a3fa547905ae"
+
+
+@pytest.fixture
+def router():
+    """TfidfLocalRouter built from the default agents file"""
+    return TfidfLocalRouter(AgentRegistryService.from_file().get_config())
+
+
+def test_route_selects_legal_agent_for_legal_query(router):
+    """Test that an unambiguous legal query is routed locally"""
+    # Act
+    decision = router.route("What does the labor law say about overtime?")
+
+    # Assert
+    assert decision.selected_agents == [LEGAL_AGENT_ID]
+    assert decision.confidence >= router.min_confidence
+
+
+def test_route_selects_accounting_agent_for_spanish_query(router):
+    """Test that accented Spanish input is normalised and routed"""
+    # Act
+    decision = router.route("¿Cuáles fueron nuestros ingresos y gastos del año pasado?")
+
+    # Assert
+    assert decision.selected_agents == [ACCOUNTING_AGENT_ID]
+
+
+def test_route_selects_no_agent_for_it_support_query(router):
+    """Test that support questions resolve to an empty selection"""
+    # Act
+    decision = router.route("How do I change my account password?")
+
+    # Assert
+    assert decision.selected_agents == []
+
+
+def test_route_defers_when_query_spans_agents(router):
+    """Test that mixed legal and financial queries fall back to the LLM"""
+    # Act
+    decision = router.route("Does the law require us to keep financial reports for five years?")
+
+    # Assert
+    assert decision is None
+
+
+def test_route_defers_on_unknown_vocabulary(router):
+    """Test that queries without known terms fall back to the LLM"""
+    # Act & Assert
+    assert router.route("What's the weather like tomorrow?") is None
+
+
+def test_route_defers_when_agent_not_available(router):
+    """Test that a confident pick outside the company's agents falls back to the LLM"""
+    # Act
+    decision = router.route("What does the labor law say about overtime?", available_agents=[ACCOUNTING_AGENT_ID])
+
+    # Assert
+    assert decision is None
+
+
+def test_registry_router_follows_registry_reloads():
+    """Test that agents added to the registry are routed locally once it reloads"""
+    # Arrange
+    registry = AgentRegistryService.from_file()
+    router = RegistryLocalRouter(registry)
+    config = registry.get_config().model_dump()
+    config["agents"].append({
+        "agent_id": "3c0c8f1e-55d4-4a4e-8a57-8b7c0d2f4e90",
+        "name": "HR Agent",
+        "description": "Recruiting, onboarding, vacation and benefits policies.",
+        "keywords": ["vacation", "onboarding", "recruiting", "benefits", "hiring", "vacaciones"]
+    })
+
+    # Act
+    before = router.route("How many vacation days do new hires get during onboarding?")
+    registry.load(AgentRegistryConfig(**config))
+    after = router.route("How many vacation days do new hires get during onboarding?")
+
+    # Assert
+    assert before is None
+    assert after.selected_agents == ["3c0c8f1e-55d4-4a4e-8a57-8b7c0d2f4e90"]
+
+
+@pytest.mark.asyncio
+async def test_supervisor_skips_llm_on_confident_local_route():
+    """Test that a confident local decision short-circuits the supervisor LLM"""
+    # Arrange
+    local_router = Mock()
+    local_router.route = Mock(return_value=LocalRouteDecision(selected_agents=[LEGAL_AGENT_ID], confidence=1.0))
+    llm_service = Mock()
+    supervisor = Supervisor(Mock(), llm_service, local_router=local_router)
+    state = {"input": "Can I fire someone?", "chat_id": uuid4(), "available_agents": [LEGAL_AGENT_ID]}
+
+    # Act
+    result = await supervisor.interact(state)
+
+    # Assert
+    assert result == SupervisorOutput(selected_agents=[LEGAL_AGENT_ID])
+    local_router.route.assert_called_once_with("Can I fire someone?", [LEGAL_AGENT_ID])
+    llm_service.get_llm.assert_not_called()
+
+
+def test_local_router_subclasses_must_implement_route():
+    """Test that a router without route() fails at construction instead of on the first request"""
+    # Arrange
+    class IncompleteRouter(LocalRouter):
+        pass
+
+    # Act & Assert
+    with pytest.raises(TypeError):
+        IncompleteRouter()
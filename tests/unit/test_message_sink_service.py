@@ -0,0 +1,268 @@
+import json
+import asyncio
+import pytest
+import httpx
+from unittest.mock import patch
+from uuid import uuid4
+
+from src.api.core.services.http_client_service import HttpClientService
+from src.workflow.services.message_sink_service import MessageSinkService
+
+ENVIRONMENT = {
+    "HMAC_SECRET": "test-secret",
+    "MAIN_SERVER_ENDPOINT": "main.test"
+}
+
+
+@pytest.fixture
+def batches():
+    """Collects the message batches received by the main server"""
+    return []
+
+
+@pytest.fixture
+def responses():
+    """Status codes returned by the main server, 201 once exhausted"""
+    return []
+
+
+@pytest.fixture
+def paths():
+    """Paths of the requests received by the main server"""
+    return []
+
+
+@pytest.fixture
+def http_client_service(batches, responses, paths):
+    """HttpClientService backed by a mock main server, with the batch and the per-chat endpoints"""
+    def handler(request: httpx.Request):
+        paths.append(request.url.path)
+        status = responses.pop(0) if responses else 201
+        if status < 300:
+            body = json.loads(request.content)
+            if request.url.path.endswith("/batch"):
+                batches.append(body["messages"])
+            else:
+                batches.append([{"chat_id": request.url.path.rsplit("/", 1)[-1], **body}])
+        return httpx.Response(status)
+
+    return HttpClientService(transport=httpx.MockTransport(handler))
+
+
+@pytest.mark.asyncio
+async def test_enqueue_does_not_wait_for_the_main_server(http_client_service, batches):
+    """Test that enqueue returns before anything is sent"""
+    # Arrange
+    sink = MessageSinkService(http_client_service)
+
+    # Act
+    sink.enqueue(chat_id=uuid4(), sender=uuid4(), message_type="human", text="Hello")
+
+    # Assert
+    assert batches == []
+    assert sink.stats()["depth"] == 1
+
+
+@pytest.mark.asyncio
+async def test_messages_are_sent_in_batches_in_order(http_client_service, batches):
+    """Test that queued messages across chats are flushed in bulk to the batch endpoint, preserving order"""
+    # Arrange
+    sink = MessageSinkService(http_client_service, batch_size=3, flush_interval=0.05, batch_endpoint=True)
+    chat_ids = [uuid4(), uuid4()]
+
+    # Act
+    with patch.dict("os.environ", ENVIRONMENT):
+        await sink.start()
+        for index in range(5):
+            sink.enqueue(chat_id=chat_ids[index % 2], sender=uuid4(), message_type="ai", text=str(index))
+        await asyncio.sleep(0.2)
+        await sink.aclose()
+
+    # Assert
+    assert [len(batch) for batch in batches] == [3, 2]
+    assert [message["text"] for batch in batches for message in batch] == ["0", "1", "2", "3", "4"]
+    assert batches[0][1]["chat_id"] == str(chat_ids[1])
+    assert sink.stats()["persisted"] == 5
+
+
+@pytest.mark.asyncio
+async def test_failed_batches_are_retried_with_backoff(http_client_service, batches, responses):
+    """Test that server errors are retried until the batch is accepted"""
+    # Arrange
+    responses.extend([503, 500])
+    sink = MessageSinkService(http_client_service, retry_backoff=0)
+    sink.enqueue(chat_id=uuid4(), sender=uuid4(), message_type="human", text="Hello")
+
+    # Act
+    with patch.dict("os.environ", ENVIRONMENT):
+        await sink.aclose()
+
+    # Assert
+    assert len(batches) == 1
+    assert sink.stats()["retries"] == 2
+    assert sink.stats()["failed"] == 0
+
+
+@pytest.mark.asyncio
+async def test_batches_are_dropped_after_max_retries(http_client_service, batches, responses):
+    """Test that a batch is counted as failed once retries are exhausted"""
+    # Arrange
+    responses.extend([500, 500, 500])
+    sink = MessageSinkService(http_client_service, max_retries=2, retry_backoff=0)
+    sink.enqueue(chat_id=uuid4(), sender=uuid4(), message_type="human", text="Hello")
+
+    # Act
+    with patch.dict("os.environ", ENVIRONMENT):
+        await sink.aclose()
+
+    # Assert
+    assert batches == []
+    assert sink.stats()["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_aclose_flushes_pending_messages(http_client_service, batches):
+    """Test that shutdown persists messages still waiting for the flush interval"""
+    # Arrange
+    sink = MessageSinkService(http_client_service, flush_interval=60)
+
+    # Act
+    with patch.dict("os.environ", ENVIRONMENT):
+        await sink.start()
+        sink.enqueue(chat_id=uuid4(), sender=uuid4(), message_type="human", text="Hello")
+        sink.enqueue(chat_id=uuid4(), sender=uuid4(), message_type="ai", text="Hi")
+        await asyncio.sleep(0)
+        await sink.aclose()
+
+    # Assert
+    assert [message["text"] for batch in batches for message in batch] == ["Hello", "Hi"]
+    assert sink.stats()["depth"] == 0
+
+
+@pytest.mark.asyncio
+async def test_messages_go_to_the_per_chat_endpoint_by_default(http_client_service, batches, paths):
+    """Test that without the batch endpoint each message is posted to its chat, in order within the chat"""
+    # Arrange
+    sink = MessageSinkService(http_client_service)
+    chat_ids = [uuid4(), uuid4()]
+    for index in range(4):
+        sink.enqueue(chat_id=chat_ids[index % 2], sender=uuid4(), message_type="ai", text=str(index))
+
+    # Act
+    with patch.dict("os.environ", ENVIRONMENT):
+        await sink.aclose()
+
+    # Assert
+    assert sorted(paths) == sorted(f"/messages/internal/{chat_ids[index % 2]}" for index in range(4))
+    for chat_id in chat_ids:
+        texts = [message["text"] for batch in batches for message in batch if message["chat_id"] == str(chat_id)]
+        assert texts == sorted(texts)
+    assert sink.stats()["persisted"] == 4
+
+
+@pytest.mark.asyncio
+async def test_client_errors_are_not_retried(http_client_service, batches, responses, paths):
+    """Test that a 4xx is final, only its message is dropped and the rest are persisted"""
+    # Arrange
+    responses.extend([422])
+    sink = MessageSinkService(http_client_service, retry_backoff=0)
+    chat_id = uuid4()
+    sink.enqueue(chat_id=chat_id, sender=uuid4(), message_type="human", text="Rejected")
+    sink.enqueue(chat_id=chat_id, sender=uuid4(), message_type="ai", text="Accepted")
+
+    # Act
+    with patch.dict("os.environ", ENVIRONMENT):
+        await sink.aclose()
+
+    # Assert
+    assert len(paths) == 2
+    assert [message["text"] for batch in batches for message in batch] == ["Accepted"]
+    assert sink.stats()["retries"] == 0
+    assert (sink.stats()["failed"], sink.stats()["persisted"]) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_missing_batch_endpoint_falls_back_to_per_chat(http_client_service, batches, responses, paths):
+    """Test that a main server without the batch endpoint still receives every message"""
+    # Arrange
+    responses.extend([404])
+    sink = MessageSinkService(http_client_service, retry_backoff=0, batch_endpoint=True)
+    sink.enqueue(chat_id=uuid4(), sender=uuid4(), message_type="human", text="Hello")
+
+    # Act
+    with patch.dict("os.environ", ENVIRONMENT):
+        await sink.aclose()
+
+    # Assert
+    assert paths[0] == "/messages/internal/batch"
+    assert paths[1].startswith("/messages/internal/") and len(paths) == 2
+    assert [message["text"] for batch in batches for message in batch] == ["Hello"]
+    assert sink.batch_endpoint is False
+    assert sink.stats()["failed"] == 0
+
+
+@pytest.mark.asyncio
+async def test_full_queue_drops_and_counts_messages(http_client_service):
+    """Test that messages beyond the queue bound are dropped instead of growing the backlog"""
+    # Arrange
+    sink = MessageSinkService(http_client_service, max_queue_size=2)
+
+    # Act
+    for index in range(3):
+        sink.enqueue(chat_id=uuid4(), sender=uuid4(), message_type="ai", text=str(index))
+
+    # Assert
+    assert sink.stats()["depth"] == 2
+    assert sink.stats()["dropped"] == 1
+
+
+@pytest.mark.asyncio
+async def test_retrying_chat_does_not_hold_back_other_chats():
+    """Test that a chat waiting on retries leaves the messages of other chats free to go"""
+    # Arrange
+    failing_chat_id, chat_id = uuid4(), uuid4()
+    persisted = []
+
+    def handler(request: httpx.Request):
+        if request.url.path.endswith(str(failing_chat_id)):
+            return httpx.Response(503)
+        persisted.append(json.loads(request.content)["text"])
+        return httpx.Response(201)
+
+    sink = MessageSinkService(HttpClientService(transport=httpx.MockTransport(handler)), flush_interval=0.01, max_retries=3, retry_backoff=0.2)
+
+    # Act
+    with patch.dict("os.environ", ENVIRONMENT):
+        await sink.start()
+        sink.enqueue(chat_id=failing_chat_id, sender=uuid4(), message_type="ai", text="Stuck")
+        await asyncio.sleep(0.05)
+        sink.enqueue(chat_id=chat_id, sender=uuid4(), message_type="ai", text="Hello")
+        flushed = await asyncio.wait_for(sink.flush(chat_id), timeout=0.5)
+        retries_so_far = sink.stats()["retries"]
+        await sink.aclose()
+
+    # Assert
+    assert flushed is True
+    assert persisted == ["Hello"]
+    assert retries_so_far < 3
+    assert sink.stats()["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_flush_reports_dropped_messages(http_client_service, responses):
+    """Test that flush waits for the chat's messages and reports whether they were persisted"""
+    # Arrange
+    responses.extend([422])
+    sink = MessageSinkService(http_client_service, retry_backoff=0)
+    rejected_chat_id, chat_id = uuid4(), uuid4()
+    sink.enqueue(chat_id=rejected_chat_id, sender=uuid4(), message_type="ai", text="Rejected")
+
+    # Act
+    with patch.dict("os.environ", ENVIRONMENT):
+        rejected = await sink.flush(rejected_chat_id)
+        sink.enqueue(chat_id=chat_id, sender=uuid4(), message_type="ai", text="Accepted")
+        accepted = await sink.flush(chat_id)
+
+    # Assert
+    assert (rejected, accepted) == (False, True)
+    assert sink.stats()["depth"] == 0
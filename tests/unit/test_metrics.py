@@ -0,0 +1,173 @@
+import pytest
+import httpx
+from unittest.mock import Mock, AsyncMock, patch
+from uuid import UUID, uuid4
+
+from src.api.core.services.http_client_service import HttpClientService
+from src.api.core.services.metrics_service import MetricsService
+from src.api.core.services.rate_limiter_service import RateLimiterService
+from src.api.modules.interactions.interactions_models import WorkerState
+from src.api.modules.websocket.websocket_service import WebsocketService
+from src.utils.metrics.metrics import REGISTRY, MetricsRegistry
+from src.workflow.agents.supervisor.supervisor_agent import Supervisor
+from src.workflow.agents.supervisor.supervisor_models import SupervisorOutput
+from src.workflow.orchestrator.deadline import Deadline
+from src.workflow.orchestrator.orchestrator import Orchestrator
+from src.workflow.services.llm_service import LlmService
+from src.workflow.services.message_sink_service import MessageSinkService
+from src.workflow.services.prompt_service import PromptService
+from src.workflow.state import create_state
+
+AGENT_ID = "95e222ef-c637-42d3-a81e-955beeeb0ba2"
+
+ENVIRONMENT = {
+    "WORKER_HOST": ".workers.test",
+    "HMAC_SECRET": "test-secret",
+    "MAIN_SERVER_ENDPOINT": "main.test"
+}
+
+
+@pytest.fixture
+def state():
+    """Graph state routed to one agent"""
+    worker_state = WorkerState(
+        input="Can I terminate an employee without notice?",
+        agents=[UUID(AGENT_ID)],
+        chat_id=uuid4(),
+        company_id=uuid4(),
+        chat_history=[],
+        user_id=uuid4()
+    )
+    return {**create_state(worker_state, Deadline.after(5).expires_at), "selected_agents": [AGENT_ID]}
+
+
+def sample(lines, name: str, **labels) -> float:
+    rendered = ",".join(f'{key}="{value}"' for key, value in labels.items())
+    prefix = f"{name}{{{rendered}}} " if labels else f"{name} "
+    return float(next(line for line in lines if line.startswith(prefix)).split(" ")[-1])
+
+
+def test_histogram_exposition_format():
+    """Test that histograms render cumulative buckets, sum and count in the Prometheus text format"""
+    # Arrange
+    registry = MetricsRegistry()
+    histogram = registry.histogram("request_seconds", "Request duration", ["route"], buckets=(0.1, 1.0))
+
+    # Act
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.labels("llm").observe(value)
+    lines = registry.render()
+
+    # Assert
+    assert lines == [
+        "# HELP request_seconds Request duration",
+        "# TYPE request_seconds histogram",
+        'request_seconds_bucket{route="llm",le="0.1"} 2',
+        'request_seconds_bucket{route="llm",le="1.0"} 3',
+        'request_seconds_bucket{route="llm",le="+Inf"} 4',
+        'request_seconds_sum{route="llm"} 3.65',
+        'request_seconds_count{route="llm"} 4'
+    ]
+    assert registry.histogram("request_seconds", "Registered again") is histogram
+
+
+@pytest.mark.asyncio
+async def test_supervisor_records_routing_latency_and_decisions(state):
+    """Test that each routing is timed by router and counted per selected agent"""
+    # Arrange
+    supervisor = Supervisor(PromptService(), LlmService(backend="fake", fake_latency=0))
+    before = REGISTRY.render()
+    decisions = sample(before, "supervisor_routing_decisions_total", agent_id=AGENT_ID) if any(AGENT_ID in line for line in before) else 0
+
+    # Act
+    await supervisor.interact(state)
+    lines = REGISTRY.render()
+
+    # Assert
+    assert sample(lines, "supervisor_routing_decisions_total", agent_id=AGENT_ID) == decisions + 1
+    assert sample(lines, "supervisor_routing_seconds_count", route="llm") >= 1
+
+
+@pytest.mark.asyncio
+async def test_worker_agent_latency_is_recorded_by_outcome(state):
+    """Test that worker agent calls are timed per agent, failures under their own outcome"""
+    # Arrange
+    def handler(request: httpx.Request):
+        if request.url.host == "main.test":
+            return httpx.Response(201)
+        return httpx.Response(500)
+
+    http_client_service = HttpClientService(transport=httpx.MockTransport(handler))
+    websocket_service = Mock(spec=WebsocketService)
+    websocket_service.send_json = AsyncMock(return_value=True)
+    message_sink_service = MessageSinkService(http_client_service)
+    with patch.dict("os.environ", ENVIRONMENT):
+        orchestrator = Orchestrator(websocket_service, http_client_service, message_sink_service)
+
+    # Act
+    with patch.dict("os.environ", ENVIRONMENT):
+        await orchestrator.orchestrate(state=state, worker_state=state["worker_state"])
+        await message_sink_service.aclose()
+    lines = REGISTRY.render()
+
+    # Assert
+    assert sample(lines, "worker_agent_request_seconds_count", agent_id=AGENT_ID, outcome="error") >= 1
+    assert sample(lines, "message_persist_seconds_count", outcome="ok") >= 1
+
+
+@pytest.mark.asyncio
+async def test_metrics_service_reads_service_stats_at_scrape_time():
+    """Test that connections, admission and outbound pools are collected from the services when scraped"""
+    # Arrange
+    websocket_service = Mock(spec=WebsocketService)
+    websocket_service.active_connections = {"a": Mock(), "b": Mock()}
+    websocket_service.queue_stats.return_value = {
+        "a": {"depth": 3, "max_depth": 256, "sent": 10, "dropped": 1, "coalesced": 2},
+        "b": {"depth": 1, "max_depth": 256, "sent": 5, "dropped": 0, "coalesced": 0}
+    }
+    websocket_service.message_totals.return_value = {"sent": 40, "dropped": 1, "coalesced": 2}
+    websocket_service.cluster_mode = True
+    websocket_service.listener_stats.return_value = {"connected": 1, "reconnects": 3, "bad_messages": 0}
+    rate_limiter_service = Mock(spec=RateLimiterService)
+    rate_limiter_service.stats = AsyncMock(return_value={"in_flight": 7, "max_in_flight": 100, "limited": 2, "shed": 1})
+    http_client_service = Mock(spec=HttpClientService)
+    http_client_service.stats.return_value = {"https://main.test": {"requests": 25, "max_connections": 100}}
+    metrics_service = MetricsService(
+        websocket_service=websocket_service,
+        rate_limiter_service=rate_limiter_service,
+        http_client_service=http_client_service,
+        registry=MetricsRegistry()
+    )
+
+    # Act
+    lines = (await metrics_service.render()).splitlines()
+
+    # Assert
+    assert sample(lines, "websocket_active_connections") == 2
+    assert sample(lines, "websocket_send_queue_depth") == 4
+    assert sample(lines, "websocket_messages_total", outcome="dropped") == 1
+    assert sample(lines, "websocket_messages_total", outcome="sent") == 40
+    assert sample(lines, "websocket_pubsub_reconnects_total") == 3
+    assert sample(lines, "admission_slots_in_use") == 7
+    assert sample(lines, "admission_rejected_total", reason="shed") == 1
+    assert sample(lines, "outbound_pool_utilisation", origin="https://main.test") == 0.25
+    assert "# TYPE websocket_active_connections gauge" in lines
+
+
+@pytest.mark.asyncio
+async def test_supervisor_labels_unknown_agents_as_unknown(state):
+    """Test that agent ids the registry does not know are counted under one label"""
+    # Arrange
+    supervisor = Supervisor(PromptService(), LlmService(backend="fake", fake_latency=0))
+    hallucinated = str(uuid4())
+    before = REGISTRY.render()
+    unknown = sample(before, "supervisor_routing_decisions_total", agent_id="unknown") if any('"unknown"' in line for line in before) else 0
+
+    # Act
+    with patch.object(Supervisor, "_Supervisor__select_agents", AsyncMock(return_value=(SupervisorOutput(selected_agents=[hallucinated]), "llm"))):
+        await supervisor.interact(state)
+    lines = REGISTRY.render()
+
+    # Assert
+    assert sample(lines, "supervisor_routing_decisions_total", agent_id="unknown") == unknown + 1
+    assert not any(hallucinated in line for line in lines)
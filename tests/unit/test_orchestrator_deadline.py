@@ -0,0 +1,121 @@
+import time
+import asyncio
+import pytest
+import httpx
+from unittest.mock import Mock, AsyncMock, patch
+from uuid import UUID, uuid4
+
+from src.workflow.orchestrator.orchestrator import Orchestrator
+from src.api.core.services.http_client_service import HttpClientService
+from src.api.modules.interactions.interactions_models import WorkerState
+from src.api.modules.websocket.websocket_service import WebsocketService
+from src.workflow.services.message_sink_service import MessageSinkService
+
+FAST_AGENT_ID = "95e222ef-c637-42d3-a81e-955beeeb0ba2"
+SLOW_AGENT_ID = "99b5792d-c38a-4e49-9207-a3fa547905ae"
+
+ENVIRONMENT = {
+    "WORKER_HOST": ".workers.test",
+    "HMAC_SECRET": "test-secret"
+}
+
+
+@pytest.fixture
+def websocket_service():
+    """Mock WebsocketService delivering to the chat socket"""
+    service = Mock(spec=WebsocketService)
+    service.send_json = AsyncMock(return_value=True)
+    return service
+
+
+@pytest.fixture
+def orchestrator(websocket_service):
+    """Orchestrator talking to one fast, one slow and any other failing worker"""
+    async def handler(request: httpx.Request):
+        if request.url.host.startswith(SLOW_AGENT_ID):
+            await asyncio.sleep(5)
+        if request.url.host.startswith(FAST_AGENT_ID):
+            return httpx.Response(200, json={"response": "Legal advice"})
+        raise httpx.ConnectError("worker down", request=request)
+
+    with patch.dict("os.environ", ENVIRONMENT):
+        return Orchestrator(
+            websocket_service,
+            HttpClientService(transport=httpx.MockTransport(handler)),
+            Mock(spec=MessageSinkService)
+        )
+
+
+def build_state(agent_ids, deadline_seconds: float) -> dict:
+    worker_state = WorkerState(
+        input="Question",
+        agents=[UUID(agent_id) for agent_id in agent_ids],
+        chat_id=uuid4(),
+        company_id=uuid4(),
+        chat_history=[],
+        user_id=uuid4()
+    )
+    return {
+        "input": worker_state.input,
+        "chat_id": worker_state.chat_id,
+        "available_agents": worker_state.agents,
+        "selected_agents": list(agent_ids),
+        "worker_state": worker_state,
+        "deadline": time.time() + deadline_seconds
+    }
+
+
+@pytest.mark.asyncio
+async def test_orchestrate_delivers_partial_results_at_deadline(orchestrator, websocket_service):
+    """Test that finished agents are delivered and stragglers are cancelled at the deadline"""
+    # Arrange
+    state = build_state([FAST_AGENT_ID, SLOW_AGENT_ID], deadline_seconds=0.2)
+
+    # Act
+    started = time.monotonic()
+    with patch.dict("os.environ", ENVIRONMENT):
+        await orchestrator.orchestrate(state, state["worker_state"])
+    elapsed = time.monotonic() - started
+
+    # Assert
+    sent = [c.args[1] for c in websocket_service.send_json.call_args_list]
+    assert elapsed < 1
+    assert {"agent_id": FAST_AGENT_ID, "response": "Legal advice"} in sent
+    assert {"agent_id": SLOW_AGENT_ID, "response": None, "error": "deadline_exceeded"} in sent
+
+
+@pytest.mark.asyncio
+async def test_orchestrate_isolates_failing_agent(orchestrator, websocket_service):
+    """Test that one failing worker does not prevent the others from answering"""
+    # Arrange
+    failing_agent_id = str(uuid4())
+    state = build_state([FAST_AGENT_ID, failing_agent_id], deadline_seconds=5)
+
+    # Act
+    with patch.dict("os.environ", ENVIRONMENT):
+        await orchestrator.orchestrate(state, state["worker_state"])
+
+    # Assert
+    sent = [c.args[1] for c in websocket_service.send_json.call_args_list]
+    assert {"agent_id": FAST_AGENT_ID, "response": "Legal advice"} in sent
+    assert {"agent_id": failing_agent_id, "response": None, "error": "agent_unavailable"} in sent
+
+
+@pytest.mark.asyncio
+async def test_orchestrate_reports_the_status_of_failed_agents(websocket_service):
+    """Test that an agent answering with an error status is reported with that status"""
+    # Arrange
+    orchestrator = Orchestrator(
+        websocket_service,
+        HttpClientService(transport=httpx.MockTransport(lambda request: httpx.Response(422, json={"detail": "invalid"}))),
+        Mock(spec=MessageSinkService)
+    )
+    state = build_state([FAST_AGENT_ID], deadline_seconds=5)
+
+    # Act
+    with patch.dict("os.environ", ENVIRONMENT):
+        await orchestrator.orchestrate(state, state["worker_state"])
+
+    # Assert
+    sent = [c.args[1] for c in websocket_service.send_json.call_args_list]
+    assert {"agent_id": FAST_AGENT_ID, "response": None, "error": "agent_error", "status": 422} in sent
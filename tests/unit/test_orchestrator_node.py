@@ -10,6 +10,9 @@ from src.workflow.state import State
 from src.workflow.agents.supervisor.supervisor_models import SupervisorOutput
 from src.api.modules.interactions.interactions_models import WorkerState
 from src.api.modules.websocket.websocket_service import WebsocketService
+from src.api.core.services.http_client_service import HttpClientService
+from src.workflow.services.message_sink_service import MessageSinkService
+from src.workflow.orchestrator.worker_client import WorkerClient
 
 
 @pytest.fixture
@@ -37,9 +40,23 @@ def mock_websocket_service(mock_websocket):
 
 
 @pytest.fixture
-def orchestrator(mock_websocket_service):
-    """Create Orchestrator instance with mocked websocket service"""
-    return Orchestrator(mock_websocket_service)
+def mock_http_client_service():
+    """Mock HttpClientService for testing"""
+    service = Mock(spec=HttpClientService)
+    service.post = AsyncMock()
+    return service
+
+
+@pytest.fixture
+def mock_message_sink_service():
+    """Mock MessageSinkService for testing"""
+    return Mock(spec=MessageSinkService)
+
+
+@pytest.fixture
+def orchestrator(mock_websocket_service, mock_http_client_service, mock_message_sink_service):
+    """Create Orchestrator instance with mocked websocket, http client and message sink services"""
+    return Orchestrator(mock_websocket_service, mock_http_client_service, mock_message_sink_service)
 
 
 @pytest.fixture
@@ -74,22 +91,26 @@ def sample_state():
 
 # Unit Tests for Constructor
 
-def test_orchestrator_constructor_initializes_websocket_service(mock_websocket_service):
+def test_orchestrator_constructor_initializes_websocket_service(mock_websocket_service, mock_http_client_service, mock_message_sink_service):
     """Test that Orchestrator constructor properly initializes websocket service"""
     # Act
-    orchestrator = Orchestrator(mock_websocket_service)
+    orchestrator = Orchestrator(mock_websocket_service, mock_http_client_service, mock_message_sink_service)
     
     # Assert
     assert orchestrator._Orchestrator__websocket_service == mock_websocket_service
+    assert isinstance(orchestrator._Orchestrator__worker_client, WorkerClient)
+    assert orchestrator._Orchestrator__message_sink_service == mock_message_sink_service
 
 
 def test_orchestrator_constructor_accepts_websocket_service_type():
     """Test that Orchestrator constructor accepts WebsocketService type"""
     # Arrange
     websocket_service = Mock(spec=WebsocketService)
+    http_client_service = Mock(spec=HttpClientService)
+    message_sink_service = Mock(spec=MessageSinkService)
     
     # Act & Assert - Should not raise any exceptions
-    orchestrator = Orchestrator(websocket_service)
+    orchestrator = Orchestrator(websocket_service, http_client_service, message_sink_service)
     assert orchestrator is not None
 
 
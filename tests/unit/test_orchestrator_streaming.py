@@ -0,0 +1,163 @@
+import json
+import pytest
+import httpx
+from unittest.mock import Mock, AsyncMock, patch
+from uuid import UUID, uuid4
+
+from src.workflow.orchestrator.orchestrator import Orchestrator
+from src.workflow.orchestrator.payload_codec import WorkerPayload
+from src.api.core.services.http_client_service import HttpClientService
+from src.api.modules.interactions.interactions_models import WorkerState
+from src.api.modules.websocket.websocket_service import WebsocketService
+from src.workflow.services.message_sink_service import MessageSinkService
+
+AGENT_ID = "95e222ef-c637-42d3-a81e-955beeeb0ba2"
+
+ENVIRONMENT = {
+    "WORKER_HOST": ".workers.test",
+    "HMAC_SECRET": "test-secret",
+    "MAIN_SERVER_ENDPOINT": "main.test",
+    "WORKER_STREAMING": "true"
+}
+
+
+@pytest.fixture
+def saved_messages():
+    """Collects the bodies posted to the main server"""
+    return []
+
+
+def build_orchestrator(worker_response: httpx.Response, saved_messages: list, websocket_service) -> Orchestrator:
+    def handler(request: httpx.Request):
+        if request.url.host == "main.test":
+            saved_messages.append({"chat_id": request.url.path.rsplit("/", 1)[-1], **json.loads(request.content)})
+            return httpx.Response(201)
+        return worker_response
+
+    http_client_service = HttpClientService(transport=httpx.MockTransport(handler))
+    with patch.dict("os.environ", ENVIRONMENT):
+        return Orchestrator(
+            websocket_service,
+            http_client_service,
+            MessageSinkService(http_client_service)
+        )
+
+
+async def flush_messages(orchestrator: Orchestrator) -> None:
+    with patch.dict("os.environ", ENVIRONMENT):
+        await orchestrator._Orchestrator__message_sink_service.aclose()
+
+
+@pytest.fixture
+def worker_state():
+    """WorkerState sent to the worker agent"""
+    return WorkerState(
+        input="Can I terminate an employee without notice?",
+        agents=[UUID(AGENT_ID)],
+        chat_id=uuid4(),
+        company_id=uuid4(),
+        chat_history=[],
+        user_id=uuid4()
+    )
+
+
+@pytest.fixture
+def websocket_service():
+    """Mock WebsocketService delivering to the chat socket"""
+    service = Mock(spec=WebsocketService)
+    service.send_json = AsyncMock(return_value=True)
+    return service
+
+
+@pytest.mark.asyncio
+async def test_streaming_forwards_tokens_then_full_response(worker_state, websocket_service, saved_messages):
+    """Test that SSE tokens are forwarded as they arrive and the full text is saved"""
+    # Arrange
+    body = (
+        'data: {"token": "You "}\n\n'
+        'data: {"token": "need "}\n\n'
+        'data: notice.\n\n'
+        'data: [DONE]\n\n'
+    )
+    orchestrator = build_orchestrator(
+        httpx.Response(200, headers={"content-type": "text/event-stream"}, content=body.encode()),
+        saved_messages,
+        websocket_service
+    )
+
+    # Act
+    with patch.dict("os.environ", ENVIRONMENT):
+        await orchestrator._Orchestrator__handle_agent_interaction(
+            agent_id=AGENT_ID,
+            state={"input": worker_state.input, "chat_id": worker_state.chat_id},
+            payload=WorkerPayload(worker_state.model_dump(mode="json"))
+        )
+    await flush_messages(orchestrator)
+
+    # Assert
+    assert all(c.args[0] == worker_state.chat_id for c in websocket_service.send_json.call_args_list)
+    sent = [c.args[1] for c in websocket_service.send_json.call_args_list]
+    assert sent == [
+        {"agent_id": AGENT_ID, "token": "You "},
+        {"agent_id": AGENT_ID, "token": "need "},
+        {"agent_id": AGENT_ID, "token": "notice."},
+        {"agent_id": AGENT_ID, "response": "You need notice."}
+    ]
+    assert saved_messages == [{"chat_id": str(worker_state.chat_id), "sender": AGENT_ID, "message_type": "ai", "text": "You need notice."}]
+
+
+@pytest.mark.asyncio
+async def test_streaming_falls_back_to_blocking_json(worker_state, websocket_service, saved_messages):
+    """Test that a worker answering with JSON is handled like the blocking mode"""
+    # Arrange
+    orchestrator = build_orchestrator(httpx.Response(200, json={"response": "Legal advice"}), saved_messages, websocket_service)
+
+    # Act
+    with patch.dict("os.environ", ENVIRONMENT):
+        await orchestrator._Orchestrator__handle_agent_interaction(
+            agent_id=AGENT_ID,
+            state={"input": worker_state.input, "chat_id": worker_state.chat_id},
+            payload=WorkerPayload(worker_state.model_dump(mode="json"))
+        )
+    await flush_messages(orchestrator)
+
+    # Assert
+    websocket_service.send_json.assert_called_once_with(
+        worker_state.chat_id,
+        {"agent_id": AGENT_ID, "response": "Legal advice"}
+    )
+    assert saved_messages == [{"chat_id": str(worker_state.chat_id), "sender": AGENT_ID, "message_type": "ai", "text": "Legal advice"}]
+
+
+@pytest.mark.asyncio
+async def test_streaming_keeps_spaces_and_numeric_tokens(worker_state, websocket_service, saved_messages):
+    """Test that plain text tokens keep their leading spaces and are not parsed as JSON scalars"""
+    # Arrange
+    body = (
+        'data: The\n\n'
+        'data:  year\n\n'
+        'data:  2024\n\n'
+        'data:  is\n\n'
+        'data: true\n\n'
+        'data: null\n\n'
+        'data: [DONE]\n\n'
+    )
+    orchestrator = build_orchestrator(
+        httpx.Response(200, headers={"content-type": "text/event-stream"}, content=body.encode()),
+        saved_messages,
+        websocket_service
+    )
+
+    # Act
+    with patch.dict("os.environ", ENVIRONMENT):
+        await orchestrator._Orchestrator__handle_agent_interaction(
+            agent_id=AGENT_ID,
+            state={"input": worker_state.input, "chat_id": worker_state.chat_id},
+            payload=WorkerPayload(worker_state.model_dump(mode="json"))
+        )
+    await flush_messages(orchestrator)
+
+    # Assert
+    tokens = [c.args[1]["token"] for c in websocket_service.send_json.call_args_list if "token" in c.args[1]]
+    assert tokens == ["The", " year", " 2024", " is", "true", "null"]
+    assert saved_messages[0]["text"] == "The year 2024 istruenull"
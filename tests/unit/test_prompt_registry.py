@@ -0,0 +1,83 @@
+import os
+import pytest
+from langchain.schema import AIMessage, HumanMessage
+
+from src.workflow.prompts.prompt_registry import PromptRegistry
+
+
+@pytest.fixture
+def templates_dir(tmp_path):
+    """Template directory with two versions of a greeting prompt"""
+    directory = tmp_path / "greeting"
+    directory.mkdir()
+    (directory / "v1.txt").write_text("Greet the user, reply as {{\"text\": ...}}")
+    (directory / "v2.txt").write_text("Greet the user politely")
+    return str(tmp_path)
+
+
+def test_templates_are_compiled_once(templates_dir):
+    """Test that repeated lookups return the same compiled template"""
+    # Arrange
+    registry = PromptRegistry(templates_dir=templates_dir, versions={}, hot_reload=False)
+
+    # Act
+    first = registry.get("greeting")
+    second = registry.get("greeting")
+
+    # Assert
+    assert first is second
+    assert registry.compilations == 1
+
+
+def test_highest_version_is_used_unless_pinned(templates_dir):
+    """Test that the latest version is active and a pinned one overrides it"""
+    # Arrange
+    latest = PromptRegistry(templates_dir=templates_dir, versions={}, hot_reload=False)
+    pinned = PromptRegistry(templates_dir=templates_dir, versions={"greeting": "v1"}, hot_reload=False)
+
+    # Act
+    latest_messages = latest.get("greeting").format_messages(input="Hi")
+    pinned_messages = pinned.get("greeting").format_messages(input="Hi")
+
+    # Assert
+    assert latest.get_version("greeting") == "v2"
+    assert latest_messages[0].content == "Greet the user politely"
+    assert pinned_messages[0].content == "Greet the user, reply as {\"text\": ...}"
+
+
+def test_history_is_injected_through_the_placeholder(templates_dir):
+    """Test that chat history goes between the system message and the input"""
+    # Arrange
+    registry = PromptRegistry(templates_dir=templates_dir, versions={}, hot_reload=False)
+    history = [HumanMessage(content="Hello"), AIMessage(content="Hi there")]
+
+    # Act
+    with_history = registry.get("greeting").format_messages(input="Bye", chat_history=history)
+    without_history = registry.get("greeting").format_messages(input="Bye")
+
+    # Assert
+    assert [m.content for m in with_history] == ["Greet the user politely", "Hello", "Hi there", "Bye"]
+    assert len(without_history) == 2
+
+
+def test_hot_reload_picks_up_changed_and_new_versions(templates_dir):
+    """Test that edited and added template files replace the compiled template"""
+    # Arrange
+    registry = PromptRegistry(templates_dir=templates_dir, versions={}, hot_reload=True, reload_interval=0)
+    registry.get("greeting")
+    path = os.path.join(templates_dir, "greeting", "v2.txt")
+
+    # Act
+    with open(path, "w") as template_file:
+        template_file.write("Greet the user briefly")
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1))
+    edited = registry.get("greeting").format_messages(input="Hi")[0].content
+
+    with open(os.path.join(templates_dir, "greeting", "v10.txt"), "w") as template_file:
+        template_file.write("Greet the user in one word")
+    added = registry.get("greeting").format_messages(input="Hi")[0].content
+
+    # Assert
+    assert edited == "Greet the user briefly"
+    assert added == "Greet the user in one word"
+    assert registry.get_version("greeting") == "v10"
@@ -0,0 +1,173 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, Mock
+from fastapi import FastAPI, Depends, HTTPException, Request
+from fastapi.testclient import TestClient
+
+from src.dependencies.container import Container
+from fakeredis import FakeAsyncRedis
+from src.api.core.services.redis_service import RedisService
+from src.api.core.services.rate_limiter_service import RateLimiterService
+from src.api.core.services.rate_limit_backends import InMemoryRateLimitBackend, RedisRateLimitBackend, TOKEN_BUCKET_SCRIPT
+from src.api.core.middleware.auth_middleware import auth_middleware
+from src.api.core.middleware.rate_limit_middleware import rate_limit_middleware
+
+
+@pytest.fixture
+def rate_limiter_service():
+    """Limiter allowing bursts of 2 per company and 3 runs in flight"""
+    return RateLimiterService(backend=InMemoryRateLimitBackend(), rate=50, burst=2, max_in_flight=3)
+
+
+@pytest.fixture
+def registered_rate_limiter(rate_limiter_service):
+    """Register the limiter in the container for the middleware"""
+    Container.register("rate_limiter_service", rate_limiter_service)
+    yield rate_limiter_service
+    Container.clear()
+
+
+@pytest.mark.asyncio
+async def test_company_over_burst_gets_429_with_retry_after(rate_limiter_service):
+    """Test that a company exceeding its bucket is rejected with Retry-After"""
+    # Arrange
+    await rate_limiter_service.check_company("company-a")
+    await rate_limiter_service.check_company("company-a")
+
+    # Act
+    with pytest.raises(HTTPException) as error:
+        await rate_limiter_service.check_company("company-a")
+
+    # Assert
+    assert error.value.status_code == 429
+    assert error.value.headers["Retry-After"] == "1"
+    assert (await rate_limiter_service.stats())["limited"] == 1
+
+
+@pytest.mark.asyncio
+async def test_companies_have_independent_buckets(rate_limiter_service):
+    """Test that one noisy company does not consume another company's tokens"""
+    # Arrange
+    for _ in range(2):
+        await rate_limiter_service.check_company("company-a")
+
+    # Act & Assert - should not raise
+    await rate_limiter_service.check_company("company-b")
+
+
+@pytest.mark.asyncio
+async def test_bucket_refills_over_time(rate_limiter_service):
+    """Test that tokens come back at the configured rate"""
+    # Arrange
+    for _ in range(2):
+        await rate_limiter_service.check_company("company-a")
+
+    # Act
+    await asyncio.sleep(0.05)
+
+    # Assert - should not raise
+    await rate_limiter_service.check_company("company-a")
+
+
+@pytest.mark.asyncio
+async def test_global_in_flight_cap_sheds_with_503(rate_limiter_service):
+    """Test that admissions beyond the in-flight cap are shed until a slot is released"""
+    # Arrange
+    slot_ids = [await rate_limiter_service.acquire_slot() for _ in range(3)]
+
+    # Act
+    with pytest.raises(HTTPException) as error:
+        await rate_limiter_service.acquire_slot()
+    await rate_limiter_service.release_slot(slot_ids[0])
+    await rate_limiter_service.release_slot(slot_ids[0])
+    await rate_limiter_service.acquire_slot()
+
+    # Assert
+    assert error.value.status_code == 503
+    assert (await rate_limiter_service.stats())["in_flight"] == 3
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_shares_in_flight_slots_across_nodes():
+    """Test that nodes sharing Redis see one global in-flight count"""
+    # Arrange
+    redis_service = RedisService(client=FakeAsyncRedis())
+    first_node = RateLimiterService(backend=RedisRateLimitBackend(redis_service), max_in_flight=2)
+    second_node = RateLimiterService(backend=RedisRateLimitBackend(redis_service), max_in_flight=2)
+
+    # Act
+    await first_node.acquire_slot()
+    slot_id = await second_node.acquire_slot()
+    with pytest.raises(HTTPException):
+        await first_node.acquire_slot()
+    await second_node.release_slot(slot_id)
+    await second_node.release_slot(slot_id)
+
+    # Assert
+    assert (await first_node.stats())["in_flight"] == 1
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_expires_slots_leaked_by_a_crashed_node():
+    """Test that a slot never released frees up after its TTL while live slots keep counting"""
+    # Arrange
+    redis_service = RedisService(client=FakeAsyncRedis())
+    crashed_node = RateLimiterService(backend=RedisRateLimitBackend(redis_service, slot_ttl_seconds=0.2), max_in_flight=2)
+    live_node = RateLimiterService(backend=RedisRateLimitBackend(redis_service, slot_ttl_seconds=60), max_in_flight=2)
+    await crashed_node.acquire_slot()
+    await live_node.acquire_slot()
+
+    # Act
+    with pytest.raises(HTTPException):
+        await live_node.acquire_slot()
+    await asyncio.sleep(0.3)
+    await live_node.acquire_slot()
+
+    # Assert
+    assert (await live_node.stats())["in_flight"] == 2
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_takes_tokens_atomically_with_script():
+    """Test that the shared bucket is evaluated in one Redis script call per check"""
+    # Arrange
+    client = Mock()
+    client.eval = AsyncMock(return_value=b"0.5")
+    backend = RedisRateLimitBackend(RedisService(client=client))
+
+    # Act
+    retry_after = await backend.take_token("company-a", 1.0, 10)
+
+    # Assert
+    client.eval.assert_awaited_once_with(TOKEN_BUCKET_SCRIPT, 1, "ratelimit:bucket:company-a", 1.0, 10)
+    assert retry_after == 0.5
+
+
+def test_middleware_releases_slot_when_request_fails(registered_rate_limiter):
+    """Test that a slot taken at admission is given back if the request errors"""
+    # Arrange
+    app = FastAPI()
+
+    async def fake_auth(req: Request):
+        req.state.company = "company-a"
+
+    @app.post("/interact")
+    async def interact(fail: bool = False, _: None = Depends(rate_limit_middleware)):
+        if fail:
+            raise HTTPException(status_code=502, detail="main server down")
+        return {"ok": True}
+
+    app.dependency_overrides[auth_middleware] = fake_auth
+    client = TestClient(app)
+
+    # Act
+    failed = client.post("/interact", params={"fail": True})
+    accepted = client.post("/interact")
+    limited = client.post("/interact")
+
+    # Assert
+    assert failed.status_code == 502
+    assert accepted.status_code == 200
+    assert limited.status_code == 429
+    assert limited.headers["Retry-After"] == "1"
+    assert asyncio.run(registered_rate_limiter.stats())["in_flight"] == 1
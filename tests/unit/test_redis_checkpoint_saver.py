@@ -0,0 +1,124 @@
+import asyncio
+import pytest
+from unittest.mock import Mock, AsyncMock
+from uuid import UUID, uuid4
+
+from fakeredis import FakeAsyncRedis
+from src.api.core.services.redis_service import RedisService
+from src.api.modules.interactions.interactions_models import WorkerState
+from src.dependencies.container import Container
+from src.workflow.agents.supervisor.supervisor_models import SupervisorOutput
+from src.workflow.graph import create_graph, get_run_config
+from src.workflow.jobs.job_models import InteractionJob
+from src.workflow.jobs.job_queue import InMemoryJobQueue
+from src.workflow.jobs.worker_pool import WorkerPool
+from src.workflow.orchestrator.deadline import Deadline
+from src.workflow.services.redis_checkpoint_saver import RedisCheckpointSaver
+
+AGENT_ID = "95e222ef-c637-42d3-a81e-955beeeb0ba2"
+
+
+@pytest.fixture
+def redis_service():
+    """RedisService backed by fakeredis"""
+    return RedisService(client=FakeAsyncRedis())
+
+
+@pytest.fixture
+def checkpointer(redis_service):
+    """Checkpointer under test"""
+    return RedisCheckpointSaver(redis_service=redis_service, ttl_seconds=60)
+
+
+@pytest.fixture
+def worker_state():
+    """WorkerState carried through the graph State"""
+    return WorkerState(
+        input="Can I terminate an employee without notice?",
+        agents=[UUID(AGENT_ID)],
+        chat_id=uuid4(),
+        company_id=uuid4(),
+        chat_history=[],
+        user_id=uuid4()
+    )
+
+
+@pytest.fixture
+def registered_nodes():
+    """Register mocked supervisor and orchestrator in the container"""
+    supervisor = Mock()
+    supervisor.interact = AsyncMock(return_value=SupervisorOutput(selected_agents=[AGENT_ID]))
+    orchestrator = Mock()
+    orchestrator.orchestrate = AsyncMock()
+
+    Container.register("supervisor", supervisor)
+    Container.register("orchestrator", orchestrator)
+    yield supervisor, orchestrator
+    Container.clear()
+
+
+@pytest.mark.asyncio
+async def test_graph_state_round_trips_through_redis(registered_nodes, checkpointer, worker_state):
+    """Test that the checkpointed state restores the typed worker state and routing"""
+    # Arrange
+    graph = create_graph(checkpointer=checkpointer)
+    config = get_run_config("interaction-1")
+    job = InteractionJob(deadline=Deadline.after().expires_at, worker_state=worker_state)
+
+    # Act
+    await graph.ainvoke(job.to_state(), config)
+    snapshot = await graph.aget_state(config)
+
+    # Assert
+    assert snapshot.next == ()
+    assert snapshot.values["worker_state"] == worker_state
+    assert snapshot.values["selected_agents"] == [AGENT_ID]
+    history = [checkpoint async for checkpoint in checkpointer.alist(config)]
+    assert [c.metadata["step"] for c in history] == [2, 1, 0, -1]
+    assert [c.metadata["step"] for c in [c async for c in checkpointer.alist(config, limit=2)]] == [2, 1]
+
+
+@pytest.mark.asyncio
+async def test_retried_job_resumes_after_the_last_completed_node(registered_nodes, checkpointer, worker_state):
+    """Test that a job failing in the orchestrator is retried without routing again"""
+    # Arrange
+    supervisor, orchestrator = registered_nodes
+    orchestrator.orchestrate.side_effect = [RuntimeError("worker down"), None]
+    job_queue = InMemoryJobQueue(max_attempts=2)
+    pool = WorkerPool(job_queue=job_queue, graph=create_graph(checkpointer=checkpointer), concurrency=1)
+    job = InteractionJob(deadline=Deadline.after().expires_at, worker_state=worker_state)
+    first_deadline = job.deadline
+    await job_queue.enqueue(job)
+
+    # Act
+    await pool.start()
+    for _ in range(200):
+        if pool.processed:
+            break
+        await asyncio.sleep(0.01)
+    await pool.stop()
+
+    # Assert
+    assert pool.failed == 1 and pool.processed == 1
+    supervisor.interact.assert_awaited_once()
+    assert orchestrator.orchestrate.await_count == 2
+    resumed_state = orchestrator.orchestrate.call_args.kwargs["state"]
+    assert resumed_state["selected_agents"] == [AGENT_ID]
+    assert resumed_state["deadline"] > first_deadline
+    assert await checkpointer.aget_tuple(get_run_config(job.job_id)) is None
+
+
+@pytest.mark.asyncio
+async def test_delete_thread_removes_all_keys(registered_nodes, checkpointer, redis_service, worker_state):
+    """Test that deleting a thread leaves nothing behind in redis"""
+    # Arrange
+    graph = create_graph(checkpointer=checkpointer)
+    job = InteractionJob(deadline=Deadline.after().expires_at, worker_state=worker_state)
+    await graph.ainvoke(job.to_state(), get_run_config("interaction-2"))
+
+    # Act
+    await checkpointer.adelete_thread("interaction-2")
+
+    # Assert
+    assert await redis_service.redis.keys("*") == []
+    assert await checkpointer.aget_tuple(get_run_config("interaction-2")) is None
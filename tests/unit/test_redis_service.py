@@ -0,0 +1,27 @@
+import pytest
+from unittest.mock import patch
+
+from src.api.core.services.redis_service import RedisService
+
+
+@pytest.mark.asyncio
+async def test_memory_url_runs_in_process_for_development():
+    """Test that REDIS_URL=memory:// gives a working in-process client in development"""
+    # Arrange
+    with patch.dict("os.environ", {"REDIS_URL": "memory://", "ENVIRONMENT": "DEVELOPMENT"}):
+        redis_service = RedisService()
+
+    # Act
+    await redis_service.set_session("chat_state:abc", {"user_id": "u"})
+
+    # Assert
+    assert await redis_service.get_session("chat_state:abc") == {"user_id": "u"}
+
+
+@pytest.mark.parametrize("environment", ["PRODUCTION", ""])
+def test_memory_url_is_refused_outside_development(environment):
+    """Test that a deployment cannot silently run on process-local Redis"""
+    # Act & Assert
+    with patch.dict("os.environ", {"REDIS_URL": "memory://", "ENVIRONMENT": environment}):
+        with pytest.raises(ValueError, match="memory://"):
+            RedisService()
@@ -0,0 +1,135 @@
+import asyncio
+import pytest
+from unittest.mock import Mock
+from uuid import UUID, uuid4
+from langchain_core.messages import HumanMessage
+from langchain_core.runnables import RunnableLambda
+
+from src.api.modules.interactions.interactions_models import WorkerState
+from src.workflow.agents.supervisor.routing_batcher import RoutingBatcher
+from src.workflow.agents.supervisor.supervisor_agent import Supervisor
+from src.workflow.services.agent_registry_service import AgentRegistryService
+from src.workflow.services.llm_service import LlmService
+from src.workflow.services.prompt_service import PromptService
+
+LEGAL_AGENT_ID = "95e222ef-c637-42d3-a81e-955beeeb0ba2"
+COMPANY_ID = "8f3c2a8e-3a52-4d0e-9d7e-3f1f0c6a1b11"
+
+
+@pytest.fixture
+def variables():
+    """Prompt variables with only the legal agent available"""
+    return AgentRegistryService.from_file().get_prompt_variables([UUID(LEGAL_AGENT_ID)])
+
+
+@pytest.mark.asyncio
+async def test_concurrent_routes_share_one_call(variables):
+    """Test that routes arriving within the window are answered by a single model call"""
+    # Arrange
+    llm_service = LlmService(backend="fake", fake_latency=0)
+    batcher = RoutingBatcher(llm_service, PromptService(), window=0.01, max_batch_size=16, scope="company")
+
+    # Act
+    responses = await asyncio.gather(*(
+        batcher.route(f"Review contract {index}", [HumanMessage(content="Hello")], variables, company_id=COMPANY_ID, chat_id=uuid4())
+        for index in range(5)
+    ))
+
+    # Assert
+    assert [response.selected_agents for response in responses] == [[LEGAL_AGENT_ID]] * 5
+    assert llm_service.get_llm(temperature=0.1).calls == 1
+    assert batcher.stats()["mean_batch_size"] == 5
+
+
+@pytest.mark.asyncio
+async def test_full_batch_is_sent_before_the_window_ends(variables):
+    """Test that reaching the max batch size flushes without waiting for the window"""
+    # Arrange
+    llm_service = LlmService(backend="fake", fake_latency=0)
+    batcher = RoutingBatcher(llm_service, PromptService(), window=10, max_batch_size=2, scope="company")
+
+    # Act
+    responses = await asyncio.wait_for(asyncio.gather(
+        batcher.route("Review contract", [], variables, company_id=COMPANY_ID),
+        batcher.route("Check the lease", [], variables, company_id=COMPANY_ID)
+    ), timeout=1)
+
+    # Assert
+    assert all(response.selected_agents == [LEGAL_AGENT_ID] for response in responses)
+
+
+@pytest.mark.asyncio
+async def test_lone_route_and_failures_fall_back(variables):
+    """Test that a batch of one and every route of a failed batch are left to their callers"""
+    # Arrange
+    llm = Mock()
+    llm.with_structured_output.return_value = RunnableLambda(Mock(side_effect=RuntimeError("rate limited")))
+    batcher = RoutingBatcher(Mock(get_llm=Mock(return_value=llm)), PromptService(), window=0.001, scope="company")
+
+    # Act
+    lone = await batcher.route("Review contract", [], variables, company_id=COMPANY_ID)
+    failures = await asyncio.gather(
+        batcher.route("Review contract", [], variables, company_id=COMPANY_ID),
+        batcher.route("Check the lease", [], variables, company_id=COMPANY_ID)
+    )
+
+    # Assert
+    assert lone is None
+    assert failures == [None, None]
+    assert batcher.stats()["fallbacks"] == 3
+
+
+@pytest.mark.asyncio
+async def test_routes_of_different_tenants_are_never_batched_together(variables):
+    """Test that companies, and chats in the default scope, get separate prompts"""
+    # Arrange
+    llm_service = LlmService(backend="fake", fake_latency=0)
+    company_batcher = RoutingBatcher(llm_service, PromptService(), window=0.01, scope="company")
+    chat_batcher = RoutingBatcher(llm_service, PromptService(), window=0.01)
+
+    # Act
+    across_companies = await asyncio.gather(
+        company_batcher.route("Review contract", [], variables, company_id=COMPANY_ID, chat_id=uuid4()),
+        company_batcher.route("Check the lease", [], variables, company_id=str(uuid4()), chat_id=uuid4())
+    )
+    across_chats = await asyncio.gather(
+        chat_batcher.route("Review contract", [], variables, company_id=COMPANY_ID, chat_id=uuid4()),
+        chat_batcher.route("Check the lease", [], variables, company_id=COMPANY_ID, chat_id=uuid4())
+    )
+    without_company = await chat_batcher.route("Review contract", [], variables, chat_id=uuid4())
+
+    # Assert
+    assert across_companies == [None, None]
+    assert across_chats == [None, None]
+    assert without_company is None
+    assert company_batcher.stats()["batches"] == chat_batcher.stats()["batches"] == 0
+
+
+@pytest.mark.asyncio
+async def test_supervisor_routes_through_the_batcher():
+    """Test that the supervisor uses the batched answer and falls back to its own call for lone requests"""
+    # Arrange
+    llm_service = LlmService(backend="fake", fake_latency=0)
+    prompt_service = PromptService()
+    batcher = RoutingBatcher(llm_service, prompt_service, window=0.01, scope="company")
+    supervisor = Supervisor(prompt_service, llm_service, routing_batcher=batcher)
+
+    def state(query: str):
+        worker_state = WorkerState(
+            input=query,
+            agents=[UUID(LEGAL_AGENT_ID)],
+            chat_id=uuid4(),
+            company_id=UUID(COMPANY_ID),
+            chat_history=[],
+            user_id=uuid4()
+        )
+        return {"input": query, "chat_id": worker_state.chat_id, "available_agents": [UUID(LEGAL_AGENT_ID)], "worker_state": worker_state}
+
+    # Act
+    batched = await asyncio.gather(supervisor.interact(state("Review contract")), supervisor.interact(state("Check the lease")))
+    lone = await supervisor.interact(state("Review contract"))
+
+    # Assert
+    assert [response.selected_agents for response in batched] == [[LEGAL_AGENT_ID]] * 2
+    assert lone.selected_agents == [LEGAL_AGENT_ID]
+    assert llm_service.get_llm(temperature=0.1).calls == 2
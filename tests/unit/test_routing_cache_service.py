@@ -0,0 +1,267 @@
+import asyncio
+import pytest
+from unittest.mock import Mock, AsyncMock, patch
+from uuid import UUID, uuid4
+from qdrant_client import AsyncQdrantClient
+
+from src.workflow.services.routing_cache_service import RoutingCacheService
+from src.workflow.services.vector_backends import InMemoryVectorBackend, QdrantVectorBackend
+from src.workflow.services.embedding_service import EmbeddingService
+from src.workflow.agents.supervisor.supervisor_agent import Supervisor
+from src.workflow.agents.supervisor.supervisor_models import SupervisorOutput
+from src.api.modules.interactions.interactions_models import WorkerState
+from src.workflow.services.llm_service import LlmService
+from src.workflow.services.prompt_service import PromptService
+
+ACCOUNTING_AGENT = "99b5792d-c38a-4e49-9207-a3fa547905ae"
+
+VECTORS = {
+    "show revenue trends": [1.0, 0.0, 0.0],
+    "show me revenue trends": [0.99, 0.05, 0.0],
+    "can i fire an employee?": [0.0, 1.0, 0.0],
+    "reset my password": [0.0, 0.0, 1.0]
+}
+
+
+@pytest.fixture
+def mock_embedding_service():
+    """Embedding service returning fixed vectors per input"""
+    service = Mock(spec=EmbeddingService)
+    service.embed = AsyncMock(side_effect=lambda text: VECTORS[text])
+    return service
+
+
+@pytest.fixture
+def routing_cache(mock_embedding_service):
+    """RoutingCacheService with the in-memory backend"""
+    backend = InMemoryVectorBackend(ttl_seconds=60, max_entries=2)
+    return RoutingCacheService(mock_embedding_service, backend, similarity_threshold=0.95)
+
+
+@pytest.mark.asyncio
+async def test_lookup_hits_for_similar_input(routing_cache):
+    """Test that a near-identical query returns the cached selection"""
+    # Arrange
+    await routing_cache.store("company", "show revenue trends", [ACCOUNTING_AGENT])
+
+    # Act
+    result = await routing_cache.lookup("company", "Show me revenue   trends")
+
+    # Assert
+    assert result == [ACCOUNTING_AGENT]
+    assert routing_cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_lookup_misses_below_threshold(routing_cache):
+    """Test that a dissimilar query misses the cache"""
+    # Arrange
+    await routing_cache.store("company", "show revenue trends", [ACCOUNTING_AGENT])
+
+    # Act
+    result = await routing_cache.lookup("company", "can I fire an employee?")
+
+    # Assert
+    assert result is None
+    assert routing_cache.stats()["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_lookup_is_namespaced_per_company(routing_cache):
+    """Test that cached decisions are not shared between companies"""
+    # Arrange
+    await routing_cache.store("company-a", "show revenue trends", [ACCOUNTING_AGENT])
+
+    # Act
+    result = await routing_cache.lookup("company-b", "show revenue trends")
+
+    # Assert
+    assert result is None
+
+
+@pytest.mark.asyncio
+async def test_entries_expire_after_ttl(routing_cache):
+    """Test that entries older than the TTL are not returned"""
+    # Arrange
+    with patch("src.workflow.services.vector_backends.time.monotonic", return_value=0.0):
+        await routing_cache.store("company", "show revenue trends", [ACCOUNTING_AGENT])
+
+    # Act
+    with patch("src.workflow.services.vector_backends.time.monotonic", return_value=61.0):
+        result = await routing_cache.lookup("company", "show revenue trends")
+
+    # Assert
+    assert result is None
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_entry_is_evicted(routing_cache):
+    """Test that the LRU entry is evicted once max_entries is exceeded"""
+    # Arrange
+    await routing_cache.store("company", "show revenue trends", [ACCOUNTING_AGENT])
+    await routing_cache.store("company", "can i fire an employee?", ["legal"])
+    await routing_cache.lookup("company", "show revenue trends")
+
+    # Act
+    await routing_cache.store("company", "reset my password", [])
+
+    # Assert
+    assert await routing_cache.lookup("company", "show revenue trends") == [ACCOUNTING_AGENT]
+    assert await routing_cache.lookup("company", "can i fire an employee?") is None
+    assert routing_cache.stats()["evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_supervisor_returns_cached_selection_without_llm(routing_cache):
+    """Test that a cache hit short-circuits the supervisor LLM call"""
+    # Arrange
+    llm_service = Mock()
+    supervisor = Supervisor(Mock(), llm_service, routing_cache_service=routing_cache)
+    worker_state = WorkerState(
+        input="show revenue trends",
+        agents=[ACCOUNTING_AGENT],
+        chat_id=uuid4(),
+        company_id=uuid4(),
+        chat_history=[],
+        user_id=uuid4()
+    )
+    await routing_cache.store(str(worker_state.company_id), "show revenue trends", [ACCOUNTING_AGENT])
+
+    # Act
+    result = await supervisor.interact({"input": "show revenue trends", "worker_state": worker_state})
+
+    # Assert
+    assert result == SupervisorOutput(selected_agents=[ACCOUNTING_AGENT])
+    llm_service.get_llm.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_supervisor_stores_decisions_in_the_background(mock_embedding_service):
+    """Test that a miss answers before the decision is written and the write lands afterwards"""
+    # Arrange
+    release = asyncio.Event()
+    backend = InMemoryVectorBackend(ttl_seconds=60, max_entries=2)
+    upsert = backend.upsert
+
+    async def slow_upsert(*args):
+        await release.wait()
+        return await upsert(*args)
+
+    backend.upsert = slow_upsert
+    routing_cache = RoutingCacheService(mock_embedding_service, backend)
+    supervisor = Supervisor(PromptService(), LlmService(backend="fake", fake_latency=0), routing_cache_service=routing_cache)
+    worker_state = WorkerState(
+        input="show revenue trends",
+        agents=[ACCOUNTING_AGENT],
+        chat_id=uuid4(),
+        company_id=uuid4(),
+        chat_history=[],
+        user_id=uuid4()
+    )
+
+    # Act
+    result = await asyncio.wait_for(supervisor.interact({
+        "input": "show revenue trends",
+        "chat_id": worker_state.chat_id,
+        "available_agents": [UUID(ACCOUNTING_AGENT)],
+        "worker_state": worker_state
+    }), timeout=1)
+    stored_before = routing_cache.stats()["stores"]
+    release.set()
+    await routing_cache.wait_for_stores()
+
+    # Assert
+    assert result.selected_agents == [ACCOUNTING_AGENT]
+    assert stored_before == 0
+    assert routing_cache.stats()["stores"] == 1
+
+
+@pytest.mark.asyncio
+async def test_qdrant_backend_round_trip():
+    """Test the Qdrant backend against a local in-memory Qdrant instance"""
+    # Arrange
+    backend = QdrantVectorBackend(
+        client=AsyncQdrantClient(location=":memory:"),
+        collection_name="routing_cache_test",
+        ttl_seconds=60,
+        max_entries=1,
+        evict_sample_rate=1.0
+    )
+    await backend.upsert("company", VECTORS["can i fire an employee?"], ["legal"])
+
+    # Act
+    evicted = await backend.upsert("company", VECTORS["show revenue trends"], [ACCOUNTING_AGENT])
+    match = await backend.search("company", VECTORS["show me revenue trends"], threshold=0.95)
+
+    # Assert
+    assert evicted == 1
+    assert match.selected_agents == [ACCOUNTING_AGENT]
+    assert await backend.search("other", VECTORS["show revenue trends"], threshold=0.95) is None
+
+
+@pytest.mark.asyncio
+async def test_qdrant_backend_trims_on_a_sample_of_upserts():
+    """Test that upserts outside the eviction sample skip the trim"""
+    # Arrange
+    client = AsyncQdrantClient(location=":memory:")
+    backend = QdrantVectorBackend(client, "routing_cache_test", ttl_seconds=60, max_entries=1, evict_sample_rate=0.0)
+
+    # Act
+    evicted = [await backend.upsert("company", VECTORS[text], ["legal"]) for text in ("show revenue trends", "reset my password")]
+
+    # Assert
+    assert evicted == [0, 0]
+    assert (await client.count("routing_cache_test", exact=True)).count == 2
+
+
+@pytest.mark.asyncio
+async def test_supervisor_skips_the_cache_for_follow_up_turns(routing_cache):
+    """Test that an input with chat history is neither answered from nor written to the cache"""
+    # Arrange
+    supervisor = Supervisor(PromptService(), LlmService(backend="fake", fake_latency=0), routing_cache_service=routing_cache)
+    worker_state = WorkerState(
+        input="show revenue trends",
+        agents=[ACCOUNTING_AGENT],
+        chat_id=uuid4(),
+        company_id=uuid4(),
+        chat_history=[{"type": "human", "text": "Can I fire an employee?"}],
+        user_id=uuid4()
+    )
+    await routing_cache.store(str(worker_state.company_id), "show revenue trends", ["legal"])
+
+    # Act
+    result = await supervisor.interact({
+        "input": "show revenue trends",
+        "chat_id": worker_state.chat_id,
+        "available_agents": [UUID(ACCOUNTING_AGENT)],
+        "worker_state": worker_state
+    })
+    await routing_cache.wait_for_stores()
+
+    # Assert
+    assert result.selected_agents == [ACCOUNTING_AGENT]
+    assert routing_cache.stats()["hits"] == 0
+    assert routing_cache.stats()["stores"] == 1
+
+
+@pytest.mark.asyncio
+async def test_qdrant_backend_writes_hits_back_only_before_a_trim():
+    """Test that search hits skip the payload write until a sampled trim needs them"""
+    # Arrange
+    client = AsyncQdrantClient(location=":memory:")
+    backend = QdrantVectorBackend(client, "routing_cache_test", ttl_seconds=60, max_entries=1, evict_sample_rate=0.0)
+    await backend.upsert("company", VECTORS["show revenue trends"], [ACCOUNTING_AGENT])
+    await backend.upsert("company", VECTORS["reset my password"], ["support"])
+
+    # Act
+    with patch.object(client, "set_payload", wraps=client.set_payload) as set_payload:
+        await backend.search("company", VECTORS["show me revenue trends"], threshold=0.95)
+        writes_on_hit = set_payload.await_count
+        backend.evict_sample_rate = 1.0
+        evicted = await backend.upsert("company", VECTORS["can i fire an employee?"], ["legal"])
+
+    # Assert
+    assert writes_on_hit == 0
+    assert set_payload.await_count == 1
+    assert evicted == 2
+    assert await backend.search("company", VECTORS["show revenue trends"], threshold=0.95) is not None
@@ -0,0 +1,95 @@
+import pytest
+from unittest.mock import Mock
+from uuid import UUID
+from langchain_core.runnables import RunnableLambda
+
+from src.workflow.agents.supervisor.routing_cascade import RoutingCascade
+from src.workflow.agents.supervisor.supervisor_models import ModelTier
+from src.workflow.services.agent_registry_service import AgentRegistryService
+from src.workflow.services.llm_service import LlmService
+from src.workflow.services.prompt_service import PromptService
+
+LEGAL_AGENT_ID = "95e222ef-c637-42d3-a81e-955beeeb0ba2"
+TIERS = [ModelTier(model="gpt-4o-mini", input_cost=0.15, output_cost=0.6), ModelTier(model="gpt-4o", input_cost=2.5, output_cost=10)]
+
+
+@pytest.fixture
+def llm_service():
+    """Fake model backend without latency"""
+    return LlmService(backend="fake", fake_latency=0)
+
+
+@pytest.fixture
+def prompt_and_inputs():
+    """Supervisor prompt and its inputs with only the legal agent available"""
+    variables = AgentRegistryService.from_file().get_prompt_variables([UUID(LEGAL_AGENT_ID)])
+    return PromptService().get_prompt("supervisor"), {"input": "Review this contract", "chat_history": [], **variables}
+
+
+@pytest.mark.asyncio
+async def test_confident_small_model_is_not_escalated(llm_service, prompt_and_inputs):
+    """Test that a confident answer of the first tier is used without calling the large model"""
+    # Arrange
+    cascade = RoutingCascade(llm_service, TIERS, min_confidence=0.7)
+
+    # Act
+    response = await cascade.route(*prompt_and_inputs, available_agents=[UUID(LEGAL_AGENT_ID)])
+
+    # Assert
+    stats = cascade.stats()
+    assert response.selected_agents == [LEGAL_AGENT_ID]
+    assert stats["gpt-4o-mini"]["calls"] == 1 and stats["gpt-4o"]["calls"] == 0
+    assert stats["gpt-4o-mini"]["cost"] > 0
+    assert stats["gpt-4o-mini"]["p50"] is not None
+
+
+@pytest.mark.asyncio
+async def test_low_confidence_escalates_to_the_next_tier(llm_service, prompt_and_inputs):
+    """Test that a low confidence answer is routed again by the large model"""
+    # Arrange
+    llm_service.get_llm(temperature=0.1, model="gpt-4o-mini").confidence = 0.3
+    cascade = RoutingCascade(llm_service, TIERS, min_confidence=0.7)
+
+    # Act
+    response = await cascade.route(*prompt_and_inputs, available_agents=[UUID(LEGAL_AGENT_ID)])
+
+    # Assert
+    stats = cascade.stats()
+    assert response.selected_agents == [LEGAL_AGENT_ID]
+    assert stats["gpt-4o-mini"]["escalations"] == {"low_confidence": 1}
+    assert stats["gpt-4o"]["calls"] == 1
+    assert stats["gpt-4o"]["cost"] > stats["gpt-4o-mini"]["cost"]
+
+
+@pytest.mark.asyncio
+async def test_invalid_output_escalates_and_last_tier_drops_unknown_agents(prompt_and_inputs):
+    """Test that unparsable and unavailable selections escalate, and the last tier is filtered"""
+    # Arrange
+    answers = {
+        "small": {"raw": None, "parsed": None, "parsing_error": ValueError("bad json")},
+        "large": {"raw": None, "parsed": Mock(selected_agents=[LEGAL_AGENT_ID, "unknown"], confidence=0.9), "parsing_error": None}
+    }
+
+    def get_llm(temperature, model=None):
+        llm = Mock()
+        llm.with_structured_output.return_value = RunnableLambda(lambda prompt: answers[model])
+        return llm
+
+    llm_service = Mock(get_llm=Mock(side_effect=get_llm))
+    cascade = RoutingCascade(llm_service, [ModelTier(model="small"), ModelTier(model="large")], min_confidence=0.7)
+
+    # Act
+    response = await cascade.route(*prompt_and_inputs, available_agents=[UUID(LEGAL_AGENT_ID)])
+
+    # Assert
+    assert response.selected_agents == [LEGAL_AGENT_ID]
+    assert cascade.stats()["small"]["escalations"] == {"invalid_output": 1}
+
+
+def test_tiers_are_parsed_from_configuration():
+    """Test the model:input_cost:output_cost tier format"""
+    # Act
+    tiers = RoutingCascade.parse_tiers("gpt-4o-mini:0.15:0.6, gpt-4o")
+
+    # Assert
+    assert tiers == [ModelTier(model="gpt-4o-mini", input_cost=0.15, output_cost=0.6), ModelTier(model="gpt-4o")]
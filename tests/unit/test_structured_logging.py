@@ -0,0 +1,121 @@
+import io
+import sys
+import json
+import queue
+import asyncio
+import logging
+import pytest
+from uuid import uuid4
+
+from src.utils.logs.structured_logging import (
+    AsyncQueueHandler,
+    ContextFilter,
+    JsonFormatter,
+    SamplingFilter,
+    configure_logging,
+    log_context,
+    shutdown_logging
+)
+from src.utils.tracing.tracer import InMemorySpanExporter, Tracer, get_tracer, set_tracer
+
+
+@pytest.fixture
+def stream():
+    """Async JSON logging installed on the root logger for the test, written to a buffer"""
+    stream = io.StringIO()
+    configure_logging(level="INFO", format="json", async_enabled=True, sample_rates={}, stream=stream)
+    yield stream
+    shutdown_logging()
+
+
+def records(stream: io.StringIO):
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+@pytest.mark.asyncio
+async def test_records_carry_the_interaction_context(stream):
+    """Test that records logged by concurrent interactions carry their own chat and company"""
+    # Arrange
+    chats = [(uuid4(), uuid4()) for _ in range(2)]
+
+    async def interaction(chat_id, company_id):
+        with log_context(chat_id=chat_id, company_id=company_id):
+            await asyncio.sleep(0)
+            logging.getLogger("interactions.controller").info("Interaction %s started", chat_id)
+
+    # Act
+    await asyncio.gather(*(interaction(chat_id, company_id) for chat_id, company_id in chats))
+    logging.getLogger("interactions.controller").info("Outside of any interaction")
+    shutdown_logging()
+
+    # Assert
+    logged = records(stream)
+    for (chat_id, company_id), record in zip(chats, logged):
+        assert record["chat_id"] == str(chat_id)
+        assert record["company_id"] == str(company_id)
+        assert record["message"] == f"Interaction {chat_id} started"
+        assert record["level"] == "INFO"
+    assert "chat_id" not in logged[2]
+
+
+def test_json_records_include_fields_exception_and_trace():
+    """Test the JSON format with structured fields, a traceback and the current trace id"""
+    # Arrange
+    previous = get_tracer()
+    set_tracer(Tracer(exporter=InMemorySpanExporter(), enabled=True, sample_ratio=1.0))
+    logger = logging.getLogger("graph.supervisor")
+    formatter, context_filter = JsonFormatter(), ContextFilter()
+
+    # Act
+    try:
+        with get_tracer().start_span("graph.supervisor") as span:
+            try:
+                raise ValueError("no agents")
+            except ValueError:
+                record = logger.makeRecord(
+                    logger.name, logging.ERROR, __file__, 0, "Routing failed", None, sys.exc_info(),
+                    extra={"fields": {"selected_agents": ["95e222ef"]}}
+                )
+                context_filter.filter(record)
+    finally:
+        set_tracer(previous)
+    entry = json.loads(formatter.format(record))
+
+    # Assert
+    assert entry["selected_agents"] == ["95e222ef"]
+    assert entry["trace_id"] == span.context.trace_id
+    assert "ValueError: no agents" in entry["exception"]
+
+
+def test_sampling_keeps_a_fraction_of_noisy_loggers_and_every_warning():
+    """Test that sampled loggers are thinned by prefix while warnings and other loggers pass"""
+    # Arrange
+    sampling = SamplingFilter({"websocket.connection": 0.1, "websocket": 1.0}, seed=7)
+
+    def record(name: str, level: int = logging.INFO):
+        return logging.LogRecord(name, level, __file__, 0, "message", None, None)
+
+    # Act
+    kept = sum(sampling.filter(record("websocket.connection")) for _ in range(1000))
+
+    # Assert
+    assert 50 < kept < 150
+    assert sampling.dropped == 1000 - kept
+    assert sampling.filter(record("websocket.connection", logging.WARNING))
+    assert sampling.filter(record("websocket.interact"))
+    assert sampling.filter(record("interactions.controller"))
+    assert SamplingFilter.parse_rates("websocket.connection:0.1, graph:0.5") == {"websocket.connection": 0.1, "graph": 0.5}
+
+
+def test_full_queue_drops_instead_of_blocking():
+    """Test that the caller never waits on a full log queue"""
+    # Arrange
+    handler = AsyncQueueHandler(queue.Queue(maxsize=2))
+
+    # Act
+    for index in range(5):
+        handler.handle(logging.LogRecord("app", logging.INFO, __file__, 0, "message %d", (index,), None))
+
+    # Assert
+    assert handler.dropped == 3
+    assert handler.queue.get_nowait().msg == "message 0"
@@ -8,6 +8,7 @@ from src.workflow.agents.supervisor.supervisor_models import SupervisorOutput
 from src.workflow.state import State
 from src.workflow.services.prompt_service import PromptService
 from src.workflow.services.llm_service import LlmService
+from src.workflow.services.agent_registry_service import AgentRegistryService
 
 
 @pytest.fixture
@@ -22,7 +23,8 @@ def event_loop():
 def mock_prompt_service():
     """Mock PromptService for testing"""
     mock_service = Mock(spec=PromptService)
-    mock_service.custom_prompt_template = AsyncMock(return_value="mock_prompt_template")
+    mock_service.get_prompt = Mock(return_value="mock_prompt_template")
+    mock_service.get_chat_history = AsyncMock(return_value=[])
     return mock_service
 
 
@@ -85,27 +87,26 @@ def test_supervisor_constructor_accepts_correct_types():
 
 @pytest.mark.asyncio
 async def test_get_prompt_template_calls_prompt_service(supervisor_instance, mock_prompt_service, sample_state):
-    """Test that __get_prompt_template calls prompt service with correct parameters"""
+    """Test that __get_prompt_template takes the supervisor template from the prompt service"""
     # Act
     await supervisor_instance._Supervisor__get_prompt_template(sample_state)
     
     # Assert
-    mock_prompt_service.custom_prompt_template.assert_called_once()
-    call_args = mock_prompt_service.custom_prompt_template.call_args
-    assert call_args.kwargs["state"] == sample_state
-    assert call_args.kwargs["with_chat_history"] is True
-    assert "system_message" in call_args.kwargs
+    mock_prompt_service.get_prompt.assert_called_once_with("supervisor")
 
 
 @pytest.mark.asyncio
-async def test_get_prompt_template_system_message_content(supervisor_instance, mock_prompt_service, sample_state):
-    """Test that __get_prompt_template includes correct system message content"""
+async def test_get_prompt_template_system_message_content(sample_state):
+    """Test that the supervisor template includes correct system message content"""
+    # Arrange
+    supervisor = Supervisor(PromptService(), Mock(spec=LlmService))
+    
     # Act
-    await supervisor_instance._Supervisor__get_prompt_template(sample_state)
+    prompt = await supervisor._Supervisor__get_prompt_template(sample_state)
     
     # Assert
-    call_args = mock_prompt_service.custom_prompt_template.call_args
-    system_message = call_args.kwargs["system_message"]
+    variables = AgentRegistryService.from_file().get_prompt_variables(sample_state["available_agents"])
+    system_message = prompt.format_messages(input=sample_state["input"], **variables)[0].content
     
     # Check key components of the system message
     assert "workflow orchestrator" in system_message
@@ -120,7 +121,7 @@ async def test_get_prompt_template_returns_prompt(supervisor_instance, mock_prom
     """Test that __get_prompt_template returns the prompt from prompt service"""
     # Arrange
     expected_prompt = "test_prompt_template"
-    mock_prompt_service.custom_prompt_template.return_value = expected_prompt
+    mock_prompt_service.get_prompt.return_value = expected_prompt
     
     # Act
     result = await supervisor_instance._Supervisor__get_prompt_template(sample_state)
@@ -137,7 +138,7 @@ async def test_get_prompt_template_with_error_handler():
     
     # Arrange
     mock_prompt_service = Mock(spec=PromptService)
-    mock_prompt_service.custom_prompt_template = AsyncMock(return_value="prompt")
+    mock_prompt_service.get_prompt = Mock(return_value="prompt")
     mock_llm_service = Mock(spec=LlmService)
     
     supervisor = Supervisor(mock_prompt_service, mock_llm_service)
@@ -252,7 +253,11 @@ async def test_interact_invokes_chain_with_input(supervisor_instance, mock_llm_s
     await supervisor_instance.interact(sample_state)
     
     # Assert
-    mock_chain.ainvoke.assert_called_once_with({"input": sample_state["input"]})
+    mock_chain.ainvoke.assert_called_once_with({
+        "input": sample_state["input"],
+        "chat_history": [],
+        **AgentRegistryService.from_file().get_prompt_variables(sample_state["available_agents"])
+    })
 
 
 @pytest.mark.asyncio
@@ -397,7 +402,7 @@ async def test_interact_with_error_handler_decorator():
     
     # Arrange
     mock_prompt_service = Mock(spec=PromptService)
-    mock_prompt_service.custom_prompt_template = AsyncMock(return_value="prompt")
+    mock_prompt_service.get_chat_history = AsyncMock(return_value=[])
     mock_llm_service = Mock(spec=LlmService)
     
     supervisor = Supervisor(mock_prompt_service, mock_llm_service)
@@ -0,0 +1,151 @@
+import pytest
+import httpx
+from unittest.mock import Mock, AsyncMock, patch
+from uuid import UUID, uuid4
+
+from src.api.core.services.http_client_service import HttpClientService
+from src.api.modules.interactions.interactions_models import WorkerState
+from src.api.modules.websocket.websocket_service import WebsocketService
+from src.utils.tracing.tracer import InMemorySpanExporter, SpanContext, Tracer, get_tracer, set_tracer
+from src.workflow.agents.supervisor.supervisor_agent import Supervisor
+from src.workflow.orchestrator.deadline import Deadline
+from src.workflow.orchestrator.orchestrator import Orchestrator
+from src.workflow.services.llm_service import LlmService
+from src.workflow.services.message_sink_service import MessageSinkService
+from src.workflow.services.prompt_service import PromptService
+from src.workflow.state import create_state
+
+AGENT_ID = "95e222ef-c637-42d3-a81e-955beeeb0ba2"
+
+ENVIRONMENT = {
+    "WORKER_HOST": ".workers.test",
+    "HMAC_SECRET": "test-secret",
+    "MAIN_SERVER_ENDPOINT": "main.test"
+}
+
+
+@pytest.fixture
+def exporter():
+    """In-memory exporter installed on the process tracer for the test"""
+    exporter = InMemorySpanExporter()
+    previous = get_tracer()
+    set_tracer(Tracer(exporter=exporter, enabled=True, sample_ratio=1.0))
+    yield exporter
+    set_tracer(previous)
+
+
+@pytest.fixture
+def state():
+    """Graph state routed to one agent"""
+    worker_state = WorkerState(
+        input="Can I terminate an employee without notice?",
+        agents=[UUID(AGENT_ID)],
+        chat_id=uuid4(),
+        company_id=uuid4(),
+        chat_history=[],
+        user_id=uuid4()
+    )
+    return {**create_state(worker_state, Deadline.after(5).expires_at), "selected_agents": [AGENT_ID]}
+
+
+def test_traceparent_round_trip():
+    """Test the W3C traceparent format and that malformed headers are ignored"""
+    # Arrange
+    context = SpanContext("4bf92f3577b34da6a3ce929d0e0e4736", "00f067aa0ba902b7", sampled=True)
+
+    # Act
+    parsed = SpanContext.from_traceparent(context.to_traceparent())
+
+    # Assert
+    assert context.to_traceparent() == "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+    assert (parsed.trace_id, parsed.span_id, parsed.sampled) == (context.trace_id, context.span_id, True)
+    assert SpanContext.from_traceparent("00-xyz-00f067aa0ba902b7-01") is None
+    assert SpanContext.from_traceparent(None) is None
+
+
+@pytest.mark.asyncio
+async def test_interaction_spans_nest_and_propagate_to_workers(exporter, state):
+    """Test that worker calls, socket sends and persistence are traced and workers receive the trace context"""
+    # Arrange
+    requests_seen = []
+
+    def handler(request: httpx.Request):
+        requests_seen.append(request)
+        if request.url.host == "main.test":
+            return httpx.Response(201)
+        return httpx.Response(200, json={"response": "Legal advice"})
+
+    http_client_service = HttpClientService(transport=httpx.MockTransport(handler))
+    websocket_service = Mock(spec=WebsocketService)
+    websocket_service.send_json = AsyncMock(return_value=True)
+    message_sink_service = MessageSinkService(http_client_service)
+    with patch.dict("os.environ", ENVIRONMENT):
+        orchestrator = Orchestrator(websocket_service, http_client_service, message_sink_service)
+
+    # Act
+    with patch.dict("os.environ", ENVIRONMENT):
+        with get_tracer().start_span("interaction.run") as root:
+            await orchestrator.orchestrate(state=state, worker_state=state["worker_state"])
+        await message_sink_service.aclose()
+
+    # Assert
+    agent_span = exporter.get_finished_spans("orchestrator.agent")[0]
+    worker_request = next(request for request in requests_seen if request.url.host.endswith("workers.test"))
+    assert agent_span.parent_id == root.context.span_id
+    assert agent_span.attributes["agent_id"] == AGENT_ID
+    assert worker_request.headers["traceparent"] == agent_span.context.to_traceparent()
+    assert agent_span.context.trace_id == root.context.trace_id
+
+    sink_span = exporter.get_finished_spans("message_sink.send_batch")[0]
+    sink_request = next(request for request in requests_seen if request.url.host == "main.test")
+    assert sink_span.attributes == {"messages": 2, "persisted": True}
+    assert sink_request.headers["traceparent"] == sink_span.context.to_traceparent()
+
+
+@pytest.mark.asyncio
+async def test_supervisor_span_records_the_route(exporter, state):
+    """Test that the supervisor span says which router selected the agents"""
+    # Arrange
+    supervisor = Supervisor(PromptService(), LlmService(backend="fake", fake_latency=0))
+
+    # Act
+    with get_tracer().start_span("graph.supervisor"):
+        await supervisor.interact(state)
+
+    # Assert
+    span = exporter.get_finished_spans("supervisor.interact")[0]
+    assert span.attributes == {"route": "llm", "selected_agents": 1}
+    assert span.parent_id == exporter.get_finished_spans("graph.supervisor")[0].context.span_id
+    assert span.duration > 0
+
+
+@pytest.mark.asyncio
+async def test_unsampled_traces_are_propagated_but_not_exported():
+    """Test that a trace left out by sampling still tells downstream services not to record it"""
+    # Arrange
+    exporter = InMemorySpanExporter()
+    tracer = Tracer(exporter=exporter, enabled=True, sample_ratio=0.0)
+
+    # Act
+    with tracer.start_span("interaction.run"):
+        with tracer.start_span("orchestrator.agent"):
+            headers = tracer.inject({})
+
+    # Assert
+    assert headers["traceparent"].endswith("-00")
+    assert exporter.get_finished_spans() == []
+
+
+def test_disabled_tracer_adds_nothing():
+    """Test that nothing is recorded or propagated while tracing is disabled"""
+    # Arrange
+    tracer = Tracer(exporter=InMemorySpanExporter(), enabled=False)
+
+    # Act
+    with tracer.start_span("interaction.run") as span:
+        span.set_attribute("ignored", True)
+        headers = tracer.inject({})
+
+    # Assert
+    assert headers == {}
+    assert tracer.exporter.get_finished_spans() == []
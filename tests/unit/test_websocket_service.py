@@ -0,0 +1,210 @@
+import asyncio
+import pytest
+import pytest_asyncio
+from unittest.mock import Mock, AsyncMock
+from uuid import uuid4
+
+from src.api.modules.websocket.websocket_service import WebsocketService
+from src.api.core.services.redis_service import RedisService
+from fakeredis import FakeAsyncRedis
+
+
+@pytest.fixture
+def redis_service():
+    """RedisService backed by fakeredis"""
+    return RedisService(client=FakeAsyncRedis())
+
+
+@pytest.fixture
+def websocket():
+    """Mock frontend websocket"""
+    websocket = Mock()
+    websocket.send_json = AsyncMock()
+    return websocket
+
+
+@pytest_asyncio.fixture
+async def nodes(redis_service):
+    """Two cluster-mode WebsocketService nodes sharing one Redis"""
+    node_a = WebsocketService(redis_service=redis_service)
+    node_b = WebsocketService(redis_service=redis_service)
+    await node_a.start()
+    await node_b.start()
+    yield node_a, node_b
+    await node_a.stop()
+    await node_b.stop()
+
+
+async def wait_for_call(mock: AsyncMock, timeout: float = 1.0):
+    async def poll():
+        while not mock.await_count:
+            await asyncio.sleep(0)
+    await asyncio.wait_for(poll(), timeout)
+
+
+@pytest.mark.asyncio
+async def test_send_json_delivers_to_local_connection(websocket):
+    """Test that a locally held socket receives the message directly"""
+    # Arrange
+    service = WebsocketService()
+    chat_id = uuid4()
+    await service.add_connection(chat_id, websocket)
+
+    # Act
+    delivered = await service.send_json(chat_id, {"agents": []})
+    await wait_for_call(websocket.send_json)
+    await service.remove_connection(chat_id)
+
+    # Assert
+    assert delivered is True
+    websocket.send_json.assert_awaited_once_with({"agents": []})
+
+
+@pytest.mark.asyncio
+async def test_send_json_without_connection_or_cluster_returns_false():
+    """Test that messages for unknown chats are reported as undelivered in single-node mode"""
+    # Act & Assert
+    assert await WebsocketService().send_json(uuid4(), {"agents": []}) is False
+
+
+@pytest.mark.asyncio
+async def test_cluster_mode_delivers_through_node_holding_socket(nodes, websocket):
+    """Test that a message sent on one node reaches the socket held by another"""
+    # Arrange
+    node_a, node_b = nodes
+    chat_id = uuid4()
+    await node_a.add_connection(chat_id, websocket)
+
+    # Act
+    delivered = await node_b.send_json(chat_id, {"agent_id": "agent", "response": "hi"})
+    await wait_for_call(websocket.send_json)
+
+    # Assert
+    assert delivered is True
+    websocket.send_json.assert_awaited_once_with({"agent_id": "agent", "response": "hi"})
+
+
+@pytest.mark.asyncio
+async def test_cluster_mode_stops_delivery_after_remove(nodes, websocket):
+    """Test that removing a connection unsubscribes its chat channel"""
+    # Arrange
+    node_a, node_b = nodes
+    chat_id = uuid4()
+    await node_a.add_connection(chat_id, websocket)
+    await node_a.remove_connection(chat_id)
+
+    # Act
+    delivered = await node_b.send_json(chat_id, {"agents": []})
+
+    # Assert
+    assert delivered is False
+    websocket.send_json.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_slow_client_does_not_block_sender():
+    """Test that send_json returns immediately while the client is stalled"""
+    # Arrange
+    release = asyncio.Event()
+    websocket = Mock()
+
+    async def blocked_send(data):
+        await release.wait()
+
+    websocket.send_json = AsyncMock(side_effect=blocked_send)
+    service = WebsocketService(max_queue_size=2, overflow_policy="drop_oldest")
+    chat_id = uuid4()
+    await service.add_connection(chat_id, websocket)
+    await service.send_json(chat_id, {"index": 0})
+    await asyncio.sleep(0)
+
+    # Act
+    for index in range(1, 5):
+        await asyncio.wait_for(service.send_json(chat_id, {"index": index}), timeout=0.1)
+
+    # Assert
+    stats = service.queue_stats()[str(chat_id)]
+    assert stats["depth"] == 2
+    assert stats["dropped"] == 2
+    release.set()
+    await service.remove_connection(chat_id)
+
+
+@pytest.mark.asyncio
+async def test_cluster_mode_skips_malformed_messages(nodes, redis_service, websocket):
+    """Test that a malformed pubsub message is counted and later messages still arrive"""
+    # Arrange
+    node_a, node_b = nodes
+    chat_id = uuid4()
+    await node_a.add_connection(chat_id, websocket)
+
+    # Act
+    await redis_service.redis.publish(RedisService.get_chat_channel(chat_id), "not json")
+    await node_b.send_json(chat_id, {"agents": []})
+    await wait_for_call(websocket.send_json)
+
+    # Assert
+    websocket.send_json.assert_awaited_once_with({"agents": []})
+    assert node_a.listener_stats()["bad_messages"] == 1
+
+
+class FlakyPubsubRedisService(RedisService):
+    """RedisService whose first pubsub connection drops once it starts listening"""
+    def __init__(self, client):
+        super().__init__(client=client)
+        self.pubsubs = 0
+
+    def pubsub(self):
+        pubsub = super().pubsub()
+        self.pubsubs += 1
+        if self.pubsubs == 1:
+            async def broken_listen():
+                raise ConnectionError("connection lost")
+                yield
+            pubsub.listen = broken_listen
+        return pubsub
+
+
+@pytest.mark.asyncio
+async def test_cluster_mode_resubscribes_after_connection_loss(websocket):
+    """Test that the listener reconnects and resubscribes the chats it holds"""
+    # Arrange
+    client = FakeAsyncRedis()
+    node_a = WebsocketService(redis_service=FlakyPubsubRedisService(client), reconnect_backoff=0.01)
+    node_b = WebsocketService(redis_service=RedisService(client=client))
+    chat_id = uuid4()
+    await node_a.start()
+    await node_a.add_connection(chat_id, websocket)
+
+    # Act
+    async def reconnected():
+        while not (node_a.reconnects and node_a.listener_connected):
+            await asyncio.sleep(0.01)
+    await asyncio.wait_for(reconnected(), timeout=1.0)
+    delivered = await node_b.send_json(chat_id, {"agents": []})
+    await wait_for_call(websocket.send_json)
+
+    # Assert
+    stats = node_a.listener_stats()
+    assert stats["reconnects"] == 1
+    assert stats["connected"] == 1
+    assert delivered is True
+    websocket.send_json.assert_awaited_once_with({"agents": []})
+    await node_a.stop()
+
+
+@pytest.mark.asyncio
+async def test_message_totals_include_closed_connections(websocket):
+    """Test that messages sent on a removed connection stay in the totals"""
+    # Arrange
+    service = WebsocketService()
+    chat_id = uuid4()
+    await service.add_connection(chat_id, websocket)
+    await service.send_json(chat_id, {"agents": []})
+    await wait_for_call(websocket.send_json)
+
+    # Act
+    await service.remove_connection(chat_id)
+
+    # Assert
+    assert service.message_totals() == {"sent": 1, "dropped": 0, "coalesced": 0}
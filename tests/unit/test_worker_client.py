@@ -0,0 +1,243 @@
+import asyncio
+import pytest
+import httpx
+from unittest.mock import patch
+
+from src.api.core.services.http_client_service import HttpClientService
+from src.workflow.orchestrator.deadline import Deadline, DEADLINE_HEADER
+from src.workflow.orchestrator.worker_client import WorkerClient, LatencyTracker, AgentUnavailableError
+from src.workflow.orchestrator.payload_codec import WorkerPayload, decode_payload
+
+AGENT_ID = "95e222ef-c637-42d3-a81e-955beeeb0ba2"
+
+ENVIRONMENT = {
+    "WORKER_HOST": ".workers.test",
+    "WORKER_HEDGE_HOST": ".replica.test"
+}
+
+
+@pytest.fixture
+def requests_seen():
+    """Collects the requests received by the fake workers"""
+    return []
+
+
+@pytest.fixture
+def primary_delay():
+    """Seconds the primary worker takes to answer, mutable per test"""
+    return {"seconds": 0.0}
+
+
+@pytest.fixture
+def http_client_service(requests_seen, primary_delay):
+    """HttpClientService backed by a slow primary and a fast replica"""
+    async def handler(request: httpx.Request):
+        requests_seen.append(request)
+        if request.url.host.endswith("workers.test"):
+            await asyncio.sleep(primary_delay["seconds"])
+        return httpx.Response(200, json={"response": request.url.host})
+
+    return HttpClientService(transport=httpx.MockTransport(handler))
+
+
+def test_latency_tracker_percentile():
+    """Test that percentiles are read from the sliding window"""
+    # Arrange
+    tracker = LatencyTracker(window=100)
+    for value in range(1, 101):
+        tracker.record(value / 100)
+
+    # Assert
+    assert tracker.percentile(0.95) == 0.96
+    assert LatencyTracker().percentile(0.95) is None
+
+
+@pytest.mark.asyncio
+async def test_post_propagates_remaining_deadline(http_client_service, requests_seen):
+    """Test that workers receive the remaining budget of the interaction"""
+    # Arrange
+    client = WorkerClient(http_client_service)
+
+    # Act
+    with patch.dict("os.environ", ENVIRONMENT):
+        await client.post(AGENT_ID, headers={}, payload={}, deadline=Deadline.after(5))
+
+    # Assert
+    budget = int(requests_seen[0].headers[DEADLINE_HEADER])
+    assert 4000 < budget <= 5000
+
+
+@pytest.mark.asyncio
+async def test_post_does_not_hedge_without_latency_history(http_client_service, requests_seen, primary_delay):
+    """Test that hedging waits for enough samples to estimate the p95"""
+    # Arrange
+    primary_delay["seconds"] = 0.05
+    client = WorkerClient(http_client_service, hedging_enabled=True, hedge_min_samples=5)
+
+    # Act
+    with patch.dict("os.environ", ENVIRONMENT):
+        response = await client.post(AGENT_ID, headers={}, payload={}, deadline=Deadline.after(5))
+
+    # Assert
+    assert response.json()["response"] == f"{AGENT_ID}.workers.test"
+    assert len(requests_seen) == 1
+    assert client.stats()["hedges"] == 0
+
+
+@pytest.mark.asyncio
+async def test_post_hedges_slow_primary_to_replica(http_client_service, requests_seen, primary_delay):
+    """Test that a primary slower than the p95 is raced against a replica"""
+    # Arrange
+    client = WorkerClient(http_client_service, hedging_enabled=True, hedge_min_samples=1)
+    with patch.dict("os.environ", ENVIRONMENT):
+        await client.post(AGENT_ID, headers={}, payload={}, deadline=Deadline.after(5))
+        primary_delay["seconds"] = 1.0
+
+        # Act
+        response = await client.post(AGENT_ID, headers={}, payload={}, deadline=Deadline.after(5))
+
+    # Assert
+    assert response.json()["response"] == f"{AGENT_ID}.replica.test"
+    assert client.stats()["hedges"] == 1
+    assert client.stats()["hedge_wins"] == 1
+
+
+@pytest.mark.asyncio
+async def test_post_sheds_calls_while_breaker_is_open(requests_seen):
+    """Test that a failing agent is short-circuited once its breaker opens"""
+    # Arrange
+    def handler(request: httpx.Request):
+        requests_seen.append(request)
+        return httpx.Response(503)
+
+    # Act
+    with patch.dict("os.environ", {**ENVIRONMENT, "WORKER_BREAKER_FAILURE_THRESHOLD": "2", "WORKER_CONCURRENCY_LIMIT_ENABLED": "true"}):
+        client = WorkerClient(HttpClientService(transport=httpx.MockTransport(handler)))
+        for _ in range(2):
+            await client.post(AGENT_ID, headers={}, payload={}, deadline=Deadline.after(5))
+
+        with pytest.raises(AgentUnavailableError) as error:
+            await client.post(AGENT_ID, headers={}, payload={}, deadline=Deadline.after(5))
+
+    # Assert
+    assert error.value.reason == "circuit_open"
+    assert len(requests_seen) == 2
+    agent_stats = client.stats()["agents"][AGENT_ID]
+    assert agent_stats["breaker"]["state"] == "open"
+    assert agent_stats["limiter"]["limit"] < 50
+
+
+@pytest.mark.asyncio
+async def test_stream_feeds_the_limiter_time_to_headers():
+    """Test that a long answer streamed by a healthy agent is timed to its headers, not its last token"""
+    # Arrange
+    async def body():
+        for _ in range(3):
+            await asyncio.sleep(0.05)
+            yield b'data: {"token": "x"}\n\n'
+
+    def handler(request: httpx.Request):
+        return httpx.Response(200, content=body(), headers={"Content-Type": "text/event-stream"})
+
+    with patch.dict("os.environ", {**ENVIRONMENT, "WORKER_CONCURRENCY_LIMIT_ENABLED": "true"}):
+        client = WorkerClient(HttpClientService(transport=httpx.MockTransport(handler)))
+
+        # Act
+        async with client.stream(AGENT_ID, headers={}, payload={}, deadline=Deadline.after(5)) as response:
+            async for _ in response.aiter_bytes():
+                pass
+
+    # Assert
+    limiter = client.stats()["agents"][AGENT_ID]["limiter"]
+    assert limiter["latency"] < 0.05
+    assert limiter["limit"] > 50
+
+
+@pytest.mark.asyncio
+async def test_payload_format_is_negotiated_with_the_agent(requests_seen):
+    """Test that plain JSON is sent until the agent advertises msgpack and zstd"""
+    # Arrange
+    def handler(request: httpx.Request):
+        requests_seen.append(request)
+        return httpx.Response(200, json={"response": "ok"}, headers={"Accept-Post": "application/msgpack, application/json", "Accept-Encoding": "gzip, zstd"})
+
+    client = WorkerClient(HttpClientService(transport=httpx.MockTransport(handler)), payload_formats="msgpack,json", payload_compressions="zstd,gzip", compression_min_bytes=0)
+    payload = WorkerPayload({"input": "Hi", "chat_history": [{"role": "human", "content": "x" * 2000}]})
+
+    # Act
+    with patch.dict("os.environ", ENVIRONMENT):
+        for _ in range(2):
+            await client.post(AGENT_ID, headers={}, payload=payload, deadline=Deadline.after(5))
+
+    # Assert
+    first, second = requests_seen
+    assert first.headers["content-type"] == "application/json" and "content-encoding" not in first.headers
+    assert second.headers["content-type"] == "application/msgpack" and second.headers["content-encoding"] == "zstd"
+    assert decode_payload(second.content, "application/msgpack", "zstd") == decode_payload(first.content) == payload.payload
+    assert len(second.content) < len(first.content) / 10
+
+
+@pytest.mark.asyncio
+async def test_refused_payload_is_resent_as_plain_json(requests_seen):
+    """Test that a 415 answer forgets the negotiated format and retries once with JSON"""
+    # Arrange
+    def handler(request: httpx.Request):
+        requests_seen.append(request)
+        if "content-encoding" in request.headers:
+            return httpx.Response(415)
+        return httpx.Response(200, json={"response": "ok"}, headers={"Accept-Encoding": "gzip"} if len(requests_seen) == 1 else {})
+
+    client = WorkerClient(HttpClientService(transport=httpx.MockTransport(handler)), compression_min_bytes=0)
+
+    # Act
+    with patch.dict("os.environ", ENVIRONMENT):
+        await client.post(AGENT_ID, headers={}, payload={"input": "Hi"}, deadline=Deadline.after(5))
+        response = await client.post(AGENT_ID, headers={}, payload={"input": "Hi"}, deadline=Deadline.after(5))
+        await client.post(AGENT_ID, headers={}, payload={"input": "Hi"}, deadline=Deadline.after(5))
+
+    # Assert
+    assert response.status_code == 200
+    assert [request.headers.get("content-encoding") for request in requests_seen] == [None, "gzip", None, None]
+    assert client.stats()["payload_fallbacks"] == 1
+
+
+def test_payload_is_encoded_once_per_format():
+    """Test that the fan-out reuses the same bytes"""
+    # Arrange
+    payload = WorkerPayload({"input": "Hi", "chat_history": []})
+
+    # Act
+    first = payload.encode()
+    second = payload.encode()
+
+    # Assert
+    assert first is second
+    assert payload.encode("application/json", "gzip") is payload.encode("application/json", "gzip")
+
+
+@pytest.mark.asyncio
+async def test_post_waits_for_the_losing_attempt_to_be_cancelled(requests_seen, primary_delay):
+    """Test that the slower attempt of a hedge has finished cancelling when post returns"""
+    # Arrange
+    cancelled = []
+
+    async def handler(request: httpx.Request):
+        requests_seen.append(request)
+        if request.url.host.endswith("workers.test"):
+            try:
+                await asyncio.sleep(primary_delay["seconds"])
+            except asyncio.CancelledError:
+                cancelled.append(request.url.host)
+                raise
+        return httpx.Response(200, json={"response": request.url.host})
+
+    client = WorkerClient(HttpClientService(transport=httpx.MockTransport(handler)), hedging_enabled=True, hedge_min_samples=1)
+    with patch.dict("os.environ", ENVIRONMENT):
+        await client.post(AGENT_ID, headers={}, payload={}, deadline=Deadline.after(5))
+        primary_delay["seconds"] = 1.0
+
+        # Act
+        await client.post(AGENT_ID, headers={}, payload={}, deadline=Deadline.after(5))
+
+    # Assert
+    assert cancelled == [f"{AGENT_ID}.workers.test"]
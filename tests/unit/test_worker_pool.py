@@ -0,0 +1,171 @@
+import asyncio
+import pytest
+from unittest.mock import Mock, AsyncMock
+from uuid import UUID, uuid4
+
+from src.api.modules.interactions.interactions_models import WorkerState
+from src.workflow.jobs.job_models import InteractionJob
+from src.workflow.jobs.job_queue import InMemoryJobQueue
+from src.workflow.jobs.worker_pool import WorkerPool
+from src.workflow.services.message_sink_service import MessageSinkService
+
+
+class FakeGraph:
+    def __init__(self, fail_inputs=()):
+        self.fail_inputs = set(fail_inputs)
+        self.running = 0
+        self.max_running = 0
+        self.inputs = []
+
+    async def ainvoke(self, state):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        self.inputs.append(state["input"])
+        if state["input"] in self.fail_inputs:
+            raise RuntimeError("graph failed")
+        return state
+
+
+def build_job(text: str) -> InteractionJob:
+    worker_state = WorkerState(
+        input=text,
+        agents=[UUID("95e222ef-c637-42d3-a81e-955beeeb0ba2")],
+        chat_id=uuid4(),
+        company_id=uuid4(),
+        chat_history=[],
+        user_id=uuid4()
+    )
+    return InteractionJob(deadline=0, worker_state=worker_state)
+
+
+async def wait_until(condition, timeout: float = 2.0):
+    loop = asyncio.get_running_loop()
+    expires_at = loop.time() + timeout
+    while not condition() and loop.time() < expires_at:
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_pool_bounds_concurrent_graph_runs():
+    """Test that no more than the configured number of graphs run at once"""
+    # Arrange
+    job_queue = InMemoryJobQueue()
+    graph = FakeGraph()
+    pool = WorkerPool(job_queue=job_queue, graph=graph, concurrency=3)
+    for index in range(10):
+        await job_queue.enqueue(build_job(str(index)))
+
+    # Act
+    await pool.start()
+    await wait_until(lambda: pool.processed == 10)
+    await pool.stop()
+
+    # Assert
+    assert graph.max_running == 3
+    stats = await pool.stats()
+    assert stats["processed"] == 10
+    assert stats["queue_depth"] == 0
+    assert stats["queue_wait_p95"] is not None
+
+
+@pytest.mark.asyncio
+async def test_pool_retries_failed_runs():
+    """Test that a failing run is requeued until it runs out of attempts"""
+    # Arrange
+    job_queue = InMemoryJobQueue(max_attempts=2)
+    graph = FakeGraph(fail_inputs={"broken"})
+    pool = WorkerPool(job_queue=job_queue, graph=graph, concurrency=1)
+    await job_queue.enqueue(build_job("broken"))
+    await job_queue.enqueue(build_job("fine"))
+
+    # Act
+    await pool.start()
+    await wait_until(lambda: pool.failed == 2 and pool.processed == 1)
+    await pool.stop()
+
+    # Assert
+    assert graph.inputs.count("broken") == 2
+    assert job_queue.dropped == 1
+
+
+class FlakyJobQueue(InMemoryJobQueue):
+    def __init__(self, failures: int, **kwargs):
+        super().__init__(**kwargs)
+        self.failures = failures
+        self.renewed = 0
+
+    async def dequeue(self, timeout: float = 1.0):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("queue unavailable")
+        return await super().dequeue(timeout=timeout)
+
+    async def renew(self, job: InteractionJob) -> bool:
+        self.renewed += 1
+        return True
+
+
+@pytest.mark.asyncio
+async def test_consumer_survives_queue_errors():
+    """Test that a consumer backs off and keeps running when the queue raises"""
+    # Arrange
+    job_queue = FlakyJobQueue(failures=2)
+    graph = FakeGraph()
+    pool = WorkerPool(job_queue=job_queue, graph=graph, concurrency=1, retry_backoff=0.01)
+    await job_queue.enqueue(build_job("Hello"))
+
+    # Act
+    await pool.start()
+    await wait_until(lambda: pool.processed == 1)
+    await pool.stop()
+
+    # Assert
+    stats = await pool.stats()
+    assert stats["consumer_errors"] == 2
+    assert stats["processed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_pool_renews_leases_of_running_jobs():
+    """Test that the lease of a long running job is renewed while the graph runs"""
+    # Arrange
+    class SlowGraph(FakeGraph):
+        async def ainvoke(self, state):
+            await asyncio.sleep(0.1)
+            return await super().ainvoke(state)
+
+    job_queue = FlakyJobQueue(failures=0)
+    pool = WorkerPool(job_queue=job_queue, graph=SlowGraph(), concurrency=1, heartbeat_interval=0.02)
+    await job_queue.enqueue(build_job("Hello"))
+
+    # Act
+    await pool.start()
+    await wait_until(lambda: pool.processed == 1)
+    await pool.stop()
+
+    # Assert
+    assert job_queue.renewed >= 2
+
+
+@pytest.mark.asyncio
+async def test_pool_acks_only_after_messages_are_persisted():
+    """Test that a job whose messages could not be persisted is retried instead of acked"""
+    # Arrange
+    job_queue = InMemoryJobQueue(max_attempts=2)
+    message_sink_service = Mock(spec=MessageSinkService)
+    message_sink_service.flush = AsyncMock(side_effect=[False, True])
+    pool = WorkerPool(job_queue=job_queue, graph=FakeGraph(), concurrency=1, message_sink_service=message_sink_service)
+    job = build_job("Hello")
+    await job_queue.enqueue(job)
+
+    # Act
+    await pool.start()
+    await wait_until(lambda: pool.processed == 1)
+    await pool.stop()
+
+    # Assert
+    assert pool.failed == 1
+    assert message_sink_service.flush.await_count == 2
+    message_sink_service.flush.assert_awaited_with(job.worker_state.chat_id)